@@ -0,0 +1,764 @@
+"""
+Archive extraction module
+Extracts game client archives (zip, tar.gz/bz2/xz/zst, 7z, rar, iso) with unified
+progress reporting and cooperative cancellation
+"""
+
+import os
+import re
+import select
+import shutil
+import struct
+import logging
+import tarfile
+import tempfile
+import threading
+import subprocess
+import zipfile
+import zlib
+from collections import deque
+from pathlib import Path
+from typing import Optional, Callable, Dict, Any, List, Tuple
+
+from iso_reader import extract_iso, is_iso_image, IsoFormatError
+
+# Constants
+COPY_CHUNK_SIZE = 1024 * 1024
+KERNEL_COPY_CHUNK_SIZE = 16 * 1024 * 1024
+PROCESS_POLL_INTERVAL = 0.2
+FILES_REPORT_INTERVAL = 50
+
+DEFAULT_EXTRACT_THREADS = os.cpu_count() or 1
+
+ARCHIVE_SUFFIXES = {
+    '.zip': 'zip',
+    '.tar.gz': 'tar',
+    '.tgz': 'tar',
+    '.tar.bz2': 'tar',
+    '.tbz2': 'tar',
+    '.tar.xz': 'tar',
+    '.txz': 'tar',
+    '.tar.zst': 'tar',
+    '.tzst': 'tar',
+    '.tar': 'tar',
+    '.7z': '7z',
+    '.rar': 'rar',
+    '.iso': 'iso',
+}
+
+# Leading magic bytes of each container or compression format
+ARCHIVE_MAGIC = [
+    (b"PK\x03\x04", 'zip'),
+    (b"PK\x05\x06", 'zip'),
+    (b"7z\xbc\xaf\x27\x1c", '7z'),
+    (b"Rar!\x1a\x07", 'rar'),
+    (b"\x1f\x8b", 'tar'),
+    (b"BZh", 'tar'),
+    (b"\xfd7zXZ\x00", 'tar'),
+    (b"\x28\xb5\x2f\xfd", 'tar'),
+]
+TAR_COMPRESSION_MAGIC = [
+    (b"\x1f\x8b", 'gz'),
+    (b"BZh", 'bz2'),
+    (b"\xfd7zXZ\x00", 'xz'),
+    (b"\x28\xb5\x2f\xfd", 'zst'),
+]
+TAR_USTAR_OFFSET = 257
+
+# Parallel decompressors tried before Python's single-threaded codecs.
+# "{threads}" is replaced with the requested thread count.
+TAR_DECOMPRESSORS = {
+    'gz': [["pigz", "-d", "-c", "-p", "{threads}"]],
+    'bz2': [["lbzip2", "-d", "-c", "-n", "{threads}"], ["pbzip2", "-d", "-c", "-p{threads}"]],
+    'xz': [["xz", "-d", "-c", "-T", "{threads}"]],
+    'zst': [["zstd", "-d", "-c", "-q", "-T{threads}"]],
+}
+
+RAR_COMMANDS = ["unrar", "unrar-free"]
+
+# Local file header: signature, versions, flags, method, times, crc, sizes,
+# then the name and extra field lengths that precede the member data.
+ZIP_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+ZIP_LOCAL_SIGNATURE = b"PK\x03\x04"
+ZIP_FLAG_ENCRYPTED = 0x1
+
+# 7z -bsp1 prints " 42% 17 - path/to/file" and rewrites the line with
+# backspaces; unrar prints "Extracting  path   42%" the same way.
+SEVENZIP_PROGRESS_RE = re.compile(r'^\s*(\d{1,3})%(?:\s+(\d+))?(?:\s+[-U+]\s+(.*))?$')
+RAR_PROGRESS_RE = re.compile(r'(\d{1,3})%\s*$')
+INNO_FILE_RE = re.compile(r'^-\s+"(.+?)"')
+UNSHIELD_FILE_RE = re.compile(r'^\s*extracting:\s+(.+?)\s*$')
+UNSHIELD_TOTAL_RE = re.compile(r'^\s*(\d+)\s+files?\s*$')
+RAR_FILE_RE = re.compile(r'^Extracting\s+(?!from\s)(.+?)(?:\s+\d{1,3}%)*(?:\s+OK)?\s*$')
+
+logger = logging.getLogger("game_installer.extract")
+
+
+class ExtractionError(Exception):
+    """Raised when an archive cannot be extracted"""
+
+
+class ExtractionCancelled(ExtractionError):
+    """Raised when extraction is cancelled through the cancel event"""
+
+
+class ExtractionProgress:
+    """Snapshot of extraction progress shared by every backend"""
+
+    def __init__(self, files_total: Optional[int] = None, bytes_total: Optional[int] = None):
+        self.files_done = 0
+        self.files_total = files_total
+        self.bytes_done = 0
+        self.bytes_total = bytes_total
+        self.zero_copy_bytes = 0
+        self.current_file = ""
+
+    @property
+    def fraction(self) -> Optional[float]:
+        """Completed fraction in the range 0..1, or None when totals are unknown"""
+        if self.bytes_total:
+            return min(self.bytes_done / self.bytes_total, 1.0)
+        if self.files_total:
+            return min(self.files_done / self.files_total, 1.0)
+        return None
+
+    def describe(self) -> str:
+        """Human-readable progress line for progress callbacks"""
+        parts = []
+        fraction = self.fraction
+        if fraction is not None:
+            parts.append(f"{int(fraction * 100)}%")
+        if self.files_total:
+            parts.append(f"{self.files_done}/{self.files_total} files")
+        elif self.files_done:
+            parts.append(f"{self.files_done} files")
+        if self.bytes_total:
+            parts.append(f"{_format_size(self.bytes_done)} of {_format_size(self.bytes_total)}")
+        if not parts:
+            return "Extracting game files..."
+        return f"Extracting game files... {' - '.join(parts)}"
+
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count using binary units"""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def _read_header(archive_path: Path, size: int = TAR_USTAR_OFFSET + 8) -> bytes:
+    try:
+        with open(archive_path, 'rb') as handle:
+            return handle.read(size)
+    except OSError:
+        return b""
+
+
+def detect_archive_format(archive_path) -> Optional[str]:
+    """
+    Return the backend name for an archive, or None if unsupported.
+
+    The file's magic bytes take precedence so mislabelled downloads (e.g. a
+    Google Drive file saved as .zip) still reach the right backend; the
+    file name suffix is only consulted when the content is not recognised.
+    """
+    header = _read_header(Path(archive_path))
+    for magic, backend in ARCHIVE_MAGIC:
+        if header.startswith(magic):
+            return backend
+    if header[TAR_USTAR_OFFSET:TAR_USTAR_OFFSET + 5] == b"ustar":
+        return 'tar'
+    if is_iso_image(Path(archive_path)):
+        return 'iso'
+
+    lowered = str(archive_path).lower()
+    for suffix, backend in ARCHIVE_SUFFIXES.items():
+        if lowered.endswith(suffix):
+            return backend
+    return None
+
+
+def detect_tar_compression(archive_path: Path) -> Optional[str]:
+    """Return 'gz', 'bz2', 'xz' or 'zst' for a compressed tarball, None if uncompressed"""
+    header = _read_header(archive_path, 8)
+    for magic, compression in TAR_COMPRESSION_MAGIC:
+        if header.startswith(magic):
+            return compression
+    return None
+
+
+def _safe_join(root: Path, member_name: str) -> Path:
+    """Resolve an archive member name below root, rejecting path traversal"""
+    normalized = member_name.replace('\\', '/').lstrip('/')
+    target = (root / normalized).resolve()
+    if target != root and root not in target.parents:
+        raise ExtractionError(f"Archive member escapes destination: {member_name}")
+    return target
+
+
+def merge_tree(source: Path, dest: Path):
+    """Move the contents of source into dest, replacing existing files"""
+    dest.mkdir(parents=True, exist_ok=True)
+    for entry in source.iterdir():
+        target = dest / entry.name
+        if entry.is_dir() and not entry.is_symlink() and target.is_dir():
+            merge_tree(entry, target)
+        else:
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            os.replace(entry, target)
+
+
+class ArchiveExtractor:
+    """
+    Extract one archive into a destination directory.
+
+    Output is written to a hidden staging directory inside dest and only merged
+    into place once the backend finishes, so a cancelled or failed extraction
+    never leaves partial files behind.
+    """
+
+    def __init__(self, archive_path: Path, dest_dir: Path,
+                 progress_callback: Callable = None,
+                 cancel_event: Optional[threading.Event] = None,
+                 archive_format: Optional[str] = None,
+                 threads: Optional[int] = None,
+                 which: Optional[Callable[[str], Optional[str]]] = None):
+        self.archive_path = Path(archive_path)
+        self.dest_dir = Path(dest_dir)
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event
+        self.archive_format = archive_format or detect_archive_format(self.archive_path)
+        self.threads = max(1, threads or DEFAULT_EXTRACT_THREADS)
+        self.which = which or shutil.which
+        self.progress = ExtractionProgress()
+        self._last_reported: Optional[Tuple[int, int]] = None
+
+    # --- Public API ------------------------------------------------------
+    def extract(self) -> ExtractionProgress:
+        """
+        Run the extraction.
+
+        Returns:
+            ExtractionProgress: Final progress snapshot
+
+        Raises:
+            ExtractionCancelled: If the cancel event was set
+            ExtractionError: If the archive is unsupported or the backend failed
+        """
+        backends = {
+            'zip': self._extract_zip,
+            'tar': self._extract_tar,
+            '7z': self._extract_7z,
+            'rar': self._extract_rar,
+            'iso': self._extract_iso,
+            'inno': self._extract_inno,
+            'installshield': self._extract_installshield,
+        }
+        backend = backends.get(self.archive_format)
+        if backend is None:
+            raise ExtractionError(f"Unsupported archive format: {self.archive_path.name}")
+
+        self.dest_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=".extracting-", dir=self.dest_dir))
+        try:
+            backend(staging)
+            self._check_cancelled()
+            merge_tree(staging, self.dest_dir)
+        except ExtractionCancelled:
+            logger.info(f"Extraction of {self.archive_path.name} cancelled")
+            raise
+        except ExtractionError:
+            raise
+        except (OSError, zipfile.BadZipFile, tarfile.TarError) as e:
+            raise ExtractionError(f"Failed to extract {self.archive_path.name}: {e}") from e
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+        self._report(force=True)
+        logger.info(
+            f"Extracted {self.archive_path.name}: {self.progress.files_done} files, "
+            f"{self.progress.bytes_done} bytes ({self.progress.zero_copy_bytes} copied in-kernel)"
+        )
+        return self.progress
+
+    # --- Helpers ---------------------------------------------------------
+    def _check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise ExtractionCancelled(f"Extraction of {self.archive_path.name} cancelled")
+
+    def _report(self, force: bool = False):
+        """Forward progress to the callback when the visible state changes"""
+        if not self.progress_callback:
+            return
+        fraction = self.progress.fraction
+        if fraction is not None:
+            key = (int(fraction * 100), 0)
+        else:
+            key = (-1, self.progress.files_done // FILES_REPORT_INTERVAL)
+        if not force and key == self._last_reported:
+            return
+        self._last_reported = key
+        self.progress_callback(self.progress.describe())
+
+    def _copy_stream(self, source, target: Path):
+        """Copy a member stream to target in chunks, honouring cancellation"""
+        with open(target, 'wb') as out:
+            while True:
+                self._check_cancelled()
+                chunk = source.read(COPY_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                self.progress.bytes_done += len(chunk)
+                self._report()
+
+    def _copy_stored_member(self, archive, member: zipfile.ZipInfo, target: Path):
+        """
+        Copy a STORED zip member straight from the archive file descriptor.
+
+        Uses copy_file_range (or sendfile) so the already-compressed payload
+        never passes through Python buffers; falls back to positional reads on
+        filesystems or kernels that support neither. The CRC-32 that
+        zipfile would check is computed over the written file, which is
+        still in the page cache.
+        """
+        offset = _stored_data_offset(archive, member)
+        remaining = member.file_size
+        src_fd = archive.fileno()
+        crc = 0
+        with open(target, 'w+b') as out:
+            dst_fd = out.fileno()
+            written = 0
+            kernel_copy = True
+            while remaining > 0:
+                self._check_cancelled()
+                count = min(remaining, KERNEL_COPY_CHUNK_SIZE)
+                copied = 0
+                if kernel_copy:
+                    try:
+                        copied = _kernel_copy(src_fd, dst_fd, offset, count)
+                        self.progress.zero_copy_bytes += copied
+                        crc = _crc32_range(dst_fd, written, copied, crc)
+                    except OSError as e:
+                        logger.debug(f"In-kernel copy unavailable ({e}); using buffered copy")
+                        kernel_copy = False
+                if not kernel_copy:
+                    data = os.pread(src_fd, min(count, COPY_CHUNK_SIZE), offset)
+                    out.write(data)
+                    copied = len(data)
+                    crc = zlib.crc32(data, crc)
+                if copied <= 0:
+                    raise ExtractionError(f"Unexpected end of archive while copying {member.filename}")
+                offset += copied
+                written += copied
+                remaining -= copied
+                self.progress.bytes_done += copied
+                self._report()
+        if crc != member.CRC:
+            raise ExtractionError(f"Bad CRC-32 for {member.filename} in {self.archive_path.name}")
+
+    # --- Backends --------------------------------------------------------
+    def _extract_zip(self, staging: Path):
+        with open(self.archive_path, 'rb') as raw, zipfile.ZipFile(self.archive_path, 'r') as zip_ref:
+            members = zip_ref.infolist()
+            files = [m for m in members if not m.is_dir()]
+            self.progress.files_total = len(files)
+            self.progress.bytes_total = sum(m.file_size for m in files)
+            self._report(force=True)
+
+            root = staging.resolve()
+            for member in members:
+                self._check_cancelled()
+                target = _safe_join(root, member.filename)
+                if member.is_dir():
+                    target.mkdir(parents=True, exist_ok=True)
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                self.progress.current_file = member.filename
+                if member.compress_type == zipfile.ZIP_STORED and not member.flag_bits & ZIP_FLAG_ENCRYPTED:
+                    self._copy_stored_member(raw, member, target)
+                else:
+                    with zip_ref.open(member) as source:
+                        self._copy_stream(source, target)
+                self.progress.files_done += 1
+                self._report()
+
+    def _extract_tar(self, staging: Path):
+        # Stream the archive once instead of pre-scanning every member, and
+        # measure progress against the compressed bytes consumed.
+        self.progress.bytes_total = self.archive_path.stat().st_size
+        self._report(force=True)
+
+        compression = detect_tar_compression(self.archive_path)
+        with open(self.archive_path, 'rb') as raw:
+            decompressor = self._start_tar_decompressor(compression, raw)
+            if decompressor is None:
+                if compression == 'zst':
+                    self._extract_tar_zstandard(raw, staging)
+                else:
+                    self._extract_tar_stream(raw, 'r|*', staging, raw)
+            else:
+                try:
+                    self._extract_tar_stream(decompressor.stdout, 'r|', staging, raw)
+                    # Drain trailing padding so the decompressor can exit cleanly
+                    while decompressor.stdout.read(COPY_CHUNK_SIZE):
+                        pass
+                    returncode = decompressor.wait()
+                except BaseException:
+                    _stop_process(decompressor)
+                    raise
+                finally:
+                    decompressor.stdout.close()
+                stderr = decompressor.stderr.read().decode('utf-8', errors='replace').strip()
+                decompressor.stderr.close()
+                if returncode != 0:
+                    raise ExtractionError(f"{decompressor.args[0]} failed: {stderr}")
+        self.progress.bytes_done = self.progress.bytes_total
+
+    def _start_tar_decompressor(self, compression: Optional[str], raw) -> Optional[subprocess.Popen]:
+        """Start a multithreaded external decompressor reading the archive on stdin"""
+        for template in TAR_DECOMPRESSORS.get(compression, []):
+            if not self.which(template[0]):
+                continue
+            cmd = [arg.replace("{threads}", str(self.threads)) for arg in template]
+            logger.info(f"Decompressing with: {' '.join(cmd)}")
+            # The child shares raw's file offset, which keeps byte progress accurate
+            return subprocess.Popen(cmd, stdin=raw, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        return None
+
+    def _extract_tar_zstandard(self, raw, staging: Path):
+        try:
+            import zstandard
+        except ImportError:
+            raise ExtractionError("zstd not found. Install zstd to extract .tar.zst archives.")
+        reader = zstandard.ZstdDecompressor().stream_reader(raw)
+        try:
+            self._extract_tar_stream(reader, 'r|', staging, raw)
+        finally:
+            reader.close()
+
+    def _extract_tar_stream(self, stream, mode: str, staging: Path, raw):
+        extract_kwargs: Dict[str, Any] = {}
+        if hasattr(tarfile, 'data_filter'):
+            extract_kwargs['filter'] = 'data'
+
+        root = staging.resolve()
+        with tarfile.open(fileobj=stream, mode=mode) as tar_ref:
+            for member in tar_ref:
+                self._check_cancelled()
+                _safe_join(root, member.name)
+                tar_ref.extract(member, staging, **extract_kwargs)
+                if member.isfile():
+                    self.progress.files_done += 1
+                self.progress.current_file = member.name
+                self.progress.bytes_done = os.lseek(raw.fileno(), 0, os.SEEK_CUR)
+                self._report()
+
+    def _extract_7z(self, staging: Path):
+        if not self.which('7z'):
+            raise ExtractionError("7z not found. Install p7zip to extract .7z archives.")
+        files_total, bytes_total = _list_7z_totals(self.archive_path)
+        self.progress.files_total = files_total
+        self.progress.bytes_total = bytes_total
+        self._report(force=True)
+
+        cmd = ['7z', 'x', '-y', '-bsp1', '-bb1', '-bso1', f'-mmt{self.threads}',
+               str(self.archive_path), f'-o{staging}']
+        self._run_tool(cmd, self._handle_7z_line)
+
+    def _extract_rar(self, staging: Path):
+        rar_cmd = next((cmd for cmd in RAR_COMMANDS if self.which(cmd)), None)
+        if not rar_cmd:
+            raise ExtractionError("unrar not found. Install unrar to extract .rar archives.")
+        files_total, bytes_total = _list_rar_totals(rar_cmd, self.archive_path)
+        self.progress.files_total = files_total
+        self.progress.bytes_total = bytes_total
+        self._report(force=True)
+
+        cmd = [rar_cmd, 'x', '-o+', '-y', str(self.archive_path), f'{staging}{os.sep}']
+        if rar_cmd == 'unrar-free':
+            cmd = [rar_cmd, 'x', str(self.archive_path), str(staging)]
+        self._run_tool(cmd, self._handle_rar_line)
+
+    def _extract_inno(self, staging: Path):
+        if not self.which('innoextract'):
+            raise ExtractionError("innoextract not found. Install innoextract to unpack Inno Setup installers.")
+        self.progress.files_total = _count_tool_matches(
+            ['innoextract', '--list', '--color=0', str(self.archive_path)], INNO_FILE_RE)
+        self._report(force=True)
+
+        cmd = ['innoextract', '--extract', '--color=0', '--progress=0',
+               '--output-dir', str(staging), str(self.archive_path)]
+        self._run_tool(cmd, lambda line: self._handle_file_line(INNO_FILE_RE, line))
+
+    def _extract_installshield(self, staging: Path):
+        if not self.which('unshield'):
+            raise ExtractionError("unshield not found. Install unshield to unpack InstallShield cabinets.")
+        listing = _count_tool_matches(['unshield', 'l', str(self.archive_path)], UNSHIELD_TOTAL_RE, group_value=True)
+        self.progress.files_total = listing
+        self._report(force=True)
+
+        cmd = ['unshield', '-d', str(staging), 'x', str(self.archive_path)]
+        self._run_tool(cmd, lambda line: self._handle_file_line(UNSHIELD_FILE_RE, line))
+
+    def _extract_iso(self, staging: Path):
+        def on_progress(files_done: int, files_total: int, bytes_done: int, bytes_total: int):
+            self._check_cancelled()
+            self.progress.files_done = files_done
+            self.progress.files_total = files_total
+            self.progress.bytes_done = bytes_done
+            self.progress.bytes_total = bytes_total
+            self._report()
+
+        try:
+            extract_iso(self.archive_path, staging, on_progress)
+        except IsoFormatError as e:
+            raise ExtractionError(f"Failed to read {self.archive_path.name}: {e}") from e
+
+    # --- External tool plumbing -----------------------------------------
+    def _handle_7z_line(self, line: str):
+        parsed = parse_7z_progress(line)
+        if parsed is None:
+            if line.startswith('- '):
+                self.progress.files_done += 1
+                self.progress.current_file = line[2:]
+                self._report()
+            return
+        percent, files_done, current = parsed
+        if self.progress.bytes_total:
+            self.progress.bytes_done = self.progress.bytes_total * percent // 100
+        if files_done is not None:
+            self.progress.files_done = files_done
+        if current:
+            self.progress.current_file = current
+        self._report()
+
+    def _handle_file_line(self, pattern, line: str):
+        """Count one extracted file for tools that print a line per file"""
+        match = pattern.match(line)
+        if match:
+            self.progress.files_done += 1
+            self.progress.current_file = match.group(1)
+            self._report()
+
+    def _handle_rar_line(self, line: str):
+        file_match = RAR_FILE_RE.match(line)
+        if file_match:
+            self.progress.files_done += 1
+            self.progress.current_file = file_match.group(1)
+            self._report()
+            return
+        percent = parse_rar_progress(line)
+        if percent is not None and self.progress.bytes_total:
+            self.progress.bytes_done = self.progress.bytes_total * percent // 100
+            self._report()
+
+    def _run_tool(self, cmd: List[str], line_handler: Callable[[str], None]):
+        """Run an extraction tool, streaming its progress output line by line"""
+        logger.info(f"Running: {' '.join(cmd)}")
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL)
+        tail: deque = deque(maxlen=20)
+        buffer = b""
+        try:
+            fd = proc.stdout.fileno()
+            while True:
+                self._check_cancelled()
+                ready, _, _ = select.select([fd], [], [], PROCESS_POLL_INTERVAL)
+                if not ready:
+                    if proc.poll() is not None:
+                        break
+                    continue
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                buffer += chunk
+                # Progress lines are rewritten in place with \r or backspaces
+                parts = re.split(rb'[\r\n\x08]+', buffer)
+                buffer = parts.pop()
+                for raw_line in parts:
+                    line = raw_line.decode('utf-8', errors='replace').strip()
+                    if not line:
+                        continue
+                    tail.append(line)
+                    line_handler(line)
+            if buffer.strip():
+                line_handler(buffer.decode('utf-8', errors='replace').strip())
+            returncode = proc.wait()
+        except BaseException:
+            # Cancelled, a failing progress handler or KeyboardInterrupt: never
+            # leave the tool writing into a staging directory being removed
+            _stop_process(proc)
+            raise
+        finally:
+            proc.stdout.close()
+
+        if returncode != 0:
+            raise ExtractionError(
+                f"{cmd[0]} exited with code {returncode}: {' | '.join(list(tail)[-5:])}"
+            )
+        if self.progress.bytes_total:
+            self.progress.bytes_done = self.progress.bytes_total
+
+
+def _stop_process(proc: subprocess.Popen):
+    """Terminate a helper process if it is still running and reap it"""
+    if proc.poll() is None:
+        proc.terminate()
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+def _stored_data_offset(archive, member: zipfile.ZipInfo) -> int:
+    """Return the absolute file offset of a member's data from its local header"""
+    header = os.pread(archive.fileno(), ZIP_LOCAL_HEADER.size, member.header_offset)
+    if len(header) != ZIP_LOCAL_HEADER.size:
+        raise ExtractionError(f"Truncated local header for {member.filename}")
+    fields = ZIP_LOCAL_HEADER.unpack(header)
+    if fields[0] != ZIP_LOCAL_SIGNATURE:
+        raise ExtractionError(f"Bad local header signature for {member.filename}")
+    name_length, extra_length = fields[-2], fields[-1]
+    return member.header_offset + ZIP_LOCAL_HEADER.size + name_length + extra_length
+
+
+def _crc32_range(fd: int, offset: int, count: int, crc: int) -> int:
+    """Continue a CRC-32 over count bytes of fd starting at offset"""
+    while count > 0:
+        data = os.pread(fd, min(count, COPY_CHUNK_SIZE), offset)
+        if not data:
+            raise ExtractionError("Copied data is shorter than reported")
+        crc = zlib.crc32(data, crc)
+        offset += len(data)
+        count -= len(data)
+    return crc
+
+
+def _kernel_copy(src_fd: int, dst_fd: int, offset: int, count: int) -> int:
+    """Copy count bytes from src_fd at offset to the current position of dst_fd in-kernel"""
+    if hasattr(os, 'copy_file_range'):
+        try:
+            return os.copy_file_range(src_fd, dst_fd, count, offset)
+        except OSError as e:
+            # EXDEV/ENOSYS/EINVAL: cross-device or unsupported, try sendfile
+            logger.debug(f"copy_file_range failed: {e}")
+    return os.sendfile(dst_fd, src_fd, offset, count)
+
+
+def parse_7z_progress(line: str) -> Optional[Tuple[int, Optional[int], str]]:
+    """Parse a `7z -bsp1` progress line into (percent, files_done, current_file)"""
+    match = SEVENZIP_PROGRESS_RE.match(line)
+    if not match:
+        return None
+    percent = min(int(match.group(1)), 100)
+    files_done = int(match.group(2)) if match.group(2) else None
+    return percent, files_done, (match.group(3) or "").strip()
+
+
+def parse_rar_progress(line: str) -> Optional[int]:
+    """Parse the trailing percentage from an unrar progress line"""
+    match = RAR_PROGRESS_RE.search(line)
+    if not match:
+        return None
+    return min(int(match.group(1)), 100)
+
+
+def _list_7z_totals(archive_path: Path) -> Tuple[Optional[int], Optional[int]]:
+    """Read file count and unpacked size from the 7z archive headers"""
+    try:
+        result = subprocess.run(['7z', 'l', '-slt', '-ba', str(archive_path)],
+                                capture_output=True, text=True, check=False)
+    except OSError as e:
+        logger.debug(f"7z listing failed for {archive_path}: {e}")
+        return None, None
+    if result.returncode != 0:
+        return None, None
+
+    files, total = 0, 0
+    for block in result.stdout.split('\n\n'):
+        fields = {}
+        for line in block.splitlines():
+            key, sep, value = line.partition(' = ')
+            if sep:
+                fields[key.strip()] = value.strip()
+        if 'Path' not in fields or fields.get('Folder') == '+' or 'D' in fields.get('Attributes', '')[:1]:
+            continue
+        files += 1
+        if fields.get('Size', '').isdigit():
+            total += int(fields['Size'])
+    return (files or None), (total or None)
+
+
+def _count_tool_matches(cmd: List[str], pattern, group_value: bool = False) -> Optional[int]:
+    """
+    Run a listing command and count lines matching pattern.
+
+    With group_value, the last matching line's first group is returned
+    instead (for tools that print a "N files" summary).
+    """
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, check=False)
+    except OSError as e:
+        logger.debug(f"Listing failed ({' '.join(cmd)}): {e}")
+        return None
+    if result.returncode != 0:
+        return None
+    matches = [pattern.match(line) for line in result.stdout.splitlines()]
+    matches = [m for m in matches if m]
+    if group_value:
+        return int(matches[-1].group(1)) if matches else None
+    return len(matches) or None
+
+
+def _list_rar_totals(rar_cmd: str, archive_path: Path) -> Tuple[Optional[int], Optional[int]]:
+    """Read file count and unpacked size from the summary line of `unrar l`"""
+    try:
+        result = subprocess.run([rar_cmd, 'l', str(archive_path)],
+                                capture_output=True, text=True, check=False)
+    except OSError as e:
+        logger.debug(f"unrar listing failed for {archive_path}: {e}")
+        return None, None
+    if result.returncode != 0:
+        return None, None
+
+    lines = [line for line in result.stdout.splitlines() if line.strip()]
+    if not lines:
+        return None, None
+    numbers = [int(token) for token in lines[-1].split() if token.isdigit()]
+    if len(numbers) < 2:
+        return None, None
+    return numbers[-1], numbers[0]
+
+
+def extract_archive(archive_path: Path, dest_dir: Path, progress_callback: Callable = None,
+                    cancel_event: Optional[threading.Event] = None,
+                    archive_format: Optional[str] = None,
+                    threads: Optional[int] = None,
+                    which: Optional[Callable[[str], Optional[str]]] = None) -> ExtractionProgress:
+    """
+    Extract an archive into dest_dir.
+
+    Args:
+        archive_path: Archive to extract
+        dest_dir: Directory receiving the archive contents
+        progress_callback: Optional callback receiving progress messages
+        cancel_event: Optional event that cancels extraction when set
+        archive_format: Backend override ('zip', 'tar', '7z', 'rar', 'iso', 'inno',
+            'installshield'); detected from
+            the file's magic bytes when omitted
+        threads: Decoder thread count for 7z and compressed tarballs
+            (defaults to the number of CPUs)
+        which: Lookup for the external tools, normally SystemProbe.which
+            (default: shutil.which)
+
+    Returns:
+        ExtractionProgress: Final progress snapshot
+    """
+    extractor = ArchiveExtractor(archive_path, dest_dir, progress_callback, cancel_event,
+                                 archive_format, threads, which)
+    return extractor.extract()
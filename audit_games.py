@@ -2,6 +2,7 @@
 """Audit all games in database to identify installation issues"""
 
 from games_db import GAMES_DATABASE
+from archive_extractor import ARCHIVE_SUFFIXES
 
 def audit_game(game_id, game_data):
     """Audit a single game for installation issues"""
@@ -16,7 +17,7 @@ def audit_game(game_id, game_data):
         has_direct = False
 
         # Check for archive extensions
-        if any(download_url.endswith(ext) for ext in ['.zip', '.tar.gz', '.tar.bz2', '.7z', '.rar', '.RAR']):
+        if any(download_url.split('?')[0].lower().endswith(ext) for ext in ARCHIVE_SUFFIXES):
             has_direct = True
         # Google Drive detection
         elif 'drive.google.com' in download_url or 'drive.usercontent.google.com' in download_url:
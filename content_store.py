@@ -0,0 +1,482 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store module
+Deduplicates byte-identical files across installed game clients by sharing
+their storage through reflinks, or read-only hardlinks where reflinks are
+unavailable
+"""
+
+import argparse
+import errno
+import fcntl
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import threading
+from collections import defaultdict
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Iterable, Tuple
+
+# Constants
+HASH_CHUNK_SIZE = 1024 * 1024
+MIN_DEDUP_SIZE = 64 * 1024
+INDEX_VERSION = 1
+FICLONE = 0x40049409
+WRITE_BITS = stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH
+
+# Files games rewrite in place (settings, logs, caches). They are only ever
+# shared through reflinks, whose copy-on-write semantics keep every install
+# private, never through hardlinks.
+MUTABLE_PATTERNS = [
+    "*.ini", "*.cfg", "*.conf", "*.txt", "*.log", "*.xml", "*.json",
+    "*.wtf", "*.lua", "*.db", "*.sqlite", "*.sav", "*.dmp", "*.tmp",
+]
+MUTABLE_DIRS = {"wtf", "logs", "cache", "screenshots", "userdata", "save", "saves"}
+
+logger = logging.getLogger("game_installer.store")
+
+
+class DedupReport:
+    """Summary of a dedup run"""
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.files_hashed = 0
+        self.files_linked = 0
+        self.files_already_shared = 0
+        self.bytes_hashed = 0
+        self.bytes_reclaimed = 0
+        self.reflinks = 0
+        self.hardlinks = 0
+
+    def describe(self) -> str:
+        """Human-readable summary for logs and progress callbacks"""
+        return (f"Deduplicated {self.files_linked} files "
+                f"({self.reflinks} reflinked, {self.hardlinks} hardlinked), "
+                f"{_format_size(self.bytes_reclaimed)} reclaimed; "
+                f"{self.files_already_shared} already shared")
+
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count using binary units"""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def is_mutable(rel_path: Path) -> bool:
+    """Whether a game is likely to rewrite this file in place"""
+    name = rel_path.name.lower()
+    if any(fnmatch.fnmatch(name, pattern) for pattern in MUTABLE_PATTERNS):
+        return True
+    return any(part.lower() in MUTABLE_DIRS for part in rel_path.parts[:-1])
+
+
+def _reflink(src: Path, dst: Path):
+    """Create dst as a copy-on-write clone of src (btrfs, XFS, bcachefs)"""
+    with open(src, 'rb') as s, open(dst, 'wb') as d:
+        fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK_SIZE)
+            if not chunk:
+                return digest.hexdigest()
+            digest.update(chunk)
+
+
+class ContentStore:
+    """
+    Content-addressed object store shared by all installs under games_dir.
+
+    Objects live in <store>/objects/<aa>/<sha256> and must be on the same
+    filesystem as the installs they back. An index caches file hashes keyed
+    by stat metadata so repeated dedup runs only hash new or changed files.
+    """
+
+    def __init__(self, store_dir: Path):
+        self.store_dir = Path(store_dir)
+        self.objects_dir = self.store_dir / "objects"
+        self.index_file = self.store_dir / "index.json"
+        self._objects: Dict[str, int] = {}
+        self._files: Dict[str, List] = {}
+        self._reflink_supported: Optional[bool] = None
+        self._load_index()
+
+    # --- Index -----------------------------------------------------------
+    def _load_index(self):
+        if not self.index_file.exists():
+            return
+        try:
+            with open(self.index_file, 'r') as f:
+                data = json.load(f)
+            if data.get('version') == INDEX_VERSION:
+                self._objects = data.get('objects', {})
+                self._files = data.get('files', {})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable store index {self.index_file}: {e}")
+
+    def _save_index(self):
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".index-", dir=self.store_dir)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': INDEX_VERSION, 'objects': self._objects, 'files': self._files}, f)
+            os.replace(tmp_path, self.index_file)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+    def object_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _cached_hash(self, path: Path, st: os.stat_result) -> Optional[str]:
+        entry = self._files.get(str(path))
+        if entry and entry[:3] == [st.st_size, st.st_mtime_ns, st.st_ino]:
+            return entry[3]
+        return None
+
+    def _remember(self, path: Path, st: os.stat_result, digest: str):
+        self._files[str(path)] = [st.st_size, st.st_mtime_ns, st.st_ino, digest]
+
+    # --- Dedup -----------------------------------------------------------
+    def dedup(self, roots: Iterable[Path], progress_callback: Callable = None,
+              cancel_event: Optional[threading.Event] = None,
+              private_roots: Iterable[Path] = ()) -> DedupReport:
+        """
+        Share identical files below the given install directories.
+
+        Args:
+            roots: Install directories to scan
+            progress_callback: Optional callback for progress messages
+            cancel_event: Optional event that stops the scan between files
+            private_roots: Those of roots whose files a patcher rewrites in
+                place; they are treated like mutable files and only ever
+                shared through reflinks
+
+        Returns:
+            DedupReport with the space reclaimed
+        """
+        report = DedupReport()
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+        # Group by size first: a file whose size matches nothing else, in
+        # the scan or the store, cannot have a duplicate and is never hashed.
+        by_size: Dict[int, List[Tuple[Path, Path, bool]]] = defaultdict(list)
+        store_dev = self.store_dir.stat().st_dev
+        private = {Path(root) for root in private_roots}
+        for root in roots:
+            root = Path(root)
+            if not root.is_dir():
+                continue
+            if root.stat().st_dev != store_dev:
+                logger.warning(f"Skipping {root}: not on the same filesystem as {self.store_dir}")
+                continue
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if Path(dirpath, d) != self.store_dir]
+                for filename in filenames:
+                    path = Path(dirpath, filename)
+                    try:
+                        st = path.lstat()
+                    except OSError:
+                        continue
+                    if stat.S_ISREG(st.st_mode) and st.st_size >= MIN_DEDUP_SIZE:
+                        by_size[st.st_size].append((path, path.relative_to(root), root in private))
+                        report.files_scanned += 1
+
+        stored_sizes = set(self._objects.values())
+        candidates = [entry for size, entries in by_size.items()
+                      if len(entries) > 1 or size in stored_sizes for entry in entries]
+        if progress_callback:
+            progress_callback(f"Scanned {report.files_scanned} files, {len(candidates)} dedup candidates")
+
+        try:
+            for index, (path, rel_path, in_private_root) in enumerate(candidates, 1):
+                if cancel_event and cancel_event.is_set():
+                    logger.info("Dedup cancelled")
+                    break
+                try:
+                    self._dedup_file(path, report, in_private_root or is_mutable(rel_path))
+                except OSError as e:
+                    logger.warning(f"Skipping {path}: {e}")
+                if progress_callback and index % 100 == 0:
+                    progress_callback(f"Deduplicating... {index}/{len(candidates)} files, "
+                                      f"{_format_size(report.bytes_reclaimed)} reclaimed")
+        finally:
+            self._save_index()
+
+        logger.info(report.describe())
+        if progress_callback:
+            progress_callback(report.describe())
+        return report
+
+    def _dedup_file(self, path: Path, report: DedupReport, mutable: bool):
+        st = path.stat()
+        digest = self._cached_hash(path, st)
+        if digest is None:
+            digest = _hash_file(path)
+            report.files_hashed += 1
+            report.bytes_hashed += st.st_size
+            self._remember(path, st, digest)
+
+        obj = self.object_path(digest)
+        try:
+            obj_st = obj.stat()
+        except FileNotFoundError:
+            obj_st = None
+
+        if obj_st is None or obj_st.st_size != st.st_size:
+            # First copy of this content becomes the store object
+            obj.parent.mkdir(parents=True, exist_ok=True)
+            if mutable:
+                if not self._try_reflink(path, obj):
+                    return
+            else:
+                obj.unlink(missing_ok=True)
+                if not self._try_reflink(path, obj):
+                    os.link(path, obj)
+                    self._protect(obj)
+            self._objects[digest] = st.st_size
+            return
+
+        if obj_st.st_ino == st.st_ino and obj_st.st_dev == st.st_dev:
+            report.files_already_shared += 1
+            return
+
+        # Replace the file with a shared copy of the object, keeping its mode
+        # and timestamps, then rename over the original atomically.
+        tmp_path = path.with_name(f".{path.name}.dedup")
+        tmp_path.unlink(missing_ok=True)
+        if self._try_reflink(obj, tmp_path):
+            os.chmod(tmp_path, stat.S_IMODE(st.st_mode))
+            os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+            report.reflinks += 1
+        elif not mutable:
+            os.link(obj, tmp_path)
+            self._protect(tmp_path)
+            report.hardlinks += 1
+        else:
+            return
+        os.replace(tmp_path, path)
+        self._remember(path, path.stat(), digest)
+        report.files_linked += 1
+        report.bytes_reclaimed += st.st_size
+
+    def _try_reflink(self, src: Path, dst: Path) -> bool:
+        if self._reflink_supported is False:
+            return False
+        try:
+            _reflink(src, dst)
+            self._reflink_supported = True
+            return True
+        except OSError as e:
+            dst.unlink(missing_ok=True)
+            if e.errno in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EXDEV, errno.ENOSYS):
+                if self._reflink_supported is None:
+                    logger.info("Filesystem has no reflink support, using read-only hardlinks")
+                self._reflink_supported = False
+                return False
+            raise
+
+    @staticmethod
+    def _protect(path: Path):
+        # Hardlinked content is shared by every install; clearing the write
+        # bits makes an in-place write fail instead of changing all of them.
+        mode = path.stat().st_mode
+        os.chmod(path, stat.S_IMODE(mode) & ~WRITE_BITS)
+
+    # --- Maintenance -----------------------------------------------------
+    def unshare(self, path: Path) -> bool:
+        """
+        Give a file its own private, writable copy.
+
+        Returns:
+            True if the file was shared through a hardlink and is now private
+        """
+        path = Path(path)
+        st = path.stat()
+        if st.st_nlink < 2:
+            return False
+        tmp_path = path.with_name(f".{path.name}.unshare")
+        with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            while True:
+                chunk = src.read(HASH_CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        os.chmod(tmp_path, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+        os.utime(tmp_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        os.replace(tmp_path, path)
+        self._files.pop(str(path), None)
+        return True
+
+    def gc(self) -> int:
+        """
+        Delete store objects no install references any more.
+
+        Returns:
+            Number of bytes freed
+        """
+        referenced = set()
+        for path_str, entry in list(self._files.items()):
+            try:
+                st = os.stat(path_str)
+            except OSError:
+                del self._files[path_str]
+                continue
+            if [st.st_size, st.st_mtime_ns, st.st_ino] == entry[:3]:
+                referenced.add(entry[3])
+            else:
+                del self._files[path_str]
+
+        freed = 0
+        for digest in list(self._objects):
+            if digest in referenced:
+                continue
+            obj = self.object_path(digest)
+            try:
+                st = obj.stat()
+                # A hardlinked object with other links is still in use even if
+                # the index lost track of the file
+                if st.st_nlink > 1:
+                    continue
+                obj.unlink()
+                freed += st.st_size
+            except FileNotFoundError:
+                pass
+            del self._objects[digest]
+        self._save_index()
+        logger.info(f"Store gc freed {_format_size(freed)}")
+        return freed
+
+
+class CloneCancelled(Exception):
+    """Raised when a tree clone is cancelled; the partial clone is left for the caller"""
+
+
+class CloneReport:
+    """Summary of a tree clone"""
+
+    def __init__(self):
+        self.reflinked = 0
+        self.hardlinked = 0
+        self.copied = 0
+        self.bytes_total = 0
+
+    def describe(self) -> str:
+        return (f"Cloned {_format_size(self.bytes_total)}: {self.reflinked} reflinked, "
+                f"{self.hardlinked} hardlinked, {self.copied} copied")
+
+
+def clone_tree(src: Path, dst: Path, skip_dirs: Iterable[str] = (),
+               allow_hardlinks: bool = True, cancel_event: Optional[threading.Event] = None) -> CloneReport:
+    """
+    Clone a directory tree, sharing file contents wherever possible.
+
+    Files are reflinked when the filesystem supports it. Otherwise assets are
+    hardlinked read-only and mutable files are copied, so the clone gets a
+    private writable overlay for everything a game rewrites.
+
+    Args:
+        src: Directory to clone
+        dst: Destination directory, created if missing
+        skip_dirs: Directory names (case-insensitive) left out of the clone
+        allow_hardlinks: Copy instead of hardlinking when reflinks are unavailable
+        cancel_event: Optional event checked between files
+
+    Returns:
+        CloneReport with per-method file counts
+
+    Raises:
+        CloneCancelled: If cancel_event was set
+    """
+    src, dst = Path(src), Path(dst)
+    skip = {name.lower() for name in skip_dirs}
+    report = CloneReport()
+    reflink_ok = True
+    hardlink_ok = allow_hardlinks
+
+    for dirpath, dirnames, filenames in os.walk(src):
+        dirnames[:] = [d for d in dirnames if d.lower() not in skip]
+        rel_dir = Path(dirpath).relative_to(src)
+        (dst / rel_dir).mkdir(parents=True, exist_ok=True)
+        for filename in filenames:
+            if cancel_event is not None and cancel_event.is_set():
+                raise CloneCancelled(f"Cloning {src} was cancelled")
+            source = Path(dirpath, filename)
+            target = dst / rel_dir / filename
+            rel_path = rel_dir / filename
+            if source.is_symlink():
+                target.symlink_to(os.readlink(source))
+                continue
+            st = source.stat()
+            report.bytes_total += st.st_size
+
+            if reflink_ok:
+                try:
+                    _reflink(source, target)
+                    os.chmod(target, stat.S_IMODE(st.st_mode))
+                    os.utime(target, ns=(st.st_atime_ns, st.st_mtime_ns))
+                    report.reflinked += 1
+                    continue
+                except OSError as e:
+                    target.unlink(missing_ok=True)
+                    if e.errno not in (errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL, errno.EXDEV, errno.ENOSYS):
+                        raise
+                    reflink_ok = False
+
+            if hardlink_ok and not is_mutable(rel_path):
+                try:
+                    ContentStore._protect(source)
+                    os.link(source, target)
+                    report.hardlinked += 1
+                    continue
+                except OSError as e:
+                    if e.errno not in (errno.EXDEV, errno.EPERM, errno.EMLINK):
+                        raise
+                    hardlink_ok = False
+
+            shutil.copy2(source, target)
+            if not target.stat().st_mode & stat.S_IWUSR:
+                os.chmod(target, stat.S_IMODE(st.st_mode) | stat.S_IWUSR)
+            report.copied += 1
+
+    logger.info(f"{src} -> {dst}: {report.describe()}")
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Deduplicate identical files across game installs")
+    parser.add_argument("--store", required=True, help="Store directory on the same filesystem as the installs")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    dedup_parser = subparsers.add_parser("dedup", help="Share identical files between installs")
+    dedup_parser.add_argument("roots", nargs="+", help="Install directories to scan")
+    subparsers.add_parser("gc", help="Remove objects no install uses")
+    args = parser.parse_args(argv)
+
+    store = ContentStore(Path(args.store))
+    try:
+        if args.command == "dedup":
+            print(store.dedup([Path(root) for root in args.roots], print).describe())
+        else:
+            print(f"Freed {_format_size(store.gc())}")
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
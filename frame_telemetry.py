@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Frame telemetry module
+Has MangoHud log every frame of a session into its own directory, then
+condenses the CSV logs into a small per-session record (average FPS, 1% and
+0.1% lows, stutters, CPU/GPU load) tagged with the launch profile in use,
+so sessions before and after a profile change can be compared
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Any, Iterable
+
+# Constants
+DEFAULT_LOGS_DIR = Path.home() / ".cache" / "mmo-launcher" / "mangohud"
+MAX_SESSIONS_PER_GAME = 50
+
+# Frame times are counted into fixed buckets, so percentiles need constant
+# memory however long the session was
+BUCKET_MS = 0.05
+MAX_FRAMETIME_MS = 1000.0
+
+# A frame is a stutter when it takes this many times the recent average
+# frame time, and at least STUTTER_MIN_MS
+STUTTER_FACTOR = 2.0
+STUTTER_MIN_MS = 10.0
+STUTTER_SMOOTHING = 0.1
+
+# Frames logged before this many seconds are loading screens and shader
+# compilation, not gameplay
+WARMUP_SECONDS = 5.0
+
+# Sessions shorter than this are not worth a record
+MIN_FRAMES = 300
+
+logger = logging.getLogger("game_installer.frames")
+
+
+class FrameStats:
+    """Streaming frame time statistics"""
+
+    def __init__(self):
+        self.buckets = [0] * (int(MAX_FRAMETIME_MS / BUCKET_MS) + 1)
+        self.frames = 0
+        self.total_ms = 0.0
+        self.stutters = 0
+        self.cpu_load = 0.0
+        self.gpu_load = 0.0
+        self.load_samples = 0
+        self._recent_ms: Optional[float] = None
+
+    def add(self, frametime_ms: float, cpu_load: Optional[float] = None, gpu_load: Optional[float] = None):
+        if frametime_ms <= 0:
+            return
+        self.frames += 1
+        self.total_ms += frametime_ms
+        self.buckets[min(int(frametime_ms / BUCKET_MS), len(self.buckets) - 1)] += 1
+        if self._recent_ms is not None and \
+                frametime_ms >= max(STUTTER_MIN_MS, self._recent_ms * STUTTER_FACTOR):
+            self.stutters += 1
+        else:
+            # Stutters are kept out of the average they are measured against
+            recent = self._recent_ms if self._recent_ms is not None else frametime_ms
+            self._recent_ms = recent + (frametime_ms - recent) * STUTTER_SMOOTHING
+        if cpu_load is not None and gpu_load is not None:
+            self.cpu_load += cpu_load
+            self.gpu_load += gpu_load
+            self.load_samples += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Frame time in ms that this fraction of frames did not exceed"""
+        if not self.frames:
+            return 0.0
+        wanted = fraction * self.frames
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= wanted:
+                return (index + 0.5) * BUCKET_MS
+        return MAX_FRAMETIME_MS
+
+    def summary(self) -> Dict[str, Any]:
+        """Compact record of the statistics"""
+        minutes = self.total_ms / 60000 or 1.0
+        return {
+            'frames': self.frames,
+            'duration': round(self.total_ms / 1000, 1),
+            'avg_fps': round(self.frames * 1000 / self.total_ms, 1) if self.total_ms else 0.0,
+            'low_1': round(1000 / self.percentile(0.99), 1) if self.frames else 0.0,
+            'low_01': round(1000 / self.percentile(0.999), 1) if self.frames else 0.0,
+            'stutters': self.stutters,
+            'stutters_per_min': round(self.stutters / minutes, 2),
+            'cpu_load': round(self.cpu_load / self.load_samples, 1) if self.load_samples else None,
+            'gpu_load': round(self.gpu_load / self.load_samples, 1) if self.load_samples else None,
+        }
+
+
+def _number(row: List[str], index: Optional[int]) -> Optional[float]:
+    if index is None or index >= len(row):
+        return None
+    try:
+        return float(row[index])
+    except ValueError:
+        return None
+
+
+def parse_mangohud_log(path: Path, stats: Optional[FrameStats] = None,
+                       warmup: float = WARMUP_SECONDS) -> FrameStats:
+    """
+    Add the frames of one MangoHud CSV log to stats, reading it line by line.
+
+    The log starts with a system info header; frame rows follow a column
+    header containing 'frametime'.
+
+    Args:
+        path: CSV log written by MangoHud
+        stats: FrameStats to add to (default: a new one)
+        warmup: Seconds of frames at the start to skip
+
+    Returns:
+        The FrameStats
+    """
+    stats = stats or FrameStats()
+    with open(path, 'r', encoding='utf-8', errors='replace', newline='') as f:
+        columns: Optional[Dict[str, int]] = None
+        skipped_ms = 0.0
+        for row in csv.reader(f):
+            if columns is None:
+                if 'frametime' in row:
+                    columns = {name.strip(): i for i, name in enumerate(row)}
+                continue
+            frametime = _number(row, columns.get('frametime'))
+            if frametime is None:
+                continue
+            if skipped_ms < warmup * 1000:
+                skipped_ms += frametime
+                continue
+            stats.add(frametime, _number(row, columns.get('cpu_load')), _number(row, columns.get('gpu_load')))
+    return stats
+
+
+def profile_fingerprint(profile: Dict[str, Any]) -> str:
+    """Short stable identifier of a launch profile"""
+    return hashlib.sha1(json.dumps(profile, sort_keys=True).encode()).hexdigest()[:10]
+
+
+def _change(label: str, before: float, after: float, unit: str = "") -> str:
+    return f"{label} {before:g}{unit} → {after:g}{unit}"
+
+
+class FrameTelemetry:
+    """Per-session MangoHud logs and the records condensed from them"""
+
+    def __init__(self, records_file: Optional[Path] = None, logs_dir: Optional[Path] = None,
+                 callback: Optional[Callable[[str, Dict[str, Any]], None]] = None):
+        """
+        Args:
+            records_file: Optional JSON file session records are kept in
+            logs_dir: Directory MangoHud writes each session's logs under
+            callback: Optional callback(game_id, record) when a session has been summarised
+        """
+        self.records_file = Path(records_file) if records_file else None
+        self.logs_dir = Path(logs_dir) if logs_dir else DEFAULT_LOGS_DIR
+        self.callback = callback
+        self._lock = threading.Lock()
+
+    def session_dir(self, game_id: str) -> Path:
+        """New, empty log directory for a session"""
+        path = self.logs_dir / game_id / time.strftime("%Y%m%d-%H%M%S")
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    @staticmethod
+    def environment(session_dir: Path, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """
+        Environment enabling MangoHud with per-frame logging into session_dir.
+
+        Options the user already set in MANGOHUD_CONFIG are kept.
+        """
+        base = os.environ if base is None else base
+        options = [base['MANGOHUD_CONFIG']] if base.get('MANGOHUD_CONFIG') else []
+        options += [f"output_folder={session_dir}", "autostart_log=1", "log_interval=0"]
+        return {'MANGOHUD': "1", 'MANGOHUD_CONFIG': ",".join(options)}
+
+    def summarise(self, game_id: str, session_dir: Path, profile: Dict[str, Any],
+                  keep_logs: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Condense a finished session's logs into a record and store it.
+
+        Args:
+            game_id: Game the session belongs to
+            session_dir: Directory the session's logs were written to
+            profile: Launch profile the session ran with
+            keep_logs: Keep the raw CSV logs instead of deleting them
+
+        Returns:
+            The record, or None if the session logged too few frames
+        """
+        stats = FrameStats()
+        logs = sorted(p for p in Path(session_dir).glob("*.csv") if not p.name.endswith("_summary.csv"))
+        for path in logs:
+            try:
+                parse_mangohud_log(path, stats)
+            except OSError as e:
+                logger.warning(f"Could not read MangoHud log {path}: {e}")
+        if not keep_logs:
+            shutil.rmtree(session_dir, ignore_errors=True)
+        if stats.frames < MIN_FRAMES:
+            logger.info(f"{game_id}: no frame telemetry recorded ({stats.frames} frames in {len(logs)} logs)")
+            return None
+        record = {'started': time.time() - stats.total_ms / 1000, 'profile': profile_fingerprint(profile),
+                  **stats.summary()}
+        self._record(game_id, record)
+        logger.info(f"{game_id}: {describe_session(record)}")
+        if self.callback:
+            try:
+                self.callback(game_id, record)
+            except Exception as e:
+                logger.warning(f"Frame telemetry callback failed: {e}")
+        return record
+
+    # --- Records --------------------------------------------------------
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self.records_file is None:
+            return {}
+        try:
+            with open(self.records_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def sessions(self, game_id: str) -> List[Dict[str, Any]]:
+        """Session records of a game, oldest first"""
+        return self._load().get(game_id, [])
+
+    def _record(self, game_id: str, record: Dict[str, Any]):
+        if self.records_file is None:
+            return
+        with self._lock:
+            data = self._load()
+            data[game_id] = (data.get(game_id, []) + [record])[-MAX_SESSIONS_PER_GAME:]
+            try:
+                self.records_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.records_file.with_name(self.records_file.name + ".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.records_file)
+            except OSError as e:
+                logger.warning(f"Could not save frame telemetry: {e}")
+
+    def compare(self, game_id: str) -> Optional[str]:
+        """
+        The latest session, compared with the sessions of the profile used
+        before the current one.
+
+        Returns:
+            Text for display, or None if the game has no sessions
+        """
+        records = self.sessions(game_id)
+        if not records:
+            return None
+        current = records[-1]['profile']
+        after = [r for r in records if r['profile'] == current]
+        before_profile = next((r['profile'] for r in reversed(records) if r['profile'] != current), None)
+        lines = [f"Last session: {describe_session(records[-1])}"]
+        if before_profile is None:
+            return "\n".join(lines)
+        before = [r for r in records if r['profile'] == before_profile]
+        avg_before, avg_after = average_sessions(before), average_sessions(after)
+        lines.append(f"Since the profile change ({len(before)} → {len(after)} sessions): " + ", ".join([
+            _change("avg", avg_before['avg_fps'], avg_after['avg_fps'], " fps"),
+            _change("1% low", avg_before['low_1'], avg_after['low_1'], " fps"),
+            _change("0.1% low", avg_before['low_01'], avg_after['low_01'], " fps"),
+            _change("stutters/min", avg_before['stutters_per_min'], avg_after['stutters_per_min']),
+        ]))
+        return "\n".join(lines)
+
+
+def average_sessions(records: Iterable[Dict[str, Any]]) -> Dict[str, float]:
+    """Frame-weighted average of the frame rate figures of several sessions"""
+    records = list(records)
+    frames = sum(r['frames'] for r in records) or 1
+    return {key: round(sum(r[key] * r['frames'] for r in records) / frames, 1)
+            for key in ('avg_fps', 'low_1', 'low_01', 'stutters_per_min')}
+
+
+def describe_session(record: Dict[str, Any]) -> str:
+    """One line summary of a session record"""
+    text = (f"{record['avg_fps']:g} fps avg, 1% low {record['low_1']:g}, 0.1% low {record['low_01']:g}, "
+            f"{record['stutters']} stutters over {record['duration'] / 60:.0f} min")
+    if record.get('cpu_load') is not None:
+        text += f", CPU {record['cpu_load']:.0f}% / GPU {record['gpu_load']:.0f}%"
+    return text
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Summarise MangoHud frame time logs")
+    parser.add_argument("logs", nargs="+", help="MangoHud CSV logs of one session")
+    parser.add_argument("--warmup", type=float, default=WARMUP_SECONDS, help="Seconds to skip at the start")
+    args = parser.parse_args(argv)
+
+    stats = FrameStats()
+    try:
+        for path in args.logs:
+            parse_mangohud_log(Path(path), stats, args.warmup)
+    except OSError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    if not stats.frames:
+        print("No frames found", file=sys.stderr)
+        return 1
+    summary = stats.summary()
+    print(describe_session(summary))
+    print(json.dumps(summary, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,19 +8,69 @@ import sys
 import subprocess
 import logging
 import json
+import hashlib
+import threading
 from pathlib import Path
-from typing import Optional, Callable, Dict, Any
+from typing import Optional, Callable, Dict, Any, Tuple
 import urllib.request
 import shutil
 
+from archive_extractor import (
+    extract_archive, detect_archive_format, ExtractionCancelled, ExtractionError, ARCHIVE_SUFFIXES,
+)
+from installer_unpacker import unpack_installer, find_executable
+from content_store import ContentStore, DedupReport, CloneCancelled, clone_tree, MUTABLE_DIRS
+from patch_applier import apply_patch
+from install_pipeline import InstallPipeline, stage_timings
+from package_manager import (
+    PackagePlan, plan_packages, detect_package_manager, installed_flatpaks, FLATPAK_PREFIX,
+)
+from system_probe import SystemProbe
+from proton_runtime import ProtonRegistry
+from launch_profiles import (
+    LaunchPlan, build_launch_plan, merge_profile, validate_profile, raise_nofile_limit,
+)
+from shader_cache import ShaderCacheManager, cache_key
+from page_prefetch import PagePrefetcher
+from game_supervisor import GameSupervisor, DEFAULT_SAMPLE_INTERVAL
+from launch_timing import LaunchTimings, LaunchTimer, PHASE_RESOLVE, PHASE_SETUP, PHASE_SPAWN
+from frame_telemetry import FrameTelemetry
+from wineserver_manager import WineserverManager, DEFAULT_IDLE_TIMEOUT
+from resource_isolation import ResourceIsolator, KIND_GAME, KIND_JOB
+from process_runner import run_streamed, progress_lines, STDERR
+from install_scheduler import RESOURCE_NETWORK, RESOURCE_DISK, RESOURCE_CPU, RESOURCE_INTERACTIVE
+from install_recipes import get_recipe
+from recipe_engine import RecipeRunner, RecipeError, RecipeCancelled
+from prefix_templates import (
+    TemplateLibrary, TemplateBuildError, PrefixPool, provision_prefix, winetricks_verbs,
+    DEFAULT_PROTON, DEFAULT_POOL_SIZE,
+)
+
 # Constants
 DEFAULT_GAMES_DIR = Path.home() / "Games"
 LOG_DIR = Path("logs")
 LOG_FILE = LOG_DIR / "installer.log"
 
-AUR_HELPERS = ["yay", "paru", "pikaur", "trizen"]
-TERMINAL_EMULATORS = ["konsole", "gnome-terminal", "xfce4-terminal", "alacritty", "kitty", "xterm"]
-UMU_COMMANDS = ["umu-run", "umu"]
+STORE_DIR_NAME = ".store"
+BASE_CLIENTS_DIR_NAME = ".bases"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Windows executables (MZ) and MSI packages (OLE compound file)
+INSTALLER_MAGIC = (b"MZ", b"\xd0\xcf\x11\xe0")
+
+# User-tunable settings stored in settings.json
+DEFAULT_SETTINGS = {
+    'prefix_pool_size': DEFAULT_POOL_SIZE,
+    'proton_prefetch': True,
+    'wineserver_prewarm': False,
+    'wineserver_idle_timeout': DEFAULT_IDLE_TIMEOUT,
+    'prefetch_game_files': True,
+    'prefetch_on_select': False,
+    'telemetry_interval': DEFAULT_SAMPLE_INTERVAL,
+    'isolate_games': True,
+    'throttle_background': True,
+    'frame_telemetry': False,
+}
 
 LOG_DIR.mkdir(parents=True, exist_ok=True)
 
@@ -45,6 +95,65 @@ class GameInstaller:
         self.installed_games_file = self.config_dir / "installed_games.json"
         self.installed_games = self._load_installed_games()
 
+        # Several installs may run at once; these serialise the shared state
+        self._state_lock = threading.Lock()
+        self._package_lock = threading.Lock()
+
+        # Queued installs whose packages are batched into one transaction
+        self._pending_installs: Dict[str, dict] = {}
+
+        self.settings_file = self.config_dir / "settings.json"
+        self.settings = self._load_settings()
+
+        # Per-game checkpoints of the staged install pipeline
+        self.install_state_dir = self.config_dir / "install_state"
+
+        # Shared storage for byte-identical files across installs
+        self.content_store = ContentStore(self.games_dir / STORE_DIR_NAME)
+
+        # Pristine clients that sibling servers are cloned from
+        self.base_clients_file = self.config_dir / "base_clients.json"
+        self.base_clients = self._load_base_clients()
+
+        # Wine prefixes, prefix templates and Proton builds live under here
+        self.umu_dir = Path.home() / "Games" / "umu"
+
+        # External tools, resolved once and re-probed only when PATH changes
+        self.probe = SystemProbe(self.config_dir / "capabilities.json")
+
+        # Games and background jobs in separate scopes; jobs yield while a game runs
+        self.isolation = ResourceIsolator(self.probe.which, [self.games_dir, self.umu_dir],
+                                          enabled=self.settings['isolate_games'])
+
+        # Pre-initialised Wine prefixes keyed by Proton version and verbs
+        self.prefix_templates = TemplateLibrary(self.umu_dir / ".templates", self.isolation.wrap, self.probe.which)
+        self.prefix_pool = PrefixPool(self.umu_dir / ".pool", self.prefix_templates,
+                                      self.settings['prefix_pool_size'])
+
+        # Local Proton builds, so launches pass umu a concrete PROTONPATH
+        self.proton = ProtonRegistry(self.umu_dir / ".proton")
+        self.wineservers = WineserverManager(self.settings['wineserver_idle_timeout'])
+
+        # DXVK/VKD3D caches shared by every install of the same client build
+        self.shader_caches = ShaderCacheManager()
+
+        # Files each game reads, replayed into the page cache at launch
+        self.prefetcher = PagePrefetcher(self.config_dir / "access_profiles")
+
+        # Running games with live resource figures and a session history
+        self.supervisor = GameSupervisor(self.config_dir / "sessions.json", self.settings['telemetry_interval'],
+                                         running_callback=self._games_running_changed)
+
+        # Per-phase launch durations, kept per game to spot slow launches
+        self.launch_timings = LaunchTimings(self.config_dir / "launch_times.json")
+
+        # Frame time summaries of MangoHud-logged sessions, tagged with their profile
+        self.frame_telemetry = FrameTelemetry(self.config_dir / "frame_sessions.json",
+                                              Path.home() / ".cache" / "mmo-launcher" / "mangohud")
+
+        # Assembled launch commands, reused until the game's profile changes
+        self._launch_plans: Dict[str, tuple] = {}
+
         # Detect AUR helper
         self.aur_helper = self._detect_aur_helper()
 
@@ -53,13 +162,26 @@ class GameInstaller:
         # Auto-detect installed games
         self._auto_detect_games()
 
+    def reload(self):
+        """
+        Re-read installed games and base clients and re-run auto-detection.
+
+        Running sessions, pre-warmed wineservers, throttling and the
+        callbacks connected to them are kept, unlike with a new installer.
+        """
+        self.probe.invalidate()
+        self.aur_helper = self._detect_aur_helper()
+        self.installed_games = self._load_installed_games()
+        self.base_clients = self._load_base_clients()
+        self._launch_plans.clear()
+        self._auto_detect_games()
+
     def _detect_aur_helper(self) -> Optional[str]:
         """Detect available AUR helper"""
-        for helper in AUR_HELPERS:
-            if shutil.which(helper):
-                logger.info(f"Detected AUR helper: {helper}")
-                return helper
-        return None
+        helper = self.probe.command('aur_helper')
+        if helper:
+            logger.info(f"Detected AUR helper: {helper}")
+        return helper
 
     def _load_installed_games(self) -> Dict[str, Any]:
         """Load list of installed games from config"""
@@ -78,13 +200,55 @@ class GameInstaller:
     def _save_installed_games(self) -> bool:
         """Save installed games to config"""
         try:
-            with open(self.installed_games_file, 'w', encoding='utf-8') as f:
-                json.dump(self.installed_games, f, indent=2)
+            with self._state_lock:
+                with open(self.installed_games_file, 'w', encoding='utf-8') as f:
+                    json.dump(dict(self.installed_games), f, indent=2)
             return True
         except Exception as e:
             logger.error(f"Failed to save installed games: {e}")
             return False
 
+    def _load_settings(self) -> Dict[str, Any]:
+        """Load user settings, filling in defaults"""
+        settings = dict(DEFAULT_SETTINGS)
+        if self.settings_file.exists():
+            try:
+                with open(self.settings_file, 'r', encoding='utf-8') as f:
+                    settings.update(json.load(f))
+            except Exception as e:
+                logger.error(f"Error loading settings: {e}")
+        return settings
+
+    def save_settings(self) -> bool:
+        """Save user settings to config"""
+        try:
+            with open(self.settings_file, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save settings: {e}")
+            return False
+
+    def _load_base_clients(self) -> Dict[str, Any]:
+        """Load the base client registry from config"""
+        if self.base_clients_file.exists():
+            try:
+                with open(self.base_clients_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.error(f"Error loading base clients: {e}")
+        return {}
+
+    def _save_base_clients(self) -> bool:
+        """Save the base client registry to config"""
+        try:
+            with open(self.base_clients_file, 'w', encoding='utf-8') as f:
+                json.dump(self.base_clients, f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to save base clients: {e}")
+            return False
+
     def _auto_detect_games(self):
         """Auto-detect installed games in common directories"""
         # Don't re-import games_db at module level to avoid circular dependency
@@ -99,7 +263,7 @@ class GameInstaller:
             'runescape-launcher': 'rs3',
         }
 
-        pacman_available = shutil.which('pacman') is not None
+        pacman_available = self.probe.which('pacman') is not None
         if not pacman_available:
             logger.debug("pacman not found; skipping AUR auto-detection")
 
@@ -138,7 +302,7 @@ class GameInstaller:
             'com.jagex.RuneScape': 'rs3',
         }
 
-        if shutil.which('flatpak'):
+        if self.probe.which('flatpak'):
             result = subprocess.run(['flatpak', 'list', '--app', '--columns=application'],
                                   capture_output=True, text=True)
             if result.returncode == 0:
@@ -322,62 +486,69 @@ class GameInstaller:
 
         for dep in dependencies:
             if dep == "umu-launcher":
-                results[dep] = any(shutil.which(cmd) for cmd in UMU_COMMANDS)
+                results[dep] = self.probe.command('umu') is not None
             elif dep in ("wine", "wine-staging"):
-                results[dep] = shutil.which("wine") is not None
+                results[dep] = self.probe.command('wine') is not None
             elif dep == "steam":
-                results[dep] = shutil.which("steam") is not None
+                results[dep] = self.probe.command('steam') is not None
             elif dep == "flatpak":
-                results[dep] = shutil.which("flatpak") is not None
+                results[dep] = self.probe.command('flatpak') is not None
             elif dep == "java":
-                results[dep] = shutil.which("java") is not None
+                results[dep] = self.probe.command('java') is not None
             else:
                 # For winetricks components, assume they can be installed
                 results[dep] = True
 
         return results
 
-    def _install_flatpak_game(self, game_id: str, flatpak_id: str, game_name: str, 
+    def _install_flatpak_game(self, game_id: str, flatpak_id: str, game_name: str,
                               progress_callback: Callable = None) -> bool:
         """
         Helper method to install a game via Flatpak.
-        
+
+        Flatpak games waiting in the install queue are installed in the same
+        transaction, so their own installs only need to register them.
+
         Args:
             game_id: Unique game identifier
             flatpak_id: Flatpak application ID
             game_name: Human-readable game name
             progress_callback: Optional callback for progress updates
-            
+
         Returns:
             bool: True if installation was successful
         """
-        if progress_callback:
-            progress_callback(f"Installing via Flatpak: {flatpak_id}")
-
         try:
-            result = subprocess.run(
-                ["flatpak", "install", "-y", "flathub", flatpak_id],
-                capture_output=True,
-                text=True,
-                check=False
-            )
+            with self._package_lock:
+                installed = installed_flatpaks(self.probe.which)
+                if flatpak_id in installed:
+                    if progress_callback:
+                        progress_callback(f"Flatpak {flatpak_id} is already installed")
+                else:
+                    games = self._pending_games(game_id, {'install_type': 'flatpak', 'name': game_name,
+                                                          'client_download_url': f"{FLATPAK_PREFIX}{flatpak_id}"})
+                    plan = plan_packages(games, {}, flatpaks_installed=installed)
+                    plan.add_flatpak(flatpak_id, game_id)
+                    self._report_plan(plan, games, progress_callback)
+                    if progress_callback:
+                        progress_callback(f"Installing via Flatpak: {', '.join(plan.flatpaks)}")
+                    result = run_streamed(plan.flatpak_command(), progress_lines(progress_callback))
+                    if result.returncode != 0:
+                        logger.error(f"Flatpak install failed: {result.failure_report()}")
+                        if progress_callback:
+                            progress_callback(f"Flatpak installation failed: {result.output(STDERR)[-500:]}")
+                        return False
 
-            if result.returncode == 0:
-                self.installed_games[game_id] = {
-                    'name': game_name,
-                    'path': f"flatpak://{flatpak_id}",
-                    'install_type': 'flatpak'
-                }
-                self._save_installed_games()
-                if progress_callback:
-                    progress_callback("Installation complete!")
-                logger.info(f"Installed {game_name} via Flatpak")
-                return True
-            else:
-                logger.error(f"Flatpak install failed: {result.stderr}")
-                if progress_callback:
-                    progress_callback(f"Flatpak installation failed: {result.stderr}")
-                return False
+            self.installed_games[game_id] = {
+                'name': game_name,
+                'path': f"{FLATPAK_PREFIX}{flatpak_id}",
+                'install_type': 'flatpak'
+            }
+            self._save_installed_games()
+            if progress_callback:
+                progress_callback("Installation complete!")
+            logger.info(f"Installed {game_name} via Flatpak")
+            return True
         except FileNotFoundError:
             logger.error("Flatpak not found on system")
             if progress_callback:
@@ -389,14 +560,52 @@ class GameInstaller:
                 progress_callback(f"Installation error: {e}")
             return False
 
-    def install_dependencies(self, dependencies: list, progress_callback: Callable = None):
-        """Install missing dependencies"""
-        missing = []
-        dep_check = self.check_dependencies(dependencies)
+    def announce_install(self, game_id: str, game_data: dict):
+        """Register a queued install so its packages join the next batched transaction"""
+        with self._state_lock:
+            self._pending_installs[game_id] = game_data
+
+    def withdraw_install(self, game_id: str):
+        """Forget a queued install once it has finished or was cancelled"""
+        with self._state_lock:
+            self._pending_installs.pop(game_id, None)
+
+    def _pending_games(self, game_id: Optional[str] = None, game_data: Optional[dict] = None) -> Dict[str, dict]:
+        with self._state_lock:
+            games = dict(self._pending_installs)
+        if game_id is not None:
+            games[game_id] = game_data
+        return games
+
+    def _report_plan(self, plan: PackagePlan, games: Dict[str, dict], progress_callback: Callable = None):
+        names = {gid: data.get('name', gid) for gid, data in games.items()}
+        for package, unblocked in plan.unblocks(names):
+            logger.info(f"Package {package} unblocks: {', '.join(unblocked)}")
+            if progress_callback:
+                progress_callback(f"{package} unblocks {', '.join(unblocked)}")
+
+    def plan_dependencies(self, game_id: Optional[str] = None, game_data: Optional[dict] = None) -> PackagePlan:
+        """
+        Missing host packages of every queued install (plus an optional extra
+        game), with the games each package unblocks.
+        """
+        games = self._pending_games(game_id, game_data)
+        missing = {}
+        for gid, data in games.items():
+            results = self.check_dependencies(data.get('dependencies', []))
+            missing[gid] = [dep for dep, ok in results.items() if not ok]
+        return plan_packages(games, missing, detect_package_manager(self.probe.which), include_flatpaks=False)
+
+    def install_dependencies(self, dependencies: list, progress_callback: Callable = None,
+                             game_id: Optional[str] = None, game_data: Optional[dict] = None) -> bool:
+        """
+        Install missing dependencies.
 
-        for dep, installed in dep_check.items():
-            if not installed:
-                missing.append(dep)
+        When called for a game, the missing packages of every other queued
+        install are added to the same transaction.
+        """
+        dep_check = self.check_dependencies(dependencies)
+        missing = [dep for dep, installed in dep_check.items() if not installed]
 
         if not missing:
             if progress_callback:
@@ -406,80 +615,38 @@ class GameInstaller:
         if progress_callback:
             progress_callback(f"Installing dependencies: {', '.join(missing)}")
 
-        # Detect package manager
-        if shutil.which("pacman"):
-            pkg_manager = "pacman"
-        elif shutil.which("apt"):
-            pkg_manager = "apt"
-        elif shutil.which("dnf"):
-            pkg_manager = "dnf"
-        else:
+        game_id = game_id or "dependencies"
+        game_data = dict(game_data or {'name': "requested dependencies"}, dependencies=dependencies)
+        plan = self.plan_dependencies(game_id, game_data)
+        if plan.package_manager is None:
             logger.error("No supported package manager found")
             return False
+        if not plan.packages:
+            return True
 
-        # Map dependencies to package names
-        pkg_map = {
-            "pacman": {
-                "umu-launcher": "umu",
-                "wine": "wine",
-                "wine-staging": "wine-staging",
-                "steam": "steam",
-                "flatpak": "flatpak",
-                "java": "jre-openjdk"
-            },
-            "apt": {
-                "umu-launcher": None,  # Needs manual install
-                "wine": "wine",
-                "wine-staging": "wine-staging",
-                "steam": "steam",
-                "flatpak": "flatpak",
-                "java": "default-jre"
-            },
-            "dnf": {
-                "umu-launcher": None,  # Needs manual install
-                "wine": "wine",
-                "wine-staging": "wine",
-                "steam": "steam",
-                "flatpak": "flatpak",
-                "java": "java-latest-openjdk"
-            }
-        }
-
-        packages = []
-        for dep in missing:
-            if dep in pkg_map[pkg_manager]:
-                pkg = pkg_map[pkg_manager][dep]
-                if pkg:
-                    packages.append(pkg)
+        self._report_plan(plan, self._pending_games(game_id, game_data), progress_callback)
+        try:
+            cmd = plan.package_command()
+            if progress_callback:
+                progress_callback(f"Running: {' '.join(cmd)}")
 
-        if packages:
-            try:
-                if pkg_manager == "pacman":
-                    cmd = ["sudo", "pacman", "-S", "--noconfirm"] + packages
-                elif pkg_manager == "apt":
-                    cmd = ["sudo", "apt", "install", "-y"] + packages
-                elif pkg_manager == "dnf":
-                    cmd = ["sudo", "dnf", "install", "-y"] + packages
+            # sudo asks for the password on the controlling terminal, so the
+            # command keeps stdin and stays in the launcher's session
+            result = run_streamed(cmd, progress_lines(progress_callback), stdin_devnull=False,
+                                  new_session=False)
 
+            if result.returncode == 0:
+                logger.info(f"Dependencies installed: {', '.join(plan.packages)}")
                 if progress_callback:
-                    progress_callback(f"Running: {' '.join(cmd)}")
-
-                result = subprocess.run(cmd, capture_output=True, text=True)
-
-                if result.returncode == 0:
-                    logger.info(f"Dependencies installed: {', '.join(packages)}")
-                    if progress_callback:
-                        progress_callback("Dependencies installed successfully")
-                    return True
-                else:
-                    logger.error(f"Failed to install dependencies: {result.stderr}")
-                    return False
-
-            except Exception as e:
-                logger.error(f"Error installing dependencies: {e}")
+                    progress_callback("Dependencies installed successfully")
+                return True
+            else:
+                logger.error(f"Failed to install dependencies: {result.failure_report()}")
                 return False
 
-        return True
+        except Exception as e:
+            logger.error(f"Error installing dependencies: {e}")
+            return False
 
     def download_file(self, url: str, dest: Path, progress_callback: Callable = None) -> bool:
         """
@@ -523,14 +690,56 @@ class GameInstaller:
                 progress_callback(f"Download failed: {e}")
             return False
 
-    def install_game(self, game_id: str, game_data: dict, progress_callback: Callable = None) -> bool:
+    def install_resources(self, game_id: str, game_data: dict) -> set:
+        """
+        Resource classes an install will compete for, used by the install scheduler.
+
+        Returns:
+            Set of install_scheduler RESOURCE_* names
+        """
+        resources = set()
+        if not all(self.check_dependencies(game_data.get('dependencies', [])).values()):
+            resources.add(RESOURCE_INTERACTIVE)  # sudo package manager run
+        if self.has_base_client(game_data):
+            return resources | {RESOURCE_DISK}
+
+        install_type = game_data.get('install_type')
+        if install_type == "aur":
+            if self.aur_helper and 'aur_package' in game_data:
+                resources |= {RESOURCE_INTERACTIVE, RESOURCE_NETWORK, RESOURCE_CPU}
+            else:
+                resources |= {RESOURCE_NETWORK, RESOURCE_DISK}
+        elif install_type == "flatpak":
+            resources |= {RESOURCE_NETWORK, RESOURCE_DISK}
+        elif install_type == "manual_download":
+            recipe = get_recipe(game_data.get('install_script'))
+            if recipe is not None:
+                resources |= {RESOURCE_NETWORK, RESOURCE_DISK, RESOURCE_CPU}
+                if any(step.get('action') == 'run' for step in recipe.get('steps', [])):
+                    resources.add(RESOURCE_INTERACTIVE)
+            elif 'install_script' in game_data or (Path(__file__).parent / "install_game_helper.sh").exists():
+                resources.add(RESOURCE_INTERACTIVE)  # helper script in a terminal
+            elif game_data.get('client_download_url'):
+                resources |= {RESOURCE_NETWORK, RESOURCE_DISK, RESOURCE_CPU}
+        elif install_type == "auto_installer":
+            resources |= {RESOURCE_NETWORK, RESOURCE_DISK, RESOURCE_INTERACTIVE}
+        return resources
+
+    def install_game(self, game_id: str, game_data: dict, progress_callback: Callable = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     stage_callback: Callable = None) -> bool:
         """
         Install a game
 
+        Downloaded clients go through the staged install pipeline, so a
+        cancelled or crashed install resumes where it stopped.
+
         Args:
             game_id: Unique game identifier
             game_data: Game metadata from games_db
             progress_callback: Function to call with progress updates
+            cancel_event: Optional event that cancels long-running steps when set
+            stage_callback: Optional callback(stage, status, seconds) for pipeline stages
         """
         try:
             if progress_callback:
@@ -547,13 +756,22 @@ class GameInstaller:
                 if progress_callback:
                     progress_callback(f"Installing missing dependencies: {', '.join(missing_deps)}")
 
-                if not self.install_dependencies(game_data['dependencies'], progress_callback):
-                    return False
+                # One package manager transaction at a time
+                with self._package_lock:
+                    if not self.install_dependencies(game_data['dependencies'], progress_callback,
+                                                     game_id, game_data):
+                        return False
 
             # Create game directory
             game_dir = self.games_dir / game_id
             game_dir.mkdir(parents=True, exist_ok=True)
 
+            # Sibling servers share a client: clone it instead of downloading again
+            base_dir = self.ensure_base_client(game_data)
+            if base_dir is not None:
+                return self._install_from_base(game_id, game_data, base_dir, game_dir, progress_callback,
+                                               cancel_event)
+
             install_type = game_data['install_type']
 
             if install_type == "native":
@@ -576,12 +794,7 @@ class GameInstaller:
                         progress_callback(f"Installing via AUR ({self.aur_helper}): {aur_pkg}")
                         progress_callback("Opening terminal for AUR installation...")
 
-                    # Try to detect available terminal emulator
-                    term_cmd = None
-                    for term in TERMINAL_EMULATORS:
-                        if shutil.which(term):
-                            term_cmd = term
-                            break
+                    term_cmd = self.probe.command('terminal')
 
                     if term_cmd:
                         # Open terminal and run AUR install with auto-close
@@ -594,7 +807,7 @@ class GameInstaller:
                         else:
                             cmd = [term_cmd, '-e', 'sh', '-c', f'{self.aur_helper} -S {aur_pkg}; echo "\nPress Enter to close..."; read']
 
-                        result = subprocess.run(cmd, capture_output=True, text=True)
+                        result = run_streamed(cmd, progress_lines(progress_callback), cancel_event=cancel_event)
 
                         if result.returncode == 0:
                             self.installed_games[game_id] = {
@@ -607,9 +820,9 @@ class GameInstaller:
                                 progress_callback("Installation complete!")
                             return True
                         else:
-                            logger.error(f"AUR install failed in terminal: {result.stderr}")
+                            logger.error(f"AUR install failed in terminal: {result.failure_report()}")
                             if progress_callback:
-                                progress_callback(f"AUR installation cancelled or failed: {result.stderr}\nTrying Flatpak...")
+                                progress_callback(f"AUR installation cancelled or failed: {result.output(STDERR)[-500:]}\nTrying Flatpak...")
                             # Fall through to Flatpak
                     else:
                         logger.error("No terminal emulator found for AUR installation")
@@ -631,6 +844,12 @@ class GameInstaller:
                 return self._install_flatpak_game(game_id, flatpak_id, game_data['name'], progress_callback)
 
             elif install_type == "manual_download":
+                # Games with an install recipe are installed in-process
+                recipe = get_recipe(game_data.get('install_script'))
+                if recipe is not None:
+                    return self._install_from_recipe(game_id, game_data, recipe, game_dir,
+                                                     progress_callback, cancel_event)
+
                 # Use the helper script for manual downloads
                 # Check if running as PyInstaller bundle
                 # Check if game has a specific install script
@@ -652,12 +871,7 @@ class GameInstaller:
                         progress_callback(f"Launching installation helper for {game_data['name']}...")
                         progress_callback("The helper will search for your downloaded installer in Home and Downloads folders.")
 
-                    # Detect terminal emulator
-                    term_cmd = None
-                    for term in TERMINAL_EMULATORS:
-                        if shutil.which(term):
-                            term_cmd = term
-                            break
+                    term_cmd = self.probe.command('terminal')
 
                     if term_cmd:
                         # Run helper script in terminal
@@ -714,8 +928,9 @@ class GameInstaller:
                 is_direct_download = False
                 archive_name = None
 
-                # Check URL extensions
-                if any(download_url.endswith(ext) for ext in ['.zip', '.tar.gz', '.tar.bz2', '.7z', '.rar', '.RAR']):
+                # Check URL extensions (the actual format is sniffed after download)
+                url_path = download_url.split('?')[0].lower()
+                if any(url_path.endswith(ext) for ext in ARCHIVE_SUFFIXES):
                     is_direct_download = True
                     archive_name = download_url.split('/')[-1].split('?')[0]  # Remove query params
                 # Special handling for Google Drive
@@ -735,50 +950,8 @@ class GameInstaller:
                 if is_direct_download:
                     if progress_callback:
                         progress_callback("Direct download detected, downloading...")
-
-                    archive_file = game_dir / archive_name
-
-                    if self.download_file(download_url, archive_file, progress_callback):
-                        if progress_callback:
-                            progress_callback("Extracting game files...")
-
-                        # Extract archive
-                        try:
-                            if archive_name.endswith('.zip'):
-                                import zipfile
-                                with zipfile.ZipFile(archive_file, 'r') as zip_ref:
-                                    zip_ref.extractall(game_dir)
-                            elif archive_name.endswith(('.tar.gz', '.tar.bz2')):
-                                import tarfile
-                                with tarfile.open(archive_file, 'r:*') as tar_ref:
-                                    tar_ref.extractall(game_dir)
-                            elif archive_name.endswith('.7z'):
-                                subprocess.run(['7z', 'x', str(archive_file), f'-o{game_dir}'], check=True)
-                            elif archive_name.endswith(('.rar', '.RAR')):
-                                # Try unrar-free first, fallback to unrar
-                                try:
-                                    subprocess.run(['unrar', 'x', str(archive_file), str(game_dir)], check=True)
-                                except FileNotFoundError:
-                                    subprocess.run(['unrar-free', 'x', str(archive_file), str(game_dir)], check=True)
-
-                            # Clean up archive
-                            archive_file.unlink()
-
-                            self.installed_games[game_id] = {
-                                'name': game_data['name'],
-                                'path': str(game_dir),
-                                'install_type': 'manual_download'
-                            }
-                            self._save_installed_games()
-
-                            if progress_callback:
-                                progress_callback("Installation complete!")
-                            return True
-                        except Exception as e:
-                            logger.error(f"Failed to extract archive: {e}")
-                            if progress_callback:
-                                progress_callback(f"Extraction failed: {e}")
-                            return False
+                    return self._run_install_pipeline(game_id, game_data, game_dir, archive_name,
+                                                      progress_callback, stage_callback, cancel_event)
                 else:
                     # No direct download - provide instructions
                     if progress_callback:
@@ -799,60 +972,793 @@ class GameInstaller:
                     return False
 
             elif install_type == "auto_installer":
+                return self._run_install_pipeline(game_id, game_data, game_dir, "installer.exe",
+                                                  progress_callback, stage_callback, cancel_event)
+
+            return False
+
+        except Exception as e:
+            logger.error(f"Installation error for {game_id}: {e}")
+            if progress_callback:
+                progress_callback(f"Installation error: {e}")
+            return False
+
+    def _install_state_file(self, game_id: str) -> Path:
+        return self.install_state_dir / f"{game_id}.json"
+
+    def install_stage_timings(self, game_id: str) -> list:
+        """
+        Stage statuses and durations of a game's last install attempt.
+
+        Returns:
+            List of (stage, status, seconds) tuples, empty if there is no record
+        """
+        return stage_timings(self._install_state_file(game_id))
+
+    def _run_install_pipeline(self, game_id: str, game_data: dict, game_dir: Path, download_name: str,
+                              progress_callback: Callable = None, stage_callback: Callable = None,
+                              cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Download and install a client through the checkpointed stage pipeline.
+
+        Archives are extracted directly. Installers are unpacked natively when
+        possible and otherwise run under UMU in the game's prepared prefix.
+        Stages that finished on an earlier, interrupted attempt are skipped.
+
+        Args:
+            game_id: Unique game identifier
+            game_data: Game metadata from games_db
+            game_dir: Directory to install into
+            download_name: File name to save the download under
+            progress_callback: Optional callback for progress messages
+            stage_callback: Optional callback(stage, status, seconds)
+            cancel_event: Optional event that stops the install
+
+        Returns:
+            bool: True if every stage finished
+        """
+        install_type = game_data['install_type']
+        url = game_data['client_download_url']
+        pipeline = InstallPipeline(
+            game_id, self._install_state_file(game_id),
+            fingerprint={'install_type': install_type, 'url': url, 'path': str(game_dir)},
+            progress_callback=progress_callback, stage_callback=stage_callback, cancel_event=cancel_event
+        )
+
+        def resolve(p: InstallPipeline) -> bool:
+            game_dir.mkdir(parents=True, exist_ok=True)
+            p.values['download'] = str(game_dir / download_name)
+            return True
+
+        def download(p: InstallPipeline) -> bool:
+            dest = Path(p.values['download'])
+            if not self.download_file(url, dest, progress_callback):
+                return False
+            p.artefact(dest)
+            return True
+
+        def verify(p: InstallPipeline) -> bool:
+            dest = Path(p.values['download'])
+            problem = self._verify_download(dest, game_data)
+            if problem:
+                # Drop the bad file so the next attempt downloads it again
+                dest.unlink(missing_ok=True)
+                logger.error(f"Download for {game_id} rejected: {problem}")
                 if progress_callback:
-                    progress_callback("Downloading game installer...")
+                    progress_callback(f"Download verification failed: {problem}")
+                    progress_callback(f"Please download the client manually from: {url}")
+                return False
+            return True
 
-                installer_file = game_dir / "installer.exe"
+        def extract(p: InstallPipeline) -> bool:
+            archive_file = Path(p.values['download'])
+            if progress_callback:
+                progress_callback("Extracting game files...")
+            try:
+                extract_archive(archive_file, game_dir, progress_callback, cancel_event,
+                                threads=game_data.get('extract_threads'), which=self.probe.which)
+            except ExtractionCancelled:
+                logger.info(f"Installation of {game_id} cancelled during extraction")
+                if progress_callback:
+                    progress_callback("Extraction cancelled, partial files removed")
+                return False
+            except Exception as e:
+                logger.error(f"Failed to extract archive: {e}")
+                if progress_callback:
+                    progress_callback(f"Extraction failed: {e}")
+                return False
+            p.discard(archive_file)
+            p.values['base_client'] = True
+            self._record_client_exe(p, game_data, game_dir)
+            return True
 
-                # Download installer
-                if self.download_file(game_data['client_download_url'], installer_file, progress_callback):
-                    if progress_callback:
-                        progress_callback("Running installer via UMU launcher...")
+        def run_installer(p: InstallPipeline) -> bool:
+            installer_file = Path(p.values['download'])
+            try:
+                client_exe = self._unpack_installer_payload(game_data, installer_file, game_dir,
+                                                            progress_callback, cancel_event)
+            except ExtractionCancelled:
+                logger.info(f"Installation of {game_id} cancelled during unpacking")
+                if progress_callback:
+                    progress_callback("Extraction cancelled, partial files removed")
+                return False
+            if client_exe is not None:
+                p.discard(installer_file)
+                p.values['base_client'] = True
+            elif not self._run_installer(installer_file, game_dir, p.values.get('prefix'), progress_callback,
+                                         cancel_event):
+                return False
+            self._record_client_exe(p, game_data, game_dir)
+            return True
 
-                    # Find available UMU command
-                    umu_cmd = None
-                    for cmd in UMU_COMMANDS:
-                        if shutil.which(cmd):
-                            umu_cmd = cmd
-                            break
+        def prefix(p: InstallPipeline) -> bool:
+            p.values['prefix'] = None
+            if game_data.get('native'):
+                return True
+            prefix_dir = self.prepare_prefix(game_id, game_data, progress_callback)
+            if prefix_dir is not None:
+                p.values['prefix'] = str(prefix_dir)
+                p.artefact(prefix_dir / "drive_c")
+            return True
 
-                    if not umu_cmd:
-                        if progress_callback:
-                            progress_callback("UMU launcher not found, falling back to Wine...")
-                        umu_cmd = "wine"
-
-                    # Run installer with UMU or Wine
-                    result = subprocess.run(
-                        [umu_cmd, str(installer_file)],
-                        cwd=game_dir,
-                        capture_output=True,
-                        text=True
-                    )
-
-                    if result.returncode == 0:
-                        self.installed_games[game_id] = {
-                            'name': game_data['name'],
-                            'path': str(game_dir),
-                            'install_type': 'auto_installer'
-                        }
-                        self._save_installed_games()
+        def redistributables(p: InstallPipeline) -> bool:
+            verbs = winetricks_verbs(game_data.get('dependencies', []))
+            if not p.values.get('prefix') or not verbs:
+                return True
+            return self._install_redistributables(Path(p.values['prefix']), verbs, progress_callback, cancel_event)
 
-                        if progress_callback:
-                            progress_callback("Installation complete!")
-                        return True
-                    else:
-                        logger.error(f"Installer failed: {result.stderr}")
-                        if progress_callback:
-                            progress_callback(f"Installer failed. You may need to run manually: {umu_cmd} {installer_file}")
-                        return False
+        def register(p: InstallPipeline) -> bool:
+            game_info = {
+                'name': game_data['name'],
+                'path': str(game_dir),
+                'install_type': install_type
+            }
+            if p.values.get('client_exe'):
+                game_info['client_exe'] = p.values['client_exe']
+            if p.values.get('prefix'):
+                game_info['prefix'] = p.values['prefix']
+            self.installed_games[game_id] = game_info
+            self._save_installed_games()
+            if p.values.get('base_client'):
+                self.capture_base_client(game_id, game_data, game_dir)
+            return True
+
+        def is_registered(p: InstallPipeline) -> bool:
+            return game_id in self.installed_games
 
+        if install_type == "auto_installer":
+            # The installer itself may need the prefix and its redistributables
+            stages = [("resolve", resolve), ("download", download), ("verify", verify),
+                      ("prefix", prefix), ("redistributables", redistributables),
+                      ("extract", run_installer), ("register", register, is_registered)]
+        else:
+            stages = [("resolve", resolve), ("download", download), ("verify", verify),
+                      ("extract", extract), ("prefix", prefix), ("redistributables", redistributables),
+                      ("register", register, is_registered)]
+
+        if not pipeline.run(stages):
             return False
+        if progress_callback:
+            progress_callback("Installation complete!")
+        return True
 
-        except Exception as e:
-            logger.error(f"Installation error for {game_id}: {e}")
+    def _install_from_recipe(self, game_id: str, game_data: dict, recipe: dict, game_dir: Path,
+                             progress_callback: Callable = None,
+                             cancel_event: Optional[threading.Event] = None) -> bool:
+        """Install a game by running its declarative recipe in-process"""
+        if progress_callback:
+            progress_callback(f"Running install recipe for {game_data['name']}...")
+
+        prefix_dir = self.umu_dir / game_id / "default"
+
+        def prepare() -> Optional[Path]:
+            prefix = self.prepare_prefix(game_id, game_data, progress_callback)
+            verbs = winetricks_verbs(game_data.get('dependencies', []))
+            if prefix is not None and verbs and not self._install_redistributables(prefix, verbs, progress_callback,
+                                                                                   cancel_event):
+                return None
+            return prefix
+
+        runner = RecipeRunner(game_id, recipe, game_dir, prepare_prefix=prepare, prefix_dir=prefix_dir,
+                              progress_callback=progress_callback, cancel_event=cancel_event,
+                              umu_command=self.probe.command('umu'), proton_path=self.proton_path(game_id),
+                              which=self.probe.which)
+        try:
+            fields = runner.run()
+        except RecipeCancelled:
+            logger.info(f"Installation of {game_id} cancelled")
             if progress_callback:
-                progress_callback(f"Installation error: {e}")
+                progress_callback("Installation cancelled")
+            return False
+        except RecipeError as e:
+            logger.error(f"Install recipe for {game_id} failed: {e}")
+            if progress_callback:
+                progress_callback(f"Installation failed: {e}")
+            return False
+
+        game_info = {
+            'name': game_data['name'],
+            'path': fields.get('path') or str(game_dir),
+            'install_type': 'manual_download'
+        }
+        for key in ('client_exe', 'prefix'):
+            if fields.get(key):
+                game_info[key] = fields[key]
+        self.installed_games[game_id] = game_info
+        self._save_installed_games()
+        self.capture_base_client(game_id, game_data, Path(game_info['path']))
+
+        if progress_callback:
+            progress_callback("Installation complete!")
+        return True
+
+    @staticmethod
+    def _verify_download(path: Path, game_data: dict) -> Optional[str]:
+        """
+        Check that a downloaded client is usable before unpacking it.
+
+        Returns:
+            Description of the problem, or None if the download looks valid
+        """
+        try:
+            size = path.stat().st_size
+            with open(path, 'rb') as f:
+                header = f.read(512)
+        except OSError as e:
+            return f"cannot read {path.name}: {e}"
+        if size == 0:
+            return f"{path.name} is empty"
+        if header.lstrip()[:1] == b"<":
+            return f"{path.name} is a web page, not a game client"
+
+        expected = game_data.get('client_sha256')
+        if expected:
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            if digest.hexdigest() != expected.lower():
+                return f"{path.name} does not match the expected SHA-256 checksum"
+
+        if game_data['install_type'] == "auto_installer":
+            if not header.startswith(INSTALLER_MAGIC):
+                return f"{path.name} is not a Windows installer"
+        elif detect_archive_format(path) is None:
+            return f"{path.name} is not a supported archive"
+        return None
+
+    @staticmethod
+    def _record_client_exe(pipeline: InstallPipeline, game_data: dict, game_dir: Path):
+        """Remember where the game's executable ended up so later runs can validate it"""
+        pipeline.artefact(game_dir)
+        client_exe = find_executable(game_dir, game_data['executable'])
+        if client_exe is not None:
+            pipeline.values['client_exe'] = str(client_exe)
+            pipeline.artefact(client_exe)
+
+    def _unpack_installer_payload(self, game_data: dict, installer_file: Path, game_dir: Path,
+                                  progress_callback: Callable = None,
+                                  cancel_event: Optional[threading.Event] = None) -> Optional[Path]:
+        """
+        Try to install by extracting the installer's payload without Wine.
+
+        Returns:
+            The client executable, or None when the installer should be run
+            under UMU instead
+
+        Raises:
+            ExtractionCancelled: If cancel_event was set during unpacking
+        """
+        try:
+            # The payload is discarded when it lacks the executable, so the
+            # installer runs in a directory without a half-unpacked copy
+            fmt = unpack_installer(installer_file, game_dir, progress_callback, cancel_event,
+                                   threads=game_data.get('extract_threads'), executable=game_data['executable'],
+                                   which=self.probe.which)
+        except ExtractionCancelled:
+            raise
+        except ExtractionError as e:
+            logger.warning(f"Native unpack of {installer_file} failed, running installer instead: {e}")
+            return None
+        if fmt is None:
+            logger.info(f"No usable payload in {installer_file}, running installer instead")
+            return None
+        return find_executable(game_dir, game_data['executable'])
+
+    def _run_installer(self, installer_file: Path, game_dir: Path, prefix: Optional[str],
+                       progress_callback: Callable = None,
+                       cancel_event: Optional[threading.Event] = None) -> bool:
+        """Run a Windows installer under UMU (or plain Wine) in the game's prefix, streaming its output"""
+        if progress_callback:
+            progress_callback("Running installer via UMU launcher...")
+
+        umu_cmd = self.probe.command('umu')
+        if not umu_cmd:
+            if progress_callback:
+                progress_callback("UMU launcher not found, falling back to Wine...")
+            umu_cmd = "wine"
+
+        # Give the installer a prefix that already has the game's verbs
+        env = None
+        if prefix:
+            env = {**os.environ, 'WINEPREFIX': prefix, 'PROTONPATH': self.proton_path()}
+
+        result = run_streamed(self.isolation.wrap([umu_cmd, str(installer_file)], KIND_JOB),
+                              progress_lines(progress_callback),
+                              env=env, cwd=game_dir, cancel_event=cancel_event)
+        if result.cancelled:
+            if progress_callback:
+                progress_callback("Installer cancelled")
+            return False
+        if result.returncode != 0:
+            logger.error(f"Installer failed: {result.failure_report()}")
+            if progress_callback:
+                progress_callback(f"Installer failed. You may need to run manually: {umu_cmd} {installer_file}")
+            return False
+        return True
+
+    def _install_redistributables(self, prefix: Path, verbs: list, progress_callback: Callable = None,
+                                  cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Install winetricks verbs missing from a prefix.
+
+        Prefixes cloned from a template already contain them, which
+        winetricks.log in the prefix records.
+        """
+        try:
+            installed = set((prefix / "winetricks.log").read_text(encoding='utf-8').split())
+        except OSError:
+            installed = set()
+        missing = [verb for verb in verbs if verb not in installed]
+        if not missing:
+            return True
+
+        umu_cmd = self.probe.command('umu')
+        if umu_cmd:
+            cmd = [umu_cmd, "winetricks", "-q", *missing]
+        elif self.probe.command('winetricks'):
+            cmd = ["winetricks", "-q", *missing]
+        else:
+            logger.warning(f"winetricks not available, cannot install {', '.join(missing)} into {prefix}")
+            if progress_callback:
+                progress_callback(f"winetricks not found, skipping: {', '.join(missing)}")
+            return True
+
+        if progress_callback:
+            progress_callback(f"Installing redistributables: {', '.join(missing)}")
+        env = {**os.environ, 'WINEPREFIX': str(prefix), 'PROTONPATH': self.proton_path()}
+        result = run_streamed(self.isolation.wrap(cmd, KIND_JOB), progress_lines(progress_callback),
+                              env=env, cancel_event=cancel_event)
+        if not result.ok:
+            logger.error(f"winetricks failed for {prefix}: {result.failure_report()}")
+            if progress_callback:
+                progress_callback(f"Installing redistributables failed: {', '.join(missing)}")
+            return False
+        return True
+
+    @staticmethod
+    def _client_key(game_data: dict) -> Optional[str]:
+        family = game_data.get('client_family')
+        version = game_data.get('client_version')
+        return f"{family}-{version}" if family and version else None
+
+    @staticmethod
+    def _patched_in_place(game_data: dict) -> bool:
+        """Whether a patcher outside the launcher rewrites the game's files in place"""
+        return bool(game_data.get('patcher_url'))
+
+    def get_base_client(self, game_data: dict) -> Optional[Path]:
+        """
+        Registered pristine base client for a game's client family.
+
+        Only looks the base up; use ensure_base_client to capture one.
+
+        Returns:
+            Base client directory, or None if none is registered
+        """
+        key = self._client_key(game_data)
+        if key is None:
+            return None
+        entry = self.base_clients.get(key)
+        if entry and Path(entry['path']).is_dir():
+            return Path(entry['path'])
+        return None
+
+    def _base_client_sibling(self, game_data: dict) -> Optional[Tuple[str, dict, Path]]:
+        """Installed sibling server that could be captured as the base, as (game id, data, path)"""
+        if self._client_key(game_data) is None:
+            return None
+        from games_db import get_games_by_client
+        for sibling_id, sibling_data in get_games_by_client(game_data['client_family'],
+                                                            game_data['client_version']).items():
+            info = self.installed_games.get(sibling_id)
+            if not info or info.get('install_type') not in ('manual_download', 'auto_installer'):
+                continue
+            if info.get('status') == 'pending_manual' or not Path(info['path']).is_dir():
+                continue
+            return sibling_id, sibling_data, Path(info['path'])
+        return None
+
+    def has_base_client(self, game_data: dict) -> bool:
+        """Whether a game can be cloned from a base client, registered or still to be captured"""
+        return self.get_base_client(game_data) is not None or self._base_client_sibling(game_data) is not None
+
+    def ensure_base_client(self, game_data: dict) -> Optional[Path]:
+        """
+        Base client for a game's client family, capturing an installed
+        sibling server as the base if none is registered yet.
+
+        Capturing copies a whole client, so call this from install workers
+        only, never from the GUI thread.
+
+        Returns:
+            Base client directory, or None if the game has to be installed
+            from scratch
+        """
+        base_dir = self.get_base_client(game_data)
+        if base_dir is not None:
+            return base_dir
+        sibling = self._base_client_sibling(game_data)
+        if sibling is None:
+            return None
+        return self.capture_base_client(*sibling)
+
+    def capture_base_client(self, game_id: str, game_data: dict, source_dir: Path) -> Optional[Path]:
+        """
+        Register an installed client as the base for its client family.
+
+        Settings, logs and caches are left out so the base stays pristine.
+        Does nothing when the family already has a base.
+
+        Returns:
+            Base client directory, or None if the game has no client family
+            or the capture failed
+        """
+        key = self._client_key(game_data)
+        if key is None:
+            return None
+        entry = self.base_clients.get(key)
+        if entry and Path(entry['path']).is_dir():
+            return Path(entry['path'])
+
+        base_dir = self.games_dir / BASE_CLIENTS_DIR_NAME / key
+        staging = base_dir.with_name(f".{key}.capturing")
+        try:
+            shutil.rmtree(staging, ignore_errors=True)
+            # The source is an install the user plays and patches; never hardlink
+            # (and so write-protect) its files
+            report = clone_tree(source_dir, staging, skip_dirs=MUTABLE_DIRS, allow_hardlinks=False)
+            if base_dir.exists():
+                shutil.rmtree(base_dir)
+            staging.rename(base_dir)
+        except OSError as e:
+            logger.error(f"Failed to capture base client {key} from {source_dir}: {e}")
+            shutil.rmtree(staging, ignore_errors=True)
+            return None
+
+        self.base_clients[key] = {
+            'path': str(base_dir),
+            'source': game_id,
+            'executable': game_data.get('executable')
+        }
+        self._save_base_clients()
+        logger.info(f"Captured base client {key} from {game_id}: {report.describe()}")
+        return base_dir
+
+    def _apply_client_overrides(self, game_dir: Path, overrides: Dict[str, str]):
+        """Write server-specific files; keys may be glob patterns relative to game_dir"""
+        for pattern, content in overrides.items():
+            targets = list(game_dir.glob(pattern)) if any(c in pattern for c in '*?[') else [game_dir / pattern]
+            if not targets:
+                logger.warning(f"No file matches client override {pattern} in {game_dir}")
+            for target in targets:
+                # Replace rather than rewrite so a file shared with the base
+                # client is never modified in place
+                target.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = target.with_name(f".{target.name}.override")
+                tmp_path.write_text(content, encoding='utf-8')
+                os.replace(tmp_path, target)
+
+    def _install_from_base(self, game_id: str, game_data: dict, base_dir: Path, game_dir: Path,
+                           progress_callback: Callable = None,
+                           cancel_event: Optional[threading.Event] = None) -> bool:
+        """
+        Install a server by cloning its family's base client and applying
+        server files, then prepare its prefix as a normal install would.
+        """
+        def cancelled() -> bool:
+            if cancel_event is None or not cancel_event.is_set():
+                return False
+            logger.info(f"Installation of {game_id} cancelled")
+            shutil.rmtree(game_dir, ignore_errors=True)
+            if progress_callback:
+                progress_callback("Installation cancelled, partial files removed")
+            return True
+
+        key = self._client_key(game_data)
+        if progress_callback:
+            progress_callback(f"Cloning shared {key} client...")
+        try:
+            report = clone_tree(base_dir, game_dir, allow_hardlinks=not self._patched_in_place(game_data),
+                                cancel_event=cancel_event)
+        except CloneCancelled:
+            cancelled()
             return False
+        if progress_callback:
+            progress_callback(report.describe())
+
+        overrides = game_data.get('client_overrides')
+        if overrides:
+            if progress_callback:
+                progress_callback("Applying server-specific files...")
+            self._apply_client_overrides(game_dir, overrides)
+
+        patch_url = game_data.get('server_patch_url')
+        if patch_url:
+            if cancelled():
+                return False
+            patch_file = game_dir / f".{game_id}-server-patch.zip"
+            if not self.download_file(patch_url, patch_file, progress_callback):
+                return False
+            try:
+                result = apply_patch(patch_file, game_dir, progress_callback)
+            finally:
+                patch_file.unlink(missing_ok=True)
+            logger.info(f"Server patch for {game_id}: {result.describe()}")
+        if cancelled():
+            return False
+
+        prefix = None
+        if not game_data.get('native'):
+            prefix = self.prepare_prefix(game_id, game_data, progress_callback)
+            verbs = winetricks_verbs(game_data.get('dependencies', []))
+            if prefix is not None and verbs and \
+                    not self._install_redistributables(prefix, verbs, progress_callback, cancel_event):
+                cancelled()
+                return False
+        if cancelled():
+            return False
+
+        game_info = {
+            'name': game_data['name'],
+            'path': str(game_dir),
+            'install_type': game_data['install_type'],
+            'base_client': key
+        }
+        if prefix is not None:
+            game_info['prefix'] = str(prefix)
+        if not (game_dir / game_data['executable']).exists():
+            client_exe = find_executable(game_dir, game_data['executable'])
+            if client_exe is not None:
+                game_info['client_exe'] = str(client_exe)
+        self.installed_games[game_id] = game_info
+        self._save_installed_games()
+
+        if progress_callback:
+            progress_callback("Installation complete!")
+        return True
+
+    def prepare_prefix(self, game_id: str, game_data: dict, progress_callback: Callable = None) -> Optional[Path]:
+        """
+        Create a game's Wine prefix from the pre-booted pool or, failing that,
+        by cloning the template for its dependencies.
+
+        The template is built on first use and the pool is refilled in the
+        background afterwards, so later games do not wait on wineboot.
+
+        Returns:
+            Prefix path, or None if no prefix could be prepared
+        """
+        prefix = self.umu_dir / game_id / "default"
+        if (prefix / "drive_c").is_dir():
+            return prefix
+        verbs = winetricks_verbs(game_data.get('dependencies', []))
+        try:
+            # Templates are keyed on the build the game will launch with
+            if provision_prefix(self.prefix_templates, self.prefix_pool, self.proton_path(game_id), verbs,
+                                prefix, progress_callback):
+                return prefix
+        except (OSError, TemplateBuildError) as e:
+            logger.warning(f"Could not prepare prefix for {game_id} from template: {e}")
+        return None
+
+    def prebuild_prefix_templates(self, game_ids: Optional[list] = None):
+        """
+        Build prefix templates for the given games (default: the whole catalog)
+        in the background so later installs only clone them.
+
+        Returns:
+            The background thread, or None if nothing needed building
+        """
+        from games_db import GAMES_DATABASE
+        verb_sets = []
+        for game_id in game_ids or GAMES_DATABASE:
+            game_data = GAMES_DATABASE.get(game_id)
+            if not game_data or game_data.get('native') or game_data['install_type'] not in ('manual_download', 'auto_installer'):
+                continue
+            verbs = winetricks_verbs(game_data['dependencies'])
+            if verbs not in verb_sets:
+                verb_sets.append(verbs)
+        return self.prefix_templates.build_in_background(self.proton_path(), verb_sets)
+
+    def proton_path(self, game_id: Optional[str] = None) -> str:
+        """
+        PROTONPATH for a game: its pinned build, else the newest local build.
+
+        Falls back to the GE-Proton alias, which makes umu fetch a build,
+        only when no build is installed locally.
+        """
+        pin = self.installed_games.get(game_id, {}).get('proton') if game_id else None
+        path = self.proton.resolve(pin)
+        return str(path) if path else DEFAULT_PROTON
+
+    def set_proton_pin(self, game_id: str, build: Optional[str]) -> bool:
+        """
+        Pin an installed game to a Proton build, or unpin it with None.
+
+        Returns:
+            True if the pin was saved
+        """
+        if game_id not in self.installed_games:
+            return False
+        if build and build not in self.proton.builds():
+            logger.error(f"Cannot pin {game_id} to {build}: build is not installed")
+            return False
+        with self._state_lock:
+            if build:
+                self.installed_games[game_id]['proton'] = build
+            else:
+                self.installed_games[game_id].pop('proton', None)
+        logger.info(f"{game_id} now uses Proton {build or 'latest local build'}")
+        return self._save_installed_games()
+
+    def pinned_proton_builds(self) -> set:
+        """Proton builds installed games are pinned to"""
+        return {info['proton'] for info in self.installed_games.values() if info.get('proton')}
+
+    def prefetch_proton(self) -> Optional[threading.Thread]:
+        """
+        Fetch a new GE-Proton release in the background, if one is due.
+
+        Returns:
+            The background thread, or None if prefetching is disabled or
+            already running
+        """
+        if not self.settings['proton_prefetch']:
+            return None
+        return self.proton.prefetch_in_background(self.pinned_proton_builds())
+
+    def launch_profile(self, game_id: str, game_data: dict) -> Dict[str, Any]:
+        """Effective launch profile: defaults, client family defaults, then the game's overrides"""
+        from games_db import get_client_profile
+        overrides = self.installed_games.get(game_id, {}).get('profile')
+        return merge_profile(get_client_profile(game_data.get('client_family')), overrides)
+
+    def set_launch_profile(self, game_id: str, overrides: Optional[Dict[str, Any]]) -> bool:
+        """
+        Replace an installed game's launch profile overrides (None clears them).
+
+        Returns:
+            True if the overrides were saved
+
+        Raises:
+            ValueError: If the overrides are invalid
+        """
+        if game_id not in self.installed_games:
+            return False
+        if overrides:
+            validate_profile(overrides)
+        with self._state_lock:
+            if overrides:
+                self.installed_games[game_id]['profile'] = dict(overrides)
+            else:
+                self.installed_games[game_id].pop('profile', None)
+            self._launch_plans.pop(game_id, None)
+        return self._save_installed_games()
+
+    def launch_plan(self, game_id: str, game_data: dict, command: list) -> LaunchPlan:
+        """
+        Command and environment for launching a game in its prefix.
+
+        The plan is cached and rebuilt only when the profile, command, prefix
+        or Proton build changes.
+        """
+        game_info = self.installed_games.get(game_id, {})
+        env = {}
+        if game_info.get('prefix'):
+            env = {'WINEPREFIX': game_info['prefix'], 'PROTONPATH': self.proton_path(game_id)}
+        profile = self.launch_profile(game_id, game_data)
+        key = (json.dumps(profile, sort_keys=True), tuple(command), tuple(sorted(env.items())))
+        cached = self._launch_plans.get(game_id)
+        if cached and cached[0] == key:
+            return cached[1]
+        cache_env = self.shader_caches.environment(cache_key(game_id, game_data))
+        plan = build_launch_plan(profile, command, env, which=self.probe.which, cache_env=cache_env)
+        for note in plan.notes:
+            logger.info(f"{game_id}: {note}")
+        self._launch_plans[game_id] = (key, plan)
+        return plan
+
+    def _backup_shader_cache(self, game_id: str, game_info: dict):
+        from games_db import GAMES_DATABASE
+        key = cache_key(game_id, GAMES_DATABASE.get(game_id, {}))
+        exe_dir = Path(game_info['client_exe']).parent if game_info.get('client_exe') else Path(game_info['path'])
+        try:
+            self.shader_caches.prepare(key, [exe_dir])
+            self.shader_caches.backup(key)
+        except OSError as e:
+            logger.warning(f"Could not back up shader cache {key}: {e}")
+
+    def prewarm_wineserver(self, game_id: str) -> Optional[threading.Thread]:
+        """
+        Start a persistent wineserver for an installed game's prefix in the
+        background, if pre-warming is enabled.
+
+        Returns:
+            The background thread, or None if nothing was started
+        """
+        game_info = self.installed_games.get(game_id)
+        if not self.settings['wineserver_prewarm'] or not game_info or not game_info.get('prefix'):
+            return None
+        return self.wineservers.warm_in_background(game_info['prefix'], self.proton_path(game_id))
+
+    def prefetch_selected_game(self, game_id: str) -> Optional[threading.Thread]:
+        """
+        Start reading a game's profiled files into the page cache when it is
+        selected, if enabled, so a launch shortly after finds them warm.
+
+        Returns:
+            The background thread, or None if nothing was started
+        """
+        game_info = self.installed_games.get(game_id)
+        if not (self.settings['prefetch_game_files'] and self.settings['prefetch_on_select']) \
+                or not game_info or not game_info.get('prefix'):
+            return None
+        return self.prefetcher.prefetch_in_background(game_id, Path(game_info['path']))
+
+    def _games_running_changed(self, running: int):
+        """Throttle background work while any supervised game runs"""
+        if self.settings['throttle_background'] or not running:
+            self.isolation.set_foreground(running > 0)
+
+    def reap_stale_wineservers(self) -> list:
+        """
+        Stop wineservers left in installed games' prefixes by crashed games.
+
+        Returns:
+            PIDs of the stopped servers
+        """
+        prefixes = [info['prefix'] for info in self.installed_games.values() if info.get('prefix')]
+        return self.wineservers.reap_stale(prefixes) if prefixes else []
+
+    def dedup_installs(self, progress_callback: Callable = None,
+                       cancel_event: Optional[threading.Event] = None) -> DedupReport:
+        """
+        Share byte-identical files between installed clients.
+
+        Args:
+            progress_callback: Optional callback for progress messages
+            cancel_event: Optional event that stops the scan
+
+        Returns:
+            DedupReport with the space reclaimed
+        """
+        from games_db import GAMES_DATABASE
+        roots, private_roots = [], []
+        for game_id, game_info in self.installed_games.items():
+            if game_info.get('install_type') in ('aur', 'flatpak') or not game_info.get('path'):
+                continue
+            path = Path(game_info['path'])
+            if not path.is_dir():
+                continue
+            # Hardlinked files are read-only and shared, which in-place
+            # patchers cannot cope with; such installs only get reflinks
+            if self._patched_in_place(GAMES_DATABASE.get(game_id, {})):
+                private_roots.append(path)
+            if not any(path == root or root in path.parents for root in roots):
+                roots = [root for root in roots if path not in root.parents] + [path]
+        logger.info(f"Deduplicating {len(roots)} install directories")
+        return self.content_store.dedup(roots, progress_callback, cancel_event, private_roots)
 
     def launch_game(self, game_id: str, game_data: dict) -> bool:
         """Launch a game using UMU"""
@@ -861,6 +1767,7 @@ class GameInstaller:
             return False
 
         game_info = self.installed_games[game_id]
+        timer = self.launch_timings.start(game_id)
 
         if game_info['install_type'] == 'aur':
             # AUR packages typically install desktop entries or binaries
@@ -870,13 +1777,17 @@ class GameInstaller:
                 # Check if game has a launch command
                 if 'launch_command' in game_data:
                     launch_cmd = game_data['launch_command']
-                    subprocess.Popen(launch_cmd, shell=True)
+                    timer.mark(PHASE_RESOLVE)
+                    process = subprocess.Popen(self.isolation.wrap(["sh", "-c", launch_cmd], KIND_GAME, game_id))
+                    self._follow_launch(game_id, timer, process)
                     logger.info(f"Launched {game_data['name']} via AUR package")
                     return True
                 else:
                     # Try common executable names
-                    if shutil.which(aur_pkg):
-                        subprocess.Popen([aur_pkg])
+                    if self.probe.which(aur_pkg):
+                        timer.mark(PHASE_RESOLVE)
+                        process = subprocess.Popen(self.isolation.wrap([aur_pkg], KIND_GAME, game_id))
+                        self._follow_launch(game_id, timer, process)
                         logger.info(f"Launched {game_data['name']} via AUR package")
                         return True
                     else:
@@ -889,7 +1800,9 @@ class GameInstaller:
         elif game_info['install_type'] == 'flatpak':
             flatpak_id = game_info['path'].replace("flatpak://", "")
             try:
-                subprocess.Popen(["flatpak", "run", flatpak_id])
+                command = self.isolation.wrap(["flatpak", "run", flatpak_id], KIND_GAME, game_id)
+                timer.mark(PHASE_RESOLVE)
+                self._follow_launch(game_id, timer, subprocess.Popen(command))
                 logger.info(f"Launched {game_data['name']} via Flatpak")
                 return True
             except Exception as e:
@@ -909,32 +1822,61 @@ class GameInstaller:
                 return False
 
             try:
-                # Find available UMU command
-                umu_cmd = None
-                for cmd in UMU_COMMANDS:
-                    if shutil.which(cmd):
-                        umu_cmd = cmd
-                        break
-
+                umu_cmd = self.probe.command('umu')
                 if not umu_cmd:
                     logger.error("UMU launcher not found on system")
                     return False
 
-                # Set up environment for Wine prefix if available
-                env = None
-                if 'prefix' in game_info and game_info['prefix']:
-                    env = {**os.environ}
-                    env['WINEPREFIX'] = game_info['prefix']
-                    env['PROTONPATH'] = 'GE-Proton'
-                    logger.info(f"Using Wine prefix: {game_info['prefix']}")
-
-                subprocess.Popen([umu_cmd, str(game_path)], env=env)
-                logger.info(f"Launched {game_data['name']} via UMU")
+                plan = self.launch_plan(game_id, game_data, [umu_cmd, str(game_path)])
+                timer.mark(PHASE_RESOLVE)
+                if 'PROTONPATH' in plan.env:
+                    timer.proton = Path(plan.env['PROTONPATH']).name
+                if 'DXVK_STATE_CACHE_PATH' in plan.env:
+                    self.shader_caches.prepare(cache_key(game_id, game_data), [game_path.parent])
+                if 'PROTON_NO_ESYNC' not in plan.env:
+                    raise_nofile_limit()
+                if 'WINEPREFIX' in plan.env:
+                    logger.info(f"Using Wine prefix: {plan.env['WINEPREFIX']}")
+
+                game_dir = Path(game_info['path'])
+                prefetch = self.settings['prefetch_game_files']
+                if prefetch:
+                    # Overlaps with umu and Proton starting up
+                    self.prefetcher.prefetch_in_background(game_id, game_dir)
+                timer.mark(PHASE_SETUP)
+
+                env = plan.environment()
+                frames_dir = None
+                if self.settings['frame_telemetry'] and self.probe.command('mangohud'):
+                    frames_dir = self.frame_telemetry.session_dir(game_id)
+                    env.update(self.frame_telemetry.environment(frames_dir))
+
+                process = subprocess.Popen(self.isolation.wrap(plan.command, KIND_GAME, game_id), env=env)
+                logger.info(f"Launched {game_data['name']} via UMU: {plan.describe()}")
+                self._follow_launch(game_id, timer, process, plan.env.get('WINEPREFIX'), game_path.name)
+                if frames_dir is not None:
+                    threading.Thread(target=self._collect_frame_telemetry,
+                                     args=(game_id, frames_dir, self.launch_profile(game_id, game_data)),
+                                     name=f"frames-{game_id}", daemon=True).start()
+                if prefetch:
+                    self.prefetcher.record_in_background(game_id, game_dir, process.pid)
                 return True
             except Exception as e:
                 logger.error(f"Failed to launch via UMU: {e}")
                 return False
 
+    def _follow_launch(self, game_id: str, timer: LaunchTimer, process: subprocess.Popen,
+                       prefix: Optional[str] = None, executable: Optional[str] = None):
+        """Hand a spawned game to the supervisor and time the rest of its start-up"""
+        timer.mark(PHASE_SPAWN)
+        self.supervisor.watch(game_id, process)
+        self.launch_timings.follow_in_background(timer, process.pid, prefix, executable)
+
+    def _collect_frame_telemetry(self, game_id: str, frames_dir: Path, profile: dict):
+        """Summarise a session's MangoHud logs once the game has exited"""
+        self.supervisor.wait(game_id)
+        self.frame_telemetry.summarise(game_id, frames_dir, profile)
+
     def uninstall_game(self, game_id: str) -> bool:
         """Uninstall a game"""
         if game_id not in self.installed_games:
@@ -944,18 +1886,13 @@ class GameInstaller:
 
         if game_info['install_type'] == 'aur':
             aur_pkg = game_info['path'].replace("aur://", "")
-            pacman_available = shutil.which('pacman') is not None
+            pacman_available = self.probe.which('pacman') is not None
             if not (self.aur_helper or pacman_available):
                 logger.error("No AUR helper or pacman available for AUR uninstall")
                 return False
             try:
                 # Open terminal for user to confirm uninstall
-                terminals = ['konsole', 'gnome-terminal', 'xfce4-terminal', 'alacritty', 'kitty', 'xterm']
-                term_cmd = None
-                for term in terminals:
-                    if shutil.which(term):
-                        term_cmd = term
-                        break
+                term_cmd = self.probe.command('terminal')
 
                 if term_cmd:
                     # Open terminal and run uninstall
@@ -1006,14 +1943,21 @@ class GameInstaller:
                 logger.error(f"Failed to uninstall Flatpak: {e}")
                 return False
         else:
-            # Remove game directory
+            # Keep the compiled shaders for a reinstall or another server on the same client
+            if game_info.get('prefix'):
+                self._backup_shader_cache(game_id, game_info)
             game_path = Path(game_info['path'])
             if game_path.exists():
                 shutil.rmtree(game_path)
+                try:
+                    self.content_store.gc()
+                except OSError as e:
+                    logger.warning(f"Failed to clean content store: {e}")
 
         # Remove from installed games
         del self.installed_games[game_id]
         self._save_installed_games()
+        self._install_state_file(game_id).unlink(missing_ok=True)
 
         logger.info(f"Uninstalled game: {game_id}")
         return True
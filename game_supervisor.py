@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Game supervisor module
+Follows each launched game's process tree until it exits, sampling CPU,
+memory and disk I/O from /proc at a fixed rate, and keeps a history of
+sessions with their duration and exit status
+"""
+
+import argparse
+import json
+import logging
+import os
+import select
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Any
+
+from page_prefetch import descendants, PROC_ROOT
+
+# Constants
+DEFAULT_SAMPLE_INTERVAL = 2.0
+# The process tree is rescanned this often; in between only known PIDs are read
+TREE_RESCAN_INTERVAL = 10.0
+MAX_HISTORY = 500
+CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+logger = logging.getLogger("game_installer.supervisor")
+
+
+def read_process(pid: int, proc_root: Path = PROC_ROOT) -> Optional[Dict[str, int]]:
+    """
+    CPU ticks, RSS and I/O counters of one process.
+
+    Returns:
+        Dict with 'cpu_ticks', 'rss', 'threads', 'read_bytes', 'write_bytes',
+        or None if the process is gone
+    """
+    try:
+        stat = (proc_root / str(pid) / "stat").read_text()
+    except OSError:
+        return None
+    fields = stat[stat.rfind(")") + 2:].split()
+    if len(fields) < 22 or fields[0] in ("Z", "X"):
+        return None
+    info = {'cpu_ticks': int(fields[11]) + int(fields[12]), 'threads': int(fields[17]),
+            'rss': int(fields[21]) * PAGE_SIZE, 'read_bytes': 0, 'write_bytes': 0}
+    try:
+        with open(proc_root / str(pid) / "io", 'r', encoding='ascii') as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in ('read_bytes', 'write_bytes'):
+                    info[key] = int(value)
+    except (OSError, ValueError):
+        pass  # io needs ptrace access; not every process allows it
+    return info
+
+
+class ProcessSample:
+    """Resource use of a whole process tree at one point in time"""
+
+    def __init__(self, timestamp: float, processes: int, threads: int, rss: int,
+                 cpu_percent: float, read_rate: float, write_rate: float):
+        self.timestamp = timestamp
+        self.processes = processes
+        self.threads = threads
+        self.rss = rss
+        self.cpu_percent = cpu_percent
+        self.read_rate = read_rate
+        self.write_rate = write_rate
+
+    def describe(self) -> str:
+        return (f"CPU {self.cpu_percent:.0f}% · RSS {self.rss / (1024 ** 3):.2f} GiB · "
+                f"read {self.read_rate / (1024 ** 2):.1f} MB/s · write {self.write_rate / (1024 ** 2):.1f} MB/s · "
+                f"{self.processes} processes")
+
+    def __repr__(self) -> str:
+        return f"ProcessSample({self.describe()})"
+
+
+class GameSession:
+    """One run of a game, from launch to exit"""
+
+    def __init__(self, game_id: str, pid: int, started: Optional[float] = None):
+        self.game_id = game_id
+        self.pid = pid
+        self.started = time.time() if started is None else started
+        self.ended: Optional[float] = None
+        self.returncode: Optional[int] = None
+        self.last_sample: Optional[ProcessSample] = None
+        self.peak_rss = 0
+        self.cpu_seconds = 0.0
+        self.read_bytes = 0
+        self.write_bytes = 0
+
+    @property
+    def running(self) -> bool:
+        return self.ended is None
+
+    @property
+    def duration(self) -> float:
+        return (self.ended or time.time()) - self.started
+
+    @property
+    def crashed(self) -> bool:
+        return self.returncode is not None and self.returncode != 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'game_id': self.game_id,
+            'started': self.started,
+            'duration': round(self.duration, 1),
+            'returncode': self.returncode,
+            'peak_rss': self.peak_rss,
+            'cpu_seconds': round(self.cpu_seconds, 1),
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+        }
+
+    def __repr__(self) -> str:
+        return f"GameSession({self.game_id}, pid={self.pid}, running={self.running})"
+
+
+class _TreeSampler:
+    """Turns cumulative per-process counters into rates for a process tree"""
+
+    def __init__(self, pid: int, proc_root: Path):
+        self.pid = pid
+        self.proc_root = proc_root
+        self.pids = {pid}
+        self.rescanned = 0.0
+        self.previous: Dict[int, Dict[str, int]] = {}
+        self.previous_time: Optional[float] = None
+
+    def sample(self, session: GameSession) -> Optional[ProcessSample]:
+        now = time.monotonic()
+        if now - self.rescanned >= TREE_RESCAN_INTERVAL:
+            self.pids = descendants(self.pid, self.proc_root)
+            self.rescanned = now
+        current = {}
+        for pid in self.pids:
+            info = read_process(pid, self.proc_root)
+            if info is not None:
+                current[pid] = info
+        self.pids = set(current) | {self.pid}
+        elapsed = now - self.previous_time if self.previous_time is not None else None
+        deltas = {'cpu_ticks': 0, 'read_bytes': 0, 'write_bytes': 0}
+        for pid, info in current.items():
+            before = self.previous.get(pid)
+            for key in deltas:
+                # A process seen for the first time contributes its whole history
+                deltas[key] += max(0, info[key] - (before[key] if before else 0))
+        self.previous, self.previous_time = current, now
+
+        session.cpu_seconds += deltas['cpu_ticks'] / CLOCK_TICKS
+        session.read_bytes += deltas['read_bytes']
+        session.write_bytes += deltas['write_bytes']
+        if not current or not elapsed:
+            return None
+        rss = sum(info['rss'] for info in current.values())
+        session.peak_rss = max(session.peak_rss, rss)
+        return ProcessSample(time.time(), len(current), sum(info['threads'] for info in current.values()), rss,
+                             deltas['cpu_ticks'] / CLOCK_TICKS / elapsed * 100,
+                             deltas['read_bytes'] / elapsed, deltas['write_bytes'] / elapsed)
+
+
+class GameSupervisor:
+    """
+    Watches launched games on one thread each.
+
+    Exit is detected through a pidfd where the kernel supports it, so a
+    watcher sleeps in poll() between samples instead of busy-checking.
+    Callbacks run on the watcher threads.
+    """
+
+    def __init__(self, history_file: Optional[Path] = None, interval: float = DEFAULT_SAMPLE_INTERVAL,
+                 sample_callback: Optional[Callable[[str, ProcessSample], None]] = None,
+                 exit_callback: Optional[Callable[[str, GameSession], None]] = None,
+                 running_callback: Optional[Callable[[int], None]] = None,
+                 proc_root: Path = PROC_ROOT):
+        """
+        Args:
+            history_file: Optional JSON file finished sessions are appended to
+            interval: Seconds between samples
+            sample_callback: Optional callback(game_id, ProcessSample)
+            exit_callback: Optional callback(game_id, GameSession) when a game exits
+            running_callback: Optional callback(number of running games) when a game starts or exits
+            proc_root: procfs mount point
+        """
+        self.history_file = Path(history_file) if history_file else None
+        self.interval = interval
+        self.sample_callback = sample_callback
+        self.exit_callback = exit_callback
+        self.running_callback = running_callback
+        self.proc_root = Path(proc_root)
+        self._lock = threading.Lock()
+        self._sessions: Dict[str, GameSession] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+
+    def watch(self, game_id: str, process: subprocess.Popen) -> GameSession:
+        """Start supervising a launched process"""
+        session = GameSession(game_id, process.pid)
+        thread = threading.Thread(target=self._supervise, args=(session, process),
+                                  name=f"supervise-{game_id}", daemon=True)
+        with self._lock:
+            self._sessions[game_id] = session
+            self._threads[game_id] = thread
+            running = len(self._sessions)
+        if self.running_callback:
+            self._call(self.running_callback, running)
+        thread.start()
+        logger.info(f"Supervising {game_id} (pid {process.pid})")
+        return session
+
+    def session(self, game_id: str) -> Optional[GameSession]:
+        """Current session of a running game"""
+        with self._lock:
+            return self._sessions.get(game_id)
+
+    def running(self) -> Dict[str, GameSession]:
+        with self._lock:
+            return dict(self._sessions)
+
+    def is_running(self, game_id: str) -> bool:
+        return self.session(game_id) is not None
+
+    def wait(self, game_id: str, timeout: Optional[float] = None) -> bool:
+        """Wait for a game's supervisor thread; True if it finished"""
+        with self._lock:
+            thread = self._threads.get(game_id)
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def _supervise(self, session: GameSession, process: subprocess.Popen):
+        sampler = _TreeSampler(process.pid, self.proc_root)
+        poller = None
+        pidfd = None
+        try:
+            pidfd = os.pidfd_open(process.pid)
+            poller = select.poll()
+            poller.register(pidfd, select.POLLIN)
+        except (AttributeError, OSError):
+            pass  # no pidfd support: fall back to checking between samples
+        try:
+            while True:
+                if poller is not None:
+                    if poller.poll(self.interval * 1000):
+                        break
+                elif process.poll() is not None:
+                    break
+                else:
+                    time.sleep(self.interval)
+                    if process.poll() is not None:
+                        break
+                sample = sampler.sample(session)
+                if sample is not None:
+                    session.last_sample = sample
+                    if self.sample_callback:
+                        self._call(self.sample_callback, session.game_id, sample)
+        finally:
+            if pidfd is not None:
+                os.close(pidfd)
+        session.returncode = process.wait()
+        session.ended = time.time()
+        with self._lock:
+            if self._sessions.get(session.game_id) is session:
+                del self._sessions[session.game_id]
+            running = len(self._sessions)
+        self._record(session)
+        if self.running_callback:
+            self._call(self.running_callback, running)
+        status = "crashed" if session.crashed else "exited"
+        logger.info(f"{session.game_id} {status} with status {session.returncode} after {session.duration:.0f}s")
+        if self.exit_callback:
+            self._call(self.exit_callback, session.game_id, session)
+
+    def _call(self, callback: Callable, *args):
+        try:
+            callback(*args)
+        except Exception as e:
+            logger.warning(f"Supervisor callback failed: {e}")
+
+    # --- History --------------------------------------------------------
+    def history(self, game_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Finished sessions, oldest first, optionally for one game"""
+        if self.history_file is None:
+            return []
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                sessions = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return [s for s in sessions if game_id is None or s.get('game_id') == game_id]
+
+    def _record(self, session: GameSession):
+        if self.history_file is None:
+            return
+        with self._lock:
+            sessions = (self.history() + [session.to_dict()])[-MAX_HISTORY:]
+            try:
+                self.history_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.history_file.with_name(self.history_file.name + ".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(sessions, f, indent=2)
+                os.replace(tmp_path, self.history_file)
+            except OSError as e:
+                logger.warning(f"Could not save session history: {e}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run a command and report its resource use")
+    parser.add_argument("--interval", type=float, default=DEFAULT_SAMPLE_INTERVAL)
+    parser.add_argument("command", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+    if not args.command:
+        parser.error("no command given")
+
+    supervisor = GameSupervisor(interval=args.interval,
+                                sample_callback=lambda _, sample: print(sample.describe(), file=sys.stderr))
+    session = supervisor.watch("command", subprocess.Popen(args.command))
+    supervisor.wait("command")
+    print(json.dumps(session.to_dict(), indent=2))
+    return 1 if session.crashed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
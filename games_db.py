@@ -17,6 +17,9 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine"],
         "executable": "Wow.exe",
+        "client_family": "wow",
+        "client_version": "3.3.5a",
+        "client_overrides": {"Data/*/realmlist.wtf": "set realmlist logon.warmane.com\n"},
         "install_notes": "Manual download required from warmane.com. Has torrent and direct download options. Set realmlist to logon.warmane.com after install.",
         "native": False,
         "tested": True
@@ -65,7 +68,7 @@ GAMES_DATABASE = {
         "website": "https://project1999.com",
         "client_download_url": "https://archive.org/download/EQP99V46/EQ%20P99%20v46.zip",
         "install_type": "manual_download",
-        "install_script": "install_p99.sh",
+        "install_script": "recipe:everquest-p1999",
         "dependencies": ["umu-launcher", "wine", "d3dx9_43", "corefonts", "unzip"],
         "executable": "Launch Titanium.bat",
         "install_notes": "Auto-installer downloads Titanium + P99 v46 (1.3GB), extracts game files, applies latest P99 patches. Choose server in-game via 'Launch Titanium' launcher. CRITICAL: ALWAYS use 'Launch Titanium.bat', NEVER run eqgame.exe or patch! Account: https://www.project1999.com/account/?Play",
@@ -86,7 +89,7 @@ GAMES_DATABASE = {
         "client_download_url": "https://drive.google.com/file/d/1qoBktDeJMJKPBr-EZxub1vspJhz11i1y/view",
         "patcher_url": "https://projectquarm.com",
         "install_type": "manual_download",
-        "install_script": "install_quarm.sh",
+        "install_script": "recipe:everquest-quarm",
         "dependencies": ["umu-launcher", "wine", "d3dx9_43", "corefonts"],
         "executable": "eqgame.exe",
         "install_notes": "OFFICIALLY LICENSED by Daybreak Games! Auto-installer script downloads TAKP client from Google Drive and extracts QuarmPatcher from Downloads. Features: One-Box Policy (strictly enforced via IP), Solo Self-Found (SSF) opt-in ruleset, custom cultural tradeskill NPCs, legacy camp/item system, raid rotations, 1,200 player cap with queue. ACCOUNT: Create forum account at takproject.net/forums → 'Game Accounts' → 'Create Login Server Account'. After install: 1) launch_patcher.sh to update. 2) launch_game.sh to play.",
@@ -871,7 +874,7 @@ GAMES_DATABASE = {
         "website": "https://ko-myko.com",
         "client_download_url": "https://ko-myko.com/downloads",
         "install_type": "manual_download",
-        "install_script": "install_knight_myko.sh",
+        "install_script": "recipe:knight-myko",
         "dependencies": ["umu-launcher", "wine-staging", "d3dx9", "vcrun2008", "corefonts", "cjkfonts"],
         "executable": "Client_KOMYKO.exe",
         "install_notes": "Download client_myko.zip or Client_KOMYKO.zip from ko-myko.com/downloads and save to Downloads folder. Auto-installer will extract the archive and set up Wine dependencies. Client_KOMYKO.exe is the game launcher (no separate installation needed).",
@@ -924,6 +927,8 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging", "d3dx9", "vcrun2008", "corefonts"],
         "executable": "pol.exe",
+        "client_family": "ffxi",
+        "client_version": "retail",
         "install_notes": "Download client from website. Use PlayOnline Viewer (pol.exe) to launch. Excellent Wine compatibility.",
         "native": False,
         "tested": True
@@ -940,6 +945,8 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging", "d3dx9", "vcrun2008", "corefonts"],
         "executable": "pol.exe",
+        "client_family": "ffxi",
+        "client_version": "retail",
         "install_notes": "Requires FFXI retail client. More hardcore than Horizon with authentic retail mechanics.",
         "native": False,
         "tested": True
@@ -956,6 +963,8 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging", "d3dx9", "vcrun2008", "corefonts"],
         "executable": "pol.exe",
+        "client_family": "ffxi",
+        "client_version": "retail",
         "install_notes": "Extended cap beyond 75. Includes additional expansions. Good Wine compatibility.",
         "native": False,
         "tested": False
@@ -972,6 +981,8 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging", "d3dx9", "vcrun2008", "corefonts"],
         "executable": "pol.exe",
+        "client_family": "ffxi",
+        "client_version": "retail",
         "install_notes": "Custom rates make leveling less grindy. Good for players wanting faster progression.",
         "native": False,
         "tested": False
@@ -988,6 +999,8 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging", "d3dx9", "vcrun2008", "corefonts"],
         "executable": "pol.exe",
+        "client_family": "ffxi",
+        "client_version": "retail",
         "install_notes": "Focuses on retail accuracy. Small but dedicated community.",
         "native": False,
         "tested": False
@@ -1509,6 +1522,9 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging"],
         "executable": "Wow.exe",
+        "client_family": "wow",
+        "client_version": "3.3.5a",
+        "client_overrides": {"Data/*/realmlist.wtf": "set realmlist logon.chromiecraft.com\n"},
         "install_notes": "3.3.5a client required. Progressive content unlock. Excellent Wine compatibility.",
         "native": False,
         "tested": True
@@ -1525,6 +1541,9 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging"],
         "executable": "Wow.exe",
+        "client_family": "wow",
+        "client_version": "3.3.5a",
+        "client_overrides": {"Data/*/realmlist.wtf": "set realmlist logon.dalaran-wow.com\n"},
         "install_notes": "WotLK 3.3.5a client. 2x rates. Very stable and mature server.",
         "native": False,
         "tested": True
@@ -1541,12 +1560,26 @@ GAMES_DATABASE = {
         "install_type": "manual_download",
         "dependencies": ["umu-launcher", "wine-staging"],
         "executable": "Wow.exe",
+        "client_family": "wow",
+        "client_version": "3.3.5a",
+        "client_overrides": {"Data/*/realmlist.wtf": "set realmlist logon.sunwell.pl\n"},
         "install_notes": "WotLK 3.3.5a client. 2x rates. Very high quality scripting.",
         "native": False,
         "tested": True
     }
 }
 
+# Launch profile defaults per client family; per-game overrides are kept in
+# installed_games.json (see launch_profiles.py for the keys)
+CLIENT_FAMILY_PROFILES = {
+    # 32-bit client that runs out of address space with large addons or
+    # HD texture packs; DXVK async hides shader compile stutter in cities
+    "wow": {"large_address_aware": True, "dxvk_async": True},
+    # 32-bit PlayOnline/FFXI client; async shader builds cause visible
+    # pop-in with its D3D8 renderer
+    "ffxi": {"large_address_aware": True, "dxvk_async": False},
+}
+
 
 def get_all_games() -> Dict[str, Dict[str, Any]]:
     """
@@ -1584,6 +1617,34 @@ def get_games_by_genre(genre: str) -> Dict[str, Dict[str, Any]]:
     return {k: v for k, v in GAMES_DATABASE.items() if genre.lower() in v['genre'].lower()}
 
 
+def get_games_by_client(client_family: str, client_version: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Get servers that share the same base client.
+
+    Args:
+        client_family: Client family, e.g. "wow"
+        client_version: Client build within the family, e.g. "3.3.5a"
+
+    Returns:
+        Dict of games using that client
+    """
+    return {k: v for k, v in GAMES_DATABASE.items()
+            if v.get('client_family') == client_family and v.get('client_version') == client_version}
+
+
+def get_client_profile(client_family: Optional[str]) -> Dict[str, Any]:
+    """
+    Get the launch profile defaults of a client family.
+
+    Args:
+        client_family: Client family, e.g. "wow" (None: no family)
+
+    Returns:
+        Profile settings, empty if the family has no defaults
+    """
+    return dict(CLIENT_FAMILY_PROFILES.get(client_family, {})) if client_family else {}
+
+
 def get_native_games() -> Dict[str, Dict[str, Any]]:
     """
     Get only native Linux games.
@@ -26,13 +26,17 @@ from PyQt6.QtWidgets import (
     QPlainTextEdit,
     QProgressBar,
     QTabWidget,
+    QTreeWidget,
+    QTreeWidgetItem,
     QFrame
 )
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QUrl
+from PyQt6.QtCore import Qt, QObject, QThread, pyqtSignal, QUrl
 from PyQt6.QtGui import QFont, QDesktopServices, QPixmap, QPainter, QLinearGradient, QColor
 
 from games_db import get_all_games, get_game_by_id
 from game_installer import GameInstaller
+from system_probe import describe
+from install_scheduler import InstallScheduler, InstallJob, JOB_QUEUED, JOB_DONE, JOB_CANCELLED
 
 # Constants
 LOG_FILE = Path("logs/launcher.log")
@@ -58,23 +62,48 @@ logging.basicConfig(
 )
 
 
-class InstallThread(QThread):
-    """Background thread for game installation"""
+class SchedulerSignals(QObject):
+    """Delivers install scheduler callbacks from worker threads to the GUI thread"""
+    progress = pyqtSignal(str, str)
+    stage = pyqtSignal(str, str, str, float)
+    finished = pyqtSignal(str, str)
+    changed = pyqtSignal()
+
+
+class SupervisorSignals(QObject):
+    """Delivers running-game samples, exits and launch timings from worker threads to the GUI thread"""
+    sample = pyqtSignal(str, object)
+    exited = pyqtSignal(str, object)
+    launch_timed = pyqtSignal(str, object)
+    frames_summarised = pyqtSignal(str, object)
+
+
+def format_duration(seconds: float) -> str:
+    """Short h/m/s form of a duration"""
+    minutes, secs = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{hours}h {minutes:02d}m"
+    return f"{minutes}m {secs:02d}s" if minutes else f"{secs}s"
+
+
+class DedupThread(QThread):
+    """Background thread sharing identical files between installs"""
     progress = pyqtSignal(str)
-    finished = pyqtSignal(bool)
+    finished = pyqtSignal(str)
 
-    def __init__(self, installer: GameInstaller, game_id: str, game_data: dict):
+    def __init__(self, installer: GameInstaller):
         super().__init__()
         self.installer = installer
-        self.game_id = game_id
-        self.game_data = game_data
 
     def run(self):
-        def progress_callback(msg: str):
-            self.progress.emit(msg)
-
-        result = self.installer.install_game(self.game_id, self.game_data, progress_callback)
-        self.finished.emit(result)
+        try:
+            with self.installer.isolation.background():
+                report = self.installer.dedup_installs(self.progress.emit)
+            self.finished.emit(report.describe())
+        except Exception as e:
+            logging.error(f"Dedup failed: {e}")
+            self.finished.emit(f"Deduplication failed: {e}")
 
 
 class GameDetailPanel(QWidget):
@@ -85,6 +114,8 @@ class GameDetailPanel(QWidget):
     launch_requested = pyqtSignal(str)
     open_site_requested = pyqtSignal(str)
     open_folder_requested = pyqtSignal(str)
+    cancel_requested = pyqtSignal(str)
+    proton_pin_requested = pyqtSignal(str, str)
 
     def __init__(self, parent: Optional[QWidget] = None):
         super().__init__(parent)
@@ -230,6 +261,11 @@ class GameDetailPanel(QWidget):
         self.path_value.setWordWrap(True)
         install_form.addRow("Install Path:", self.path_value)
 
+        # Proton build the game launches with; the first entry follows the newest local build
+        self.proton_combo = QComboBox()
+        self.proton_combo.activated.connect(self._emit_proton_pin)
+        install_form.addRow("Proton:", self.proton_combo)
+
         install_layout.addLayout(install_form)
 
         self.notes_field = QPlainTextEdit()
@@ -250,11 +286,47 @@ class GameDetailPanel(QWidget):
         self.activity_label.setStyleSheet("color: #adb3c7;")
         activity_layout.addWidget(self.activity_label)
 
+        # Live figures of the running game, or a summary of its last session
+        self.session_label = QLabel()
+        self.session_label.setWordWrap(True)
+        self.session_label.setStyleSheet("color: #8fd19e;")
+        self.session_label.hide()
+        activity_layout.addWidget(self.session_label)
+
+        # Where the time of the last launch went, per phase
+        self.launch_label = QLabel()
+        self.launch_label.setWordWrap(True)
+        self.launch_label.setStyleSheet("color: #adb3c7;")
+        self.launch_label.hide()
+        activity_layout.addWidget(self.launch_label)
+
+        # Frame rate of recent sessions, before and after profile changes
+        self.frames_label = QLabel()
+        self.frames_label.setWordWrap(True)
+        self.frames_label.setStyleSheet("color: #adb3c7;")
+        self.frames_label.hide()
+        activity_layout.addWidget(self.frames_label)
+
         self.progress_bar = QProgressBar()
         self.progress_bar.setTextVisible(False)
         self.progress_bar.hide()
         activity_layout.addWidget(self.progress_bar)
 
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.setProperty("kind", "danger")
+        self.cancel_btn.clicked.connect(self._emit_cancel)
+        self.cancel_btn.hide()
+        activity_layout.addWidget(self.cancel_btn, alignment=Qt.AlignmentFlag.AlignLeft)
+
+        # Install pipeline stages with their timings
+        self.stage_tree = QTreeWidget()
+        self.stage_tree.setColumnCount(3)
+        self.stage_tree.setHeaderLabels(["Stage", "Status", "Time"])
+        self.stage_tree.setRootIsDecorated(False)
+        self.stage_tree.setMaximumHeight(190)
+        self.stage_tree.hide()
+        activity_layout.addWidget(self.stage_tree)
+
         self.log_field = QPlainTextEdit()
         self.log_field.setReadOnly(True)
         self.log_field.setMaximumBlockCount(3000)
@@ -345,8 +417,24 @@ class GameDetailPanel(QWidget):
             has_filesystem_path = not (path_str.startswith('aur://') or path_str.startswith('flatpak://'))
         self.open_folder_btn.setEnabled(has_filesystem_path)
 
+        self.proton_combo.clear()
+        self.proton_combo.setEnabled(False)
+
         self.clear_activity()
 
+    def set_proton_builds(self, builds: List[str], pinned: Optional[str]):
+        """Fill the Proton selector with local builds and select the game's pin."""
+        self.proton_combo.clear()
+        self.proton_combo.addItem("Newest installed build", "")
+        for build in reversed(builds):
+            self.proton_combo.addItem(build, build)
+        index = self.proton_combo.findData(pinned or "")
+        if index < 0:
+            self.proton_combo.addItem(f"{pinned} (missing)", pinned)
+            index = self.proton_combo.count() - 1
+        self.proton_combo.setCurrentIndex(index)
+        self.proton_combo.setEnabled(True)
+
     def _set_status_badge(self, text: str, background: str, text_color: str = '#f5f8ff'):
         """Set the status badge appearance."""
         self.status_badge.setText(text)
@@ -369,9 +457,27 @@ class GameDetailPanel(QWidget):
             self.icon_label.clear()
             self.icon_label.hide()
 
+    def show_session(self, text: Optional[str]):
+        """Show running-game figures (None hides them)."""
+        self.session_label.setText(text or "")
+        self.session_label.setVisible(bool(text))
+
+    def show_launch_times(self, text: Optional[str]):
+        """Show the last launch's phase breakdown (None hides it)."""
+        self.launch_label.setText(text or "")
+        self.launch_label.setVisible(bool(text))
+
+    def show_frame_stats(self, text: Optional[str]):
+        """Show frame time figures of recent sessions (None hides them)."""
+        self.frames_label.setText(text or "")
+        self.frames_label.setVisible(bool(text))
+
     def clear_activity(self):
         self.activity_label.setText("No active tasks")
         self.log_field.clear()
+        self.stage_tree.clear()
+        self.stage_tree.hide()
+        self.cancel_btn.hide()
         self.progress_bar.hide()
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
@@ -380,13 +486,18 @@ class GameDetailPanel(QWidget):
         self.activity_label.setText(header)
         self.log_field.clear()
         self.log_field.appendPlainText(f"=== {header} ===\n")
+        self.stage_tree.clear()
+        self.stage_tree.hide()
         self.progress_bar.show()
         self.progress_bar.setRange(0, 0)  # Busy indicator
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.show()
         # Auto-switch to Activity tab to show progress
         self.tabs.setCurrentIndex(2)  # Index 2 is Activity & Logs tab
 
     def end_activity(self, footer: str = "Finished"):
         self.activity_label.setText(footer)
+        self.cancel_btn.hide()
         self.progress_bar.hide()
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
@@ -402,6 +513,21 @@ class GameDetailPanel(QWidget):
         # Ensure the log scrolls to show latest message
         self.log_field.ensureCursorVisible()
 
+    def update_stage(self, stage: str, status: str, seconds: float):
+        """Show the status and duration of one install pipeline stage"""
+        matches = self.stage_tree.findItems(stage, Qt.MatchFlag.MatchExactly, 0)
+        item = matches[0] if matches else QTreeWidgetItem(self.stage_tree, [stage, "", ""])
+        item.setText(1, status)
+        item.setText(2, "" if status == "running" else f"{seconds:.1f}s")
+        self.stage_tree.show()
+
+    def show_stage_timings(self, timings: List[Tuple[str, str, float]]):
+        """Show the stages recorded for the game's last install attempt"""
+        self.stage_tree.clear()
+        self.stage_tree.hide()
+        for stage, status, seconds in timings:
+            self.update_stage(stage, status, seconds)
+
     # --- Signal emitters -------------------------------------------------
     def _emit_install(self):
         if self.current_game_id:
@@ -423,6 +549,15 @@ class GameDetailPanel(QWidget):
         if self.current_game_id:
             self.open_folder_requested.emit(self.current_game_id)
 
+    def _emit_proton_pin(self, index: int):
+        if self.current_game_id:
+            self.proton_pin_requested.emit(self.current_game_id, self.proton_combo.itemData(index) or "")
+
+    def _emit_cancel(self):
+        if self.current_game_id:
+            self.cancel_btn.setEnabled(False)
+            self.cancel_requested.emit(self.current_game_id)
+
 
 class LauncherApp(QMainWindow):
     """Primary window presenting expert launcher UI."""
@@ -434,17 +569,45 @@ class LauncherApp(QMainWindow):
         width, height = DEFAULT_WINDOW_SIZE
         self.setGeometry(x, y, width, height)
 
-        self.installer = GameInstaller()
+        self.installer.reload()
         self.games_db = get_all_games()
-        self.install_thread: Optional[InstallThread] = None
-        self.active_install_game: Optional[str] = None
+        self.dedup_thread: Optional[DedupThread] = None
         self.summary_labels: Dict[str, QLabel] = {}
         self.icon_cache: Dict[str, QPixmap] = {}
 
+        # Installs run concurrently, limited per resource class
+        self.scheduler_signals = SchedulerSignals()
+        self.install_scheduler = InstallScheduler(
+            self._run_install_job,
+            progress_callback=self.scheduler_signals.progress.emit,
+            stage_callback=self.scheduler_signals.stage.emit,
+            finished_callback=self.scheduler_signals.finished.emit,
+            changed_callback=self.scheduler_signals.changed.emit,
+        )
+        self.scheduler_signals.progress.connect(self.on_install_progress)
+        self.scheduler_signals.stage.connect(self.on_install_stage)
+        self.scheduler_signals.finished.connect(self.on_install_finished)
+        self.scheduler_signals.changed.connect(self.refresh_install_queue)
+
+        # Running games report through the supervisor's threads; nothing polls here
+        self.supervisor_signals = SupervisorSignals()
+        self.installer.supervisor.sample_callback = self.supervisor_signals.sample.emit
+        self.installer.supervisor.exit_callback = self.supervisor_signals.exited.emit
+        self.supervisor_signals.sample.connect(self.on_game_sample)
+        self.supervisor_signals.exited.connect(self.on_game_exited)
+        self.installer.launch_timings.callback = self.supervisor_signals.launch_timed.emit
+        self.supervisor_signals.launch_timed.connect(self.on_launch_timed)
+        self.installer.frame_telemetry.callback = self.supervisor_signals.frames_summarised.emit
+        self.supervisor_signals.frames_summarised.connect(self.on_frames_summarised)
+
         self._setup_ui()
         self._apply_style()
         self.refresh_game_list()
 
+        # Fetch a new GE-Proton release ahead of time rather than at launch
+        self.installer.prefetch_proton()
+        self.installer.reap_stale_wineservers()
+
     # --- UI assembly -----------------------------------------------------
     def _setup_ui(self):
         menu = self.menuBar()
@@ -455,6 +618,8 @@ class LauncherApp(QMainWindow):
 
         tools_menu = menu.addMenu("Tools")
         tools_menu.addAction("Check Dependencies", self.check_dependencies)
+        tools_menu.addAction("Deduplicate Game Files", self.dedup_game_files)
+        tools_menu.addAction("Build Prefix Templates", self.build_prefix_templates)
         tools_menu.addAction("View Logs", self.view_logs)
 
         help_menu = menu.addMenu("Help")
@@ -549,6 +714,38 @@ class LauncherApp(QMainWindow):
         self.games_list.itemSelectionChanged.connect(self.on_game_selected)
         list_layout.addWidget(self.games_list)
 
+        # Install queue with per-job progress
+        self.queue_panel = QWidget()
+        queue_layout = QVBoxLayout(self.queue_panel)
+        queue_layout.setContentsMargins(0, 0, 0, 0)
+        queue_layout.setSpacing(6)
+        queue_layout.addWidget(QLabel("Install queue:"))
+
+        self.queue_tree = QTreeWidget()
+        self.queue_tree.setColumnCount(4)
+        self.queue_tree.setHeaderLabels(["Game", "State", "Needs", "Progress"])
+        self.queue_tree.setRootIsDecorated(False)
+        self.queue_tree.setMaximumHeight(180)
+        queue_layout.addWidget(self.queue_tree)
+
+        queue_buttons = QHBoxLayout()
+        queue_buttons.setSpacing(8)
+        move_up_btn = QPushButton("Move Up")
+        move_up_btn.clicked.connect(lambda: self.move_queued_install(-1))
+        queue_buttons.addWidget(move_up_btn)
+        move_down_btn = QPushButton("Move Down")
+        move_down_btn.clicked.connect(lambda: self.move_queued_install(1))
+        queue_buttons.addWidget(move_down_btn)
+        queue_buttons.addStretch()
+        cancel_job_btn = QPushButton("Cancel")
+        cancel_job_btn.setProperty("kind", "danger")
+        cancel_job_btn.clicked.connect(self.cancel_queued_install)
+        queue_buttons.addWidget(cancel_job_btn)
+        queue_layout.addLayout(queue_buttons)
+
+        self.queue_panel.hide()
+        list_layout.addWidget(self.queue_panel)
+
         splitter.addWidget(list_panel)
 
         self.detail_panel = GameDetailPanel()
@@ -557,6 +754,8 @@ class LauncherApp(QMainWindow):
         self.detail_panel.launch_requested.connect(self.handle_launch_request)
         self.detail_panel.open_site_requested.connect(self.handle_open_site_request)
         self.detail_panel.open_folder_requested.connect(self.handle_open_folder_request)
+        self.detail_panel.cancel_requested.connect(self.handle_cancel_request)
+        self.detail_panel.proton_pin_requested.connect(self.handle_proton_pin_request)
         splitter.addWidget(self.detail_panel)
 
         splitter.setStretchFactor(0, 1)
@@ -765,6 +964,11 @@ class LauncherApp(QMainWindow):
             if label:
                 label.setText(value)
 
+    def closeEvent(self, event):
+        """Stop pre-warmed wineservers that no game is using."""
+        self.installer.wineservers.shutdown()
+        super().closeEvent(event)
+
     def _apply_style(self):
         self.setStyleSheet(
             """
@@ -911,27 +1115,50 @@ class LauncherApp(QMainWindow):
         install_info = self.installer.installed_games.get(game_id)
         self.detail_panel.display_game(game_id, game_data, install_info)
         self.detail_panel.set_game_icon(self._get_game_icon(game_id, game_data))
+        self.detail_panel.show_stage_timings(self.installer.install_stage_timings(game_id))
+        self._show_proton_builds(install_info)
+        self.installer.prewarm_wineserver(game_id)
+        self._show_session_summary(game_id)
+        self.detail_panel.show_launch_times(self.installer.launch_timings.summary(game_id))
+        self.detail_panel.show_frame_stats(self.installer.frame_telemetry.compare(game_id))
+        self.installer.prefetch_selected_game(game_id)
+
+        # Bring back the log of an install that is still queued or running
+        job = self.install_scheduler.get(game_id)
+        if job:
+            self.detail_panel.install_btn.setEnabled(False)
+            self.detail_panel.begin_activity(f"Installing {game_data['name']}...")
+            for message in job.messages:
+                self.detail_panel.update_activity(message)
         self.statusBar().showMessage(f"Selected: {game_data['name']}")
         self._refresh_selection_styles()
 
+    def _show_proton_builds(self, install_info: Optional[Dict[str, Any]]):
+        """Offer Proton pinning for installs that run in a Wine prefix."""
+        if install_info and install_info.get('prefix'):
+            self.detail_panel.set_proton_builds(list(self.installer.proton.builds()), install_info.get('proton'))
+
     # --- Actions ---------------------------------------------------------
     def refresh_games_database(self):
-        self.installer = GameInstaller()
+        if self.install_scheduler.is_busy():
+            QMessageBox.information(self, "Game Library", "Wait for the queued installations to finish.")
+            return
+        self.installer.reload()
         self.games_db = get_all_games()
         self.detail_panel.clear_display()
         self.refresh_game_list()
         QMessageBox.information(self, "Game Library", "Game definitions reloaded. Installer refreshed.")
 
     def handle_install_request(self, game_id: str):
-        if self.install_thread and self.install_thread.isRunning():
-            QMessageBox.information(self, "Installation in progress", "Please wait for the current installation to finish before starting another.")
-            return
-
         game_data = get_game_by_id(game_id)
         if not game_data:
             QMessageBox.warning(self, "Game not found", "Unable to locate the selected game in the database.")
             return
 
+        if self.install_scheduler.get(game_id):
+            QMessageBox.information(self, "Installation in progress", f"{game_data['name']} is already queued for installation.")
+            return
+
         deps = ', '.join(game_data['dependencies']) if game_data['dependencies'] else 'None'
         reply = QMessageBox.question(
             self,
@@ -943,30 +1170,77 @@ class LauncherApp(QMainWindow):
         if reply != QMessageBox.StandardButton.Yes:
             return
 
-        self.active_install_game = game_id
+        resources = self.installer.install_resources(game_id, game_data)
         self.detail_panel.begin_activity(f"Installing {game_data['name']}...")
-
-        self.install_thread = InstallThread(self.installer, game_id, game_data)
-        self.install_thread.progress.connect(lambda msg, gid=game_id: self.on_install_progress(gid, msg))
-        self.install_thread.finished.connect(lambda success, gid=game_id: self.on_install_finished(gid, success))
-        self.install_thread.start()
+        self.detail_panel.install_btn.setEnabled(False)
+        # Lets the first job needing packages install those of the whole queue
+        self.installer.announce_install(game_id, game_data)
+        job = self.install_scheduler.submit(game_id, game_data, resources)
+        if job and job.state == JOB_QUEUED:
+            self.detail_panel.update_activity(f"Queued until {', '.join(sorted(resources))} capacity is free")
+
+    def _run_install_job(self, job: InstallJob) -> bool:
+        """Install one scheduled game (runs in a scheduler worker thread)"""
+        progress, stage = self.install_scheduler.job_callbacks(job)
+        with self.installer.isolation.background():
+            return self.installer.install_game(job.game_id, job.game_data, progress, job.cancel_event,
+                                               stage_callback=stage)
+
+    def handle_cancel_request(self, game_id: str):
+        if self.install_scheduler.cancel(game_id):
+            self.detail_panel.update_activity("Cancelling installation...")
+
+    def refresh_install_queue(self):
+        """Rebuild the queue view from the scheduler's jobs"""
+        selected = self._selected_queue_job()
+        self.queue_tree.clear()
+        for job in self.install_scheduler.jobs():
+            item = QTreeWidgetItem(self.queue_tree, [job.name, job.state, ', '.join(sorted(job.resources)),
+                                                     job.last_message])
+            item.setData(0, Qt.ItemDataRole.UserRole, job.game_id)
+            if job.game_id == selected:
+                self.queue_tree.setCurrentItem(item)
+        self.queue_panel.setVisible(self.queue_tree.topLevelItemCount() > 0)
+
+    def _selected_queue_job(self) -> Optional[str]:
+        item = self.queue_tree.currentItem()
+        return item.data(0, Qt.ItemDataRole.UserRole) if item else None
+
+    def move_queued_install(self, offset: int):
+        game_id = self._selected_queue_job()
+        if game_id and not self.install_scheduler.move(game_id, offset):
+            self.statusBar().showMessage("Only waiting installations can be reordered", 5000)
+
+    def cancel_queued_install(self):
+        game_id = self._selected_queue_job()
+        if game_id:
+            self.handle_cancel_request(game_id)
 
     def on_install_progress(self, game_id: str, message: str):
         if self.detail_panel.current_game_id == game_id:
             self.detail_panel.update_activity(message)
+        for row in range(self.queue_tree.topLevelItemCount()):
+            item = self.queue_tree.topLevelItem(row)
+            if item.data(0, Qt.ItemDataRole.UserRole) == game_id:
+                item.setText(3, message)
         logging.info(f"{game_id}: {message}")
 
-    def on_install_finished(self, game_id: str, success: bool):
-        if self.install_thread:
-            self.install_thread.deleteLater()
-            self.install_thread = None
+    def on_install_stage(self, game_id: str, stage: str, status: str, seconds: float):
+        if self.detail_panel.current_game_id == game_id:
+            self.detail_panel.update_stage(stage, status, seconds)
 
+    def on_install_finished(self, game_id: str, state: str):
+        success = state == JOB_DONE
+        cancelled = state == JOB_CANCELLED
+        self.installer.withdraw_install(game_id)
         install_info = self.installer.installed_games.get(game_id)
         pending_manual = bool(install_info and install_info.get('status') == 'pending_manual')
 
         if self.detail_panel.current_game_id == game_id:
             footer = "Installation complete" if success else "Installation finished with notes"
-            if pending_manual:
+            if cancelled:
+                footer = "Installation cancelled"
+            elif pending_manual:
                 footer = "Manual steps still required"
             elif not success and not install_info:
                 footer = "Installation failed"
@@ -975,11 +1249,19 @@ class LauncherApp(QMainWindow):
             game_data = self.games_db[game_id]
             self.detail_panel.display_game(game_id, game_data, install_info)
             self.detail_panel.set_game_icon(self._get_game_icon(game_id, game_data))
+            self.detail_panel.show_stage_timings(self.installer.install_stage_timings(game_id))
+        self._show_proton_builds(install_info)
 
         self.refresh_game_list()
 
-        if success:
-            QMessageBox.information(self, "Installation", f"{self.games_db[game_id]['name']} installed successfully.")
+        name = self.games_db[game_id]['name']
+        if cancelled:
+            self.statusBar().showMessage(f"Installation of {name} cancelled", 10000)
+        elif success and self.install_scheduler.is_busy():
+            # Don't interrupt the rest of the queue with a dialog per game
+            self.statusBar().showMessage(f"{name} installed successfully", 10000)
+        elif success:
+            QMessageBox.information(self, "Installation", f"{name} installed successfully.")
         else:
             if pending_manual:
                 QMessageBox.warning(
@@ -994,9 +1276,7 @@ class LauncherApp(QMainWindow):
                     "Installation completed with warnings. Review the logs for details."
                 )
             else:
-                QMessageBox.critical(self, "Installation failed", "The game could not be installed. Check the activity log for details.")
-
-        self.active_install_game = None
+                QMessageBox.critical(self, "Installation failed", f"{name} could not be installed. Check the activity log for details.")
 
     def handle_uninstall_request(self, game_id: str):
         game_data = get_game_by_id(game_id)
@@ -1004,6 +1284,10 @@ class LauncherApp(QMainWindow):
             QMessageBox.warning(self, "Game not found", "Unable to locate the selected game in the database.")
             return
 
+        if self.install_scheduler.get(game_id):
+            QMessageBox.information(self, "Uninstall", "Cancel the queued installation first.")
+            return
+
         reply = QMessageBox.question(
             self,
             "Uninstall Game",
@@ -1016,8 +1300,9 @@ class LauncherApp(QMainWindow):
 
         result = self.installer.uninstall_game(game_id)
 
-        # Refresh installer to check actual package status
-        self.installer = GameInstaller()
+        # Re-check actual package status, unless installs are still using the installer
+        if not self.install_scheduler.is_busy():
+            self.installer.reload()
 
         # Refresh UI
         self.refresh_game_list()
@@ -1046,6 +1331,57 @@ class LauncherApp(QMainWindow):
         else:
             QMessageBox.critical(self, "Launch failed", "Unable to launch the game. Verify installation and configuration.")
 
+    def handle_proton_pin_request(self, game_id: str, build: str):
+        """Pin the game to a Proton build ("" follows the newest local build)."""
+        game_data = get_game_by_id(game_id)
+        if not self.installer.set_proton_pin(game_id, build or None):
+            QMessageBox.warning(self, "Proton", "Could not change the Proton build for this game.")
+            return
+        name = game_data['name'] if game_data else game_id
+        self.statusBar().showMessage(f"{name} will launch with {build or 'the newest installed Proton build'}", 10000)
+
+    def _show_session_summary(self, game_id: str):
+        """Show live figures if the game runs, else how its last session ended."""
+        session = self.installer.supervisor.session(game_id)
+        if session:
+            sample = session.last_sample
+            details = f" — {sample.describe()}" if sample else ""
+            self.detail_panel.show_session(f"Running for {format_duration(session.duration)}{details}")
+            return
+        history = self.installer.supervisor.history(game_id)
+        if not history:
+            self.detail_panel.show_session(None)
+            return
+        last = history[-1]
+        status = "exited normally" if last['returncode'] == 0 else f"exited with status {last['returncode']}"
+        self.detail_panel.show_session(
+            f"Last session: {format_duration(last['duration'])}, {status}, "
+            f"peak RSS {last['peak_rss'] / (1024 ** 3):.2f} GiB, {last['cpu_seconds']:.0f} CPU seconds"
+        )
+
+    def on_game_sample(self, game_id: str, sample):
+        if self.detail_panel.current_game_id == game_id:
+            self._show_session_summary(game_id)
+
+    def on_launch_timed(self, game_id: str, record: dict):
+        if self.detail_panel.current_game_id == game_id:
+            self.detail_panel.show_launch_times(self.installer.launch_timings.summary(game_id))
+
+    def on_frames_summarised(self, game_id: str, record: dict):
+        if self.detail_panel.current_game_id == game_id:
+            self.detail_panel.show_frame_stats(self.installer.frame_telemetry.compare(game_id))
+
+    def on_game_exited(self, game_id: str, session):
+        game_data = self.games_db.get(game_id, {})
+        name = game_data.get('name', game_id)
+        if session.crashed:
+            self.statusBar().showMessage(f"{name} exited with status {session.returncode} "
+                                         f"after {format_duration(session.duration)}", 15000)
+        else:
+            self.statusBar().showMessage(f"{name} closed after {format_duration(session.duration)}", 10000)
+        if self.detail_panel.current_game_id == game_id:
+            self._show_session_summary(game_id)
+
     def handle_open_site_request(self, game_id: str):
         """Open the game's website in the default browser."""
         game_data = get_game_by_id(game_id)
@@ -1094,8 +1430,38 @@ class LauncherApp(QMainWindow):
             status = "✓ OK" if installed else "✗ Missing"
             summary_lines.append(f"{dep}: {status}")
 
+        summary_lines += ["", "Detected tools:"] + describe(self.installer.probe.snapshot())
+        isolation = self.installer.isolation.status()
+        summary_lines.append(f"Background work: {isolation['mode']} ({isolation['background']})")
         QMessageBox.information(self, "Dependency Check", "\n".join(summary_lines))
 
+    def dedup_game_files(self):
+        """Share identical client files between installs in the background."""
+        if self.dedup_thread and self.dedup_thread.isRunning():
+            QMessageBox.information(self, "Deduplicate", "Deduplication is already running.")
+            return
+        if self.install_scheduler.is_busy():
+            QMessageBox.information(self, "Deduplicate", "Wait for the queued installations to finish.")
+            return
+
+        self.statusBar().showMessage("Deduplicating game files...")
+        self.dedup_thread = DedupThread(self.installer)
+        self.dedup_thread.progress.connect(self.statusBar().showMessage)
+        self.dedup_thread.finished.connect(self.on_dedup_finished)
+        self.dedup_thread.start()
+
+    def on_dedup_finished(self, summary: str):
+        self.statusBar().showMessage(summary, 10000)
+        QMessageBox.information(self, "Deduplicate", summary)
+
+    def build_prefix_templates(self):
+        """Pre-build Wine prefix templates for the catalog at idle priority."""
+        thread = self.installer.prebuild_prefix_templates()
+        if thread is None:
+            QMessageBox.information(self, "Prefix Templates", "All prefix templates are already built or queued.")
+        else:
+            self.statusBar().showMessage("Building Wine prefix templates in the background...", 10000)
+
     def view_logs(self):
         """View launcher log file contents."""
         if LOG_FILE.exists():
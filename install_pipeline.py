@@ -0,0 +1,259 @@
+"""
+Install pipeline module
+Runs an install as named stages whose completion, artefacts and timings are
+checkpointed per game, so an interrupted install resumes at the first stage
+that has not finished
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Any, Tuple
+
+# Constants
+STAGES = ("resolve", "download", "verify", "extract", "prefix", "redistributables", "register")
+STATE_VERSION = 1
+
+STATUS_DONE = "done"
+STATUS_SKIPPED = "skipped"
+STATUS_FAILED = "failed"
+STATUS_CANCELLED = "cancelled"
+STATUS_RUNNING = "running"
+
+logger = logging.getLogger("game_installer.pipeline")
+
+
+class InstallCheckpoint:
+    """
+    Per-game JSON record of finished stages, their artefacts and durations.
+
+    The record is discarded when the install inputs (its fingerprint) change,
+    e.g. when a game's download URL is updated.
+    """
+
+    def __init__(self, state_file: Path, fingerprint: Optional[Dict[str, Any]] = None):
+        self.state_file = Path(state_file)
+        self.fingerprint = fingerprint or {}
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.values: Dict[str, Any] = {}
+
+        data = read_checkpoint(self.state_file)
+        if data.get('version') == STATE_VERSION and data.get('fingerprint') == self.fingerprint:
+            self.stages = data.get('stages', {})
+            self.values = data.get('values', {})
+        elif data:
+            logger.info(f"Install inputs changed, discarding checkpoint {self.state_file}")
+
+    def save(self):
+        """Write the checkpoint atomically"""
+        self.state_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{self.state_file.name}.", dir=self.state_file.parent)
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'version': STATE_VERSION,
+                    'fingerprint': self.fingerprint,
+                    'stages': self.stages,
+                    'values': self.values,
+                }, f, indent=2)
+            os.replace(tmp_path, self.state_file)
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def read_checkpoint(state_file: Path) -> Dict[str, Any]:
+    """Load a checkpoint file, returning an empty dict if it is missing or unreadable"""
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"Ignoring unreadable install checkpoint {state_file}: {e}")
+        return {}
+
+
+def stage_timings(state_file: Path) -> List[Tuple[str, str, float]]:
+    """
+    Read the recorded stage statuses and durations of an install.
+
+    Returns:
+        List of (stage, status, seconds) in pipeline order
+    """
+    stages = read_checkpoint(state_file).get('stages', {})
+    ordered = [name for name in STAGES if name in stages]
+    ordered += [name for name in stages if name not in STAGES]
+    return [(name, stages[name].get('status', ''), stages[name].get('duration', 0.0)) for name in ordered]
+
+
+def _describe_artefact(path: Path) -> Dict[str, Any]:
+    st = path.stat()
+    if path.is_dir():
+        return {'path': str(path), 'kind': 'dir'}
+    return {'path': str(path), 'kind': 'file', 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+
+def _artefact_is_valid(artefact: Dict[str, Any]) -> bool:
+    if artefact.get('consumed'):
+        return True
+    path = Path(artefact['path'])
+    if artefact.get('kind') == 'dir':
+        return path.is_dir()
+    try:
+        st = path.stat()
+    except OSError:
+        return False
+    return st.st_size == artefact.get('size') and st.st_mtime_ns == artefact.get('mtime_ns')
+
+
+class InstallPipeline:
+    """
+    Runs a sequence of install stages with a persistent checkpoint.
+
+    A stage is a ``(name, func)`` or ``(name, func, is_current)`` tuple.
+    ``func(pipeline)`` returns True on success and False to stop the
+    install; it may register output paths with :meth:`artefact` and share
+    small values with later stages (and later runs) through ``values``.
+    A finished stage is skipped on the next run as long as its artefacts
+    are unchanged and the optional ``is_current(pipeline)`` check passes;
+    once any stage runs again, every stage after it runs again too.
+    """
+
+    def __init__(self, game_id: str, state_file: Path, fingerprint: Optional[Dict[str, Any]] = None,
+                 progress_callback: Callable = None, stage_callback: Callable = None,
+                 cancel_event: Optional[threading.Event] = None):
+        """
+        Args:
+            game_id: Game being installed, used for logging
+            state_file: Checkpoint file for this game
+            fingerprint: Install inputs; a different fingerprint starts over
+            progress_callback: Optional callback for progress messages
+            stage_callback: Optional callback(stage, status, seconds)
+            cancel_event: Optional event that stops the pipeline between stages
+        """
+        self.game_id = game_id
+        self.checkpoint = InstallCheckpoint(state_file, fingerprint)
+        self.progress_callback = progress_callback
+        self.stage_callback = stage_callback
+        self.cancel_event = cancel_event
+        self._current: Optional[str] = None
+        self._pending_discards: List[Path] = []
+
+    @property
+    def values(self) -> Dict[str, Any]:
+        return self.checkpoint.values
+
+    def artefact(self, path: Path):
+        """Record a file or directory produced by the running stage"""
+        record = self.checkpoint.stages[self._current]
+        record.setdefault('artefacts', []).append(_describe_artefact(Path(path)))
+
+    def discard(self, path: Path):
+        """
+        Delete an earlier stage's artefact once the running stage has been
+        checkpointed, e.g. a downloaded archive after extraction.
+        """
+        self._pending_discards.append(Path(path))
+
+    def _report(self, name: str, status: str, duration: float):
+        if self.stage_callback:
+            self.stage_callback(name, status, duration)
+
+    def _is_finished(self, stage: tuple) -> bool:
+        record = self.checkpoint.stages.get(stage[0])
+        if not record or record.get('status') != STATUS_DONE:
+            return False
+        if not all(_artefact_is_valid(a) for a in record.get('artefacts', [])):
+            logger.info(f"{self.game_id}: outputs of stage {stage[0]} changed, running it again")
+            return False
+        return len(stage) < 3 or stage[2](self)
+
+    def _apply_discards(self):
+        for path in self._pending_discards:
+            try:
+                path.unlink(missing_ok=True)
+            except OSError as e:
+                logger.warning(f"Could not remove {path}: {e}")
+            for record in self.checkpoint.stages.values():
+                for artefact in record.get('artefacts', []):
+                    if artefact['path'] == str(path):
+                        artefact['consumed'] = True
+        self._pending_discards = []
+
+    def run(self, stages: List[tuple]) -> bool:
+        """
+        Run the stages in order, skipping those already finished.
+
+        Returns:
+            True if every stage finished, False if one failed or the run was cancelled
+
+        Raises:
+            Whatever a stage raises; the stage is checkpointed as failed first
+        """
+        resuming = True
+        for stage in stages:
+            name, func = stage[0], stage[1]
+            if resuming and self._is_finished(stage):
+                duration = self.checkpoint.stages[name].get('duration', 0.0)
+                logger.info(f"{self.game_id}: stage {name} already done, skipping")
+                self._report(name, STATUS_SKIPPED, duration)
+                continue
+
+            if resuming:
+                # Everything from here on depends on this stage's fresh output
+                for later in stages[stages.index(stage):]:
+                    self.checkpoint.stages.pop(later[0], None)
+                resuming = False
+
+            if self.cancel_event is not None and self.cancel_event.is_set():
+                self._finish(name, STATUS_CANCELLED, 0.0)
+                return False
+
+            self._current = name
+            self.checkpoint.stages[name] = {'status': STATUS_RUNNING}
+            self._report(name, STATUS_RUNNING, 0.0)
+            started = time.monotonic()
+            try:
+                ok = func(self)
+            except BaseException as e:
+                self._pending_discards = []
+                self._finish(name, self._failure_status(), time.monotonic() - started, str(e))
+                raise
+            duration = time.monotonic() - started
+
+            if not ok:
+                self._pending_discards = []
+                self._finish(name, self._failure_status(), duration)
+                return False
+
+            self._finish(name, STATUS_DONE, duration)
+            if self._pending_discards:
+                self._apply_discards()
+                self.checkpoint.save()
+            if self.progress_callback:
+                self.progress_callback(f"Stage {name} finished in {duration:.1f}s")
+
+        self._current = None
+        return True
+
+    def _failure_status(self) -> str:
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            return STATUS_CANCELLED
+        return STATUS_FAILED
+
+    def _finish(self, name: str, status: str, duration: float, error: Optional[str] = None):
+        record = self.checkpoint.stages.setdefault(name, {})
+        record.update({'status': status, 'duration': round(duration, 3), 'finished_at': time.time()})
+        if error:
+            record['error'] = error
+        try:
+            self.checkpoint.save()
+        except OSError as e:
+            logger.warning(f"Could not save install checkpoint for {self.game_id}: {e}")
+        logger.info(f"{self.game_id}: stage {name} {status} after {duration:.1f}s")
+        self._report(name, status, duration)
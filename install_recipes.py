@@ -0,0 +1,181 @@
+"""
+Install recipes
+Declarative install steps for games whose clients need more than a single
+download, referenced from games_db with "install_script": "recipe:<name>"
+and executed by recipe_engine.
+
+Step parameters may use $game_dir, $home, $work (scratch space removed
+after a successful run), $cache, $prefix_dir, $umu and $proton (the umu
+command and PROTONPATH the installer resolved) and the output of any
+earlier step as $<step id>; referring to a step makes it a dependency, so steps
+that do not depend on each other run at the same time.
+"""
+
+from typing import Optional, Dict, Any
+
+RECIPE_PREFIX = "recipe:"
+
+TITANIUM_DISCS = ["EQ_TITANIUM_CD1", "EQ_TITANIUM_CD2", "EQ_TITANIUM_CD3", "EQ_TITANIUM_CD4", "EQ_TITANIUM_CD5"]
+
+RECIPES: Dict[str, Dict[str, Any]] = {
+    "everquest-p1999": {
+        "description": "EverQuest Titanium from its CD images, patched for Project 1999",
+        "steps": [
+            {
+                "id": "titanium",
+                "action": "fetch",
+                "search": ["EverQuest_Titanium.zip", "EverQuest Titanium.zip", "EverQuest-Titanium.zip",
+                           "EQ_Titanium.zip", "EverQuest.zip"],
+                "url": "https://archive.org/download/EverQuestTitanium/EverQuest%20Titanium.zip",
+                "name": "EverQuest_Titanium.zip",
+                "skip_if": "$prefix_dir/drive_c/EverQuest",
+            },
+            {
+                "id": "p99_patch",
+                "action": "fetch",
+                "search": ["P99Files*.zip", "Project1999Files*.zip"],
+                "latest": {
+                    "urls": [
+                        "https://www.project1999.com/files/P99FilesV$$version.zip",
+                        "https://www.project1999.com/files/P99Filesv$$version.zip",
+                        "https://www.project1999.com/files/Project1999FilesV$$version.zip",
+                        "https://www.project1999.com/files/Project1999Filesv$$version.zip",
+                    ],
+                    "versions": [120, 40],
+                },
+                "help": "Download the latest P99Files zip from "
+                        "https://www.project1999.com/forums/forumdisplay.php?f=11",
+            },
+            {"id": "prefix", "action": "prefix"},
+            {
+                "id": "cds",
+                "action": "extract_isos",
+                "archive": "$titanium",
+                "pattern": "EQ_TITANIUM_CD*.iso",
+                "dest": "$work/cds",
+                "expect": TITANIUM_DISCS,
+                "when": "titanium",
+            },
+            {
+                "id": "drives",
+                "action": "map_drives",
+                "prefix": "$prefix",
+                "drives": {letter: f"$cds/{disc}" for letter, disc in zip("defgh", TITANIUM_DISCS)},
+                "when": "cds",
+            },
+            {
+                "id": "titanium_setup",
+                "action": "run",
+                "exe": "$cds/EQ_TITANIUM_CD1/setup.exe",
+                "prefix": "$prefix",
+                "message": "Install EverQuest to exactly C:\\EverQuest (not Program Files). "
+                           "Discs 1-5 are drives D: to H:.",
+                "needs": ["drives"],
+                "when": "cds",
+            },
+            {
+                "id": "eq_dir",
+                "action": "first_existing",
+                "paths": ["$prefix/drive_c/EverQuest", "$prefix/drive_c/Program Files/EverQuest",
+                          "$prefix/drive_c/Program Files (x86)/EverQuest"],
+                "needs": ["titanium_setup"],
+            },
+            {"id": "patched", "action": "patch", "archive": "$p99_patch", "dest": "$eq_dir"},
+            {
+                "id": "live_files",
+                "action": "remove",
+                "root": "$eq_dir",
+                "files": ["arena.eqg", "arena_EnvironmentEmitters.txt", "lavastorm.eqg", "nektulos.eqg",
+                          "Nektulos_EnvironmentEmitters.txt"],
+                "needs": ["patched"],
+            },
+            {
+                "id": "casing",
+                "action": "rename",
+                "root": "$eq_dir",
+                "files": {"dsetup.dll": "DSETUP.dll"},
+                "needs": ["patched"],
+            },
+            {"id": "eqgame", "action": "find_executable", "root": "$eq_dir", "names": ["eqgame.exe"],
+             "needs": ["patched"]},
+            {
+                "id": "launch_bat",
+                "action": "write_file",
+                "path": "$eq_dir/Launch Titanium.bat",
+                "content": "@echo off\r\ncd /d \"%~dp0\"\r\nstart \"\" \"eqgame.exe\" patchme\r\n",
+                "needs": ["eqgame", "live_files", "casing"],
+            },
+        ],
+        "register": {"path": "$eq_dir", "client_exe": "$launch_bat", "prefix": "$prefix"},
+    },
+
+    "everquest-quarm": {
+        "description": "TAKP client with the Quarm patcher",
+        "steps": [
+            {
+                "id": "client",
+                "action": "fetch",
+                "search": ["quarm_client*.zip", "TAKP*.zip"],
+                "url": "https://drive.usercontent.google.com/download?id=1qoBktDeJMJKPBr-EZxub1vspJhz11i1y"
+                       "&export=download&authuser=0&confirm=t",
+                "name": "quarm_client.zip",
+                "help": "Download the TAKP client from "
+                        "https://drive.google.com/file/d/1qoBktDeJMJKPBr-EZxub1vspJhz11i1y/view",
+            },
+            {"id": "patcher", "action": "fetch", "search": ["QuarmPatcher*.zip"], "optional": True},
+            {"id": "prefix", "action": "prefix"},
+            {"id": "client_files", "action": "extract", "archive": "$client", "dest": "$game_dir",
+             "hoist": "eqgame.exe"},
+            {"id": "patcher_files", "action": "extract", "archive": "$patcher", "dest": "$game_dir",
+             "when": "patcher", "needs": ["client_files"]},
+            {
+                "id": "patcher_launcher",
+                "action": "write_file",
+                "path": "$game_dir/launch_patcher.sh",
+                "content": "#!/bin/bash\ncd \"$$(dirname \"$$0\")\"\n"
+                           "WINEPREFIX=\"$prefix\" PROTONPATH=\"$${PROTONPATH:-$proton}\" exec $umu eqemupatcher.exe\n",
+                "executable": True,
+                "needs": ["client_files"],
+            },
+            {"id": "eqgame", "action": "find_executable", "root": "$game_dir", "names": ["eqgame.exe"],
+             "needs": ["client_files"]},
+            {"id": "patcher_missing", "action": "notice", "skip_if": "$game_dir/eqemupatcher.exe",
+             "message": "QuarmPatcher.zip not found; get it from #server-files on the Project Quarm "
+                        "Discord and extract it into $game_dir",
+             "needs": ["patcher_files"]},
+        ],
+        "register": {"path": "$game_dir", "client_exe": "$eqgame", "prefix": "$prefix"},
+    },
+
+    "knight-myko": {
+        "description": "Knight Online MyKO client from the user's Downloads folder",
+        "steps": [
+            {
+                "id": "client",
+                "action": "fetch",
+                "search": ["Client_KOMYKO.zip", "client_myko.zip", "Client_KOMYKO.rar", "Client_KOMYKO.7z",
+                           "Client_KOMYKO.exe", "client_myko.exe",
+                           "*myko*.zip", "*myko*.rar", "*myko*.7z", "*myko*.exe",
+                           "*knight*.zip", "*knight*.rar", "*knight*.7z", "*knight*.exe",
+                           "client_ko*.zip", "client_ko*.rar", "client_ko*.7z", "client_ko*.exe"],
+                "exclude": ["silkroad|origin|genesis|seal|legend|zenger|phoenix"],
+                "help": "Download the client from https://ko-myko.com/downloads and save it to your "
+                        "Downloads folder",
+                "skip_if": "$game_dir/Client_KOMYKO.exe",
+            },
+            {"id": "prefix", "action": "prefix"},
+            {"id": "client_files", "action": "extract", "archive": "$client", "dest": "$game_dir",
+             "copy_other": True, "when": "client"},
+            {"id": "client_exe", "action": "find_executable", "root": "$game_dir",
+             "names": ["Client_KOMYKO.exe", "KnightOnLine.exe"], "needs": ["client_files"]},
+        ],
+        "register": {"path": "$game_dir", "client_exe": "$client_exe", "prefix": "$prefix"},
+    },
+}
+
+
+def get_recipe(install_script: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Return the recipe an install_script entry refers to, or None if it is a shell script"""
+    if not install_script or not install_script.startswith(RECIPE_PREFIX):
+        return None
+    return RECIPES.get(install_script[len(RECIPE_PREFIX):])
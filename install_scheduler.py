@@ -0,0 +1,253 @@
+"""
+Install scheduler module
+Runs several game installs at once, limited per resource class (network,
+disk, CPU, interactive windows) so that installs which compete for the
+same thing queue up while the rest proceed
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Optional, Callable, Dict, List, Iterable
+
+# Constants
+RESOURCE_NETWORK = "network"
+RESOURCE_DISK = "disk"
+RESOURCE_CPU = "cpu"
+RESOURCE_INTERACTIVE = "interactive"
+
+# How many installs may hold each resource class at the same time. Only one
+# install may open a terminal or installer window, so prompts never overlap.
+DEFAULT_LIMITS = {
+    RESOURCE_NETWORK: 3,
+    RESOURCE_DISK: 2,
+    RESOURCE_CPU: max(1, (os.cpu_count() or 2) // 2),
+    RESOURCE_INTERACTIVE: 1,
+}
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_DONE = "done"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+MAX_JOB_MESSAGES = 500
+
+logger = logging.getLogger("game_installer.scheduler")
+
+
+class InstallJob:
+    """One queued or running install"""
+
+    def __init__(self, game_id: str, game_data: dict, resources: Iterable[str]):
+        self.game_id = game_id
+        self.game_data = game_data
+        self.resources = frozenset(resources)
+        self.state = JOB_QUEUED
+        self.cancel_event = threading.Event()
+        self.messages: List[str] = []
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def name(self) -> str:
+        return self.game_data.get('name', self.game_id)
+
+    @property
+    def last_message(self) -> str:
+        return self.messages[-1] if self.messages else ""
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (JOB_DONE, JOB_FAILED, JOB_CANCELLED)
+
+    def __repr__(self) -> str:
+        return f"InstallJob({self.game_id!r}, {self.state})"
+
+
+class InstallScheduler:
+    """
+    Queue of installs started as soon as their resource classes have room.
+
+    Jobs are considered in queue order, but a job that has to wait does not
+    hold back later jobs that need different resources. Callbacks are
+    invoked from worker threads.
+    """
+
+    def __init__(self, run_job: Callable[[InstallJob], bool], limits: Optional[Dict[str, int]] = None,
+                 progress_callback: Callable = None, stage_callback: Callable = None,
+                 finished_callback: Callable = None, changed_callback: Callable = None):
+        """
+        Args:
+            run_job: Called in a worker thread to install a job; returns success
+            limits: Concurrent jobs allowed per resource class
+            progress_callback: Optional callback(game_id, message)
+            stage_callback: Optional callback(game_id, stage, status, seconds)
+            finished_callback: Optional callback(game_id, state) with JOB_DONE, JOB_FAILED or JOB_CANCELLED
+            changed_callback: Optional callback() when jobs are added, started, moved or finish
+        """
+        self.run_job = run_job
+        self.limits = dict(DEFAULT_LIMITS, **(limits or {}))
+        self.progress_callback = progress_callback
+        self.stage_callback = stage_callback
+        self.finished_callback = finished_callback
+        self.changed_callback = changed_callback
+        self._jobs: List[InstallJob] = []
+        self._in_use: Dict[str, int] = {}
+        self._workers: List[threading.Thread] = []
+        self._lock = threading.Lock()
+
+    def jobs(self) -> List[InstallJob]:
+        """Unfinished jobs in queue order, running ones first"""
+        with self._lock:
+            return sorted(self._jobs, key=lambda job: job.state != JOB_RUNNING)
+
+    def get(self, game_id: str) -> Optional[InstallJob]:
+        with self._lock:
+            return next((job for job in self._jobs if job.game_id == game_id), None)
+
+    def is_busy(self) -> bool:
+        with self._lock:
+            return bool(self._jobs)
+
+    def submit(self, game_id: str, game_data: dict, resources: Iterable[str]) -> Optional[InstallJob]:
+        """
+        Queue an install.
+
+        Returns:
+            The new job, or None if the game is already queued or installing
+        """
+        with self._lock:
+            if any(job.game_id == game_id for job in self._jobs):
+                return None
+            job = InstallJob(game_id, game_data, resources)
+            unknown = job.resources - set(self.limits)
+            if unknown:
+                raise ValueError(f"Unknown resource class: {', '.join(sorted(unknown))}")
+            self._jobs.append(job)
+        logger.info(f"Queued {game_id} (needs {', '.join(sorted(job.resources)) or 'nothing'})")
+        self._dispatch()
+        self._changed()
+        return job
+
+    def move(self, game_id: str, offset: int) -> bool:
+        """Move a queued job earlier (negative offset) or later in the queue"""
+        with self._lock:
+            queued = [job for job in self._jobs if job.state == JOB_QUEUED]
+            job = next((j for j in queued if j.game_id == game_id), None)
+            if job is None:
+                return False
+            target = max(0, min(len(queued) - 1, queued.index(job) + offset))
+            if queued[target] is job:
+                return False
+            queued.remove(job)
+            queued.insert(target, job)
+            self._jobs = [j for j in self._jobs if j.state != JOB_QUEUED] + queued
+        self._changed()
+        return True
+
+    def cancel(self, game_id: str) -> bool:
+        """Drop a queued job, or ask a running one to stop"""
+        with self._lock:
+            job = next((j for j in self._jobs if j.game_id == game_id), None)
+            if job is None:
+                return False
+            job.cancel_event.set()
+            dequeued = job.state == JOB_QUEUED
+            if dequeued:
+                job.state = JOB_CANCELLED
+                self._jobs.remove(job)
+        logger.info(f"Cancel requested for {game_id}")
+        if dequeued:
+            if self.finished_callback:
+                self.finished_callback(game_id, JOB_CANCELLED)
+            self._changed()
+        return True
+
+    def cancel_all(self):
+        for job in self.jobs():
+            self.cancel(job.game_id)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every job has finished.
+
+        Returns:
+            False if jobs are still queued or running after the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._workers = [t for t in self._workers if t.is_alive()]
+                workers = list(self._workers)
+            if not workers:
+                return not self.is_busy()
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            workers[0].join(remaining)
+
+    def _fits(self, job: InstallJob) -> bool:
+        return all(self._in_use.get(r, 0) < self.limits[r] for r in job.resources)
+
+    def _dispatch(self):
+        with self._lock:
+            for job in self._jobs:
+                if job.state == JOB_QUEUED and self._fits(job):
+                    for r in job.resources:
+                        self._in_use[r] = self._in_use.get(r, 0) + 1
+                    job.state = JOB_RUNNING
+                    job.thread = threading.Thread(target=self._run, args=(job,),
+                                                  name=f"install-{job.game_id}", daemon=True)
+                    # Started under the lock so wait() never sees an unstarted worker
+                    job.thread.start()
+                    self._workers.append(job.thread)
+                    logger.info(f"Starting install of {job.game_id}")
+
+    def _run(self, job: InstallJob):
+        success = False
+        try:
+            success = bool(self.run_job(job))
+        except Exception as e:
+            logger.error(f"Install of {job.game_id} crashed: {e}")
+            self._progress(job, f"Installation error: {e}")
+        finally:
+            with self._lock:
+                for r in job.resources:
+                    self._in_use[r] -= 1
+                if job.cancel_event.is_set() and not success:
+                    job.state = JOB_CANCELLED
+                else:
+                    job.state = JOB_DONE if success else JOB_FAILED
+                self._jobs.remove(job)
+            logger.info(f"Install of {job.game_id} {job.state}")
+            if self.finished_callback:
+                self.finished_callback(job.game_id, job.state)
+            self._dispatch()
+            self._changed()
+
+    def _progress(self, job: InstallJob, message: str):
+        job.messages.append(message)
+        del job.messages[:-MAX_JOB_MESSAGES]
+        if self.progress_callback:
+            self.progress_callback(job.game_id, message)
+
+    def job_callbacks(self, job: InstallJob):
+        """
+        Progress and stage callbacks for ``run_job`` to hand to the installer.
+
+        Returns:
+            Tuple of (progress_callback(message), stage_callback(stage, status, seconds))
+        """
+        def progress(message: str):
+            self._progress(job, message)
+
+        def stage(name: str, status: str, seconds: float):
+            if self.stage_callback:
+                self.stage_callback(job.game_id, name, status, seconds)
+
+        return progress, stage
+
+    def _changed(self):
+        if self.changed_callback:
+            self.changed_callback()
@@ -12,6 +12,8 @@ echo ""
 # Configuration
 GAME_DIR="$HOME/Games/silkroad-origin"
 PREFIX="$HOME/Games/umu/silkroad/origin"
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+PREFIX_TEMPLATES="$SCRIPT_DIR/prefix_templates.py"
 SEARCH_DIRS=("$HOME" "$HOME/Downloads")
 
 # Colors
@@ -172,17 +174,24 @@ echo -e "${GREEN}[4/5]${NC} Installing Wine dependencies..."
 echo "This may take a few minutes..."
 WINETRICKS="d3dx9 vcrun2008 corefonts liberation"
 
-# Initialize Wine prefix
-echo "Initializing Wine prefix..."
-WINEPREFIX="$PREFIX" PROTONPATH="GE-Proton" umu-run "" || true
-sleep 2
-
-# Install dependencies
-echo "Installing DirectX, Visual C++ runtime, and fonts..."
-WINEPREFIX="$PREFIX" PROTONPATH="GE-Proton" umu-run winetricks -q $WINETRICKS || {
-    echo -e "${YELLOW}Warning:${NC} Some dependencies may have failed to install."
-    echo "Continuing anyway..."
-}
+# Clone a pre-built prefix template when one matches; building it
+# once makes every later install take seconds instead of minutes
+if [ ! -d "$PREFIX/drive_c" ] && [ -f "$PREFIX_TEMPLATES" ] && \
+   python3 "$PREFIX_TEMPLATES" clone --game "silkroad-origin" --verbs "$WINETRICKS" --dest "$PREFIX"; then
+    echo "Wine prefix cloned from template."
+else
+    # Initialize Wine prefix
+    echo "Initializing Wine prefix..."
+    WINEPREFIX="$PREFIX" PROTONPATH="GE-Proton" umu-run "" || true
+    sleep 2
+
+    # Install dependencies
+    echo "Installing DirectX, Visual C++ runtime, and fonts..."
+    WINEPREFIX="$PREFIX" PROTONPATH="GE-Proton" umu-run winetricks -q $WINETRICKS || {
+        echo -e "${YELLOW}Warning:${NC} Some dependencies may have failed to install."
+        echo "Continuing anyway..."
+    }
+fi
 
 echo -e "${GREEN}✓${NC} Dependencies installed"
 
@@ -0,0 +1,196 @@
+"""
+Installer unpacker module
+Recognises common Windows installer formats and extracts their payload
+natively instead of running the installer under Wine
+"""
+
+import logging
+import shutil
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Callable, List
+
+from archive_extractor import extract_archive, merge_tree, ExtractionError
+
+# Constants
+SCAN_LIMIT = 16 * 1024 * 1024
+SCAN_CHUNK_SIZE = 1024 * 1024
+PE_MAGIC = b"MZ"
+
+# Ordered by specificity: installer stubs are checked before the generic
+# archive signatures that may also appear inside their payload.
+INSTALLER_SIGNATURES = [
+    (b"Inno Setup Setup Data", 'inno'),
+    (b"rDlPtS\xcd\xe6\xd7\x7b\x0b\x2a", 'inno'),
+    (b"\xef\xbe\xad\xdeNullsoftInst", 'nsis'),
+    (b"ISc(", 'installshield'),
+    (b"7z\xbc\xaf\x27\x1c", '7z-sfx'),
+    (b"MSCF\x00\x00\x00\x00", 'cab'),
+]
+
+# Archive backend used for each installer format
+UNPACK_BACKENDS = {
+    'inno': 'inno',
+    'nsis': '7z',
+    'installshield': 'installshield',
+    '7z-sfx': '7z',
+    'cab': '7z',
+    'zip-sfx': 'zip',
+}
+
+# InstallShield setups ship their payload as data1.cab next to setup.exe
+INSTALLSHIELD_CABINETS = ("data1.cab", "data1.hdr")
+
+logger = logging.getLogger("game_installer.unpack")
+
+
+def detect_installer_format(installer_path: Path) -> Optional[str]:
+    """
+    Identify the installer technology of a downloaded file.
+
+    Args:
+        installer_path: Downloaded installer or archive
+
+    Returns:
+        One of 'inno', 'nsis', 'installshield', '7z-sfx', 'cab', 'zip-sfx',
+        or None when the format is unknown
+    """
+    installer_path = Path(installer_path)
+    try:
+        with open(installer_path, 'rb') as handle:
+            head = handle.read(SCAN_CHUNK_SIZE)
+            if head.startswith(b"ISc("):
+                return 'installshield'
+            if head.startswith(b"MSCF"):
+                return 'cab'
+            if not head.startswith(PE_MAGIC):
+                return None
+
+            # Scan the stub and the start of the overlay; signatures may
+            # straddle chunk boundaries so keep a small tail between reads.
+            overlap = max(len(sig) for sig, _ in INSTALLER_SIGNATURES)
+            window = head
+            scanned = len(head)
+            found = {}
+            while True:
+                for signature, fmt in INSTALLER_SIGNATURES:
+                    if fmt not in found:
+                        position = window.find(signature, 2)
+                        if position != -1:
+                            found[fmt] = scanned - len(window) + position
+                if scanned >= SCAN_LIMIT:
+                    break
+                chunk = handle.read(SCAN_CHUNK_SIZE)
+                if not chunk:
+                    break
+                window = window[-overlap:] + chunk
+                scanned += len(chunk)
+    except OSError as e:
+        logger.error(f"Cannot inspect installer {installer_path}: {e}")
+        return None
+
+    for _, fmt in INSTALLER_SIGNATURES:
+        if fmt in found:
+            return fmt
+    if zipfile.is_zipfile(installer_path):
+        return 'zip-sfx'
+    return None
+
+
+def find_executable(root: Path, executable: str) -> Optional[Path]:
+    """Locate an executable by name (case-insensitive) below root, shallowest first"""
+    wanted = Path(executable).name.lower()
+    matches = [p for p in Path(root).rglob('*') if p.is_file() and p.name.lower() == wanted]
+    if not matches:
+        return None
+    return min(matches, key=lambda p: (len(p.relative_to(root).parts), str(p)))
+
+
+def _nested_cabinets(root: Path) -> List[Path]:
+    """Find InstallShield cabinet sets left behind by an outer self-extractor"""
+    cabinets = []
+    for candidate in Path(root).rglob('*'):
+        if candidate.is_file() and candidate.name.lower() in INSTALLSHIELD_CABINETS:
+            # unshield resolves data1.hdr and the numbered volumes itself
+            if candidate.name.lower() == "data1.hdr" or not (candidate.parent / "data1.hdr").exists():
+                cabinets.append(candidate)
+    return cabinets
+
+
+def unpack_installer(installer_path: Path, dest_dir: Path, progress_callback: Callable = None,
+                     cancel_event: Optional[threading.Event] = None,
+                     threads: Optional[int] = None, executable: Optional[str] = None,
+                     which: Optional[Callable[[str], Optional[str]]] = None) -> Optional[str]:
+    """
+    Extract an installer's payload into dest_dir without running it.
+
+    InstallShield cabinet sets found inside an outer self-extractor are
+    unpacked afterwards, concurrently when there are several. The payload is
+    unpacked into a hidden staging directory and only merged into dest_dir
+    once it is complete, so the installer can still be run in a clean
+    directory when unpacking fails.
+
+    Args:
+        installer_path: Downloaded installer
+        dest_dir: Directory receiving the payload
+        progress_callback: Optional callback for progress messages
+        cancel_event: Optional event that cancels extraction when set
+        threads: Decoder threads for 7z-based formats
+        executable: Optional file name the payload must contain; when it is
+            missing, the payload is discarded
+
+    Returns:
+        The detected installer format, or None if the format is unknown or
+        the payload lacks the executable; nothing is extracted in that case
+
+    Raises:
+        ExtractionError: If the format was recognised but unpacking failed
+    """
+    fmt = detect_installer_format(installer_path)
+    if fmt is None:
+        logger.info(f"Unknown installer format: {installer_path}")
+        return None
+
+    if progress_callback:
+        progress_callback(f"Detected {fmt} installer, unpacking payload natively...")
+    logger.info(f"Unpacking {installer_path} as {fmt}")
+    Path(dest_dir).mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".unpacking-", dir=dest_dir))
+    try:
+        extract_archive(installer_path, staging, progress_callback, cancel_event,
+                        archive_format=UNPACK_BACKENDS[fmt], threads=threads, which=which)
+
+        cabinets = [] if fmt == 'installshield' else _nested_cabinets(staging)
+        if cabinets:
+            if progress_callback:
+                progress_callback(f"Unpacking {len(cabinets)} embedded InstallShield cabinet(s)...")
+
+            def unpack_cabinet(cabinet: Path):
+                extract_archive(cabinet, cabinet.parent, progress_callback, cancel_event,
+                                archive_format='installshield', which=which)
+
+            with ThreadPoolExecutor(max_workers=len(cabinets)) as pool:
+                # list() re-raises the first worker failure
+                list(pool.map(unpack_cabinet, cabinets))
+
+        if executable and find_executable(staging, executable) is None:
+            logger.warning(f"{executable} not found in unpacked {fmt} payload, discarding it")
+            return None
+        try:
+            merge_tree(staging, Path(dest_dir))
+        except OSError as e:
+            raise ExtractionError(f"Failed to move unpacked payload into {dest_dir}: {e}") from e
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return fmt
+
+
+__all__ = [
+    'detect_installer_format',
+    'find_executable',
+    'unpack_installer',
+    'ExtractionError',
+]
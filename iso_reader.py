@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+ISO9660 reader module
+Reads ISO9660/Joliet CD images in-process so installers can copy disc
+contents without loop-mounting, including ISOs stored inside a zip archive
+"""
+
+import argparse
+import fnmatch
+import heapq
+import logging
+import os
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Tuple
+
+# Constants
+SECTOR_SIZE = 2048
+VOLUME_DESCRIPTOR_START = 16
+COPY_CHUNK_SIZE = 1024 * 1024
+
+VD_PRIMARY = 1
+VD_SUPPLEMENTARY = 2
+VD_TERMINATOR = 255
+JOLIET_ESCAPES = (b"%/@", b"%/C", b"%/E")
+UDF_IDENTIFIERS = (b"NSR02", b"NSR03")
+
+FLAG_DIRECTORY = 0x02
+FLAG_MULTI_EXTENT = 0x80
+
+# Offset of the root directory record inside a volume descriptor
+ROOT_RECORD_OFFSET = 156
+
+logger = logging.getLogger("game_installer.iso")
+
+
+class IsoFormatError(Exception):
+    """Raised when an image is not a readable ISO9660 volume"""
+
+
+class IsoExtractionCancelled(Exception):
+    """Raised when extraction is stopped through the cancel event"""
+
+
+class IsoEntry:
+    """A file or directory inside an ISO image"""
+
+    def __init__(self, path: str, extent: int, size: int, is_dir: bool):
+        self.path = path
+        self.extent = extent
+        self.size = size
+        self.is_dir = is_dir
+
+    def __repr__(self) -> str:
+        kind = "dir" if self.is_dir else "file"
+        return f"IsoEntry({self.path!r}, {kind}, extent={self.extent}, size={self.size})"
+
+
+def _parse_record(data: bytes, offset: int) -> Tuple[int, int, int, int, bytes]:
+    """Return (record_length, extent, size, flags, raw_name) for a directory record"""
+    length = data[offset]
+    extent = struct.unpack_from("<I", data, offset + 2)[0]
+    size = struct.unpack_from("<I", data, offset + 10)[0]
+    flags = data[offset + 25]
+    name_length = data[offset + 32]
+    raw_name = data[offset + 33:offset + 33 + name_length]
+    return length, extent, size, flags, raw_name
+
+
+class IsoImage:
+    """
+    Read-only view of an ISO9660 image.
+
+    Works on any seekable binary file object, including members opened from
+    a zipfile. Files are read in extent order so compressed sources are
+    decoded front to back without rewinding.
+    """
+
+    def __init__(self, fileobj):
+        self.fileobj = fileobj
+        self.joliet = False
+        self._root: Optional[Tuple[int, int]] = None
+        self._read_volume_descriptors()
+
+    # --- Volume parsing --------------------------------------------------
+    def _read_sectors(self, sector: int, length: int) -> bytes:
+        self.fileobj.seek(sector * SECTOR_SIZE)
+        data = self.fileobj.read(length)
+        if len(data) != length:
+            raise IsoFormatError(f"Unexpected end of image at sector {sector}")
+        return data
+
+    def _read_volume_descriptors(self):
+        primary_root = None
+        joliet_root = None
+        udf_present = False
+        sector = VOLUME_DESCRIPTOR_START
+
+        while True:
+            try:
+                descriptor = self._read_sectors(sector, SECTOR_SIZE)
+            except IsoFormatError:
+                break
+            vd_type, identifier = descriptor[0], descriptor[1:6]
+            if identifier in UDF_IDENTIFIERS:
+                udf_present = True
+            elif identifier == b"CD001":
+                record = descriptor[ROOT_RECORD_OFFSET:ROOT_RECORD_OFFSET + 34]
+                _, extent, size, _, _ = _parse_record(record, 0)
+                if vd_type == VD_PRIMARY and primary_root is None:
+                    primary_root = (extent, size)
+                elif vd_type == VD_SUPPLEMENTARY and descriptor[88:91] in JOLIET_ESCAPES:
+                    joliet_root = (extent, size)
+                elif vd_type == VD_TERMINATOR:
+                    # UDF bridge discs place their NSR descriptor after the terminator
+                    sector += 1
+                    continue
+            elif primary_root is not None or udf_present or sector > VOLUME_DESCRIPTOR_START + 32:
+                break
+            sector += 1
+
+        if joliet_root:
+            self._root = joliet_root
+            self.joliet = True
+        elif primary_root:
+            self._root = primary_root
+        elif udf_present:
+            raise IsoFormatError("UDF-only images are not supported; no ISO9660 volume found")
+        else:
+            raise IsoFormatError("No ISO9660 primary volume descriptor found")
+
+    def _decode_name(self, raw_name: bytes) -> str:
+        if self.joliet:
+            name = raw_name.decode('utf-16-be', errors='replace')
+        else:
+            name = raw_name.decode('ascii', errors='replace')
+        name = name.split(';', 1)[0]
+        if name.endswith('.') and not self.joliet:
+            name = name[:-1]
+        return name
+
+    def _read_directory(self, extent: int, size: int) -> List[Tuple[str, int, int, bool]]:
+        data = self._read_sectors(extent, size)
+        records = []
+        offset = 0
+        while offset < size:
+            length = data[offset]
+            if length == 0:
+                # Records never span sectors; skip the padding to the next one
+                offset = (offset // SECTOR_SIZE + 1) * SECTOR_SIZE
+                continue
+            _, child_extent, child_size, flags, raw_name = _parse_record(data, offset)
+            offset += length
+            if raw_name in (b"\x00", b"\x01"):
+                continue
+            if flags & FLAG_MULTI_EXTENT:
+                raise IsoFormatError(f"Multi-extent files are not supported: {self._decode_name(raw_name)}")
+            records.append((self._decode_name(raw_name), child_extent, child_size, bool(flags & FLAG_DIRECTORY)))
+        return records
+
+    # --- Public API ------------------------------------------------------
+    def entries(self) -> List[IsoEntry]:
+        """Return every file and directory in the image, parents first"""
+        result: List[IsoEntry] = []
+        # Visit directories in extent order to keep reads moving forward
+        pending = [(self._root[0], self._root[1], "")]
+        visited = set()
+        while pending:
+            extent, size, prefix = heapq.heappop(pending)
+            if extent in visited:
+                continue
+            visited.add(extent)
+            for name, child_extent, child_size, is_dir in self._read_directory(extent, size):
+                path = f"{prefix}/{name}" if prefix else name
+                result.append(IsoEntry(path, child_extent, child_size, is_dir))
+                if is_dir:
+                    heapq.heappush(pending, (child_extent, child_size, path))
+        return result
+
+    def read_file(self, entry: IsoEntry, out, chunk_callback: Callable[[int], None] = None):
+        """Stream a file entry's contents to a writable binary file object"""
+        self.fileobj.seek(entry.extent * SECTOR_SIZE)
+        remaining = entry.size
+        while remaining > 0:
+            chunk = self.fileobj.read(min(remaining, COPY_CHUNK_SIZE))
+            if not chunk:
+                raise IsoFormatError(f"Unexpected end of image while reading {entry.path}")
+            out.write(chunk)
+            remaining -= len(chunk)
+            if chunk_callback:
+                chunk_callback(len(chunk))
+
+    def extract_all(self, dest_dir: Path, progress_callback: Callable[[int, int, int, int], None] = None,
+                    cancel_event: Optional[threading.Event] = None) -> int:
+        """
+        Extract the whole image below dest_dir.
+
+        Args:
+            dest_dir: Target directory
+            progress_callback: Optional callback receiving
+                (files_done, files_total, bytes_done, bytes_total)
+            cancel_event: Optional event that stops extraction when set
+
+        Returns:
+            int: Number of files written
+        """
+        dest_dir = Path(dest_dir)
+        root = dest_dir.resolve()
+        entries = self.entries()
+        files = sorted((e for e in entries if not e.is_dir), key=lambda e: e.extent)
+        bytes_total = sum(e.size for e in files)
+        done = {'files': 0, 'bytes': 0}
+
+        for entry in entries:
+            if entry.is_dir:
+                _safe_target(root, entry.path).mkdir(parents=True, exist_ok=True)
+
+        def on_chunk(count: int):
+            done['bytes'] += count
+            if progress_callback:
+                progress_callback(done['files'], len(files), done['bytes'], bytes_total)
+
+        for entry in files:
+            if cancel_event is not None and cancel_event.is_set():
+                raise IsoExtractionCancelled("ISO extraction cancelled")
+            target = _safe_target(root, entry.path)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            with open(target, 'wb') as out:
+                self.read_file(entry, out, on_chunk)
+            done['files'] += 1
+            if progress_callback:
+                progress_callback(done['files'], len(files), done['bytes'], bytes_total)
+        return done['files']
+
+
+def _safe_target(root: Path, member_path: str) -> Path:
+    target = (root / member_path.lstrip('/')).resolve()
+    if target != root and root not in target.parents:
+        raise IsoFormatError(f"ISO entry escapes destination: {member_path}")
+    return target
+
+
+def is_iso_image(path: Path) -> bool:
+    """Check for an ISO9660 volume descriptor at sector 16"""
+    try:
+        with open(path, 'rb') as handle:
+            handle.seek(VOLUME_DESCRIPTOR_START * SECTOR_SIZE + 1)
+            return handle.read(5) == b"CD001"
+    except OSError:
+        return False
+
+
+def extract_iso(iso_path: Path, dest_dir: Path, progress_callback: Callable = None,
+                cancel_event: Optional[threading.Event] = None) -> int:
+    """Extract an ISO file on disk into dest_dir"""
+    with open(iso_path, 'rb') as handle:
+        return IsoImage(handle).extract_all(dest_dir, progress_callback, cancel_event)
+
+
+def extract_isos_from_zip(zip_path: Path, pattern: str, dest_dir: Path,
+                          progress_callback: Callable[[str, int, int, int, int], None] = None,
+                          max_workers: Optional[int] = None,
+                          cancel_event: Optional[threading.Event] = None) -> Dict[str, Path]:
+    """
+    Extract every ISO inside a zip archive without writing the ISOs to disk.
+
+    Each matching image is unpacked by its own worker, reading the zip member
+    directly, into a hidden staging directory inside dest_dir. The images are
+    only moved to dest_dir/<iso stem> once all of them are complete, so a
+    cancelled or failed run leaves no partial discs behind.
+
+    Args:
+        zip_path: Outer zip archive
+        pattern: Case-insensitive glob for ISO member names (e.g. "*CD*.iso")
+        dest_dir: Directory receiving one sub-directory per image
+        progress_callback: Optional callback receiving
+            (iso_name, files_done, files_total, bytes_done, bytes_total)
+        max_workers: Parallel image limit (defaults to one per image)
+        cancel_event: Optional event that stops extraction when set
+
+    Returns:
+        Dict mapping ISO member name to its extraction directory
+
+    Raises:
+        IsoExtractionCancelled: If the cancel event was set
+    """
+    with zipfile.ZipFile(zip_path) as archive:
+        members = [
+            info.filename for info in archive.infolist()
+            if not info.is_dir() and fnmatch.fnmatch(Path(info.filename).name.lower(), pattern.lower())
+        ]
+    if not members:
+        raise IsoFormatError(f"No ISO images matching {pattern} in {zip_path}")
+
+    dest_dir = Path(dest_dir)
+    dest_dir.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=".extracting-", dir=dest_dir))
+
+    def extract_member(member: str) -> Path:
+        target = staging / Path(member).stem
+        # A private ZipFile per worker keeps decompression state independent
+        with zipfile.ZipFile(zip_path) as archive, archive.open(member) as handle:
+            def report(files_done, files_total, bytes_done, bytes_total):
+                progress_callback(Path(member).name, files_done, files_total, bytes_done, bytes_total)
+            IsoImage(handle).extract_all(target, report if progress_callback else None, cancel_event)
+        logger.info(f"Extracted {member} from {zip_path}")
+        return target
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers or len(members)) as pool:
+            staged = dict(zip(members, pool.map(extract_member, members)))
+        if cancel_event is not None and cancel_event.is_set():
+            raise IsoExtractionCancelled("ISO extraction cancelled")
+        results = {}
+        for member, source in staged.items():
+            target = dest_dir / source.name
+            if target.is_dir() and not target.is_symlink():
+                shutil.rmtree(target)
+            os.replace(source, target)
+            results[member] = target
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return results
+
+
+class _ConsoleProgress:
+    """Thread-safe percentage printer for the command line interface"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last: Dict[str, int] = {}
+
+    def __call__(self, name: str, files_done: int, files_total: int, bytes_done: int, bytes_total: int):
+        percent = int(bytes_done * 100 / bytes_total) if bytes_total else 100
+        with self._lock:
+            step = percent // 10 if files_done != files_total else 11
+            if self._last.get(name) == step:
+                return
+            self._last[name] = step
+            print(f"  {name}: {percent}% ({files_done}/{files_total} files)", flush=True)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Extract ISO9660/Joliet images without mounting")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List the contents of an ISO image")
+    list_parser.add_argument("iso", help="ISO image to list")
+
+    extract_parser = subparsers.add_parser("extract", help="Extract ISO images in parallel")
+    extract_parser.add_argument("isos", nargs="*", help="ISO images on disk")
+    extract_parser.add_argument("--zip", dest="zip_path", help="Read ISO images directly from this zip archive")
+    extract_parser.add_argument("--pattern", default="*.iso", help="ISO member glob when using --zip")
+    extract_parser.add_argument("--dest", required=True, help="Directory receiving one folder per image")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "list":
+            with open(args.iso, 'rb') as handle:
+                for entry in IsoImage(handle).entries():
+                    print(f"{'d' if entry.is_dir else '-'} {entry.size:>12} {entry.path}")
+            return 0
+
+        progress = _ConsoleProgress()
+        if args.zip_path:
+            results = extract_isos_from_zip(Path(args.zip_path), args.pattern, Path(args.dest), progress)
+        else:
+            if not args.isos:
+                parser.error("provide ISO paths or --zip")
+
+            def extract_one(iso: str) -> Path:
+                target = Path(args.dest) / Path(iso).stem
+                extract_iso(Path(iso), target, lambda *counts: progress(Path(iso).name, *counts))
+                return target
+
+            with ThreadPoolExecutor(max_workers=len(args.isos)) as pool:
+                results = dict(zip(args.isos, pool.map(extract_one, args.isos)))
+    except (OSError, IsoFormatError, zipfile.BadZipFile) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+    for name, target in sorted(results.items()):
+        print(f"{Path(name).name} -> {target}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+Launch profile module
+Turns a game's performance profile (Wine debug output, esync/fsync, DXVK,
+large address awareness, GameMode, CPU affinity) into the command and
+environment launch_game runs, after checking what the kernel supports
+"""
+
+import argparse
+import ctypes
+import errno
+import json
+import logging
+import os
+import platform
+import resource
+import shutil
+import sys
+from typing import Optional, Callable, Dict, List, Any
+
+# Constants
+DEFAULT_PROFILE = {
+    'wine_debug': "-all",
+    'esync': True,
+    'fsync': True,
+    'dxvk_async': False,
+    'dxvk_state_cache': True,
+    'large_address_aware': False,
+    'gamemode': True,
+    'cpu_affinity': None,
+    'env': {},
+}
+
+# Value types accepted for each profile key (None is accepted for cpu_affinity)
+PROFILE_TYPES = {
+    'wine_debug': str,
+    'esync': bool,
+    'fsync': bool,
+    'dxvk_async': bool,
+    'dxvk_state_cache': bool,
+    'large_address_aware': bool,
+    'gamemode': bool,
+    'cpu_affinity': str,
+    'env': dict,
+}
+
+# esync keeps one file descriptor per synchronisation object
+ESYNC_MIN_NOFILE = 524288
+
+# futex_waitv has the same number on every architecture that has it
+FUTEX_WAITV_SYSCALLS = {'x86_64': 449, 'aarch64': 449, 'riscv64': 449}
+
+logger = logging.getLogger("game_installer.profiles")
+
+_features: Optional[Dict[str, Any]] = None
+
+
+def _has_futex_waitv() -> bool:
+    """Call futex_waitv with no futexes: EINVAL means supported, ENOSYS means not"""
+    number = FUTEX_WAITV_SYSCALLS.get(platform.machine())
+    if number is None:
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.syscall(number, None, 0, 0, None, 0) == 0:
+            return True
+        return ctypes.get_errno() != errno.ENOSYS
+    except (OSError, AttributeError):
+        return False
+
+
+def kernel_features(refresh: bool = False) -> Dict[str, Any]:
+    """
+    Kernel support relevant to launch profiles, detected once per process.
+
+    Returns:
+        Dict with 'futex_waitv' (fsync support), 'nofile_soft' and
+        'nofile_hard' (open file limits for esync)
+    """
+    global _features
+    if _features is None or refresh:
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        _features = {'futex_waitv': _has_futex_waitv(), 'nofile_soft': soft, 'nofile_hard': hard}
+    return dict(_features)
+
+
+def raise_nofile_limit(target: int = ESYNC_MIN_NOFILE) -> int:
+    """
+    Raise the soft open file limit (inherited by launched games) towards target.
+
+    Returns:
+        The soft limit in effect afterwards
+    """
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    wanted = target if hard == resource.RLIM_INFINITY else min(target, hard)
+    if soft != resource.RLIM_INFINITY and soft < wanted:
+        try:
+            resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+            soft = wanted
+        except (ValueError, OSError) as e:
+            logger.warning(f"Could not raise the open file limit to {wanted}: {e}")
+    return soft
+
+
+def parse_cpu_list(value: str) -> List[int]:
+    """
+    Parse a CPU list such as "0-3,6".
+
+    Raises:
+        ValueError: If the list is malformed
+    """
+    cpus = set()
+    for part in value.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        start, end = int(first), int(last or first)
+        if start < 0 or end < start:
+            raise ValueError(f"Invalid CPU range: {part}")
+        cpus.update(range(start, end + 1))
+    if not cpus:
+        raise ValueError("Empty CPU list")
+    return sorted(cpus)
+
+
+def validate_profile(overrides: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Check a profile override mapping.
+
+    Returns:
+        The overrides
+
+    Raises:
+        ValueError: On unknown keys, wrong value types or bad CPU lists
+    """
+    for key, value in overrides.items():
+        if key not in PROFILE_TYPES:
+            raise ValueError(f"Unknown launch profile setting: {key}")
+        if value is None and key == 'cpu_affinity':
+            continue
+        if not isinstance(value, PROFILE_TYPES[key]):
+            raise ValueError(f"{key} must be {PROFILE_TYPES[key].__name__}")
+    if overrides.get('cpu_affinity'):
+        parse_cpu_list(overrides['cpu_affinity'])
+    if any(not isinstance(v, str) for v in overrides.get('env', {}).values()):
+        raise ValueError("env values must be strings")
+    return overrides
+
+
+def merge_profile(*layers: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Apply profile layers over DEFAULT_PROFILE; later layers win, 'env' is merged"""
+    profile = dict(DEFAULT_PROFILE)
+    profile['env'] = {}
+    for layer in layers:
+        for key, value in (layer or {}).items():
+            if key == 'env':
+                profile['env'].update(value)
+            else:
+                profile[key] = value
+    return profile
+
+
+class LaunchPlan:
+    """Command and environment additions for one launch"""
+
+    def __init__(self, command: List[str], env: Dict[str, str], notes: List[str]):
+        self.command = command
+        self.env = env
+        self.notes = notes
+
+    def environment(self, base: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+        """Full environment for the process"""
+        return {**(os.environ if base is None else base), **self.env}
+
+    def describe(self) -> str:
+        env = " ".join(f"{k}={v}" for k, v in sorted(self.env.items()))
+        return f"{env} {' '.join(self.command)}".strip()
+
+    def __repr__(self) -> str:
+        return f"LaunchPlan({self.command!r}, env={sorted(self.env)})"
+
+
+def build_launch_plan(profile: Dict[str, Any], command: List[str], env: Optional[Dict[str, str]] = None,
+                      features: Optional[Dict[str, Any]] = None,
+                      which: Callable[[str], Optional[str]] = shutil.which,
+                      cache_env: Optional[Dict[str, str]] = None) -> LaunchPlan:
+    """
+    Assemble a launch from a merged profile.
+
+    Settings the system cannot honour are dropped with a note: fsync without
+    futex_waitv, esync when the open file limit cannot be raised far enough,
+    GameMode or CPU affinity when gamemoderun or taskset is missing.
+
+    Args:
+        profile: Merged profile (see merge_profile)
+        command: Base command, e.g. [umu-run, game.exe]
+        env: Environment additions the caller already needs (WINEPREFIX...)
+        features: kernel_features() result
+        which: Command lookup
+        cache_env: Shader cache locations (see shader_cache.ShaderCacheManager)
+
+    Returns:
+        LaunchPlan
+    """
+    features = kernel_features() if features is None else features
+    env = dict(env or {})
+    notes = []
+
+    if profile['wine_debug']:
+        env['WINEDEBUG'] = profile['wine_debug']
+    fsync = profile['fsync']
+    if fsync and not features.get('futex_waitv'):
+        fsync = False
+        notes.append("fsync disabled: kernel has no futex_waitv")
+    if not fsync:
+        env['PROTON_NO_FSYNC'] = "1"
+    esync = profile['esync']
+    hard = features.get('nofile_hard', 0)
+    if esync and hard != resource.RLIM_INFINITY and hard < ESYNC_MIN_NOFILE:
+        esync = False
+        notes.append(f"esync disabled: open file limit {hard} < {ESYNC_MIN_NOFILE}")
+    if not esync:
+        env['PROTON_NO_ESYNC'] = "1"
+    if profile['dxvk_async']:
+        env['DXVK_ASYNC'] = "1"
+    if profile['dxvk_state_cache']:
+        env.update(cache_env or {})
+    else:
+        env['DXVK_STATE_CACHE'] = "0"
+    if profile['large_address_aware']:
+        env['WINE_LARGE_ADDRESS_AWARE'] = "1"
+    env.update(profile['env'])
+
+    wrappers = []
+    if profile['gamemode']:
+        if which("gamemoderun"):
+            wrappers.append("gamemoderun")
+        else:
+            notes.append("GameMode disabled: gamemoderun not found")
+    if profile['cpu_affinity']:
+        if which("taskset"):
+            cpus = ",".join(str(cpu) for cpu in parse_cpu_list(profile['cpu_affinity']))
+            wrappers += ["taskset", "-c", cpus]
+        else:
+            notes.append("CPU affinity ignored: taskset not found")
+    return LaunchPlan(wrappers + list(command), env, notes)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show detected kernel support and a game's launch profile")
+    parser.add_argument("--game", help="Catalog game id to show the effective profile for")
+    args = parser.parse_args(argv)
+
+    features = kernel_features()
+    print(f"futex_waitv (fsync): {'yes' if features['futex_waitv'] else 'no'}")
+    print(f"open file limit: soft {features['nofile_soft']}, hard {features['nofile_hard']}")
+    if args.game:
+        from games_db import get_game_by_id, get_client_profile
+        game_data = get_game_by_id(args.game)
+        if not game_data:
+            print(f"Unknown game: {args.game}", file=sys.stderr)
+            return 1
+        profile = merge_profile(get_client_profile(game_data.get('client_family')))
+        print(json.dumps(profile, indent=2))
+        plan = build_launch_plan(profile, ["umu-run", game_data['executable']], features=features)
+        print(plan.describe())
+        for note in plan.notes:
+            print(f"  {note}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+#!/usr/bin/env python3
+"""
+Launch timing module
+Breaks the time from clicking Launch to the game drawing into phases
+(resolving the command, Proton and prefix setup, process spawn, wineserver
+ready, first GPU device open) and keeps a per-game history, so slow
+launches and regressions after umu or Proton updates can be pinned down
+"""
+
+import argparse
+import json
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Any
+
+from page_prefetch import descendants, is_running, PROC_ROOT
+
+# Constants
+PHASE_RESOLVE = "resolve"
+PHASE_SETUP = "setup"
+PHASE_SPAWN = "spawn"
+PHASE_WINESERVER = "wineserver"
+PHASE_WINDOW = "window"
+
+# In launch order, with the labels shown to users
+PHASES = [
+    (PHASE_RESOLVE, "Resolve command"),
+    (PHASE_SETUP, "Proton and prefix setup"),
+    (PHASE_SPAWN, "Process spawn"),
+    (PHASE_WINESERVER, "Wineserver ready"),
+    (PHASE_WINDOW, "First GPU device open"),
+]
+
+# Device nodes a game opens when it creates its first window or swapchain
+GPU_DEVICE_PREFIXES = ("/dev/dri/", "/dev/nvidia")
+
+# Wine puts each prefix's server socket under /tmp/.wine-<uid>/server-<dev>-<inode>
+WINE_SERVER_ROOT = Path("/tmp")
+
+WATCH_INTERVAL = 0.2
+WATCH_TIMEOUT = 300.0
+MAX_LAUNCHES_PER_GAME = 50
+
+# A phase counts as a regression when it takes this much longer than its
+# median over earlier launches
+REGRESSION_FACTOR = 1.5
+REGRESSION_MIN_SECONDS = 1.0
+
+logger = logging.getLogger("game_installer.launchtiming")
+
+
+def wineserver_socket(prefix: str) -> Optional[Path]:
+    """Socket the wineserver of a prefix listens on once it is ready"""
+    try:
+        st = os.stat(prefix)
+    except OSError:
+        return None
+    return WINE_SERVER_ROOT / f".wine-{os.getuid()}" / f"server-{st.st_dev:x}-{st.st_ino:x}" / "socket"
+
+
+def has_gpu_device(pid: int, proc_root: Path = PROC_ROOT) -> bool:
+    """Whether a process has a GPU device node open"""
+    fd_dir = proc_root / str(pid) / "fd"
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        return False
+    for fd in fds:
+        try:
+            if os.readlink(fd_dir / fd).startswith(GPU_DEVICE_PREFIXES):
+                return True
+        except OSError:
+            continue
+    return False
+
+
+def _comm(pid: int, proc_root: Path) -> str:
+    try:
+        return (proc_root / str(pid) / "comm").read_text().strip()
+    except OSError:
+        return ""
+
+
+class LaunchTimer:
+    """Timestamps of one launch's phases"""
+
+    def __init__(self, game_id: str, proton: Optional[str] = None):
+        self.game_id = game_id
+        self.proton = proton
+        self.started = time.time()
+        self._start = time.monotonic()
+        self.marks: Dict[str, float] = {}
+        self.complete = False
+
+    def mark(self, phase: str) -> float:
+        """Record that a phase finished; returns seconds since the launch started"""
+        elapsed = time.monotonic() - self._start
+        self.marks.setdefault(phase, elapsed)
+        return elapsed
+
+    def phases(self) -> Dict[str, float]:
+        """Duration of each reached phase"""
+        durations, previous = {}, 0.0
+        for phase, _ in PHASES:
+            if phase in self.marks:
+                durations[phase] = round(self.marks[phase] - previous, 3)
+                previous = self.marks[phase]
+        return durations
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started': self.started,
+            'proton': self.proton,
+            'phases': self.phases(),
+            'total': round(max(self.marks.values(), default=0.0), 3),
+            'complete': self.complete,
+        }
+
+
+def describe_launch(record: Dict[str, Any]) -> str:
+    """One line breakdown of a launch record"""
+    parts = [f"{phase} {record['phases'][phase]:.2f}s" for phase, _ in PHASES if phase in record['phases']]
+    suffix = "" if record.get('complete') else ", game window not seen"
+    return f"{' · '.join(parts)} (total {record['total']:.1f}s{suffix})"
+
+
+def regressions(records: List[Dict[str, Any]]) -> List[str]:
+    """
+    Phases of the latest launch that took much longer than usual.
+
+    Returns:
+        Descriptions such as "wineserver 4.1s, usually 0.9s (Proton changed)"
+    """
+    if len(records) < 2:
+        return []
+    latest, earlier = records[-1], records[:-1]
+    proton_changed = latest.get('proton') != earlier[-1].get('proton')
+    found = []
+    for phase, _ in PHASES:
+        previous = [r['phases'][phase] for r in earlier if phase in r.get('phases', {})]
+        current = latest['phases'].get(phase)
+        if current is None or not previous:
+            continue
+        usual = statistics.median(previous)
+        if current > usual * REGRESSION_FACTOR and current - usual >= REGRESSION_MIN_SECONDS:
+            note = " (Proton changed)" if proton_changed else ""
+            found.append(f"{phase} {current:.1f}s, usually {usual:.1f}s{note}")
+    return found
+
+
+class LaunchTimings:
+    """
+    Follows launches until the game opens a GPU device and keeps their
+    timings, up to MAX_LAUNCHES_PER_GAME per game, in a JSON file.
+    """
+
+    def __init__(self, history_file: Optional[Path] = None,
+                 callback: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                 proc_root: Path = PROC_ROOT, timeout: float = WATCH_TIMEOUT):
+        """
+        Args:
+            history_file: Optional JSON file launch records are kept in
+            callback: Optional callback(game_id, record) when a launch has been timed
+            proc_root: procfs mount point
+            timeout: Seconds to wait for the game's window before giving up
+        """
+        self.history_file = Path(history_file) if history_file else None
+        self.callback = callback
+        self.proc_root = Path(proc_root)
+        self.timeout = timeout
+        self._lock = threading.Lock()
+
+    def start(self, game_id: str, proton: Optional[str] = None) -> LaunchTimer:
+        return LaunchTimer(game_id, proton)
+
+    def follow(self, timer: LaunchTimer, pid: int, prefix: Optional[str] = None,
+               executable: Optional[str] = None, interval: float = WATCH_INTERVAL) -> Dict[str, Any]:
+        """
+        Wait for the remaining phases of a spawned launch and record it.
+
+        Args:
+            timer: The launch's timer, marked up to PHASE_SPAWN
+            pid: PID of the launched process
+            prefix: Wine prefix, if the game runs under Wine
+            executable: File name of the game executable; its process is the
+                one whose GPU device open is timed (default: any process in the tree)
+            interval: Seconds between checks
+
+        Returns:
+            The launch record
+        """
+        socket = wineserver_socket(prefix) if prefix else None
+        # The kernel truncates process names to 15 characters
+        comm = executable[:15] if executable else None
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline and is_running(pid, self.proc_root):
+            if socket is not None and PHASE_WINESERVER not in timer.marks and socket.exists():
+                timer.mark(PHASE_WINESERVER)
+            tree = descendants(pid, self.proc_root)
+            if any((comm is None or _comm(p, self.proc_root) == comm) and has_gpu_device(p, self.proc_root)
+                   for p in tree):
+                if socket is not None:
+                    timer.mark(PHASE_WINESERVER)  # the game cannot draw without its server
+                timer.mark(PHASE_WINDOW)
+                timer.complete = True
+                break
+            time.sleep(interval)
+        record = timer.to_dict()
+        self._record(timer.game_id, record)
+        logger.info(f"Launch of {timer.game_id}: {describe_launch(record)}")
+        if self.callback:
+            try:
+                self.callback(timer.game_id, record)
+            except Exception as e:
+                logger.warning(f"Launch timing callback failed: {e}")
+        return record
+
+    def follow_in_background(self, timer: LaunchTimer, pid: int, prefix: Optional[str] = None,
+                             executable: Optional[str] = None) -> threading.Thread:
+        thread = threading.Thread(target=self.follow, args=(timer, pid, prefix, executable),
+                                  name=f"launch-timing-{timer.game_id}", daemon=True)
+        thread.start()
+        return thread
+
+    # --- History --------------------------------------------------------
+    def _load(self) -> Dict[str, List[Dict[str, Any]]]:
+        if self.history_file is None:
+            return {}
+        try:
+            with open(self.history_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def history(self, game_id: str) -> List[Dict[str, Any]]:
+        """Timed launches of a game, oldest first"""
+        return self._load().get(game_id, [])
+
+    def _record(self, game_id: str, record: Dict[str, Any]):
+        if self.history_file is None:
+            return
+        with self._lock:
+            data = self._load()
+            data[game_id] = (data.get(game_id, []) + [record])[-MAX_LAUNCHES_PER_GAME:]
+            try:
+                self.history_file.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = self.history_file.with_name(self.history_file.name + ".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
+                os.replace(tmp_path, self.history_file)
+            except OSError as e:
+                logger.warning(f"Could not save launch timings: {e}")
+
+    def summary(self, game_id: str) -> Optional[str]:
+        """Breakdown of the last launch with any regressions, for display"""
+        records = self.history(game_id)
+        if not records:
+            return None
+        latest = records[-1]
+        lines = [f"Last launch: {describe_launch(latest)}"]
+        if latest.get('proton'):
+            lines[0] += f" with {latest['proton']}"
+        slower = regressions(records)
+        if slower:
+            lines.append("Slower than usual: " + "; ".join(slower))
+        return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show recorded launch timings")
+    parser.add_argument("--history-file", default=str(Path.home() / ".config" / "mmo-launcher" / "launch_times.json"))
+    parser.add_argument("game_id")
+    args = parser.parse_args(argv)
+
+    timings = LaunchTimings(Path(args.history_file))
+    records = timings.history(args.game_id)
+    if not records:
+        print(f"No launches recorded for {args.game_id}")
+        return 1
+    for record in records:
+        started = time.strftime("%Y-%m-%d %H:%M", time.localtime(record['started']))
+        print(f"{started}  {record.get('proton') or '-':<16} {describe_launch(record)}")
+    for line in regressions(records):
+        print(f"Slower than usual: {line}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,7 +5,7 @@ a = Analysis(
     ['gui.py'],
     pathex=[],
     binaries=[],
-    datas=[('install_knight_myko.sh', '.'), ('install_silkroad_origin.sh', '.'), ('install_quarm.sh', '.'), ('install_p99.sh', '.')],
+    datas=[('install_silkroad_origin.sh', '.'), ('prefix_templates.py', '.'), ('content_store.py', '.'), ('games_db.py', '.')],
     hiddenimports=[],
     hookspath=[],
     hooksconfig={},
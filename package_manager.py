@@ -0,0 +1,174 @@
+"""
+Package manager module
+Plans host package and Flatpak installs for several games at once, so that
+a batch of queued installs costs one package manager transaction and one
+Flatpak transaction instead of one of each per game
+"""
+
+import logging
+import shutil
+import subprocess
+from typing import Optional, Callable, Dict, List, Iterable, Tuple
+
+# Constants
+PACKAGE_MANAGERS = ["pacman", "apt", "dnf"]
+FLATPAK_REMOTE = "flathub"
+FLATPAK_PREFIX = "flatpak://"
+
+# Catalog dependency -> package name per package manager (None: not packaged)
+PACKAGE_MAP = {
+    "pacman": {
+        "umu-launcher": "umu",
+        "wine": "wine",
+        "wine-staging": "wine-staging",
+        "steam": "steam",
+        "flatpak": "flatpak",
+        "java": "jre-openjdk"
+    },
+    "apt": {
+        "umu-launcher": None,  # Needs manual install
+        "wine": "wine",
+        "wine-staging": "wine-staging",
+        "steam": "steam",
+        "flatpak": "flatpak",
+        "java": "default-jre"
+    },
+    "dnf": {
+        "umu-launcher": None,  # Needs manual install
+        "wine": "wine",
+        "wine-staging": "wine",
+        "steam": "steam",
+        "flatpak": "flatpak",
+        "java": "java-latest-openjdk"
+    }
+}
+
+logger = logging.getLogger("game_installer.packages")
+
+
+def detect_package_manager(which: Callable[[str], Optional[str]] = shutil.which) -> Optional[str]:
+    """Return the first supported package manager found on PATH"""
+    return next((pm for pm in PACKAGE_MANAGERS if which(pm)), None)
+
+
+def install_command(package_manager: str, packages: Iterable[str]) -> List[str]:
+    """Command installing all packages in a single non-interactive transaction"""
+    packages = list(packages)
+    if package_manager == "pacman":
+        return ["sudo", "pacman", "-S", "--needed", "--noconfirm"] + packages
+    if package_manager == "apt":
+        return ["sudo", "apt", "install", "-y"] + packages
+    if package_manager == "dnf":
+        return ["sudo", "dnf", "install", "-y"] + packages
+    raise ValueError(f"Unsupported package manager: {package_manager}")
+
+
+def flatpak_install_command(refs: Iterable[str]) -> List[str]:
+    """Command installing several Flatpak apps in one transaction"""
+    return ["flatpak", "install", "-y", "--noninteractive", FLATPAK_REMOTE] + list(refs)
+
+
+def installed_flatpaks(which: Callable[[str], Optional[str]] = shutil.which) -> set:
+    """Application ids of installed Flatpaks (empty if flatpak is unavailable)"""
+    if not which("flatpak"):
+        return set()
+    try:
+        result = subprocess.run(["flatpak", "list", "--app", "--columns=application"],
+                                capture_output=True, text=True)
+    except OSError:
+        return set()
+    return set(result.stdout.split()) if result.returncode == 0 else set()
+
+
+def flatpak_ref(game_data: dict) -> Optional[str]:
+    """Flatpak application id a game installs from, if any"""
+    url = game_data.get('client_download_url', '')
+    return url[len(FLATPAK_PREFIX):] if url.startswith(FLATPAK_PREFIX) else None
+
+
+class PackagePlan:
+    """
+    Packages and Flatpak refs missing for a set of games, each mapped to the
+    games it unblocks.
+    """
+
+    def __init__(self, package_manager: Optional[str]):
+        self.package_manager = package_manager
+        self.packages: Dict[str, List[str]] = {}
+        self.flatpaks: Dict[str, List[str]] = {}
+        self.unavailable: Dict[str, List[str]] = {}
+
+    def add_package(self, package: str, game_id: str):
+        games = self.packages.setdefault(package, [])
+        if game_id not in games:
+            games.append(game_id)
+
+    def add_flatpak(self, ref: str, game_id: str):
+        games = self.flatpaks.setdefault(ref, [])
+        if game_id not in games:
+            games.append(game_id)
+
+    def add_unavailable(self, dependency: str, game_id: str):
+        games = self.unavailable.setdefault(dependency, [])
+        if game_id not in games:
+            games.append(game_id)
+
+    def package_command(self) -> Optional[List[str]]:
+        if not self.packages or not self.package_manager:
+            return None
+        return install_command(self.package_manager, self.packages)
+
+    def flatpak_command(self) -> Optional[List[str]]:
+        return flatpak_install_command(self.flatpaks) if self.flatpaks else None
+
+    def unblocks(self, names: Optional[Dict[str, str]] = None) -> List[Tuple[str, List[str]]]:
+        """
+        Which games each package or Flatpak unblocks.
+
+        Args:
+            names: Optional game id -> display name mapping
+
+        Returns:
+            List of (package, [game names]) sorted by package
+        """
+        names = names or {}
+        items = list(self.packages.items()) + list(self.flatpaks.items())
+        return [(pkg, [names.get(g, g) for g in games]) for pkg, games in sorted(items)]
+
+    def __bool__(self) -> bool:
+        return bool(self.packages or self.flatpaks)
+
+    def __repr__(self) -> str:
+        return f"PackagePlan({self.package_manager}, packages={sorted(self.packages)}, flatpaks={sorted(self.flatpaks)})"
+
+
+def plan_packages(games: Dict[str, dict], missing: Dict[str, List[str]],
+                  package_manager: Optional[str] = None, flatpaks_installed: Optional[set] = None,
+                  include_flatpaks: bool = True) -> PackagePlan:
+    """
+    Work out one transaction per package manager for a set of games.
+
+    Args:
+        games: game_id -> game data of every pending install
+        missing: game_id -> catalog dependencies that are not installed
+        package_manager: Host package manager (None: host packages cannot be installed)
+        flatpaks_installed: Flatpak ids already installed
+        include_flatpaks: Also plan the Flatpak apps of flatpak games
+
+    Returns:
+        PackagePlan
+    """
+    plan = PackagePlan(package_manager)
+    flatpaks_installed = flatpaks_installed or set()
+    pkg_map = PACKAGE_MAP.get(package_manager, {})
+    for game_id, game_data in games.items():
+        for dep in missing.get(game_id, []):
+            package = pkg_map.get(dep)
+            if package:
+                plan.add_package(package, game_id)
+            elif dep in pkg_map or package_manager is None:
+                plan.add_unavailable(dep, game_id)
+        ref = flatpak_ref(game_data) if include_flatpaks else None
+        if ref and game_data.get('install_type') == 'flatpak' and ref not in flatpaks_installed:
+            plan.add_flatpak(ref, game_id)
+    return plan
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Page cache prefetch module
+Records which files under a game's directory the client reads during a
+session, and on later launches asks the kernel to read them into the page
+cache ahead of time, in the order they were first used, so loading screens
+do not wait on cold disk reads
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Set, Tuple
+
+# Constants
+PROC_ROOT = Path("/proc")
+SAMPLE_INTERVAL = 0.25
+PROFILE_VERSION = 1
+MAX_PROFILE_FILES = 20000
+
+# Never prefetch more than this share of the currently available memory,
+# so prefetching does not evict what the game itself is using
+MEMORY_BUDGET_FRACTION = 0.5
+
+logger = logging.getLogger("game_installer.prefetch")
+
+
+def descendants(pid: int, proc_root: Path = PROC_ROOT) -> Set[int]:
+    """pid and every process below it (umu -> proton -> wine -> game.exe)"""
+    children: Dict[int, List[int]] = {}
+    try:
+        entries = [e for e in os.listdir(proc_root) if e.isdigit()]
+    except OSError:
+        return {pid}
+    for entry in entries:
+        try:
+            stat = (proc_root / entry / "stat").read_text()
+        except OSError:
+            continue
+        # The command name may contain spaces and parentheses
+        fields = stat[stat.rfind(")") + 2:].split()
+        if len(fields) > 1:
+            children.setdefault(int(fields[1]), []).append(int(entry))
+    found, pending = set(), [pid]
+    while pending:
+        current = pending.pop()
+        if current not in found:
+            found.add(current)
+            pending.extend(children.get(current, []))
+    return found
+
+
+def is_running(pid: int, proc_root: Path = PROC_ROOT) -> bool:
+    """Whether a process exists and has not exited (zombies count as exited)"""
+    try:
+        stat = (proc_root / str(pid) / "stat").read_text()
+    except OSError:
+        return False
+    return stat[stat.rfind(")") + 2:][:1] not in ("Z", "X")
+
+
+def open_files(pid: int, proc_root: Path = PROC_ROOT) -> List[str]:
+    """Paths a process has open or mapped"""
+    paths = []
+    fd_dir = proc_root / str(pid) / "fd"
+    try:
+        fds = os.listdir(fd_dir)
+    except OSError:
+        fds = []
+    for fd in fds:
+        try:
+            paths.append(os.readlink(fd_dir / fd))
+        except OSError:
+            continue
+    try:
+        with open(proc_root / str(pid) / "maps", 'r', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                parts = line.split(None, 5)
+                if len(parts) == 6 and parts[5].startswith("/"):
+                    paths.append(parts[5].rstrip("\n"))
+    except OSError:
+        pass
+    return paths
+
+
+def available_memory() -> Optional[int]:
+    """MemAvailable from /proc/meminfo in bytes"""
+    try:
+        with open(PROC_ROOT / "meminfo", 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class PagePrefetcher:
+    """Per-game file access profiles and page cache prefetching"""
+
+    def __init__(self, profiles_dir: Path, proc_root: Path = PROC_ROOT):
+        """
+        Args:
+            profiles_dir: Directory holding one <game_id>.json profile per game
+            proc_root: procfs mount point
+        """
+        self.profiles_dir = Path(profiles_dir)
+        self.proc_root = Path(proc_root)
+        self._lock = threading.Lock()
+        self._prefetching: Dict[str, threading.Thread] = {}
+
+    def _profile_file(self, game_id: str) -> Path:
+        return self.profiles_dir / f"{game_id}.json"
+
+    def load_profile(self, game_id: str) -> List[str]:
+        """Recorded files of a game, relative to its directory, in access order"""
+        try:
+            with open(self._profile_file(game_id), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return []
+        return data.get('files', []) if data.get('version') == PROFILE_VERSION else []
+
+    def save_profile(self, game_id: str, session_files: List[str]) -> List[str]:
+        """
+        Merge a session's files into the game's profile.
+
+        This session's files come first in the order they were opened, then
+        files only earlier sessions used.
+
+        Returns:
+            The merged file list
+        """
+        with self._lock:
+            previous = self.load_profile(game_id)
+            merged = list(dict.fromkeys(session_files + previous))[:MAX_PROFILE_FILES]
+            self.profiles_dir.mkdir(parents=True, exist_ok=True)
+            path = self._profile_file(game_id)
+            tmp_path = path.with_name(path.name + ".tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': PROFILE_VERSION, 'updated': time.time(), 'files': merged}, f)
+            os.replace(tmp_path, path)
+        return merged
+
+    def sample(self, pid: int, game_dir: Path, seen: Dict[str, None]) -> int:
+        """
+        Add files under game_dir that pid or its children have open.
+
+        Returns:
+            Number of newly seen files
+        """
+        root = os.path.realpath(game_dir) + os.sep
+        added = 0
+        for process in descendants(pid, self.proc_root):
+            for path in open_files(process, self.proc_root):
+                if path.startswith(root):
+                    relative = path[len(root):]
+                    if relative not in seen:
+                        seen[relative] = None
+                        added += 1
+        return added
+
+    def record(self, game_id: str, game_dir: Path, pid: int, stop_event: Optional[threading.Event] = None,
+               interval: float = SAMPLE_INTERVAL) -> List[str]:
+        """
+        Sample the files a game session reads until its process exits.
+
+        Files that are opened and closed between two samples are missed; a
+        few sessions fill the profile in.
+
+        Returns:
+            Files seen in this session, in first-seen order
+        """
+        seen: Dict[str, None] = {}
+        stop_event = stop_event or threading.Event()
+        while not stop_event.is_set() and is_running(pid, self.proc_root):
+            self.sample(pid, game_dir, seen)
+            stop_event.wait(interval)
+        session = [path for path in seen if os.path.isfile(os.path.join(game_dir, path))]
+        if session:
+            total = len(self.save_profile(game_id, session))
+            logger.info(f"Recorded {len(session)} files read by {game_id} ({total} in profile)")
+        return session
+
+    def record_in_background(self, game_id: str, game_dir: Path, pid: int,
+                             stop_event: Optional[threading.Event] = None) -> threading.Thread:
+        thread = threading.Thread(target=self.record, args=(game_id, game_dir, pid, stop_event),
+                                  name=f"prefetch-record-{game_id}", daemon=True)
+        thread.start()
+        return thread
+
+    def prefetch(self, game_id: str, game_dir: Path, cancel_event: Optional[threading.Event] = None,
+                 budget: Optional[int] = None) -> Tuple[int, int]:
+        """
+        Ask the kernel to read a game's profiled files into the page cache.
+
+        posix_fadvise(WILLNEED) starts readahead without waiting for it, so
+        files are handed over one by one in access order.
+
+        Args:
+            game_id: Game whose profile to use
+            game_dir: Directory the profile paths are relative to
+            cancel_event: Optional event that stops prefetching
+            budget: Maximum bytes to prefetch (default: part of available memory)
+
+        Returns:
+            (files, bytes) prefetched
+        """
+        if budget is None:
+            available = available_memory()
+            budget = int(available * MEMORY_BUDGET_FRACTION) if available else 0
+        files = done = 0
+        for relative in self.load_profile(game_id):
+            if cancel_event is not None and cancel_event.is_set():
+                break
+            try:
+                fd = os.open(os.path.join(game_dir, relative), os.O_RDONLY)
+            except OSError:
+                continue
+            try:
+                size = os.fstat(fd).st_size
+                if done + size > budget:
+                    break
+                os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+                files += 1
+                done += size
+            except OSError:
+                pass
+            finally:
+                os.close(fd)
+        if files:
+            logger.info(f"Prefetched {files} files ({done / (1024 * 1024):.0f} MiB) for {game_id}")
+        return files, done
+
+    def prefetch_in_background(self, game_id: str, game_dir: Path) -> Optional[threading.Thread]:
+        """
+        Run prefetch() on a daemon thread.
+
+        Returns:
+            The thread, or None if the game has no profile or is already being prefetched
+        """
+        if not self._profile_file(game_id).exists():
+            return None
+        with self._lock:
+            running = self._prefetching.get(game_id)
+            if running is not None and running.is_alive():
+                return None
+
+            def run():
+                try:
+                    self.prefetch(game_id, game_dir)
+                except OSError as e:
+                    logger.warning(f"Prefetch for {game_id} failed: {e}")
+
+            thread = threading.Thread(target=run, name=f"prefetch-{game_id}", daemon=True)
+            self._prefetching[game_id] = thread
+            thread.start()
+        return thread
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Record or replay a game's file access profile")
+    parser.add_argument("--profiles-dir", default=str(Path.home() / ".config" / "mmo-launcher" / "access_profiles"))
+    sub = parser.add_subparsers(dest="command", required=True)
+    record = sub.add_parser("record", help="Record the files a running game reads")
+    record.add_argument("game_id")
+    record.add_argument("game_dir")
+    record.add_argument("pid", type=int)
+    prefetch = sub.add_parser("prefetch", help="Read a game's profiled files into the page cache")
+    prefetch.add_argument("game_id")
+    prefetch.add_argument("game_dir")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    prefetcher = PagePrefetcher(Path(args.profiles_dir))
+    if args.command == "record":
+        try:
+            files = prefetcher.record(args.game_id, Path(args.game_dir), args.pid)
+        except KeyboardInterrupt:
+            return 1
+        print(f"Recorded {len(files)} files")
+        return 0
+    files, size = prefetcher.prefetch(args.game_id, Path(args.game_dir))
+    print(f"Prefetched {files} files ({size / (1024 * 1024):.0f} MiB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Patch applier module
+Applies zip patch archives over an installed game, writing only members whose
+size or CRC32 differ from the files already on disk
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+import zipfile
+import zlib
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Tuple
+
+# Constants
+COPY_CHUNK_SIZE = 1024 * 1024
+CACHE_FILE_NAME = ".patch-cache.json"
+CACHE_VERSION = 1
+DEFAULT_FILE_MODE = 0o644
+ZIP_UNIX_SYSTEM = 3
+
+logger = logging.getLogger("game_installer.patch")
+
+
+class PatchError(Exception):
+    """Raised when a patch archive cannot be applied"""
+
+
+class PatchResult:
+    """Summary of a patch run"""
+
+    def __init__(self):
+        self.files_total = 0
+        self.files_written = 0
+        self.files_skipped = 0
+        self.bytes_written = 0
+        self.bytes_skipped = 0
+        self.bytes_hashed = 0
+
+    def describe(self) -> str:
+        """Human-readable summary for logs and progress callbacks"""
+        return (f"Patched {self.files_written} of {self.files_total} files "
+                f"({_format_size(self.bytes_written)} written), "
+                f"{self.files_skipped} unchanged ({_format_size(self.bytes_skipped)} saved)")
+
+
+def _format_size(num_bytes: int) -> str:
+    """Format a byte count using binary units"""
+    size = float(num_bytes)
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            return f"{size:.1f} {unit}" if unit != "B" else f"{int(size)} B"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+class StatCache:
+    """
+    CRC32 cache keyed by relative path and validated against stat metadata.
+
+    A cached checksum is trusted only while the file's size, mtime and inode
+    are unchanged, so untouched files are never re-read between patch runs.
+    """
+
+    def __init__(self, cache_file: Path):
+        self.cache_file = Path(cache_file)
+        self._entries: Dict[str, List[int]] = {}
+        self._dirty = False
+        if self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r') as f:
+                    data = json.load(f)
+                if data.get('version') == CACHE_VERSION:
+                    self._entries = data.get('files', {})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable patch cache {self.cache_file}: {e}")
+
+    @staticmethod
+    def _signature(st: os.stat_result) -> Tuple[int, int, int]:
+        return st.st_size, st.st_mtime_ns, st.st_ino
+
+    def lookup(self, rel_path: str, st: os.stat_result) -> Optional[int]:
+        """Return the cached CRC32 if the file is unchanged since it was recorded"""
+        entry = self._entries.get(rel_path)
+        if entry and tuple(entry[:3]) == self._signature(st):
+            return entry[3]
+        return None
+
+    def record(self, rel_path: str, st: os.stat_result, crc: int):
+        self._entries[rel_path] = [*self._signature(st), crc]
+        self._dirty = True
+
+    def save(self):
+        """Write the cache atomically if anything changed"""
+        if not self._dirty:
+            return
+        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".patch-cache-", dir=self.cache_file.parent)
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump({'version': CACHE_VERSION, 'files': self._entries}, f)
+            os.replace(tmp_path, self.cache_file)
+            self._dirty = False
+        except OSError:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+
+def _file_crc32(path: Path) -> int:
+    crc = 0
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(COPY_CHUNK_SIZE)
+            if not chunk:
+                return crc
+            crc = zlib.crc32(chunk, crc)
+
+
+def _umask() -> int:
+    """The process umask, read from /proc since os.umask() can only read it by changing it"""
+    try:
+        with open("/proc/self/status", 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError):
+        pass
+    mask = os.umask(0o022)
+    os.umask(mask)
+    return mask
+
+
+def _member_mode(target: Path, info: zipfile.ZipInfo) -> int:
+    """
+    Permissions for a patched file: those of the file it replaces, else the
+    archive's unix mode, else the default for new files.
+
+    The owner write bit is always kept, since a replaced file may be a
+    read-only deduplicated copy and the next patch must be able to replace
+    it again.
+    """
+    try:
+        mode = stat.S_IMODE(target.stat().st_mode)
+    except FileNotFoundError:
+        archive_mode = (info.external_attr >> 16) & 0o7777
+        if info.create_system == ZIP_UNIX_SYSTEM and archive_mode:
+            mode = archive_mode
+        else:
+            mode = DEFAULT_FILE_MODE & ~_umask()
+    return mode | stat.S_IWUSR
+
+
+def _safe_target(root: Path, member_name: str) -> Path:
+    target = (root / member_name).resolve()
+    if target != root and root not in target.parents:
+        raise PatchError(f"Patch member escapes destination: {member_name}")
+    return target
+
+
+class PatchApplier:
+    """Applies one zip patch archive to a game directory"""
+
+    def __init__(self, patch_path: Path, dest_dir: Path, progress_callback: Callable = None,
+                 cache_file: Optional[Path] = None):
+        """
+        Args:
+            patch_path: Zip archive containing the patch files
+            dest_dir: Installed game directory to patch
+            progress_callback: Optional callback for progress messages
+            cache_file: Stat/CRC cache location, defaults to a hidden file in dest_dir
+        """
+        self.patch_path = Path(patch_path)
+        self.dest_dir = Path(dest_dir).resolve()
+        self.progress_callback = progress_callback
+        self.cache = StatCache(cache_file or self.dest_dir / CACHE_FILE_NAME)
+        self.result = PatchResult()
+
+    def apply(self) -> PatchResult:
+        """
+        Write every member that differs from the installed file.
+
+        Returns:
+            PatchResult with written/skipped counts and bytes saved
+
+        Raises:
+            PatchError: If the archive is invalid or a member cannot be written
+        """
+        self.dest_dir.mkdir(parents=True, exist_ok=True)
+        try:
+            with zipfile.ZipFile(self.patch_path) as zf:
+                members = [info for info in zf.infolist() if not info.is_dir()]
+                self.result.files_total = len(members)
+                for info in zf.infolist():
+                    if info.is_dir():
+                        _safe_target(self.dest_dir, info.filename).mkdir(parents=True, exist_ok=True)
+                for index, info in enumerate(members, 1):
+                    self._apply_member(zf, info)
+                    if self.progress_callback:
+                        self.progress_callback(f"Patching... {index}/{len(members)} files")
+        except zipfile.BadZipFile as e:
+            raise PatchError(f"Invalid patch archive {self.patch_path}: {e}") from e
+        except OSError as e:
+            raise PatchError(f"Failed to apply {self.patch_path.name}: {e}") from e
+        finally:
+            try:
+                self.cache.save()
+            except OSError as e:
+                logger.warning(f"Could not save patch cache: {e}")
+
+        logger.info(f"{self.patch_path.name} -> {self.dest_dir}: {self.result.describe()}")
+        if self.progress_callback:
+            self.progress_callback(self.result.describe())
+        return self.result
+
+    def _is_current(self, rel_path: str, target: Path, info: zipfile.ZipInfo) -> bool:
+        try:
+            st = target.stat()
+        except FileNotFoundError:
+            return False
+        if st.st_size != info.file_size:
+            return False
+        crc = self.cache.lookup(rel_path, st)
+        if crc is None:
+            crc = _file_crc32(target)
+            self.result.bytes_hashed += st.st_size
+            self.cache.record(rel_path, st, crc)
+        return crc == info.CRC
+
+    def _apply_member(self, zf: zipfile.ZipFile, info: zipfile.ZipInfo):
+        target = _safe_target(self.dest_dir, info.filename)
+        rel_path = target.relative_to(self.dest_dir).as_posix()
+        if self._is_current(rel_path, target, info):
+            self.result.files_skipped += 1
+            self.result.bytes_skipped += info.file_size
+            return
+
+        # Write beside the target and rename so an interrupted run never
+        # leaves a truncated game file behind.
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{target.name}.", dir=target.parent)
+        try:
+            with os.fdopen(fd, 'wb') as out, zf.open(info) as src:
+                shutil.copyfileobj(src, out, COPY_CHUNK_SIZE)
+            # mkstemp creates files 0600, which would drop the exec bit
+            os.chmod(tmp_path, _member_mode(target, info))
+            mtime = time.mktime(info.date_time + (0, 0, -1))
+            os.utime(tmp_path, (mtime, mtime))
+            os.replace(tmp_path, target)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+
+        # The archive already told us the checksum of what we just wrote
+        self.cache.record(rel_path, target.stat(), info.CRC)
+        self.result.files_written += 1
+        self.result.bytes_written += info.file_size
+
+
+def apply_patch(patch_path: Path, dest_dir: Path, progress_callback: Callable = None,
+                cache_file: Optional[Path] = None) -> PatchResult:
+    """
+    Apply a zip patch archive, skipping members already present on disk.
+
+    Args:
+        patch_path: Zip archive containing the patch files
+        dest_dir: Installed game directory to patch
+        progress_callback: Optional callback for progress messages
+        cache_file: Optional stat/CRC cache location
+
+    Returns:
+        PatchResult describing what was written and what was skipped
+    """
+    return PatchApplier(patch_path, dest_dir, progress_callback, cache_file).apply()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Apply a zip patch, writing only files that changed")
+    parser.add_argument("patch", help="Patch zip archive")
+    parser.add_argument("dest", nargs="+", help="Game directories to patch")
+    args = parser.parse_args(argv)
+
+    for dest in args.dest:
+        try:
+            result = apply_patch(Path(args.patch), Path(dest))
+        except PatchError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        print(f"{dest}: {result.describe()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
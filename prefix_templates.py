@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""
+Wine prefix template module
+Keeps pre-initialised prefixes with winetricks verbs already installed, keyed
+by Proton version and verb set, and clones them for new installs
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Optional, Callable, Dict, Iterable, List
+
+from content_store import clone_tree
+from proton_runtime import ProtonRegistry
+from resource_isolation import IOPRIO_CLASS_IDLE, set_io_priority
+from system_probe import SystemProbe, DEFAULT_CACHE_FILE
+
+# Constants
+DEFAULT_PROTON = "GE-Proton"
+DEFAULT_TEMPLATES_DIR = Path.home() / "Games" / "umu" / ".templates"
+MANIFEST_NAME = "template.json"
+UMU_COMMANDS = ["umu-run", "umu"]
+DEFAULT_POOL_SIZE = 2
+SETTINGS_FILE = Path.home() / ".config" / "mmo-launcher" / "settings.json"
+POOL_READY_PREFIX = "ready-"
+POOL_FILLING_PREFIX = ".filling-"
+IDLE_NICE = 19
+
+# Catalog dependencies that are host packages or runtimes, not winetricks verbs
+NON_WINETRICKS_DEPENDENCIES = {
+    "umu-launcher", "wine", "wine-staging", "winetricks", "proton", "proton-ge",
+    "steam", "flatpak", "unzip", "java", "java-10-openjdk", "xivlauncher",
+    "battleye-runtime",
+}
+
+logger = logging.getLogger("game_installer.prefix")
+
+
+class TemplateBuildError(Exception):
+    """Raised when a prefix template cannot be built"""
+
+
+def winetricks_verbs(dependencies: Iterable[str]) -> List[str]:
+    """Extract the winetricks verbs from a games_db dependency list, sorted"""
+    return sorted({dep for dep in dependencies if dep not in NON_WINETRICKS_DEPENDENCIES})
+
+
+def requested_verbs(game_id: Optional[str], extra: Iterable[str] = ()) -> List[str]:
+    """
+    Verbs a template needs: the game's catalog verbs plus any extra ones.
+
+    Install scripts pass their own verbs (fonts, runtimes the catalog does
+    not list) alongside --game, so neither set may replace the other.
+    """
+    verbs = set(extra)
+    if game_id:
+        from games_db import get_game_by_id
+        game_data = get_game_by_id(game_id)
+        if game_data:
+            verbs.update(winetricks_verbs(game_data['dependencies']))
+    return sorted(verbs)
+
+
+def template_key(proton: str, verbs: Iterable[str]) -> str:
+    """
+    Stable directory name for a (Proton build, verb set) pair.
+
+    proton is a PROTONPATH: a local build directory, whose name identifies
+    the Wine version, or umu's GE-Proton alias when no build is installed.
+    """
+    verbs = sorted(set(verbs))
+    digest = hashlib.sha1(" ".join(verbs).encode('utf-8')).hexdigest()[:12]
+    safe_proton = "".join(c if c.isalnum() or c in ".-_" else "_" for c in Path(proton).name or proton)
+    return f"{safe_proton}-{digest}"
+
+
+def default_proton() -> str:
+    """PROTONPATH GameInstaller.proton_path() picks for unpinned games: the newest local build"""
+    path = ProtonRegistry().resolve()
+    return str(path) if path else DEFAULT_PROTON
+
+
+def _find_umu(which: Callable[[str], Optional[str]]) -> Optional[str]:
+    for cmd in UMU_COMMANDS:
+        if which(cmd):
+            return cmd
+    return None
+
+
+def configured_pool_size() -> int:
+    """Pool size from the launcher's settings.json, for the shell helpers"""
+    try:
+        with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
+            return int(json.load(f).get('prefix_pool_size', DEFAULT_POOL_SIZE))
+    except (OSError, ValueError, TypeError):
+        return DEFAULT_POOL_SIZE
+
+
+def _idle_command(cmd: List[str], which: Callable[[str], Optional[str]]) -> List[str]:
+    """Wrap a command so it runs at idle I/O and lowest CPU priority"""
+    prefix = []
+    if which("ionice"):
+        prefix += ["ionice", "-c", "3"]
+    if which("nice"):
+        prefix += ["nice", "-n", str(IDLE_NICE)]
+    return prefix + cmd
+
+
+def _idle_thread():
+    """Run the calling thread at idle I/O and lowest CPU priority, for good"""
+    tid = threading.get_native_id()
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, IDLE_NICE)
+    except OSError as e:
+        logger.debug(f"Could not lower thread priority: {e}")
+    set_io_priority(0, IOPRIO_CLASS_IDLE)
+
+
+class TemplateLibrary:
+    """Library of pre-initialised Wine prefixes"""
+
+    def __init__(self, templates_dir: Path = DEFAULT_TEMPLATES_DIR,
+                 command_wrapper: Optional[Callable[[List[str]], List[str]]] = None,
+                 which: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Args:
+            templates_dir: Directory holding the templates
+            command_wrapper: Optional callback that wraps build commands, e.g. to
+                run them in a background scope
+            which: Lookup for umu, ionice and nice, normally SystemProbe.which
+                (default: shutil.which)
+        """
+        self.templates_dir = Path(templates_dir)
+        self.command_wrapper = command_wrapper
+        self.which = which or shutil.which
+        self._lock = threading.Lock()
+        self._building: Dict[str, threading.Thread] = {}
+
+    def _command(self, cmd: List[str], low_priority: bool = False) -> List[str]:
+        cmd = _idle_command(cmd, self.which) if low_priority else list(cmd)
+        return self.command_wrapper(cmd) if self.command_wrapper else cmd
+
+    def template_path(self, proton: str, verbs: Iterable[str]) -> Path:
+        return self.templates_dir / template_key(proton, verbs)
+
+    def get_template(self, proton: str, verbs: Iterable[str]) -> Optional[Path]:
+        """Return the template prefix if it has been built"""
+        path = self.template_path(proton, verbs)
+        if (path / MANIFEST_NAME).exists() and (path / "drive_c").is_dir():
+            return path
+        return None
+
+    def list_templates(self) -> List[Dict]:
+        """Manifests of all built templates"""
+        manifests = []
+        for manifest in sorted(self.templates_dir.glob(f"*/{MANIFEST_NAME}")):
+            try:
+                with open(manifest, 'r', encoding='utf-8') as f:
+                    manifests.append({**json.load(f), 'path': str(manifest.parent)})
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable template manifest {manifest}: {e}")
+        return manifests
+
+    def build(self, proton: str, verbs: Iterable[str], progress_callback: Callable = None,
+              low_priority: bool = False) -> Path:
+        """
+        Build a template prefix unless it already exists.
+
+        Args:
+            proton: PROTONPATH value used for the prefix
+            verbs: Winetricks verbs to pre-install
+            progress_callback: Optional callback for progress messages
+            low_priority: Run wine at idle I/O and CPU priority
+
+        Returns:
+            Path of the template prefix
+
+        Raises:
+            TemplateBuildError: If umu is missing or prefix creation fails
+        """
+        verbs = sorted(set(verbs))
+        existing = self.get_template(proton, verbs)
+        if existing:
+            return existing
+
+        umu_cmd = _find_umu(self.which)
+        if not umu_cmd:
+            raise TemplateBuildError("umu-run not found, cannot build prefix templates")
+
+        target = self.template_path(proton, verbs)
+        staging = target.with_name(f".{target.name}.building")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        env = {**os.environ, 'WINEPREFIX': str(staging), 'PROTONPATH': proton}
+        started = time.monotonic()
+        try:
+            if progress_callback:
+                progress_callback(f"Initialising template prefix for {proton}...")
+            subprocess.run(self._command([umu_cmd, ""], low_priority), env=env, capture_output=True)
+            if not (staging / "drive_c").is_dir():
+                raise TemplateBuildError(f"{umu_cmd} did not create a prefix in {staging}")
+
+            if verbs:
+                if progress_callback:
+                    progress_callback(f"Installing {' '.join(verbs)} into template...")
+                result = subprocess.run(self._command([umu_cmd, "winetricks", "-q", *verbs], low_priority), env=env,
+                                        capture_output=True, text=True)
+                if result.returncode != 0:
+                    raise TemplateBuildError(f"winetricks failed: {result.stderr.strip()[-500:]}")
+
+            manifest = {
+                'proton': proton,
+                'verbs': verbs,
+                'built': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                'build_seconds': round(time.monotonic() - started, 1),
+            }
+            with open(staging / MANIFEST_NAME, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            shutil.rmtree(target, ignore_errors=True)
+            staging.rename(target)
+        except BaseException:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        logger.info(f"Built prefix template {target.name} ({proton}; {' '.join(verbs) or 'no verbs'})")
+        return target
+
+    def build_in_background(self, proton: str, verb_sets: Iterable[Iterable[str]]) -> Optional[threading.Thread]:
+        """
+        Build missing templates one after another on a daemon thread at idle priority.
+
+        Returns:
+            The build thread, or None if every template exists or is already
+            queued
+        """
+        with self._lock:
+            pending = {}
+            for verbs in verb_sets:
+                verbs = sorted(set(verbs))
+                key = template_key(proton, verbs)
+                if key not in self._building and self.get_template(proton, verbs) is None:
+                    pending[key] = verbs
+            if not pending:
+                return None
+
+            def run():
+                for key, verbs in pending.items():
+                    try:
+                        self.build(proton, verbs, low_priority=True)
+                    except (OSError, TemplateBuildError) as e:
+                        logger.error(f"Background build of template {key} failed: {e}")
+                    finally:
+                        with self._lock:
+                            self._building.pop(key, None)
+
+            thread = threading.Thread(target=run, name="prefix-templates", daemon=True)
+            for key in pending:
+                self._building[key] = thread
+            thread.start()
+        return thread
+
+    def clone(self, proton: str, verbs: Iterable[str], dest_prefix: Path,
+              progress_callback: Callable = None, build_missing: bool = True) -> bool:
+        """
+        Create a prefix by cloning the matching template.
+
+        Args:
+            proton: PROTONPATH value the prefix will be used with
+            verbs: Winetricks verbs the game needs
+            dest_prefix: Prefix directory to create; must not be initialised yet
+            progress_callback: Optional callback for progress messages
+            build_missing: Build the template first if it does not exist
+
+        Returns:
+            True if dest_prefix was created from a template
+        """
+        dest_prefix = Path(dest_prefix)
+        if (dest_prefix / "drive_c").exists():
+            return False
+
+        template = self.get_template(proton, verbs)
+        if template is None:
+            if not build_missing:
+                return False
+            template = self.build(proton, verbs, progress_callback)
+
+        if progress_callback:
+            progress_callback(f"Cloning Wine prefix template {template.name}...")
+        # Wine rewrites registry hives and DLLs in place, so prefixes are only
+        # ever reflinked or copied, never hardlinked
+        report = clone_tree(template, dest_prefix, allow_hardlinks=False)
+        (dest_prefix / MANIFEST_NAME).unlink(missing_ok=True)
+        logger.info(f"Created prefix {dest_prefix} from template {template.name}: {report.describe()}")
+        return True
+
+
+class PrefixPool:
+    """
+    Pool of ready-to-use prefixes cloned from templates ahead of time.
+
+    Slots are filled under a hidden name and renamed to ready-* only when
+    complete. Claiming renames a ready slot onto the game's prefix path,
+    which is atomic, so concurrent installers never share a slot. The pool
+    must live on the same filesystem as the prefixes it serves.
+    """
+
+    def __init__(self, pool_dir: Path, library: TemplateLibrary, size: int = DEFAULT_POOL_SIZE):
+        self.pool_dir = Path(pool_dir)
+        self.library = library
+        self.size = size
+        self._lock = threading.Lock()
+        self._refilling = set()
+
+    def _slots_dir(self, proton: str, verbs: Iterable[str]) -> Path:
+        return self.pool_dir / template_key(proton, verbs)
+
+    def available(self, proton: str, verbs: Iterable[str]) -> int:
+        slots_dir = self._slots_dir(proton, verbs)
+        if not slots_dir.is_dir():
+            return 0
+        return sum(1 for p in slots_dir.iterdir() if p.name.startswith(POOL_READY_PREFIX))
+
+    def claim(self, proton: str, verbs: Iterable[str], dest_prefix: Path) -> bool:
+        """
+        Move a ready prefix into place.
+
+        Returns:
+            True if dest_prefix now holds a claimed prefix
+        """
+        dest_prefix = Path(dest_prefix)
+        if (dest_prefix / "drive_c").exists():
+            return False
+        slots_dir = self._slots_dir(proton, verbs)
+        if not slots_dir.is_dir():
+            return False
+
+        dest_prefix.parent.mkdir(parents=True, exist_ok=True)
+        for slot in sorted(slots_dir.glob(f"{POOL_READY_PREFIX}*")):
+            try:
+                # rename() replaces an empty destination directory and fails
+                # if another process already took this slot
+                os.rename(slot, dest_prefix)
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Cannot claim pooled prefix {slot} for {dest_prefix}: {e}")
+                return False
+            logger.info(f"Claimed pooled prefix {slot.name} for {dest_prefix}")
+            return True
+        return False
+
+    def refill(self, proton: str, verbs: Iterable[str]) -> int:
+        """
+        Top the pool up to its configured size, building the template at
+        idle priority if needed.
+
+        Returns:
+            Number of slots created
+        """
+        verbs = sorted(set(verbs))
+        template = self.library.build(proton, verbs, low_priority=True)
+        slots_dir = self._slots_dir(proton, verbs)
+        slots_dir.mkdir(parents=True, exist_ok=True)
+        for stale in slots_dir.glob(f"{POOL_FILLING_PREFIX}*"):
+            shutil.rmtree(stale, ignore_errors=True)
+
+        created = 0
+        while self.available(proton, verbs) < self.size:
+            slot_id = uuid.uuid4().hex[:12]
+            staging = slots_dir / f"{POOL_FILLING_PREFIX}{slot_id}"
+            try:
+                # Reflinked or copied like TemplateLibrary.clone, never hardlinked
+                clone_tree(template, staging, allow_hardlinks=False)
+            except OSError as e:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise OSError(f"Failed to fill prefix pool: {e}") from e
+            (staging / MANIFEST_NAME).unlink(missing_ok=True)
+            staging.rename(slots_dir / f"{POOL_READY_PREFIX}{slot_id}")
+            created += 1
+        if created:
+            logger.info(f"Refilled prefix pool {slots_dir.name} with {created} prefix(es)")
+        return created
+
+    def refill_in_background(self, proton: str, verbs: Iterable[str]) -> Optional[threading.Thread]:
+        """
+        Refill the pool on a daemon thread.
+
+        Returns:
+            The refill thread, or None if the pool is full or already refilling
+        """
+        verbs = sorted(set(verbs))
+        key = template_key(proton, verbs)
+        with self._lock:
+            if key in self._refilling or self.size <= 0 or self.available(proton, verbs) >= self.size:
+                return None
+            self._refilling.add(key)
+
+        def run():
+            # Cloning a template is pure disk I/O; keep it out of the way of
+            # installs and launches as the shell helpers' ionice -c3 refill does
+            _idle_thread()
+            try:
+                self.refill(proton, verbs)
+            except (OSError, TemplateBuildError) as e:
+                logger.error(f"Refilling prefix pool {key} failed: {e}")
+            finally:
+                with self._lock:
+                    self._refilling.discard(key)
+
+        thread = threading.Thread(target=run, name=f"prefix-pool-{key}", daemon=True)
+        thread.start()
+        return thread
+
+
+def provision_prefix(library: TemplateLibrary, pool: Optional[PrefixPool], proton: str,
+                     verbs: Iterable[str], dest_prefix: Path, progress_callback: Callable = None) -> bool:
+    """
+    Create a prefix the fastest way available: pooled, then cloned from a template.
+
+    Returns:
+        True if dest_prefix was created
+    """
+    verbs = sorted(set(verbs))
+    if pool is not None and pool.claim(proton, verbs, dest_prefix):
+        if progress_callback:
+            progress_callback("Using a pre-booted Wine prefix from the pool")
+        created = True
+    else:
+        created = library.clone(proton, verbs, dest_prefix, progress_callback)
+    if created and pool is not None:
+        pool.refill_in_background(proton, verbs)
+    return created
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Manage pre-initialised Wine prefix templates")
+    parser.add_argument("--templates-dir", default=str(DEFAULT_TEMPLATES_DIR), help="Template library location")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for name, help_text in (("build", "Build a template"), ("clone", "Create a prefix from a template")):
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--proton", default=None, help="PROTONPATH for the prefix (default: newest local build)")
+        sub.add_argument("--game", help="Take winetricks verbs from this game's dependencies in games_db")
+        sub.add_argument("--verbs", default="", help="Space-separated verbs added to those of --game")
+        if name == "clone":
+            sub.add_argument("--dest", required=True, help="Prefix directory to create")
+    refill_parser = subparsers.add_parser("refill", help="Top up the pre-booted prefix pool")
+    refill_parser.add_argument("--proton", default=None, help="PROTONPATH for the prefixes (default: newest local build)")
+    refill_parser.add_argument("--verbs", default="", help="Space-separated verbs of the pooled prefixes")
+    subparsers.add_parser("list", help="List built templates")
+    parser.add_argument("--pool-size", type=int, default=configured_pool_size(),
+                        help="Pre-booted prefixes kept per template")
+    args = parser.parse_args(argv)
+
+    library = TemplateLibrary(Path(args.templates_dir), which=SystemProbe(DEFAULT_CACHE_FILE).which)
+    pool = PrefixPool(Path(args.templates_dir).parent / ".pool", library, args.pool_size)
+    if args.command == "list":
+        for manifest in library.list_templates():
+            print(f"{manifest['proton']:<16} {' '.join(manifest['verbs']) or '-'}  ({manifest['path']})")
+        return 0
+
+    verbs = requested_verbs(getattr(args, 'game', None), args.verbs.split())
+    args.proton = args.proton or default_proton()
+
+    try:
+        if args.command == "build":
+            print(library.build(args.proton, verbs, print))
+            return 0
+        if args.command == "refill":
+            print(f"Created {pool.refill(args.proton, verbs)} pooled prefix(es)")
+            return 0
+        if pool.claim(args.proton, verbs, Path(args.dest)):
+            print("Using a pre-booted Wine prefix from the pool")
+        elif not library.clone(args.proton, verbs, Path(args.dest), print):
+            return 1
+        # Refill after this process exits so the script is not kept waiting
+        subprocess.Popen(
+            _idle_command([sys.executable, str(Path(__file__).resolve()), "--templates-dir", args.templates_dir,
+                           "--pool-size", str(args.pool_size), "refill", "--proton", args.proton,
+                           "--verbs", " ".join(verbs)], library.which),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+        )
+        return 0
+    except (OSError, TemplateBuildError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,243 @@
+"""
+Process runner module
+Runs installers and helper tools with their stdout and stderr streamed line
+by line to a callback, keeping only the last lines for failure reports
+instead of buffering the whole output
+"""
+
+import asyncio
+import logging
+import os
+import re
+import signal
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Sequence, Tuple, Union
+
+# Constants
+DEFAULT_TAIL_LINES = 200
+READ_CHUNK_SIZE = 64 * 1024
+MAX_LINE_LENGTH = 4096
+CANCEL_POLL_INTERVAL = 0.25
+TERMINATE_GRACE_SECONDS = 5.0
+PIPE_DRAIN_SECONDS = 2.0
+
+# Progress bars redraw a line with \r many times a second; pass on at most
+# one redraw per interval
+REDRAW_INTERVAL = 0.5
+
+_LINE_END = re.compile(rb"\r\n|\n|\r")
+
+STDOUT = "stdout"
+STDERR = "stderr"
+
+logger = logging.getLogger("game_installer.process")
+
+
+class ProcessResult:
+    """Exit status and the last lines of output of a finished process"""
+
+    def __init__(self, args: Sequence[str], returncode: int, tail: List[Tuple[str, str]],
+                 cancelled: bool = False, lines: int = 0):
+        self.args = list(args)
+        self.returncode = returncode
+        self.tail = tail
+        self.cancelled = cancelled
+        self.lines = lines
+
+    @property
+    def ok(self) -> bool:
+        return self.returncode == 0 and not self.cancelled
+
+    def output(self, stream: Optional[str] = None) -> str:
+        """Kept output as text, optionally only one stream (STDOUT or STDERR)"""
+        return "\n".join(line for name, line in self.tail if stream is None or name == stream)
+
+    def failure_report(self, max_lines: int = 20) -> str:
+        """Short description of a failed run for logs and progress messages"""
+        command = Path(self.args[0]).name if self.args else "process"
+        if self.cancelled:
+            return f"{command} was cancelled"
+        lines = [line for _, line in self.tail[-max_lines:]]
+        report = f"{command} exited with status {self.returncode}"
+        return report + (":\n" + "\n".join(lines) if lines else "")
+
+    def __repr__(self) -> str:
+        return f"ProcessResult({self.args[:1]!r}, returncode={self.returncode}, lines={self.lines})"
+
+
+class _LineSplitter:
+    """Splits a byte stream into lines on \\n and \\r, capping line length"""
+
+    def __init__(self):
+        self.buffer = b""
+
+    def feed(self, data: bytes) -> List[Tuple[str, bool]]:
+        """Returns (line, is_redraw) pairs; a redraw line ended with a lone \\r"""
+        self.buffer += data
+        lines = []
+        pos = 0
+        for match in _LINE_END.finditer(self.buffer):
+            if match.group() == b"\r" and match.end() == len(self.buffer):
+                break  # may be the first half of \r\n
+            lines.append((_decode(self.buffer[pos:match.start()]), match.group() == b"\r"))
+            pos = match.end()
+        self.buffer = self.buffer[pos:]
+        if len(self.buffer) > MAX_LINE_LENGTH:
+            lines.append((_decode(self.buffer), False))
+            self.buffer = b""
+        return lines
+
+    def flush(self) -> List[Tuple[str, bool]]:
+        rest, self.buffer = self.buffer, b""
+        return [(_decode(rest), False)] if rest else []
+
+
+def _decode(raw: bytes) -> str:
+    return raw[:MAX_LINE_LENGTH].decode("utf-8", errors="replace").rstrip()
+
+
+async def _pump(stream: asyncio.StreamReader, name: str, tail: deque, line_callback: Optional[Callable],
+                counter: List[int]):
+    splitter = _LineSplitter()
+    last_redraw = 0.0
+    while True:
+        data = await stream.read(READ_CHUNK_SIZE)
+        chunks = splitter.feed(data) if data else splitter.flush()
+        for line, redraw in chunks:
+            if not line:
+                continue
+            if redraw:
+                now = time.monotonic()
+                if now - last_redraw < REDRAW_INTERVAL:
+                    continue
+                last_redraw = now
+            else:
+                counter[0] += 1
+                tail.append((name, line))
+            if line_callback:
+                try:
+                    line_callback(line)
+                except Exception as e:
+                    logger.warning(f"Output callback failed: {e}")
+        if not data:
+            return
+
+
+async def _stop(proc: asyncio.subprocess.Process, group: bool):
+    """Terminate the process (or its group), then kill it if it does not exit"""
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            if group:
+                os.killpg(proc.pid, sig)
+            else:
+                proc.send_signal(sig)
+        except (ProcessLookupError, PermissionError):
+            return
+        deadline = time.monotonic() + TERMINATE_GRACE_SECONDS
+        while proc.returncode is None and time.monotonic() < deadline:
+            await asyncio.sleep(CANCEL_POLL_INTERVAL)
+        if proc.returncode is not None:
+            return
+
+
+async def _open_pipe(loop: asyncio.AbstractEventLoop) -> Tuple[int, asyncio.StreamReader, asyncio.BaseTransport]:
+    """Pipe whose read end is served by the loop; returns (write fd, reader, transport)"""
+    read_fd, write_fd = os.pipe()
+    reader = asyncio.StreamReader()
+    transport, _ = await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader),
+                                                os.fdopen(read_fd, "rb", buffering=0))
+    return write_fd, reader, transport
+
+
+async def _run(args: Sequence[str], line_callback: Optional[Callable], env: Optional[Dict[str, str]],
+               cwd: Optional[Union[str, Path]], cancel_event: Optional[threading.Event],
+               tail_lines: int, stdin_devnull: bool, new_session: bool) -> ProcessResult:
+    # The pipes are ours rather than the subprocess transport's, so they can
+    # be closed when a child that outlives the process keeps them open
+    loop = asyncio.get_running_loop()
+    pipes = [await _open_pipe(loop) for _ in (STDOUT, STDERR)]
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            *args, stdout=pipes[0][0], stderr=pipes[1][0],
+            stdin=asyncio.subprocess.DEVNULL if stdin_devnull else None,
+            env=env, cwd=cwd, start_new_session=new_session,
+        )
+    except BaseException:
+        for _, _, transport in pipes:
+            transport.close()
+        raise
+    finally:
+        for write_fd, _, _ in pipes:
+            os.close(write_fd)
+    tail: deque = deque(maxlen=tail_lines)
+    counter = [0]
+    pumps = asyncio.gather(_pump(pipes[0][1], STDOUT, tail, line_callback, counter),
+                           _pump(pipes[1][1], STDERR, tail, line_callback, counter))
+    cancelled = False
+    # Poll the exit status rather than awaiting proc.wait(), which also waits
+    # for the pipes to close
+    while proc.returncode is None:
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            await _stop(proc, new_session)
+            break
+        await asyncio.sleep(CANCEL_POLL_INTERVAL)
+    # Children such as wineserver may hold the pipes open after the process exits
+    try:
+        await asyncio.wait_for(pumps, PIPE_DRAIN_SECONDS)
+    except asyncio.TimeoutError:
+        logger.debug(f"{args[0]} exited but its output pipes are still open")
+    finally:
+        for _, _, transport in pipes:
+            transport.close()
+    returncode = proc.returncode
+    return ProcessResult(args, returncode, list(tail), cancelled, counter[0])
+
+
+def run_streamed(args: Sequence[str], line_callback: Optional[Callable[[str], None]] = None,
+                 env: Optional[Dict[str, str]] = None, cwd: Optional[Union[str, Path]] = None,
+                 cancel_event: Optional[threading.Event] = None, tail_lines: int = DEFAULT_TAIL_LINES,
+                 stdin_devnull: bool = True, new_session: bool = True) -> ProcessResult:
+    """
+    Run a command, passing each line of its output to a callback as it arrives.
+
+    Only the last ``tail_lines`` lines are kept, so chatty tools do not grow
+    memory without bound. Must not be called from a thread that is already
+    running an asyncio event loop.
+
+    Args:
+        args: Command and arguments
+        line_callback: Optional callback(line) for stdout and stderr lines
+        env: Environment for the process (defaults to the current one)
+        cwd: Working directory
+        cancel_event: Optional event that terminates the process when set
+        tail_lines: Number of output lines kept for the result
+        stdin_devnull: Give the process no stdin (set False for tools that prompt)
+        new_session: Start the process in its own session, so cancelling also
+            stops its children (wineserver, installers). Set False for tools
+            that need the controlling terminal, such as sudo asking for a
+            password; cancelling then only signals the process itself
+
+    Returns:
+        ProcessResult with the exit status and the kept lines
+
+    Raises:
+        FileNotFoundError: If the command does not exist
+    """
+    args = [str(a) for a in args]
+    result = asyncio.run(_run(args, line_callback, env, cwd, cancel_event, tail_lines, stdin_devnull,
+                                  new_session))
+    if not result.ok:
+        logger.info(f"{args[0]} finished with status {result.returncode} after {result.lines} lines"
+                    f"{' (cancelled)' if result.cancelled else ''}")
+    return result
+
+
+def progress_lines(progress_callback: Optional[Callable], prefix: str = "") -> Optional[Callable[[str], None]]:
+    """Adapt an installer progress callback to receive process output lines"""
+    if progress_callback is None:
+        return None
+    return lambda line: progress_callback(f"{prefix}{line}")
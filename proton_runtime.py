@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Proton runtime module
+Keeps GE-Proton builds in a local registry so launches can pass umu a
+concrete PROTONPATH instead of having it resolve (and possibly download)
+the latest release on every first click
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import re
+import shutil
+import sys
+import tarfile
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+from typing import Optional, Callable, Dict, Iterable, List, Tuple
+
+# Constants
+DEFAULT_RUNTIMES_DIR = Path.home() / "Games" / "umu" / ".proton"
+# Where umu and ProtonUp-Qt unpack builds; reused read-only
+EXTRA_SEARCH_DIRS = [
+    Path.home() / ".local" / "share" / "Steam" / "compatibilitytools.d",
+    Path.home() / ".steam" / "root" / "compatibilitytools.d",
+    Path.home() / ".local" / "share" / "umu" / "compatibilitytools",
+]
+BUILD_PREFIX = "GE-Proton"
+RELEASES_URL = "https://api.github.com/repos/GloriousEggroll/proton-ge-custom/releases/latest"
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64)"
+STATE_FILE_NAME = "registry.json"
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Look for a new release at most this often
+PREFETCH_INTERVAL = 24 * 3600
+
+# Unpinned builds kept in the managed directory
+KEEP_BUILDS = 2
+
+logger = logging.getLogger("game_installer.proton")
+
+
+class ProtonBuildError(Exception):
+    """Raised when a Proton build cannot be fetched or unpacked"""
+
+
+def version_key(name: str) -> Tuple[int, ...]:
+    """Sort key for build names such as GE-Proton9-20"""
+    return tuple(int(n) for n in re.findall(r"\d+", name))
+
+
+def is_build(path: Path) -> bool:
+    """Whether a directory is an unpacked Proton build"""
+    return (path / "proton").is_file()
+
+
+class ProtonRegistry:
+    """
+    Local Proton builds, the managed directory first, then the directories
+    other tools unpack builds into.
+
+    ``resolve(pin)`` picks the build for a launch without touching the
+    network; ``prefetch()`` fetches a new release ahead of time.
+    """
+
+    def __init__(self, runtimes_dir: Optional[Path] = None, search_dirs: Optional[Iterable[Path]] = None):
+        """
+        Args:
+            runtimes_dir: Directory the launcher unpacks builds into
+            search_dirs: Other directories to pick up builds from
+        """
+        self.runtimes_dir = Path(runtimes_dir) if runtimes_dir else DEFAULT_RUNTIMES_DIR
+        self.search_dirs = [Path(d) for d in (EXTRA_SEARCH_DIRS if search_dirs is None else search_dirs)]
+        self.state_file = self.runtimes_dir / STATE_FILE_NAME
+        self._lock = threading.Lock()
+        self._prefetching: Optional[threading.Thread] = None
+
+    def builds(self) -> Dict[str, Path]:
+        """Installed builds, name -> path, oldest first"""
+        found: Dict[str, Path] = {}
+        for directory in [*self.search_dirs, self.runtimes_dir]:
+            try:
+                entries = list(directory.iterdir())
+            except OSError:
+                continue
+            for entry in entries:
+                if not entry.name.startswith(".") and is_build(entry):
+                    found[entry.name] = entry  # managed directory wins
+        return {name: found[name] for name in sorted(found, key=version_key)}
+
+    def latest(self) -> Optional[str]:
+        """Newest installed GE-Proton build"""
+        names = [name for name in self.builds() if name.startswith(BUILD_PREFIX)]
+        return names[-1] if names else None
+
+    def resolve(self, pin: Optional[str] = None) -> Optional[Path]:
+        """
+        Build to launch with, without any network access.
+
+        Args:
+            pin: Build name a game is pinned to (None: newest installed)
+
+        Returns:
+            Path for PROTONPATH, or None if no build is installed
+        """
+        builds = self.builds()
+        if pin:
+            if pin in builds:
+                return builds[pin]
+            logger.warning(f"Pinned Proton build {pin} is not installed, using the newest local build")
+        latest = self.latest()
+        return builds[latest] if latest else None
+
+    # --- State ----------------------------------------------------------
+    def _load_state(self) -> dict:
+        try:
+            with open(self.state_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_state(self, state: dict):
+        self.runtimes_dir.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_file.with_name(self.state_file.name + ".tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, self.state_file)
+
+    # --- Fetching -------------------------------------------------------
+    def latest_release(self, timeout: float = 15) -> Tuple[str, str, Optional[str]]:
+        """
+        Look up the newest GE-Proton release.
+
+        Returns:
+            (tag, tarball URL, checksum URL or None)
+
+        Raises:
+            ProtonBuildError: If the release cannot be looked up
+        """
+        request = urllib.request.Request(RELEASES_URL, headers={'User-Agent': USER_AGENT,
+                                                               'Accept': "application/vnd.github+json"})
+        try:
+            with urllib.request.urlopen(request, timeout=timeout) as response:
+                release = json.load(response)
+        except (urllib.error.URLError, OSError, ValueError) as e:
+            raise ProtonBuildError(f"Could not look up the latest GE-Proton release: {e}") from e
+        assets = {a.get('name', ''): a.get('browser_download_url') for a in release.get('assets', [])}
+        tarball = next((name for name in assets if name.endswith(".tar.gz")), None)
+        if not release.get('tag_name') or not tarball:
+            raise ProtonBuildError("Latest GE-Proton release has no tarball")
+        checksum = next((assets[name] for name in assets if name.endswith(".sha512sum")), None)
+        return release['tag_name'], assets[tarball], checksum
+
+    def install(self, tag: str, url: str, checksum_url: Optional[str] = None,
+                progress_callback: Optional[Callable] = None) -> Path:
+        """
+        Download and unpack a build into the managed directory.
+
+        The tarball is verified against its .sha512sum when one is published,
+        and the build is renamed into place only once fully unpacked.
+
+        Returns:
+            Path of the installed build
+
+        Raises:
+            ProtonBuildError: If the download, checksum or unpacking fails
+        """
+        target = self.runtimes_dir / tag
+        if is_build(target):
+            return target
+        self.runtimes_dir.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".fetch-{tag}-", dir=self.runtimes_dir))
+        try:
+            tarball = staging / f"{tag}.tar.gz"
+            if progress_callback:
+                progress_callback(f"Downloading {tag}...")
+            self._download(url, tarball)
+            if checksum_url:
+                self._verify(tarball, checksum_url)
+            if progress_callback:
+                progress_callback(f"Unpacking {tag}...")
+            unpacked = staging / "unpacked"
+            with tarfile.open(tarball) as archive:
+                if hasattr(tarfile, 'data_filter'):
+                    archive.extractall(unpacked, filter='data')
+                else:
+                    for member in archive.getmembers():
+                        if member.name.startswith("/") or ".." in Path(member.name).parts:
+                            raise ProtonBuildError(f"Unsafe path in {tarball.name}: {member.name}")
+                    archive.extractall(unpacked)
+            roots = [p for p in unpacked.iterdir() if is_build(p)]
+            if len(roots) != 1:
+                raise ProtonBuildError(f"{tarball.name} does not contain a single Proton build")
+            os.replace(roots[0], target)
+        except (OSError, tarfile.TarError) as e:
+            raise ProtonBuildError(f"Installing {tag} failed: {e}") from e
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+        logger.info(f"Installed Proton build {tag} to {target}")
+        return target
+
+    def _download(self, url: str, dest: Path):
+        request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=60) as response, open(dest, 'wb') as out:
+                shutil.copyfileobj(response, out, DOWNLOAD_CHUNK_SIZE)
+        except urllib.error.URLError as e:
+            raise ProtonBuildError(f"Download of {url} failed: {e}") from e
+
+    def _verify(self, tarball: Path, checksum_url: str):
+        request = urllib.request.Request(checksum_url, headers={'User-Agent': USER_AGENT})
+        try:
+            with urllib.request.urlopen(request, timeout=15) as response:
+                expected = response.read().decode('utf-8', errors='replace').split()[0].lower()
+        except (urllib.error.URLError, OSError, IndexError) as e:
+            raise ProtonBuildError(f"Could not fetch checksum {checksum_url}: {e}") from e
+        digest = hashlib.sha512()
+        with open(tarball, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+        if digest.hexdigest() != expected:
+            raise ProtonBuildError(f"Checksum mismatch for {tarball.name}")
+
+    def prefetch(self, keep: Iterable[str] = (), force: bool = False,
+                 progress_callback: Optional[Callable] = None) -> Optional[str]:
+        """
+        Install the newest release if it is not installed yet.
+
+        Args:
+            keep: Build names games are pinned to (never pruned)
+            force: Check even if the last check was recent
+            progress_callback: Optional callback for progress messages
+
+        Returns:
+            Name of the newly installed build, or None
+        """
+        state = self._load_state()
+        if not force and time.time() - state.get('checked_at', 0) < PREFETCH_INTERVAL:
+            return None
+        tag, url, checksum_url = self.latest_release()
+        state['checked_at'] = time.time()
+        state['latest'] = tag
+        self._save_state(state)
+        if tag in self.builds():
+            return None
+        self.install(tag, url, checksum_url, progress_callback)
+        self.prune(keep)
+        return tag
+
+    def prefetch_in_background(self, keep: Iterable[str] = ()) -> Optional[threading.Thread]:
+        """
+        Run prefetch() on a daemon thread.
+
+        Returns:
+            The thread, or None if a prefetch is already running
+        """
+        keep = list(keep)
+        with self._lock:
+            if self._prefetching is not None and self._prefetching.is_alive():
+                return None
+
+            def run():
+                try:
+                    self.prefetch(keep)
+                except ProtonBuildError as e:
+                    logger.warning(f"Proton prefetch failed: {e}")
+
+            self._prefetching = threading.Thread(target=run, name="proton-prefetch", daemon=True)
+            self._prefetching.start()
+            return self._prefetching
+
+    def prune(self, keep: Iterable[str] = ()) -> List[str]:
+        """
+        Remove old managed builds, keeping pinned ones and the newest KEEP_BUILDS.
+
+        Returns:
+            Names of the removed builds
+        """
+        keep = set(keep)
+        try:
+            managed = sorted((p.name for p in self.runtimes_dir.iterdir()
+                              if not p.name.startswith(".") and is_build(p)), key=version_key)
+        except OSError:
+            return []
+        removed = []
+        for name in managed[:-KEEP_BUILDS] if KEEP_BUILDS else managed:
+            if name not in keep:
+                shutil.rmtree(self.runtimes_dir / name, ignore_errors=True)
+                removed.append(name)
+                logger.info(f"Removed old Proton build {name}")
+        return removed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Manage the launcher's local Proton builds")
+    parser.add_argument("--runtimes-dir", default=str(DEFAULT_RUNTIMES_DIR),
+                        help="Directory builds are unpacked into")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List installed builds")
+    sub.add_parser("prefetch", help="Install the newest GE-Proton release")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    registry = ProtonRegistry(Path(args.runtimes_dir))
+    if args.command == "list":
+        latest = registry.latest()
+        for name, path in registry.builds().items():
+            print(f"{name:<20} {path}{'  (default)' if name == latest else ''}")
+        return 0
+
+    try:
+        name = registry.prefetch(force=True, progress_callback=print)
+    except ProtonBuildError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(f"Installed {name}" if name else "The newest build is already installed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
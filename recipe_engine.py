@@ -0,0 +1,678 @@
+#!/usr/bin/env python3
+"""
+Recipe engine module
+Runs declarative install recipes (see install_recipes.py) in-process. Steps
+declare what they need, so independent work such as downloading a patch,
+unpacking disc images and creating the Wine prefix runs concurrently
+"""
+
+import argparse
+import fnmatch
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+from string import Template
+from typing import Optional, Callable, Dict, List, Any, Iterable
+
+from archive_extractor import extract_archive, detect_archive_format, ExtractionCancelled, ExtractionError
+from installer_unpacker import find_executable
+from iso_reader import extract_isos_from_zip, IsoExtractionCancelled, IsoFormatError
+from patch_applier import apply_patch, PatchError
+from process_runner import run_streamed
+
+# Constants
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "mmo-launcher"
+DEFAULT_MAX_WORKERS = 4
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+PROBE_WORKERS = 8
+STEP_KEYS = ('id', 'action', 'needs', 'when', 'skip_if')
+USER_AGENT = "Mozilla/5.0 (X11; Linux x86_64)"
+
+# Localised names of the Downloads folder, checked in order
+DOWNLOAD_DIR_NAMES = ["Downloads", "Hämtningar", "Téléchargements", "Descargas", "下载", "Download"]
+
+logger = logging.getLogger("game_installer.recipe")
+
+# One lock per cached download so concurrent recipes never fetch a URL twice
+_download_locks: Dict[str, threading.Lock] = {}
+_download_locks_guard = threading.Lock()
+
+
+class RecipeError(Exception):
+    """Raised when a recipe is invalid or one of its steps fails"""
+
+
+class RecipeCancelled(RecipeError):
+    """Raised when a recipe run is stopped through the cancel event"""
+
+
+def download_dirs(home: Optional[Path] = None) -> List[Path]:
+    """Existing Downloads folders (any language) followed by the home directory"""
+    home = Path(home) if home else Path.home()
+    dirs = [home / name for name in DOWNLOAD_DIR_NAMES if (home / name).is_dir()]
+    return dirs + [home]
+
+
+def _references(value: Any) -> set:
+    """Names of every $variable used in a step parameter"""
+    if isinstance(value, str):
+        return {m.group('named') or m.group('braced') for m in Template.pattern.finditer(value)
+                if m.group('named') or m.group('braced')}
+    if isinstance(value, dict):
+        return set().union(*(_references(v) for v in value.values())) if value else set()
+    if isinstance(value, (list, tuple)):
+        return set().union(*(_references(v) for v in value)) if value else set()
+    return set()
+
+
+def _substitute(value: Any, variables: Dict[str, Any]) -> Any:
+    if isinstance(value, str):
+        try:
+            return Template(value).substitute(variables)
+        except KeyError as e:
+            raise RecipeError(f"Unknown variable {e} in {value!r}") from e
+    if isinstance(value, dict):
+        return {k: _substitute(v, variables) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_substitute(v, variables) for v in value]
+    return value
+
+
+class RecipeStep:
+    """
+    One step of a recipe with its resolved dependencies.
+
+    Besides its action's parameters a step may set ``needs`` (extra step ids
+    to wait for), ``when`` (only run if that step produced something) and
+    ``skip_if`` (a path whose existence means the step's work is done).
+    Every ``$name`` a parameter refers to is an implicit dependency.
+    """
+
+    def __init__(self, spec: Dict[str, Any]):
+        self.id = spec['id']
+        self.action = spec['action']
+        self.when = spec.get('when')
+        self.skip_if = spec.get('skip_if')
+        self.params = {k: v for k, v in spec.items() if k not in STEP_KEYS}
+        self.needs = set(spec.get('needs', [])) | _references(self.params) | _references(self.skip_if)
+        if self.when:
+            self.needs.add(self.when)
+
+    def __repr__(self) -> str:
+        return f"RecipeStep({self.id!r}, {self.action!r})"
+
+
+def load_steps(recipe: Dict[str, Any], builtins: Iterable[str] = ()) -> List[RecipeStep]:
+    """
+    Parse and validate a recipe's steps.
+
+    Raises:
+        RecipeError: On duplicate ids, unknown actions or variables, or cycles
+    """
+    steps = [RecipeStep(spec) for spec in recipe.get('steps', [])]
+    ids = [step.id for step in steps]
+    if len(ids) != len(set(ids)):
+        raise RecipeError("Duplicate step ids in recipe")
+    known = set(ids) | set(builtins)
+    for step in steps:
+        if step.action not in ACTIONS:
+            raise RecipeError(f"Step {step.id} uses unknown action {step.action}")
+        unknown = step.needs - known
+        if unknown:
+            raise RecipeError(f"Step {step.id} refers to unknown {', '.join(sorted(unknown))}")
+        step.needs &= set(ids)
+
+    # Kahn's algorithm; anything left over is part of a cycle
+    remaining = {step.id: set(step.needs) for step in steps}
+    while True:
+        ready = [sid for sid, needs in remaining.items() if not needs]
+        if not ready:
+            break
+        for sid in ready:
+            del remaining[sid]
+        for needs in remaining.values():
+            needs.difference_update(ready)
+    if remaining:
+        raise RecipeError(f"Dependency cycle between steps: {', '.join(sorted(remaining))}")
+    return steps
+
+
+class _StopSignal:
+    """Read-only event that counts as set while any of its events is"""
+
+    def __init__(self, *events: threading.Event):
+        self._events = events
+
+    def is_set(self) -> bool:
+        return any(event.is_set() for event in self._events)
+
+
+class RecipeRunner:
+    """Executes one recipe, running every step whose dependencies are met in parallel"""
+
+    def __init__(self, name: str, recipe: Dict[str, Any], game_dir: Path,
+                 prepare_prefix: Optional[Callable[[], Optional[Path]]] = None,
+                 prefix_dir: Optional[Path] = None, progress_callback: Callable = None,
+                 cancel_event: Optional[threading.Event] = None, cache_dir: Path = DEFAULT_CACHE_DIR,
+                 home: Optional[Path] = None, max_workers: int = DEFAULT_MAX_WORKERS,
+                 umu_command: Optional[str] = None, proton_path: Optional[str] = None,
+                 which: Optional[Callable[[str], Optional[str]]] = None):
+        """
+        Args:
+            name: Recipe name, used for logging and the work directory
+            recipe: Recipe definition from install_recipes
+            game_dir: Directory the game is installed into
+            prepare_prefix: Callback creating the game's Wine prefix, used by
+                the ``prefix`` action
+            prefix_dir: Where that prefix will live, available as $prefix_dir
+                without waiting for the prefix step
+            progress_callback: Optional callback for progress messages
+            cancel_event: Optional event that stops the run
+            cache_dir: Download cache shared by all recipes
+            home: Home directory searched for user downloads
+            max_workers: Maximum number of steps running at once
+            umu_command: umu launcher Windows programs run with, available
+                as $umu (default: wine)
+            proton_path: PROTONPATH they run with, available as $proton;
+                GameInstaller passes its resolved build (default: umu's own)
+            which: Lookup for external tools, normally SystemProbe.which
+        """
+        self.name = name
+        self.home = Path(home) if home else Path.home()
+        self.recipe = recipe
+        self.game_dir = Path(game_dir)
+        self.prepare_prefix = prepare_prefix
+        self.prefix_dir = Path(prefix_dir) if prefix_dir else self.home / "Games" / "umu" / name / "default"
+        self.progress_callback = progress_callback
+        self.cancel_event = cancel_event or threading.Event()
+        # Set when a step fails, to stop its siblings without touching the
+        # caller's event: callers tell cancellation from failure by it
+        self._step_failed = threading.Event()
+        self.stop_event = _StopSignal(self.cancel_event, self._step_failed)
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers
+        self.umu_command = umu_command or "wine"
+        self.proton_path = proton_path or ""
+        self.which = which
+        self.work_dir = self.cache_dir / "work" / name
+        self.outputs: Dict[str, Any] = {}
+        self.timings: Dict[str, float] = {}
+        self._cleanups: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def variables(self) -> Dict[str, Any]:
+        with self._lock:
+            outputs = {k: ("" if v is None else str(v)) for k, v in self.outputs.items()}
+        return {
+            'game_dir': str(self.game_dir),
+            'home': str(self.home),
+            'work': str(self.work_dir),
+            'cache': str(self.cache_dir),
+            'prefix_dir': str(self.prefix_dir),
+            'umu': self.umu_command,
+            'proton': self.proton_path,
+            **outputs,
+        }
+
+    def report(self, message: str, step: Optional[RecipeStep] = None):
+        text = f"[{step.id}] {message}" if step else message
+        logger.info(f"{self.name}: {text}")
+        if self.progress_callback:
+            self.progress_callback(text)
+
+    def add_cleanup(self, func: Callable[[], None]):
+        """Register work to undo when the run ends, successful or not"""
+        with self._lock:
+            self._cleanups.append(func)
+
+    def check_cancelled(self):
+        if self.stop_event.is_set():
+            raise RecipeCancelled(f"Recipe {self.name} cancelled")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Run every step of the recipe.
+
+        Returns:
+            The recipe's ``register`` fields with variables substituted
+
+        Raises:
+            RecipeError: If a step fails; RecipeCancelled if cancelled
+        """
+        steps = load_steps(self.recipe, self.variables())
+        pending = {step.id: step for step in steps}
+        started_at = time.monotonic()
+        self.game_dir.mkdir(parents=True, exist_ok=True)
+        self.work_dir.mkdir(parents=True, exist_ok=True)
+        failure: Optional[Exception] = None
+
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"recipe-{self.name}") as pool:
+                running = {}
+                while pending or running:
+                    if failure is None:
+                        for step in [s for s in pending.values() if s.needs <= self.outputs.keys()]:
+                            del pending[step.id]
+                            running[pool.submit(self._run_step, step)] = step
+                    if not running:
+                        break
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        step = running.pop(future)
+                        try:
+                            output = future.result()
+                        except Exception as e:
+                            if failure is None:
+                                failure = e
+                                # Stop extractions and processes in sibling steps
+                                self._step_failed.set()
+                            continue
+                        with self._lock:
+                            self.outputs[step.id] = output
+            if failure is not None:
+                if isinstance(failure, RecipeError):
+                    raise failure
+                raise RecipeError(str(failure)) from failure
+        finally:
+            self._run_cleanups()
+
+        # Scratch space (e.g. unpacked discs) is only kept to help a failed run
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+        self.report(f"Recipe finished in {time.monotonic() - started_at:.1f}s")
+        return _substitute(self.recipe.get('register', {}), self.variables())
+
+    def _run_step(self, step: RecipeStep) -> Any:
+        self.check_cancelled()
+        if step.when and not self.outputs.get(step.when):
+            logger.info(f"{self.name}: skipping {step.id}, {step.when} produced nothing")
+            return None
+        if step.skip_if:
+            done_marker = Path(_substitute(step.skip_if, self.variables()))
+            if done_marker.exists():
+                self.report(f"{done_marker} exists, skipping", step)
+                return None
+        params = _substitute(step.params, self.variables())
+        started = time.monotonic()
+        try:
+            output = ACTIONS[step.action](self, step, params)
+        except (ExtractionCancelled, IsoExtractionCancelled) as e:
+            raise RecipeCancelled(str(e)) from e
+        except (ExtractionError, IsoFormatError, PatchError, OSError) as e:
+            if self.stop_event.is_set():
+                raise RecipeCancelled(f"Recipe {self.name} cancelled") from e
+            raise RecipeError(f"Step {step.id} failed: {e}") from e
+        self.timings[step.id] = time.monotonic() - started
+        logger.info(f"{self.name}: step {step.id} finished in {self.timings[step.id]:.1f}s")
+        return output
+
+    def _run_cleanups(self):
+        for func in reversed(self._cleanups):
+            try:
+                func()
+            except OSError as e:
+                logger.warning(f"{self.name}: cleanup failed: {e}")
+        self._cleanups = []
+
+
+# --- Actions -------------------------------------------------------------
+#
+# Each action takes (runner, step, params) with variables already
+# substituted and returns the step's output, usually a path.
+
+def _find_user_file(runner: RecipeRunner, patterns: List[str], exclude: List[str]) -> Optional[Path]:
+    """Newest file in the Downloads/home folders matching the earliest pattern that matches anything"""
+    excluded = [re.compile(regex, re.IGNORECASE) for regex in exclude]
+    listings = []
+    for directory in download_dirs(runner.home):
+        try:
+            listings.extend(entry for entry in directory.iterdir() if entry.is_file())
+        except OSError:
+            continue
+    for pattern in patterns:
+        if os.path.isabs(pattern):
+            matches = [Path(pattern)] if Path(pattern).is_file() else []
+        else:
+            matches = [entry for entry in listings
+                       if fnmatch.fnmatch(entry.name.lower(), pattern.lower())
+                       and not any(regex.search(entry.name) for regex in excluded)]
+        matches = [m for m in matches if m.stat().st_size > 0]
+        if matches:
+            return max(matches, key=lambda m: m.stat().st_mtime)
+    return None
+
+
+def _url_exists(url: str) -> bool:
+    request = urllib.request.Request(url, method="HEAD", headers={'User-Agent': USER_AGENT})
+    try:
+        with urllib.request.urlopen(request, timeout=15) as response:
+            return response.status == 200
+    except (urllib.error.URLError, OSError, ValueError):
+        return False
+
+
+def _latest_url(templates: List[str], versions: List[int]) -> Optional[str]:
+    """Probe versioned URL templates ($version) and return the newest that exists"""
+    newest, oldest = versions
+    candidates = [Template(t).substitute(version=f"{v:02d}") for v in range(newest, oldest - 1, -1) for t in templates]
+    with ThreadPoolExecutor(max_workers=PROBE_WORKERS) as pool:
+        # Probe a batch at a time, newest first; map() keeps candidate order
+        for start in range(0, len(candidates), PROBE_WORKERS):
+            batch = candidates[start:start + PROBE_WORKERS]
+            for url, exists in zip(batch, pool.map(_url_exists, batch)):
+                if exists:
+                    return url
+    return None
+
+
+def _download(runner: RecipeRunner, step: RecipeStep, url: str, dest: Path):
+    """Download to a .part file and rename it into place once complete"""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    partial = dest.with_name(dest.name + ".part")
+    request = urllib.request.Request(url, headers={'User-Agent': USER_AGENT})
+    runner.report(f"Downloading {url}", step)
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response, open(partial, 'wb') as out:
+            total = int(response.headers.get('Content-Length') or 0)
+            done = 0
+            last_percent = -10
+            while True:
+                runner.check_cancelled()
+                chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                out.write(chunk)
+                done += len(chunk)
+                if total and done * 100 // total >= last_percent + 10:
+                    last_percent = done * 100 // total
+                    runner.report(f"Downloaded {last_percent}% of {dest.name}", step)
+    except urllib.error.URLError as e:
+        partial.unlink(missing_ok=True)
+        raise RecipeError(f"Download of {url} failed: {e}") from e
+    except BaseException:
+        partial.unlink(missing_ok=True)
+        raise
+    if partial.stat().st_size == 0:
+        partial.unlink()
+        raise RecipeError(f"Download of {url} returned an empty file")
+    os.replace(partial, dest)
+
+
+def action_fetch(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Optional[Path]:
+    """
+    Find a file the user already downloaded, else reuse the shared download
+    cache, else download it.
+
+    Params: search (glob list), exclude (regex list), url, latest
+    ({urls: [...$$version...], versions: [newest, oldest]}), name, optional,
+    help (shown when nothing could be found)
+    """
+    found = _find_user_file(runner, params.get('search', []), params.get('exclude', []))
+    if found is not None:
+        runner.report(f"Using {found}", step)
+        return found
+
+    url = params.get('url')
+    if not url and params.get('latest'):
+        latest = params['latest']
+        url = _latest_url(latest['urls'], latest['versions'])
+    if url:
+        name = params.get('name') or url.split('?')[0].rstrip('/').split('/')[-1]
+        cached = runner.cache_dir / "downloads" / f"{hashlib.sha1(url.encode()).hexdigest()[:12]}-{name}"
+        with _download_locks_guard:
+            lock = _download_locks.setdefault(str(cached), threading.Lock())
+        with lock:
+            if cached.is_file() and cached.stat().st_size > 0:
+                runner.report(f"Using cached download {cached.name}", step)
+                return cached
+            try:
+                _download(runner, step, url, cached)
+                return cached
+            except RecipeError:
+                if not params.get('optional') or isinstance(sys.exc_info()[1], RecipeCancelled):
+                    raise
+                logger.warning(f"{runner.name}: optional download {url} failed")
+
+    if params.get('optional'):
+        runner.report(f"{step.id} not found, continuing without it", step)
+        return None
+    hint = params.get('help') or f"Download it and save it to {download_dirs(runner.home)[0]}"
+    raise RecipeError(f"Could not find {step.id}. {hint}")
+
+
+def action_prefix(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Create the game's Wine prefix with its redistributables"""
+    if runner.prepare_prefix is None:
+        raise RecipeError("No prefix provider configured")
+    runner.report("Preparing Wine prefix...", step)
+    prefix = runner.prepare_prefix()
+    if prefix is None:
+        raise RecipeError("Could not create the Wine prefix (is umu-launcher installed?)")
+    return prefix
+
+
+def action_extract(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """
+    Extract an archive into dest.
+
+    Params: archive, dest, hoist (executable whose folder becomes dest, for
+    clients packed inside a sub-folder), copy_other (copy files that are not
+    archives, e.g. a bare client exe)
+    """
+    archive = Path(params['archive'])
+    dest = Path(params['dest'])
+    if detect_archive_format(archive) is None:
+        if not params.get('copy_other'):
+            raise RecipeError(f"{archive.name} is not a supported archive")
+        dest.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(archive, dest / archive.name)
+        return dest
+
+    runner.report(f"Extracting {archive.name}...", step)
+    extract_archive(archive, dest, lambda msg: runner.report(msg, step), runner.stop_event, which=runner.which)
+
+    hoist = params.get('hoist')
+    if hoist:
+        exe = find_executable(dest, hoist)
+        if exe is not None and exe.parent != dest:
+            # Move the client's folder contents up to dest
+            nested = exe.parent
+            for entry in list(nested.iterdir()):
+                target = dest / entry.name
+                if not target.exists():
+                    entry.rename(target)
+            shutil.rmtree(nested, ignore_errors=True)
+    return dest
+
+
+def action_extract_isos(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Unpack the disc images inside a zip in parallel. Params: archive, pattern, dest"""
+    dest = Path(params['dest'])
+    runner.report(f"Extracting {params['pattern']} from {Path(params['archive']).name}...", step)
+    last = {}
+
+    def progress(name, files_done, files_total, bytes_done, bytes_total):
+        runner.check_cancelled()
+        percent = int(bytes_done * 100 / bytes_total) if bytes_total else 100
+        if percent // 25 != last.get(name):
+            last[name] = percent // 25
+            runner.report(f"{name}: {percent}%", step)
+
+    extract_isos_from_zip(Path(params['archive']), params['pattern'], dest, progress,
+                          cancel_event=runner.stop_event)
+    for expected in params.get('expect', []):
+        if not (dest / expected).is_dir():
+            raise RecipeError(f"{expected} is missing from {params['archive']}; the archive may be incomplete")
+    return dest
+
+
+def action_map_drives(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Expose directories as Wine drive letters until the run ends. Params: prefix, drives"""
+    dosdevices = Path(params['prefix']) / "dosdevices"
+    dosdevices.mkdir(parents=True, exist_ok=True)
+    for letter, target in params['drives'].items():
+        link = dosdevices / letter.lower()
+        if link.is_symlink() or link.exists():
+            link.unlink()
+        link.symlink_to(target)
+        runner.add_cleanup(lambda link=link: link.unlink(missing_ok=True))
+        runner.report(f"{target} mapped to {letter.upper()}", step)
+    return dosdevices
+
+
+def action_run(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """
+    Run a Windows program under UMU in the prefix and wait for it.
+
+    Params: exe, prefix, cwd, args, message (shown before starting)
+    """
+    env = {**os.environ, 'WINEPREFIX': params['prefix']}
+    if runner.proton_path:
+        env['PROTONPATH'] = runner.proton_path
+    if params.get('message'):
+        runner.report(params['message'], step)
+    runner.report(f"Running {Path(params['exe']).name}...", step)
+    result = run_streamed([runner.umu_command, params['exe'], *params.get('args', [])],
+                          lambda line: runner.report(line, step), env=env,
+                          cwd=params.get('cwd') or Path(params['exe']).parent, cancel_event=runner.stop_event)
+    if result.cancelled:
+        raise RecipeCancelled(f"Recipe {runner.name} cancelled")
+    if result.returncode != 0:
+        raise RecipeError(result.failure_report())
+    return Path(params['exe'])
+
+
+def action_first_existing(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Return the first of several candidate paths that exists. Params: paths"""
+    for candidate in params['paths']:
+        if Path(candidate).exists():
+            return Path(candidate)
+    raise RecipeError(f"None of {', '.join(params['paths'])} exists")
+
+
+def action_patch(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Apply a zip patch, writing only changed files. Params: archive, dest"""
+    result = apply_patch(Path(params['archive']), Path(params['dest']), lambda msg: runner.report(msg, step))
+    runner.report(result.describe(), step)
+    return Path(params['dest'])
+
+
+def action_remove(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Delete files from a directory if present. Params: root, files"""
+    root = Path(params['root'])
+    for name in params['files']:
+        (root / name).unlink(missing_ok=True)
+    return root
+
+
+def action_rename(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Rename files inside a directory, e.g. to fix casing. Params: root, files ({old: new})"""
+    root = Path(params['root'])
+    for old, new in params['files'].items():
+        if (root / old).exists():
+            os.replace(root / old, root / new)
+    return root
+
+
+def action_write_file(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Write a text file. Params: path, content, executable"""
+    path = Path(params['path'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(params['content'], encoding='utf-8')
+    if params.get('executable'):
+        path.chmod(0o755)
+    return path
+
+
+def action_find_executable(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> Path:
+    """Locate a program inside the install, case-insensitively. Params: root, names"""
+    for name in params['names']:
+        exe = find_executable(Path(params['root']), name)
+        if exe is not None:
+            return exe
+    raise RecipeError(f"{' or '.join(params['names'])} not found in {params['root']}")
+
+
+def action_notice(runner: RecipeRunner, step: RecipeStep, params: Dict[str, Any]) -> str:
+    """Show a message to the user. Params: message"""
+    runner.report(params['message'], step)
+    return params['message']
+
+
+ACTIONS: Dict[str, Callable[[RecipeRunner, RecipeStep, Dict[str, Any]], Any]] = {
+    'fetch': action_fetch,
+    'prefix': action_prefix,
+    'extract': action_extract,
+    'extract_isos': action_extract_isos,
+    'map_drives': action_map_drives,
+    'run': action_run,
+    'first_existing': action_first_existing,
+    'patch': action_patch,
+    'remove': action_remove,
+    'rename': action_rename,
+    'write_file': action_write_file,
+    'find_executable': action_find_executable,
+    'notice': action_notice,
+}
+
+BUILTIN_VARIABLES = ('game_dir', 'home', 'work', 'cache', 'prefix_dir', 'umu', 'proton')
+
+
+def execution_waves(recipe: Dict[str, Any]) -> List[List[str]]:
+    """Group step ids into waves that can run concurrently, for display"""
+    steps = load_steps(recipe, BUILTIN_VARIABLES)
+    done: set = set()
+    waves = []
+    while len(done) < len(steps):
+        wave = [step.id for step in steps if step.id not in done and step.needs <= done]
+        waves.append(wave)
+        done.update(wave)
+    return waves
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from install_recipes import RECIPES
+
+    parser = argparse.ArgumentParser(description="Inspect and run declarative install recipes")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("list", help="List available recipes")
+    plan_parser = subparsers.add_parser("plan", help="Show which steps of a recipe run concurrently")
+    plan_parser.add_argument("recipe")
+    run_parser = subparsers.add_parser("run", help="Install a game from its recipe")
+    run_parser.add_argument("recipe")
+    args = parser.parse_args(argv)
+
+    if args.command == "list":
+        for name, recipe in sorted(RECIPES.items()):
+            print(f"{name}: {recipe.get('description', '')}")
+        return 0
+
+    if args.recipe not in RECIPES:
+        print(f"Error: unknown recipe {args.recipe}", file=sys.stderr)
+        return 1
+
+    if args.command == "plan":
+        for index, wave in enumerate(execution_waves(RECIPES[args.recipe]), 1):
+            print(f"{index}: {', '.join(wave)}")
+        return 0
+
+    from game_installer import GameInstaller
+    from games_db import get_game_by_id
+    game_data = get_game_by_id(args.recipe)
+    if not game_data:
+        print(f"Error: {args.recipe} is not in the games database", file=sys.stderr)
+        return 1
+    installer = GameInstaller()
+    return 0 if installer.install_game(args.recipe, game_data, print) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Resource isolation module
+Runs launched games and the launcher's background jobs (installers,
+winetricks, extraction, hashing) in separate cgroup v2 scopes through the
+systemd user manager, and throttles the background scopes while a game is
+running so installs do not make it hitch. Without systemd, background work
+falls back to nice and I/O priority
+"""
+
+import argparse
+import ctypes
+import logging
+import os
+import platform
+import re
+import shutil
+import subprocess
+import sys
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional, Callable, Dict, List, Iterable, Set
+
+# Constants
+CGROUP_ROOT = Path("/sys/fs/cgroup")
+GAMES_SLICE = "mmo-launcher-games.slice"
+JOBS_SLICE = "mmo-launcher-jobs.slice"
+
+KIND_GAME = "game"
+KIND_JOB = "job"
+
+# Background slice properties while no game runs, and while one does.
+# Weights only matter under contention; the bandwidth caps apply to the
+# devices holding the game directories.
+NORMAL_PROPERTIES = {'CPUWeight': "100", 'IOWeight': "100"}
+THROTTLED_PROPERTIES = {'CPUWeight': "20", 'IOWeight': "10"}
+THROTTLED_BANDWIDTH = "64M"
+
+# Fallback when there is no systemd user manager
+BACKGROUND_NICE = 10
+IOPRIO_CLASS_BE = 2
+IOPRIO_CLASS_IDLE = 3
+IOPRIO_BACKGROUND_LEVEL = 7
+IOPRIO_WHO_PROCESS = 1
+IOPRIO_CLASS_SHIFT = 13
+IOPRIO_SET_SYSCALLS = {'x86_64': 251, 'aarch64': 30, 'riscv64': 30}
+
+SYSTEMCTL_TIMEOUT = 10
+
+logger = logging.getLogger("game_installer.isolation")
+
+
+def cgroup_v2_available(cgroup_root: Path = CGROUP_ROOT) -> bool:
+    """Whether the unified cgroup hierarchy is mounted"""
+    return (Path(cgroup_root) / "cgroup.controllers").is_file()
+
+
+def set_io_priority(tid: int, io_class: int, level: int = 0) -> bool:
+    """
+    Set the I/O priority of a thread or process (0 means the calling thread).
+
+    Returns:
+        True on success
+    """
+    number = IOPRIO_SET_SYSCALLS.get(platform.machine())
+    if number is None:
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.syscall(number, IOPRIO_WHO_PROCESS, tid, (io_class << IOPRIO_CLASS_SHIFT) | level) == 0
+    except (OSError, AttributeError):
+        return False
+
+
+def _unit_slug(name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", name)[:64] or "unnamed"
+
+
+class ResourceIsolator:
+    """
+    Places games and background jobs in their own systemd scopes.
+
+    Scopes are created with ``systemd-run --user --scope``, which registers
+    the scope and then execs the command, so the launched PID is the
+    command's own. Background threads of the launcher itself cannot leave
+    its cgroup; they get nice and I/O priority instead, and drop to the idle
+    I/O class while a game runs.
+    """
+
+    def __init__(self, which: Callable[[str], Optional[str]] = shutil.which,
+                 throttle_paths: Iterable[Path] = (), enabled: bool = True,
+                 cgroup_root: Path = CGROUP_ROOT, run: Callable = subprocess.run):
+        """
+        Args:
+            which: Command lookup
+            throttle_paths: Directories whose devices get bandwidth caps while throttled
+            enabled: Use systemd scopes when available
+            cgroup_root: cgroup2 mount point
+            run: subprocess.run replacement for systemctl calls
+        """
+        self.which = which
+        self.throttle_paths = [Path(p) for p in throttle_paths]
+        self.enabled = enabled
+        self.cgroup_root = Path(cgroup_root)
+        self.run = run
+        self.throttled = False
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+        self._threads: Set[int] = set()
+        self._counter = 0
+
+    @property
+    def available(self) -> bool:
+        """Whether systemd scopes can be used (checked once)"""
+        if not self.enabled:
+            return False
+        if self._available is None:
+            self._available = self._detect()
+        return self._available
+
+    def _detect(self) -> bool:
+        if not cgroup_v2_available(self.cgroup_root):
+            logger.info("cgroup v2 not mounted, using nice/ionice for background work")
+            return False
+        if not (self.which("systemd-run") and self.which("systemctl")):
+            logger.info("systemd-run not found, using nice/ionice for background work")
+            return False
+        try:
+            result = self.run(["systemctl", "--user", "show", "--property=Version", "--value"],
+                              capture_output=True, text=True, timeout=SYSTEMCTL_TIMEOUT, check=False)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.info(f"systemd user manager unavailable ({e}), using nice/ionice for background work")
+            return False
+        if result.returncode != 0:
+            logger.info("systemd user manager unavailable, using nice/ionice for background work")
+            return False
+        return True
+
+    def wrap(self, command: List[str], kind: str = KIND_JOB, name: str = "") -> List[str]:
+        """
+        Command that runs command in the scope for its kind.
+
+        Args:
+            command: Command and arguments
+            kind: KIND_GAME or KIND_JOB
+            name: Game id or tool name, used in the scope's unit name
+
+        Returns:
+            The wrapped command (unchanged for games without systemd)
+        """
+        command = [str(c) for c in command]
+        if self.available:
+            with self._lock:
+                self._counter += 1
+                unit = f"mmo-launcher-{kind}-{_unit_slug(name or Path(command[0]).name)}-{os.getpid()}-{self._counter}"
+            return ["systemd-run", "--user", "--scope", "--quiet", "--collect",
+                    f"--slice={GAMES_SLICE if kind == KIND_GAME else JOBS_SLICE}", f"--unit={unit}", "--"] + command
+        if kind == KIND_GAME or threading.get_native_id() in self._threads:
+            return command  # background threads' children inherit their priority
+        wrapper = []
+        if self.which("nice"):
+            wrapper += ["nice", "-n", str(BACKGROUND_NICE)]
+        if self.which("ionice"):
+            wrapper += ["ionice", "-c", str(IOPRIO_CLASS_BE), "-n", str(IOPRIO_BACKGROUND_LEVEL)]
+        return wrapper + command
+
+    @contextmanager
+    def background(self):
+        """
+        Run the calling thread (and what it spawns) as background work.
+
+        The thread's nice value is raised for good, since lowering it again
+        needs privileges; use this on worker threads that end with the job.
+        """
+        tid = threading.get_native_id()
+        try:
+            os.setpriority(os.PRIO_PROCESS, tid, max(os.getpriority(os.PRIO_PROCESS, tid), BACKGROUND_NICE))
+        except OSError as e:
+            logger.debug(f"Could not lower thread priority: {e}")
+        with self._lock:
+            self._threads.add(tid)
+            io_class = IOPRIO_CLASS_IDLE if self.throttled else IOPRIO_CLASS_BE
+        set_io_priority(0, io_class, IOPRIO_BACKGROUND_LEVEL)
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._threads.discard(tid)
+
+    def _slice_properties(self, throttled: bool) -> List[str]:
+        properties = THROTTLED_PROPERTIES if throttled else NORMAL_PROPERTIES
+        args = [f"{key}={value}" for key, value in properties.items()]
+        for key in ("IOReadBandwidthMax", "IOWriteBandwidthMax"):
+            if throttled:
+                args += [f"{key}={path} {THROTTLED_BANDWIDTH}" for path in self.throttle_paths if path.exists()]
+            else:
+                args.append(f"{key}=")  # an empty assignment clears the caps
+        return args
+
+    def set_foreground(self, active: bool) -> bool:
+        """
+        Throttle background work while a game runs, and lift it afterwards.
+
+        Args:
+            active: Whether a game is in the foreground
+
+        Returns:
+            True if the state changed
+        """
+        with self._lock:
+            if active == self.throttled:
+                return False
+            self.throttled = active
+            threads = list(self._threads)
+        io_class = IOPRIO_CLASS_IDLE if active else IOPRIO_CLASS_BE
+        for tid in threads:
+            set_io_priority(tid, io_class, IOPRIO_BACKGROUND_LEVEL)
+        if self.available:
+            cmd = ["systemctl", "--user", "set-property", "--runtime", JOBS_SLICE] + self._slice_properties(active)
+            try:
+                result = self.run(cmd, capture_output=True, text=True, timeout=SYSTEMCTL_TIMEOUT, check=False)
+                if result.returncode != 0:
+                    logger.warning(f"Could not update {JOBS_SLICE}: {result.stderr.strip()}")
+            except (OSError, subprocess.TimeoutExpired) as e:
+                logger.warning(f"Could not update {JOBS_SLICE}: {e}")
+        logger.info(f"Background work {'throttled' if active else 'no longer throttled'}")
+        return True
+
+    def status(self) -> Dict[str, str]:
+        """How isolation is currently done, for diagnostics"""
+        return {
+            'mode': "systemd scopes" if self.available else "nice/ionice",
+            'background': "throttled" if self.throttled else "normal",
+        }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Run commands in the launcher's game or background scopes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("status", help="Show how isolation would be done here")
+    run = sub.add_parser("run", help="Run a command in a scope")
+    run.add_argument("--kind", choices=[KIND_GAME, KIND_JOB], default=KIND_JOB)
+    run.add_argument("args", nargs=argparse.REMAINDER)
+    throttle = sub.add_parser("throttle", help="Throttle or release background scopes")
+    throttle.add_argument("state", choices=["on", "off"])
+    throttle.add_argument("--path", action="append", default=[], help="Directory whose device gets bandwidth caps")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "status":
+        for key, value in ResourceIsolator().status().items():
+            print(f"{key}: {value}")
+        return 0
+    if args.command == "run":
+        if not args.args:
+            parser.error("no command given")
+        return subprocess.call(ResourceIsolator().wrap(args.args, args.kind))
+    isolator = ResourceIsolator(throttle_paths=[Path(p) for p in args.path])
+    # A fresh isolator believes nothing is throttled; force the requested state
+    isolator.throttled = args.state == "off"
+    isolator.set_foreground(args.state == "on")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Shader cache module
+Keeps DXVK state caches and VKD3D-Proton shader caches per client build
+instead of per install, so every server on the same client starts with the
+pipelines the others already compiled, and keeps backups that survive
+reinstalls
+"""
+
+import argparse
+import hashlib
+import logging
+import os
+import re
+import shutil
+import struct
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Iterable, List, Tuple
+
+# Constants
+DEFAULT_CACHE_ROOT = Path.home() / ".cache" / "mmo-launcher" / "shader-cache"
+DEFAULT_BACKUP_ROOT = Path.home() / ".local" / "share" / "mmo-launcher" / "shader-cache-backups"
+DXVK_DIR_NAME = "dxvk"
+VKD3D_DIR_NAME = "vkd3d"
+DXVK_CACHE_SUFFIX = ".dxvk-cache"
+
+# DXVK state cache file layout: "DXVK", u32 version, u32 entry size, then
+# from version 8 on, entries of a u32 header (8 bit stage mask, 24 bit
+# payload size), the SHA-1 of the payload and the payload itself
+DXVK_MAGIC = b"DXVK"
+DXVK_HEADER = struct.Struct("<4sII")
+DXVK_ENTRY_HEADER = struct.Struct("<I")
+DXVK_ENTRY_HASH_SIZE = 20
+DXVK_MIN_MERGE_VERSION = 8
+
+logger = logging.getLogger("game_installer.shadercache")
+
+
+class StateCacheError(Exception):
+    """Raised when a DXVK state cache file cannot be parsed"""
+
+
+def _split_state_cache(path: Path) -> Tuple[bytes, List[bytes], bool]:
+    """Header, intact entries, and whether they reach the end of the file"""
+    data = Path(path).read_bytes()
+    if len(data) < DXVK_HEADER.size:
+        raise StateCacheError(f"{path} is too short")
+    magic, version, _ = DXVK_HEADER.unpack_from(data)
+    if magic != DXVK_MAGIC:
+        raise StateCacheError(f"{path} is not a DXVK state cache")
+    if version < DXVK_MIN_MERGE_VERSION:
+        raise StateCacheError(f"{path} uses state cache version {version}")
+    entries = []
+    pos = DXVK_HEADER.size
+    while pos + DXVK_ENTRY_HEADER.size + DXVK_ENTRY_HASH_SIZE <= len(data):
+        size = DXVK_ENTRY_HEADER.unpack_from(data, pos)[0] >> 8
+        start = pos + DXVK_ENTRY_HEADER.size + DXVK_ENTRY_HASH_SIZE
+        end = start + size
+        if end > len(data):
+            break
+        if hashlib.sha1(data[start:end]).digest() != data[start - DXVK_ENTRY_HASH_SIZE:start]:
+            break
+        entries.append(data[pos:end])
+        pos = end
+    return data[:DXVK_HEADER.size], entries, pos == len(data)
+
+
+def read_state_cache(path: Path) -> Tuple[bytes, List[bytes]]:
+    """
+    Split a DXVK state cache into its header and raw entries.
+
+    Reading stops at the first truncated entry (the game was killed while
+    writing) or entry whose hash does not match, as DXVK itself does.
+
+    Returns:
+        (header bytes, list of entry bytes including their entry header and hash)
+
+    Raises:
+        StateCacheError: If the file is not a state cache of a mergeable version
+    """
+    header, entries, _ = _split_state_cache(path)
+    return header, entries
+
+
+def merge_state_cache(target: Path, source: Path) -> int:
+    """
+    Add the entries of source that target does not have.
+
+    If the files have different versions, or either cannot be merged, the
+    larger file wins. A target with a damaged entry is left alone, since
+    rewriting it would drop everything after that entry.
+
+    Returns:
+        Number of entries added
+    """
+    target, source = Path(target), Path(source)
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(source, target)
+        try:
+            return len(read_state_cache(target)[1])
+        except StateCacheError:
+            return 0
+    try:
+        target_header, target_entries, complete = _split_state_cache(target)
+        source_header, source_entries = read_state_cache(source)
+    except StateCacheError as e:
+        logger.info(f"Not merging state caches entry by entry: {e}")
+        if source.stat().st_size > target.stat().st_size:
+            shutil.copy2(source, target)
+        return 0
+    if not complete:
+        logger.warning(f"{target} has a damaged entry after {len(target_entries)} intact ones; not merging into it")
+        return 0
+    if target_header[:8] != source_header[:8]:
+        if source.stat().st_size > target.stat().st_size:
+            shutil.copy2(source, target)
+        return 0
+    known = set(target_entries)
+    added = [entry for entry in dict.fromkeys(source_entries) if entry not in known]
+    if added:
+        _atomic_write(target, target_header + b"".join(target_entries + added))
+    return len(added)
+
+
+def _atomic_write(path: Path, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+def cache_key(game_id: str, game_data: dict) -> str:
+    """Games on the same client build share one cache; others get their own"""
+    family, version = game_data.get('client_family'), game_data.get('client_version')
+    key = f"{family}-{version}" if family and version else (family or game_id)
+    return re.sub(r"[^A-Za-z0-9._-]", "_", key)
+
+
+class ShaderCacheManager:
+    """
+    Shared shader caches, one directory per client build, with backups.
+
+    Only files the game's runtime writes through the environment variables
+    set here are managed; driver caches (Mesa, NVIDIA) are already shared
+    per user.
+    """
+
+    def __init__(self, cache_root: Optional[Path] = None, backup_root: Optional[Path] = None):
+        """
+        Args:
+            cache_root: Directory holding the live caches
+            backup_root: Directory holding backups that outlive uninstalls
+        """
+        self.cache_root = Path(cache_root) if cache_root else DEFAULT_CACHE_ROOT
+        self.backup_root = Path(backup_root) if backup_root else DEFAULT_BACKUP_ROOT
+        self._lock = threading.Lock()
+
+    def cache_dir(self, key: str) -> Path:
+        return self.cache_root / key
+
+    def environment(self, key: str) -> Dict[str, str]:
+        """Environment pointing DXVK and VKD3D-Proton at the shared directory"""
+        cache_dir = self.cache_dir(key)
+        return {'DXVK_STATE_CACHE_PATH': str(cache_dir / DXVK_DIR_NAME),
+                'VKD3D_SHADER_CACHE_PATH': str(cache_dir / VKD3D_DIR_NAME)}
+
+    def _merge_dir(self, target_dir: Path, source_files: Iterable[Path]) -> int:
+        added = 0
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for source in source_files:
+            try:
+                if source.name.endswith(DXVK_CACHE_SUFFIX):
+                    added += merge_state_cache(target_dir / source.name, source)
+                elif not (target_dir / source.name).exists() or \
+                        source.stat().st_size > (target_dir / source.name).stat().st_size:
+                    shutil.copy2(source, target_dir / source.name)
+            except OSError as e:
+                logger.warning(f"Could not merge shader cache {source}: {e}")
+        return added
+
+    def _sync(self, source_root: Path, target_root: Path) -> int:
+        added = 0
+        for name in (DXVK_DIR_NAME, VKD3D_DIR_NAME):
+            source_dir = source_root / name
+            if source_dir.is_dir():
+                added += self._merge_dir(target_root / name, [p for p in source_dir.iterdir() if p.is_file()])
+        return added
+
+    def prepare(self, key: str, game_dirs: Iterable[Path] = ()) -> Dict[str, str]:
+        """
+        Get the shared cache ready before a launch.
+
+        Restores the backup if the live cache is gone (reinstall, cleared
+        ~/.cache) and merges caches DXVK wrote next to the game's executable
+        before the launcher managed them.
+
+        Args:
+            key: cache_key() of the game
+            game_dirs: Directories to import *.dxvk-cache files from
+
+        Returns:
+            Environment for the launch
+        """
+        cache_dir = self.cache_dir(key)
+        with self._lock:
+            dxvk_dir = cache_dir / DXVK_DIR_NAME
+            if not any(dxvk_dir.glob(f"*{DXVK_CACHE_SUFFIX}")) and (self.backup_root / key).is_dir():
+                restored = self._sync(self.backup_root / key, cache_dir)
+                logger.info(f"Restored shader cache {key} from backup ({restored} pipeline entries)")
+            (cache_dir / VKD3D_DIR_NAME).mkdir(parents=True, exist_ok=True)
+            found = [p for d in game_dirs for p in Path(d).glob(f"*{DXVK_CACHE_SUFFIX}") if p.is_file()]
+            if found:
+                added = self._merge_dir(dxvk_dir, found)
+                logger.info(f"Imported {len(found)} DXVK state cache(s) into {key} ({added} new entries)")
+                for path in found:
+                    path.unlink(missing_ok=True)
+            dxvk_dir.mkdir(parents=True, exist_ok=True)
+        return self.environment(key)
+
+    def backup(self, key: str) -> int:
+        """
+        Merge the live cache into its backup.
+
+        Returns:
+            Number of DXVK entries the backup gained
+        """
+        with self._lock:
+            if not self.cache_dir(key).is_dir():
+                return 0
+            added = self._sync(self.cache_dir(key), self.backup_root / key)
+        logger.info(f"Backed up shader cache {key} ({added} new entries)")
+        return added
+
+    def restore(self, key: str) -> int:
+        """
+        Merge a backup into the live cache.
+
+        Returns:
+            Number of DXVK entries the live cache gained
+        """
+        with self._lock:
+            if not (self.backup_root / key).is_dir():
+                return 0
+            return self._sync(self.backup_root / key, self.cache_dir(key))
+
+    def list_caches(self) -> Dict[str, int]:
+        """Live caches with their size in bytes"""
+        sizes = {}
+        if self.cache_root.is_dir():
+            for cache_dir in sorted(self.cache_root.iterdir()):
+                if cache_dir.is_dir():
+                    sizes[cache_dir.name] = sum(p.stat().st_size for p in cache_dir.rglob("*") if p.is_file())
+        return sizes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Manage shared DXVK/VKD3D shader caches")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List shared caches")
+    for name in ("backup", "restore"):
+        cmd = sub.add_parser(name, help=f"{name.title()} a shared cache")
+        cmd.add_argument("key", help="Cache key, e.g. wow-3.3.5a")
+    merge = sub.add_parser("merge", help="Merge one .dxvk-cache file into another")
+    merge.add_argument("target")
+    merge.add_argument("source")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    manager = ShaderCacheManager()
+    if args.command == "list":
+        for key, size in manager.list_caches().items():
+            print(f"{key:<24} {size / (1024 * 1024):.1f} MiB")
+        return 0
+    if args.command == "backup":
+        print(f"{manager.backup(args.key)} new entries backed up")
+        return 0
+    if args.command == "restore":
+        print(f"{manager.restore(args.key)} entries restored")
+        return 0
+    try:
+        print(f"Added {merge_state_cache(Path(args.target), Path(args.source))} entries")
+    except (OSError, StateCacheError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
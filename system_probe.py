@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+System capability probe module
+Resolves the external tools the launcher relies on (UMU, Wine, terminal,
+package manager, archive tools...) once, and only probes again when a
+directory on PATH changes
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Dict, List, Tuple, Any
+
+# Constants
+# Shared with GameInstaller, which keeps it beside its other settings
+DEFAULT_CACHE_FILE = Path.home() / ".config" / "mmo-launcher" / "capabilities.json"
+CACHE_VERSION = 1
+
+# Re-stat the PATH directories at most this often
+FINGERPRINT_INTERVAL = 1.0
+
+# Capability -> candidate commands in order of preference
+CAPABILITIES = {
+    'umu': ["umu-run", "umu"],
+    'wine': ["wine"],
+    'winetricks': ["winetricks"],
+    'terminal': ["konsole", "gnome-terminal", "xfce4-terminal", "alacritty", "kitty", "xterm"],
+    'package_manager': ["pacman", "apt", "dnf"],
+    'aur_helper': ["yay", "paru", "pikaur", "trizen"],
+    'flatpak': ["flatpak"],
+    'steam': ["steam"],
+    'java': ["java"],
+    '7z': ["7z"],
+    'unrar': ["unrar", "unrar-free"],
+    'mangohud': ["mangohud"],
+}
+
+logger = logging.getLogger("game_installer.probe")
+
+
+def path_fingerprint(path_env: Optional[str] = None) -> List[Tuple[str, Optional[int]]]:
+    """
+    Modification times of every PATH directory.
+
+    Installing or removing a program changes its directory's mtime, so an
+    unchanged fingerprint means every lookup result is still valid.
+    """
+    path_env = os.environ.get('PATH', os.defpath) if path_env is None else path_env
+    fingerprint = []
+    for entry in path_env.split(os.pathsep):
+        if not entry:
+            continue
+        try:
+            fingerprint.append((entry, os.stat(entry).st_mtime_ns))
+        except OSError:
+            fingerprint.append((entry, None))
+    return fingerprint
+
+
+class SystemProbe:
+    """
+    Cached lookups of external tools.
+
+    ``command(capability)`` returns the name of the first available command
+    for a capability (e.g. "umu-run" for "umu"), ``which(cmd)`` caches
+    arbitrary lookups. Results are persisted so a new process (or the GUI at
+    startup) can use them without probing.
+    """
+
+    def __init__(self, cache_file: Optional[Path] = None):
+        """
+        Args:
+            cache_file: Optional JSON file the snapshot is persisted to
+        """
+        self.cache_file = Path(cache_file) if cache_file else None
+        self._lock = threading.Lock()
+        self._fingerprint: Optional[List[Tuple[str, Optional[int]]]] = None
+        self._checked_at = 0.0
+        self._paths: Dict[str, Optional[str]] = {}
+        self._probed_at: Optional[float] = None
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        if self.cache_file is None:
+            return
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('version') != CACHE_VERSION:
+            return
+        fingerprint = [tuple(item) for item in data.get('fingerprint', [])]
+        if fingerprint == path_fingerprint():
+            self._fingerprint = fingerprint
+            self._checked_at = time.monotonic()
+            self._paths = data.get('paths', {})
+            self._probed_at = data.get('probed_at')
+
+    def _save(self):
+        if self.cache_file is None:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(prefix=f".{self.cache_file.name}.", dir=self.cache_file.parent)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump({'version': CACHE_VERSION, 'fingerprint': self._fingerprint,
+                           'paths': self._paths, 'probed_at': self._probed_at}, f, indent=2)
+            os.replace(tmp_path, self.cache_file)
+        except OSError as e:
+            logger.warning(f"Could not save capability cache {self.cache_file}: {e}")
+
+    def _validate(self):
+        """Drop cached lookups if PATH changed (called with the lock held)"""
+        now = time.monotonic()
+        if self._fingerprint is not None and now - self._checked_at < FINGERPRINT_INTERVAL:
+            return
+        fingerprint = path_fingerprint()
+        self._checked_at = now
+        if fingerprint != self._fingerprint:
+            if self._fingerprint is not None:
+                logger.info("PATH changed, probing system tools again")
+            self._fingerprint = fingerprint
+            self._paths = {}
+            self._probed_at = None
+
+    def _which(self, cmd: str) -> Optional[str]:
+        if cmd not in self._paths:
+            self._paths[cmd] = shutil.which(cmd)
+            self._dirty = True
+        return self._paths[cmd]
+
+    def which(self, cmd: str) -> Optional[str]:
+        """Cached shutil.which"""
+        with self._lock:
+            self._validate()
+            self._dirty = False
+            path = self._which(cmd)
+            if self._dirty:
+                self._save()
+            return path
+
+    def command(self, capability: str) -> Optional[str]:
+        """First available command for a capability, or None"""
+        for cmd in CAPABILITIES[capability]:
+            if self.which(cmd):
+                return cmd
+        return None
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Resolve every capability.
+
+        Returns:
+            Dict of capability -> {'command': name or None, 'path': full path or None}
+        """
+        with self._lock:
+            self._validate()
+            self._dirty = False
+            result = {}
+            for capability, candidates in CAPABILITIES.items():
+                cmd = next((c for c in candidates if self._which(c)), None)
+                result[capability] = {'command': cmd, 'path': self._paths.get(cmd) if cmd else None}
+            if self._probed_at is None:
+                self._probed_at = time.time()
+                self._dirty = True
+            if self._dirty:
+                self._save()
+            return result
+
+    @property
+    def probed_at(self) -> Optional[float]:
+        """Wall-clock time of the last full snapshot, if still valid"""
+        return self._probed_at
+
+    def invalidate(self):
+        """Forget every lookup"""
+        with self._lock:
+            self._fingerprint = None
+            self._paths = {}
+            self._probed_at = None
+
+
+def describe(snapshot: Dict[str, Dict[str, Any]]) -> List[str]:
+    """Human readable lines for a snapshot"""
+    lines = []
+    for capability, info in snapshot.items():
+        if info['command']:
+            lines.append(f"{capability}: {info['command']} ({info['path']})")
+        else:
+            lines.append(f"{capability}: not found")
+    return lines
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Show the system tools the launcher can use")
+    parser.add_argument('--refresh', action='store_true', help="Ignore the cached results")
+    parser.add_argument('--json', action='store_true', help="Print the snapshot as JSON")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    probe = SystemProbe(DEFAULT_CACHE_FILE)
+    if args.refresh:
+        probe.invalidate()
+    snapshot = probe.snapshot()
+    if args.json:
+        print(json.dumps(snapshot, indent=2))
+    else:
+        print("\n".join(describe(snapshot)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,335 @@
+"""
+Tests for archive_extractor.py module
+"""
+
+import pytest
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import threading
+import zipfile
+from contextlib import nullcontext
+from pathlib import Path
+from unittest.mock import patch
+
+from archive_extractor import (
+    ArchiveExtractor,
+    ExtractionCancelled,
+    ExtractionError,
+    detect_archive_format,
+    detect_tar_compression,
+    extract_archive,
+    parse_7z_progress,
+    parse_rar_progress,
+)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def sample_zip(temp_dir):
+    """Create a small zip archive with nested members"""
+    archive = temp_dir / "client.zip"
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("Data/readme.txt", "hello")
+        zf.writestr("Data/assets.bin", b"x" * 4096)
+        zf.writestr("Game.exe", b"MZ" + b"\0" * 100)
+    return archive
+
+
+class TestFormatDetection:
+    """Test archive format detection"""
+
+    def test_detects_known_suffixes(self):
+        """Test that supported suffixes map to backends"""
+        assert detect_archive_format("client.zip") == 'zip'
+        assert detect_archive_format("client.tar.gz") == 'tar'
+        assert detect_archive_format("client.tar.bz2") == 'tar'
+        assert detect_archive_format("client.7z") == '7z'
+        assert detect_archive_format("CLIENT.RAR") == 'rar'
+
+    def test_unknown_suffix(self):
+        """Test that unknown suffixes are rejected"""
+        assert detect_archive_format("installer.exe") is None
+
+    def test_magic_bytes_override_suffix(self, sample_zip, temp_dir):
+        """Test that content sniffing wins over a misleading file name"""
+        mislabelled = temp_dir / "client.rar"
+        shutil.copy(sample_zip, mislabelled)
+        assert detect_archive_format(mislabelled) == 'zip'
+
+    def test_detects_compressed_tar_without_suffix(self, temp_dir):
+        """Test that an xz tarball is recognised from its header"""
+        archive = temp_dir / "download"
+        with tarfile.open(archive, 'w:xz') as tar:
+            tar.addfile(tarfile.TarInfo("empty"))
+        assert detect_archive_format(archive) == 'tar'
+        assert detect_tar_compression(archive) == 'xz'
+
+
+class TestZipExtraction:
+    """Test zip backend"""
+
+    def test_extracts_all_members(self, sample_zip, temp_dir):
+        """Test that every member lands in the destination"""
+        dest = temp_dir / "game"
+        progress = extract_archive(sample_zip, dest)
+
+        assert (dest / "Data" / "readme.txt").read_text() == "hello"
+        assert (dest / "Game.exe").exists()
+        assert progress.files_done == progress.files_total == 3
+        assert progress.bytes_done == progress.bytes_total
+
+    def test_reports_progress_messages(self, sample_zip, temp_dir):
+        """Test that progress callback receives percentage updates"""
+        messages = []
+        extract_archive(sample_zip, temp_dir / "game", messages.append)
+
+        assert messages
+        assert "100%" in messages[-1]
+        assert "3/3 files" in messages[-1]
+
+    def test_no_staging_directory_left_behind(self, sample_zip, temp_dir):
+        """Test that the staging directory is removed after extraction"""
+        dest = temp_dir / "game"
+        extract_archive(sample_zip, dest)
+        assert not any(p.name.startswith(".extracting-") for p in dest.iterdir())
+
+    def test_rejects_path_traversal(self, temp_dir):
+        """Test that members escaping the destination are refused"""
+        archive = temp_dir / "evil.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr("../../escape.txt", "nope")
+
+        with pytest.raises(ExtractionError):
+            extract_archive(archive, temp_dir / "game")
+        assert not (temp_dir / "escape.txt").exists()
+
+
+class TestStoredMembers:
+    """Test zero-copy extraction of STORED zip members"""
+
+    @pytest.fixture
+    def stored_zip(self, temp_dir):
+        """Create a zip mixing stored and deflated members"""
+        archive = temp_dir / "assets.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr(zipfile.ZipInfo("Data/patch.mpq"), bytes(range(256)) * 512)
+            zf.writestr("Data/config.wtf", "SET realmlist x", compress_type=zipfile.ZIP_DEFLATED)
+        return archive
+
+    def test_stored_member_copied_in_kernel(self, stored_zip, temp_dir):
+        """Test that stored members bypass Python buffers"""
+        dest = temp_dir / "game"
+        progress = extract_archive(stored_zip, dest)
+
+        assert (dest / "Data" / "patch.mpq").read_bytes() == bytes(range(256)) * 512
+        assert (dest / "Data" / "config.wtf").read_text() == "SET realmlist x"
+        assert progress.zero_copy_bytes == 256 * 512
+
+    def test_falls_back_to_buffered_copy(self, stored_zip, temp_dir):
+        """Test buffered fallback when in-kernel copies are unsupported"""
+        dest = temp_dir / "game"
+        with patch('archive_extractor._kernel_copy', side_effect=OSError("unsupported")):
+            progress = extract_archive(stored_zip, dest)
+
+        assert (dest / "Data" / "patch.mpq").read_bytes() == bytes(range(256)) * 512
+        assert progress.zero_copy_bytes == 0
+
+    @pytest.mark.parametrize("kernel_copy", [True, False])
+    def test_corrupt_stored_member_is_rejected(self, stored_zip, temp_dir, kernel_copy):
+        """Test that the fast path still checks the CRC-32 and leaves nothing behind"""
+        data = bytearray(stored_zip.read_bytes())
+        position = data.index(bytes(range(256))) + 1000
+        data[position] ^= 0xFF
+        stored_zip.write_bytes(bytes(data))
+        dest = temp_dir / "game"
+
+        fallback = patch('archive_extractor._kernel_copy', side_effect=OSError("unsupported"))
+        with nullcontext() if kernel_copy else fallback:
+            with pytest.raises(ExtractionError, match="CRC"):
+                extract_archive(stored_zip, dest)
+        assert not (dest / "Data").exists()
+
+    def test_self_extracting_prefix(self, stored_zip, temp_dir):
+        """Test member offsets when the zip has data prepended (SFX stub)"""
+        sfx = temp_dir / "client.zip"
+        sfx.write_bytes(b"MZ" + b"\0" * 1022 + stored_zip.read_bytes())
+
+        dest = temp_dir / "game"
+        extract_archive(sfx, dest)
+        assert (dest / "Data" / "patch.mpq").read_bytes() == bytes(range(256)) * 512
+
+
+class TestTarExtraction:
+    """Test tar backend"""
+
+    def test_extracts_tar_gz(self, temp_dir):
+        """Test streaming extraction of a gzipped tarball"""
+        source = temp_dir / "src"
+        (source / "bin").mkdir(parents=True)
+        (source / "bin" / "game").write_text("run")
+        archive = temp_dir / "client.tar.gz"
+        with tarfile.open(archive, 'w:gz') as tar:
+            tar.add(source / "bin", arcname="bin")
+
+        dest = temp_dir / "game"
+        progress = extract_archive(archive, dest)
+
+        assert (dest / "bin" / "game").read_text() == "run"
+        assert progress.files_done == 1
+        assert progress.fraction == 1.0
+
+
+class TestFastCodecs:
+    """Test multithreaded decoders for compressed tarballs"""
+
+    @pytest.fixture
+    def source_tree(self, temp_dir):
+        """Create a small directory tree to archive"""
+        source = temp_dir / "src"
+        (source / "Data").mkdir(parents=True)
+        (source / "Data" / "model.grf").write_bytes(b"grf" * 1000)
+        return source
+
+    def test_tar_xz_python_fallback(self, source_tree, temp_dir):
+        """Test tar.xz extraction without an external decompressor"""
+        archive = temp_dir / "client.tar.xz"
+        with tarfile.open(archive, 'w:xz') as tar:
+            tar.add(source_tree / "Data", arcname="Data")
+
+        dest = temp_dir / "game"
+        with patch('archive_extractor.shutil.which', return_value=None):
+            extract_archive(archive, dest)
+        assert (dest / "Data" / "model.grf").read_bytes() == b"grf" * 1000
+
+    @pytest.mark.skipif(shutil.which("xz") is None, reason="xz not installed")
+    def test_tar_xz_external_decoder(self, source_tree, temp_dir):
+        """Test tar.xz extraction through the threaded xz decoder"""
+        archive = temp_dir / "client.tar.xz"
+        with tarfile.open(archive, 'w:xz') as tar:
+            tar.add(source_tree / "Data", arcname="Data")
+
+        dest = temp_dir / "game"
+        progress = extract_archive(archive, dest, threads=2)
+        assert (dest / "Data" / "model.grf").read_bytes() == b"grf" * 1000
+        assert progress.files_done == 1
+
+    @pytest.mark.skipif(shutil.which("zstd") is None, reason="zstd not installed")
+    def test_tar_zst_external_decoder(self, source_tree, temp_dir):
+        """Test tar.zst extraction through the zstd command"""
+        import subprocess
+        plain = temp_dir / "client.tar"
+        with tarfile.open(plain, 'w') as tar:
+            tar.add(source_tree / "Data", arcname="Data")
+        subprocess.run(["zstd", "-q", str(plain), "-o", str(temp_dir / "client.tar.zst")], check=True)
+
+        dest = temp_dir / "game"
+        extract_archive(temp_dir / "client.tar.zst", dest)
+        assert (dest / "Data" / "model.grf").read_bytes() == b"grf" * 1000
+
+    def test_7z_thread_count_passed(self, temp_dir):
+        """Test that the 7z backend forwards the thread count"""
+        archive = temp_dir / "client.7z"
+        archive.write_bytes(b"7z\xbc\xaf\x27\x1c" + b"\0" * 32)
+        extractor = ArchiveExtractor(archive, temp_dir / "game", threads=6, which=lambda cmd: '/usr/bin/7z')
+
+        with patch('archive_extractor._list_7z_totals', return_value=(None, None)), \
+             patch.object(ArchiveExtractor, '_run_tool') as mock_run:
+            extractor.extract()
+
+        assert '-mmt6' in mock_run.call_args[0][0]
+
+    def test_tools_looked_up_through_probe(self, temp_dir):
+        """Test that tool lookups go through the injected probe instead of searching PATH"""
+        archive = temp_dir / "client.7z"
+        archive.write_bytes(b"7z\xbc\xaf\x27\x1c" + b"\0" * 32)
+        looked_up = []
+
+        def which(cmd):
+            looked_up.append(cmd)
+            return None
+
+        with patch('archive_extractor.shutil.which') as mock_which:
+            with pytest.raises(ExtractionError):
+                extract_archive(archive, temp_dir / "game", which=which)
+        assert looked_up == ['7z']
+        mock_which.assert_not_called()
+
+
+class TestCancellation:
+    """Test cooperative cancellation"""
+
+    def test_cancel_removes_partial_output(self, sample_zip, temp_dir):
+        """Test that a cancelled extraction leaves the destination clean"""
+        dest = temp_dir / "game"
+        cancel_event = threading.Event()
+
+        def cancel_after_first(message):
+            if "1/3 files" in message:
+                cancel_event.set()
+
+        with pytest.raises(ExtractionCancelled):
+            extract_archive(sample_zip, dest, cancel_after_first, cancel_event)
+
+        assert list(dest.iterdir()) == []
+
+    def test_existing_files_survive_cancel(self, sample_zip, temp_dir):
+        """Test that files already present in dest are untouched on cancel"""
+        dest = temp_dir / "game"
+        dest.mkdir()
+        (dest / "Game.exe").write_text("original")
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(ExtractionCancelled):
+            ArchiveExtractor(sample_zip, dest, cancel_event=cancel_event).extract()
+
+        assert (dest / "Game.exe").read_text() == "original"
+
+    def test_tool_stopped_when_handler_fails(self, temp_dir):
+        """Test that an error while streaming tool output terminates and reaps the tool"""
+        started = []
+        popen = subprocess.Popen
+
+        def spawn(*args, **kwargs):
+            started.append(popen(*args, **kwargs))
+            return started[-1]
+
+        def fail(line):
+            raise RuntimeError("handler failed")
+
+        extractor = ArchiveExtractor(temp_dir / "missing.7z", temp_dir / "game", archive_format='7z')
+        with patch('archive_extractor.subprocess.Popen', side_effect=spawn), \
+             pytest.raises(RuntimeError):
+            extractor._run_tool(["sh", "-c", "echo started; exec sleep 60"], fail)
+
+        assert started[0].returncode is not None
+
+
+class TestToolOutputParsing:
+    """Test parsing of external tool progress output"""
+
+    def test_parse_7z_progress_line(self):
+        """Test parsing a 7z -bsp1 line with file count and name"""
+        assert parse_7z_progress(" 42% 17 - Data/model.mpq") == (42, 17, "Data/model.mpq")
+
+    def test_parse_7z_percent_only(self):
+        """Test parsing a bare percentage line"""
+        assert parse_7z_progress("  5%") == (5, None, "")
+
+    def test_parse_7z_ignores_other_lines(self):
+        """Test that non-progress output is ignored"""
+        assert parse_7z_progress("Everything is Ok") is None
+
+    def test_parse_rar_progress(self):
+        """Test parsing unrar percentage output"""
+        assert parse_rar_progress("Extracting  Data/file.grf   73%") == 73
+        assert parse_rar_progress("All OK") is None
@@ -0,0 +1,233 @@
+"""
+Tests for content_store.py module
+"""
+
+import errno
+import os
+import pytest
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from content_store import ContentStore, CloneCancelled, MIN_DEDUP_SIZE, clone_tree, is_mutable
+
+
+BLOB = bytes(range(256)) * (MIN_DEDUP_SIZE // 256 + 1)
+
+
+def _no_reflink(src, dst):
+    Path(dst).touch()
+    raise OSError(errno.EOPNOTSUPP, "reflink not supported")
+
+
+def _fake_reflink(src, dst):
+    shutil.copyfile(src, dst)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def installs(temp_dir):
+    """Two installs sharing a client file and a settings file"""
+    roots = []
+    for name in ("wow-a", "wow-b"):
+        root = temp_dir / "Games" / name
+        (root / "Data").mkdir(parents=True)
+        (root / "Data" / "common.MPQ").write_bytes(BLOB)
+        (root / "Config.wtf").write_bytes(BLOB[::-1])
+        roots.append(root)
+    (roots[1] / "Data" / "patch-x.MPQ").write_bytes(b"x" * MIN_DEDUP_SIZE)
+    return roots
+
+
+@pytest.fixture
+def store(temp_dir):
+    """Content store beside the installs"""
+    return ContentStore(temp_dir / "Games" / ".store")
+
+
+class TestDedup:
+    """Test sharing identical files"""
+
+    def test_hardlinks_identical_files(self, installs, store):
+        """Test that duplicate assets end up on one inode, read-only"""
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            report = store.dedup(installs)
+
+        a, b = (root / "Data" / "common.MPQ" for root in installs)
+        assert a.stat().st_ino == b.stat().st_ino
+        assert not os.access(a, os.W_OK) or os.geteuid() == 0
+        assert not a.stat().st_mode & 0o222
+        assert report.hardlinks == 1
+        assert report.bytes_reclaimed == len(BLOB)
+        assert b.read_bytes() == BLOB
+
+    def test_mutable_files_not_hardlinked(self, installs, store):
+        """Test that settings files stay private without reflink support"""
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            store.dedup(installs)
+
+        a, b = (root / "Config.wtf" for root in installs)
+        assert a.stat().st_ino != b.stat().st_ino
+        assert a.stat().st_mode & 0o200
+
+    def test_private_roots_not_hardlinked(self, installs, store):
+        """Test that installs patched in place keep their own inodes"""
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            report = store.dedup(installs, private_roots=[installs[1]])
+
+        a, b = (root / "Data" / "common.MPQ" for root in installs)
+        assert a.stat().st_ino != b.stat().st_ino
+        assert b.stat().st_mode & 0o200
+        assert report.hardlinks == 0
+
+    def test_second_run_hashes_nothing(self, installs, store):
+        """Test that the stat-keyed index avoids re-hashing"""
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            store.dedup(installs)
+            report = ContentStore(store.store_dir).dedup(installs)
+
+        assert report.files_hashed == 0
+        assert report.files_already_shared == 2
+        assert report.bytes_reclaimed == 0
+
+    def test_reflinks_keep_files_writable(self, installs, store):
+        """Test copy-on-write clones for both assets and settings"""
+        with patch('content_store._reflink', side_effect=_fake_reflink):
+            report = store.dedup(installs)
+
+        assert report.reflinks == 2
+        assert report.hardlinks == 0
+        assert (installs[0] / "Data" / "common.MPQ").stat().st_mode & 0o200
+
+    def test_mutable_patterns(self):
+        """Test which files count as rewritten by games"""
+        assert is_mutable(Path("eqclient.ini"))
+        assert is_mutable(Path("WTF/Account/bindings-cache.dat"))
+        assert not is_mutable(Path("Data/common.MPQ"))
+
+
+class TestMaintenance:
+    """Test unshare and garbage collection"""
+
+    def test_unshare_gives_private_copy(self, installs, store):
+        """Test breaking a hardlink before writing a shared file"""
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            store.dedup(installs)
+        target = installs[0] / "Data" / "common.MPQ"
+
+        assert store.unshare(target)
+        assert target.stat().st_nlink == 1
+        assert target.stat().st_mode & 0o200
+        assert target.read_bytes() == BLOB
+
+    def test_patching_deduplicated_file(self, installs, store, temp_dir):
+        """Test that the patch applier gives a shared file a private copy"""
+        from patch_applier import apply_patch
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            store.dedup(installs)
+        patch_zip = temp_dir / "patch.zip"
+        with zipfile.ZipFile(patch_zip, 'w') as zf:
+            zf.writestr("Data/common.MPQ", b"patched" * 100)
+
+        apply_patch(patch_zip, installs[0])
+
+        patched, other = (root / "Data" / "common.MPQ" for root in installs)
+        assert patched.read_bytes() == b"patched" * 100
+        assert patched.stat().st_nlink == 1
+        assert os.access(patched, os.W_OK)
+        assert other.read_bytes() == BLOB
+
+    def test_gc_after_uninstall(self, installs, store):
+        """Test that objects are freed once no install uses them"""
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            store.dedup(installs)
+        for root in installs:
+            for path in root.rglob('*'):
+                if path.is_file():
+                    path.chmod(0o644)
+            shutil.rmtree(root)
+
+        assert store.gc() == len(BLOB)
+        assert not any(p.is_file() for p in store.objects_dir.rglob('*'))
+
+
+class TestInstallerIntegration:
+    """Test dedup from GameInstaller"""
+
+    def test_dedup_installs(self, installs, temp_dir):
+        """Test that installed game directories are deduplicated"""
+        from game_installer import GameInstaller
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+        installer.installed_games = {
+            root.name: {'name': root.name, 'path': str(root), 'install_type': 'manual_download'}
+            for root in installs
+        }
+        installer.installed_games['aur-game'] = {'name': 'x', 'path': 'aur://x', 'install_type': 'aur'}
+
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            report = installer.dedup_installs()
+
+        assert report.files_linked == 1
+
+    def test_patched_games_are_not_hardlinked(self, installs, temp_dir):
+        """Test that games with their own patcher are only shared through reflinks"""
+        from game_installer import GameInstaller
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+        installer.installed_games = {
+            game_id: {'name': game_id, 'path': str(root), 'install_type': 'manual_download'}
+            for game_id, root in zip(("everquest-quarm", "everquest-p1999"), installs)
+        }
+
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            report = installer.dedup_installs()
+
+        assert report.hardlinks == 0
+        assert os.access(installs[0] / "Data" / "common.MPQ", os.W_OK)
+
+
+class TestCloneTree:
+    """Test cloning install trees"""
+
+    def test_hardlink_fallback_keeps_mutable_files_private(self, installs, temp_dir):
+        """Test the hardlink-plus-private-copy fallback"""
+        source = installs[0]
+        with patch('content_store._reflink', side_effect=_no_reflink):
+            report = clone_tree(source, temp_dir / "clone", skip_dirs=["wtf"])
+
+        clone = temp_dir / "clone"
+        assert (clone / "Data" / "common.MPQ").stat().st_ino == (source / "Data" / "common.MPQ").stat().st_ino
+        assert (clone / "Config.wtf").stat().st_ino != (source / "Config.wtf").stat().st_ino
+        assert report.hardlinked == 1
+        assert report.copied == 1
+
+    def test_skip_dirs(self, installs, temp_dir):
+        """Test that per-install directories are left out"""
+        (installs[0] / "WTF").mkdir()
+        (installs[0] / "WTF" / "Account.wtf").write_text("me")
+
+        with patch('content_store._reflink', side_effect=_fake_reflink):
+            report = clone_tree(installs[0], temp_dir / "clone", skip_dirs=["wtf"])
+
+        assert not (temp_dir / "clone" / "WTF").exists()
+        assert report.reflinked == 2
+
+    def test_cancel(self, installs, temp_dir):
+        """Test that a set cancel event stops the clone"""
+        import threading
+        cancel_event = threading.Event()
+        cancel_event.set()
+        with pytest.raises(CloneCancelled):
+            clone_tree(installs[0], temp_dir / "clone", cancel_event=cancel_event)
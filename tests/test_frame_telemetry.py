@@ -0,0 +1,78 @@
+import pytest
+import tempfile
+from pathlib import Path
+
+from frame_telemetry import (
+    FrameStats, FrameTelemetry, parse_mangohud_log, profile_fingerprint, MIN_FRAMES,
+)
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def write_log(path: Path, frametimes):
+    lines = ["os,cpu,gpu,ram,kernel,driver,cpuscheduler",
+             "Arch Linux,Ryzen 7 5800X,RX 6800,32GB,6.9.1,Mesa 24.1,schedutil",
+             "fps,frametime,cpu_load,gpu_load,cpu_temp,gpu_temp,elapsed"]
+    elapsed = 0
+    for frametime in frametimes:
+        elapsed += int(frametime * 1e6)
+        lines.append(f"{1000 / frametime:.1f},{frametime},40,80,60,70,{elapsed}")
+    path.write_text("\n".join(lines) + "\n")
+
+
+class TestFrameStats:
+    def test_percentiles_and_stutters(self):
+        stats = FrameStats()
+        for i in range(1000):
+            stats.add(50.0 if i % 100 == 50 else 10.0, 30, 90)
+        summary = stats.summary()
+        assert summary['frames'] == 1000
+        assert 90 < summary['avg_fps'] < 100
+        assert summary['low_1'] == pytest.approx(100, abs=1)
+        assert summary['low_01'] == pytest.approx(20, abs=1)
+        assert summary['stutters'] == 10
+        assert summary['cpu_load'] == 30 and summary['gpu_load'] == 90
+
+    def test_parse_skips_header_and_warmup(self, temp_dir):
+        log = temp_dir / "Wow_2024-05-01_20-00-00.csv"
+        # 2s of slow loading frames, then 10s at 100 fps
+        write_log(log, [100.0] * 20 + [10.0] * 1000)
+        stats = parse_mangohud_log(log, warmup=2.0)
+        assert stats.frames == 1000
+        assert stats.summary()['avg_fps'] == 100.0
+
+
+class TestFrameTelemetry:
+    def test_environment_keeps_user_options(self, temp_dir):
+        env = FrameTelemetry.environment(temp_dir, {'MANGOHUD_CONFIG': "fps_only"})
+        assert env['MANGOHUD'] == "1"
+        assert env['MANGOHUD_CONFIG'].startswith("fps_only,")
+        assert f"output_folder={temp_dir}" in env['MANGOHUD_CONFIG']
+
+    def test_summarise_and_compare_profiles(self, temp_dir):
+        telemetry = FrameTelemetry(temp_dir / "frame_sessions.json", temp_dir / "logs")
+        before, after = {'dxvk_async': False}, {'dxvk_async': True}
+        for profile, frametime in ((before, 20.0), (before, 20.0), (after, 10.0)):
+            session_dir = telemetry.session_dir("wow")
+            write_log(session_dir / "Wow.csv", [frametime] * (MIN_FRAMES + 500))
+            (session_dir / "Wow_summary.csv").write_text("not,a,frame,log\n")
+            record = telemetry.summarise("wow", session_dir, profile)
+            assert record['profile'] == profile_fingerprint(profile)
+            assert not session_dir.exists()
+
+        sessions = telemetry.sessions("wow")
+        assert [s['avg_fps'] for s in sessions] == [50.0, 50.0, 100.0]
+        text = telemetry.compare("wow")
+        assert text.startswith("Last session: 100 fps avg")
+        assert "(2 → 1 sessions)" in text and "avg 50 fps → 100 fps" in text
+
+    def test_short_session_not_recorded(self, temp_dir):
+        telemetry = FrameTelemetry(temp_dir / "frame_sessions.json", temp_dir / "logs")
+        session_dir = telemetry.session_dir("wow")
+        write_log(session_dir / "Wow.csv", [10.0] * 10)
+        assert telemetry.summarise("wow", session_dir, {}) is None
+        assert telemetry.compare("wow") is None
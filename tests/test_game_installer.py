@@ -46,11 +46,36 @@ class TestGameInstallerInit:
             installer = GameInstaller(games_dir=str(temp_dir / "Games"))
             assert installer.config_dir.exists()
 
+    def test_shares_probe_cache_with_cli(self, temp_dir):
+        """Test that the installer and the system_probe command use one capability cache"""
+        import system_probe
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+        assert installer.probe.cache_file.relative_to(temp_dir) == \
+            system_probe.DEFAULT_CACHE_FILE.relative_to(Path.home())
+        assert installer.prefix_templates.which == installer.probe.which
+
     def test_loads_installed_games(self, mock_installer):
         """Test that installed games are loaded from JSON"""
         assert isinstance(mock_installer.installed_games, dict)
 
 
+    def test_reload_keeps_subsystems(self, mock_installer):
+        """Test that reloading re-reads state without replacing running services"""
+        supervisor, wineservers = mock_installer.supervisor, mock_installer.wineservers
+        mock_installer.supervisor.exit_callback = callback = Mock()
+        with open(mock_installer.installed_games_file, 'w', encoding='utf-8') as f:
+            json.dump({'eq': {'path': '/games/eq'}}, f)
+
+        mock_installer.reload()
+
+        assert mock_installer.installed_games['eq'] == {'path': '/games/eq'}
+        assert mock_installer.supervisor is supervisor
+        assert mock_installer.wineservers is wineservers
+        assert mock_installer.supervisor.exit_callback is callback
+
+
 class TestAURHelperDetection:
     """Test AUR helper detection"""
 
@@ -58,6 +83,7 @@ class TestAURHelperDetection:
         """Test detection of yay AUR helper"""
         with patch('shutil.which') as mock_which:
             mock_which.side_effect = lambda x: '/usr/bin/yay' if x == 'yay' else None
+            mock_installer.probe.invalidate()
             helper = mock_installer._detect_aur_helper()
             assert helper == 'yay'
 
@@ -65,12 +91,14 @@ class TestAURHelperDetection:
         """Test detection of paru AUR helper"""
         with patch('shutil.which') as mock_which:
             mock_which.side_effect = lambda x: '/usr/bin/paru' if x == 'paru' else None
+            mock_installer.probe.invalidate()
             helper = mock_installer._detect_aur_helper()
             assert helper == 'paru'
 
     def test_no_helper_found(self, mock_installer):
         """Test when no AUR helper is found"""
         with patch('shutil.which', return_value=None):
+            mock_installer.probe.invalidate()
             helper = mock_installer._detect_aur_helper()
             assert helper is None
 
@@ -81,18 +109,21 @@ class TestDependencyChecking:
     def test_check_umu_launcher(self, mock_installer):
         """Test checking for umu-launcher"""
         with patch('shutil.which', return_value='/usr/bin/umu'):
+            mock_installer.probe.invalidate()
             results = mock_installer.check_dependencies(['umu-launcher'])
             assert results['umu-launcher'] is True
 
     def test_check_wine(self, mock_installer):
         """Test checking for wine"""
         with patch('shutil.which', return_value='/usr/bin/wine'):
+            mock_installer.probe.invalidate()
             results = mock_installer.check_dependencies(['wine'])
             assert results['wine'] is True
 
     def test_missing_dependency(self, mock_installer):
         """Test detection of missing dependency"""
         with patch('shutil.which', return_value=None):
+            mock_installer.probe.invalidate()
             results = mock_installer.check_dependencies(['steam'])
             assert results['steam'] is False
 
@@ -180,10 +211,14 @@ class TestGameLaunching:
         }
         game_data = {'name': 'Test Game', 'launch_command': 'test-package'}
 
-        with patch('subprocess.Popen') as mock_popen:
+        with patch('subprocess.Popen') as mock_popen, \
+             patch.object(mock_installer, 'supervisor') as mock_supervisor, \
+             patch.object(mock_installer, 'launch_timings') as mock_timings:
             result = mock_installer.launch_game('test-game', game_data)
             assert result is True
             mock_popen.assert_called_once()
+            mock_supervisor.watch.assert_called_once_with('test-game', mock_popen.return_value)
+            mock_timings.follow_in_background.assert_called_once()
 
     def test_launch_flatpak_game(self, mock_installer):
         """Test launching Flatpak game"""
@@ -196,10 +231,14 @@ class TestGameLaunching:
         }
         game_data = {'name': 'Test Game'}
 
-        with patch('subprocess.Popen') as mock_popen:
+        with patch('subprocess.Popen') as mock_popen, \
+             patch.object(mock_installer.isolation, 'enabled', False), \
+             patch.object(mock_installer, 'supervisor') as mock_supervisor, \
+             patch.object(mock_installer, 'launch_timings'):
             result = mock_installer.launch_game('test-game', game_data)
             assert result is True
             mock_popen.assert_called_with(['flatpak', 'run', 'com.test.Game'])
+            mock_supervisor.watch.assert_called_once()
 
     def test_launch_umu_game(self, mock_installer, temp_dir):
         """Test launching game via UMU"""
@@ -217,9 +256,39 @@ class TestGameLaunching:
         game_data = {'name': 'Test Game', 'executable': 'game.exe'}
 
         with patch('subprocess.Popen') as mock_popen, \
-             patch('shutil.which', return_value='/usr/bin/umu-run'):
+             patch('shutil.which', return_value='/usr/bin/umu-run'), \
+             patch.object(mock_installer, 'supervisor') as mock_supervisor, \
+             patch.object(mock_installer, 'prefetcher'), \
+             patch.object(mock_installer, 'launch_timings') as mock_timings:
             result = mock_installer.launch_game('test-game', game_data)
             assert result is True
+            mock_supervisor.watch.assert_called_once_with('test-game', mock_popen.return_value)
+            timer = mock_timings.start.return_value
+            mock_timings.follow_in_background.assert_called_once_with(
+                timer, mock_popen.return_value.pid, None, 'game.exe')
+
+    def test_launch_umu_game_with_frame_telemetry(self, mock_installer, temp_dir):
+        """Test that MangoHud logging is enabled per session when requested"""
+        game_dir = temp_dir / "Games" / "test-game"
+        game_dir.mkdir(parents=True)
+        (game_dir / "game.exe").touch()
+        mock_installer.installed_games = {
+            'test-game': {'name': 'Test Game', 'path': str(game_dir), 'install_type': 'manual_download'}
+        }
+        mock_installer.settings['frame_telemetry'] = True
+        mock_installer.probe.invalidate()
+        game_data = {'name': 'Test Game', 'executable': 'game.exe'}
+
+        with patch('subprocess.Popen') as mock_popen, \
+             patch('shutil.which', return_value='/usr/bin/umu-run'), \
+             patch.object(mock_installer, 'supervisor'), \
+             patch.object(mock_installer, 'prefetcher'), \
+             patch.object(mock_installer, 'launch_timings'), \
+             patch.object(mock_installer, '_collect_frame_telemetry') as mock_collect:
+            assert mock_installer.launch_game('test-game', game_data) is True
+            env = mock_popen.call_args.kwargs['env']
+            assert env['MANGOHUD'] == "1" and "output_folder=" in env['MANGOHUD_CONFIG']
+            mock_collect.assert_called_once()
 
     def test_launch_game_not_installed(self, mock_installer):
         """Test launching game that's not installed"""
@@ -281,3 +350,108 @@ class TestConfigPersistence:
 
         loaded = mock_installer._load_installed_games()
         assert loaded == test_data
+
+
+class TestBaseClients:
+    """Test cloning sibling servers from a shared base client"""
+
+    @pytest.fixture
+    def sunwell_install(self, mock_installer, temp_dir):
+        """An installed 3.3.5a client with some per-install state"""
+        game_dir = temp_dir / "Games" / "wow-sunwell"
+        (game_dir / "Data" / "enUS").mkdir(parents=True)
+        (game_dir / "Wow.exe").write_bytes(b"MZ" * 100)
+        (game_dir / "Data" / "common.MPQ").write_bytes(b"mpq" * 1000)
+        (game_dir / "Data" / "enUS" / "realmlist.wtf").write_text("set realmlist logon.sunwell.pl\n")
+        (game_dir / "WTF").mkdir()
+        (game_dir / "WTF" / "Config.wtf").write_text("SET accountName \"me\"\n")
+        mock_installer.installed_games['wow-sunwell'] = {
+            'name': 'Sunwell', 'path': str(game_dir), 'install_type': 'manual_download'
+        }
+        return game_dir
+
+    def test_sibling_install_is_captured_as_base(self, mock_installer, sunwell_install):
+        """Test that an installed sibling becomes the pristine base"""
+        from games_db import GAMES_DATABASE
+        base_dir = mock_installer.ensure_base_client(GAMES_DATABASE['wow-dalaran'])
+
+        assert base_dir is not None
+        assert (base_dir / "Data" / "common.MPQ").exists()
+        assert not (base_dir / "WTF").exists()
+        assert mock_installer.base_clients['wow-3.3.5a']['source'] == 'wow-sunwell'
+
+    def test_lookup_and_scheduling_do_not_capture(self, mock_installer, sunwell_install):
+        """Test that the GUI-side checks never copy a client"""
+        from games_db import GAMES_DATABASE
+        from install_scheduler import RESOURCE_DISK
+        game_data = GAMES_DATABASE['wow-dalaran']
+        with patch.object(mock_installer, 'check_dependencies', return_value={}), \
+             patch('game_installer.clone_tree') as mock_clone:
+            assert mock_installer.get_base_client(game_data) is None
+            assert mock_installer.install_resources('wow-dalaran', game_data) == {RESOURCE_DISK}
+        mock_clone.assert_not_called()
+        assert mock_installer.base_clients == {}
+
+    def test_capture_leaves_source_writable(self, mock_installer, sunwell_install):
+        """Test that capturing a base never hardlinks or write-protects the live install"""
+        import os
+        from games_db import GAMES_DATABASE
+        base_dir = mock_installer.ensure_base_client(GAMES_DATABASE['wow-dalaran'])
+
+        source = sunwell_install / "Data" / "common.MPQ"
+        assert os.access(source, os.W_OK)
+        assert source.stat().st_nlink == 1
+        assert (base_dir / "Data" / "common.MPQ").read_bytes() == source.read_bytes()
+
+    def test_install_clones_base_and_applies_overrides(self, mock_installer, sunwell_install, temp_dir):
+        """Test that a sibling server installs without downloading"""
+        from games_db import GAMES_DATABASE
+        game_data = GAMES_DATABASE['wow-warmane-icecrown']
+
+        with patch.object(mock_installer, 'check_dependencies', return_value={}), \
+             patch.object(mock_installer, 'prepare_prefix', return_value=None), \
+             patch.object(mock_installer, 'download_file') as mock_download:
+            result = mock_installer.install_game('wow-warmane-icecrown', game_data)
+
+        assert result is True
+        mock_download.assert_not_called()
+        game_dir = temp_dir / "Games" / "wow-warmane-icecrown"
+        assert (game_dir / "Data" / "common.MPQ").read_bytes() == b"mpq" * 1000
+        assert (game_dir / "Data" / "enUS" / "realmlist.wtf").read_text() == "set realmlist logon.warmane.com\n"
+        assert (sunwell_install / "Data" / "enUS" / "realmlist.wtf").read_text() == "set realmlist logon.sunwell.pl\n"
+        assert mock_installer.installed_games['wow-warmane-icecrown']['base_client'] == 'wow-3.3.5a'
+
+    def test_cloned_install_gets_prefix(self, mock_installer, sunwell_install, temp_dir):
+        """Test that a cloned server gets its own prefix like a normal install"""
+        from games_db import GAMES_DATABASE
+        prefix = temp_dir / "Games" / "umu" / "wow-dalaran" / "default"
+
+        with patch.object(mock_installer, 'check_dependencies', return_value={}), \
+             patch.object(mock_installer, 'prepare_prefix', return_value=prefix) as mock_prepare, \
+             patch.object(mock_installer, '_install_redistributables', return_value=True):
+            assert mock_installer.install_game('wow-dalaran', GAMES_DATABASE['wow-dalaran']) is True
+
+        mock_prepare.assert_called_once()
+        assert mock_installer.installed_games['wow-dalaran']['prefix'] == str(prefix)
+
+    def test_cloned_install_can_be_cancelled(self, mock_installer, sunwell_install, temp_dir):
+        """Test that cancelling a clone removes the partial install"""
+        import threading
+        from games_db import GAMES_DATABASE
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with patch.object(mock_installer, 'check_dependencies', return_value={}), \
+             patch.object(mock_installer, 'prepare_prefix') as mock_prepare:
+            result = mock_installer.install_game('wow-dalaran', GAMES_DATABASE['wow-dalaran'],
+                                                 cancel_event=cancel_event)
+
+        assert result is False
+        mock_prepare.assert_not_called()
+        assert not (temp_dir / "Games" / "wow-dalaran").exists()
+        assert 'wow-dalaran' not in mock_installer.installed_games
+
+    def test_games_without_family_have_no_base(self, mock_installer):
+        """Test that unrelated games install from scratch"""
+        from games_db import GAMES_DATABASE
+        assert mock_installer.get_base_client(GAMES_DATABASE['swtor']) is None
@@ -0,0 +1,78 @@
+import pytest
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from game_supervisor import GameSupervisor, GameSession, read_process
+from page_prefetch import descendants
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def spawn(code: str) -> subprocess.Popen:
+    return subprocess.Popen([sys.executable, "-c", code])
+
+
+class TestGameSupervisor:
+    def test_exit_status_and_history(self, temp_dir):
+        exited = []
+        supervisor = GameSupervisor(temp_dir / "sessions.json", interval=0.05,
+                                    exit_callback=lambda game_id, session: exited.append((game_id, session)))
+        supervisor.watch("good", spawn("pass"))
+        supervisor.watch("bad", spawn("import sys; sys.exit(3)"))
+        assert supervisor.wait("good", 10) and supervisor.wait("bad", 10)
+
+        sessions = {game_id: session for game_id, session in exited}
+        assert not sessions["good"].crashed
+        assert sessions["bad"].crashed and sessions["bad"].returncode == 3
+        assert not supervisor.is_running("good")
+
+        history = json.loads((temp_dir / "sessions.json").read_text())
+        assert {s['game_id'] for s in history} == {"good", "bad"}
+        assert supervisor.history("bad")[0]['returncode'] == 3
+
+    def test_samples_process_tree(self, temp_dir):
+        samples = []
+        got_sample = threading.Event()
+
+        def on_sample(game_id, sample):
+            samples.append(sample)
+            if sample.processes >= 2:
+                got_sample.set()
+
+        supervisor = GameSupervisor(interval=0.05, sample_callback=on_sample)
+        code = ("import subprocess, sys, time; "
+                "child = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(30)']); "
+                "time.sleep(30)")
+        process = spawn(code)
+        try:
+            session = supervisor.watch("tree", process)
+            assert got_sample.wait(10)
+            assert supervisor.session("tree") is session
+            assert session.last_sample is not None and session.peak_rss > 0
+        finally:
+            for pid in descendants(process.pid) - {process.pid}:
+                os.kill(pid, signal.SIGKILL)
+            process.kill()
+        assert supervisor.wait("tree", 10)
+        assert session.crashed
+
+    def test_read_process(self):
+        info = read_process(os.getpid())
+        assert info['rss'] > 0 and info['threads'] >= 1
+        assert read_process(2 ** 22 + 1) is None
+
+    def test_session_to_dict(self):
+        session = GameSession("wow", 1, started=100.0)
+        session.ended, session.returncode = 160.0, 0
+        assert session.to_dict()['duration'] == 60.0
+        assert not session.running and not session.crashed
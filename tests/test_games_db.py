@@ -7,6 +7,7 @@ from games_db import (
     GAMES_DATABASE,
     get_all_games,
     get_game_by_id,
+    get_games_by_client,
     get_games_by_genre,
     get_native_games,
     get_tested_games
@@ -167,6 +168,29 @@ class TestGetGamesByGenre:
         assert len(result) == 0
 
 
+class TestGetGamesByClient:
+    """Test get_games_by_client() function"""
+
+    def test_wotlk_servers_share_client(self):
+        """Test that 3.3.5a servers are grouped together"""
+        result = get_games_by_client('wow', '3.3.5a')
+        assert {'wow-sunwell', 'wow-dalaran', 'wow-warmane-icecrown'} <= set(result)
+        assert 'wow-turtle' not in result
+
+    def test_family_entries_declare_version(self):
+        """Test that client_family is always paired with client_version"""
+        for game_id, game_data in GAMES_DATABASE.items():
+            assert ('client_family' in game_data) == ('client_version' in game_data), game_id
+
+    def test_shared_wow_clients_point_at_their_server(self):
+        """Test that WoW servers sharing a cloned client override its realmlist"""
+        for game_id, game_data in GAMES_DATABASE.items():
+            if game_data.get('client_family') == 'wow':
+                realmlists = [v for k, v in game_data.get('client_overrides', {}).items()
+                              if k.endswith("realmlist.wtf")]
+                assert realmlists or game_data.get('server_patch_url'), game_id
+
+
 class TestGetNativeGames:
     """Test get_native_games() function"""
 
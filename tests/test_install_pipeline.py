@@ -0,0 +1,173 @@
+"""
+Tests for install_pipeline.py module
+"""
+
+import pytest
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from install_pipeline import InstallPipeline, stage_timings
+from game_installer import GameInstaller
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+class Recorder:
+    """Stage functions that log their calls and write one artefact each"""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.calls = []
+
+    def stage(self, name, ok=True):
+        def func(pipeline):
+            self.calls.append(name)
+            output = self.root / f"{name}.out"
+            output.write_text(name)
+            pipeline.artefact(output)
+            return ok
+        return (name, func)
+
+
+class TestInstallPipeline:
+    """Test stage checkpointing and resume"""
+
+    def test_rerun_skips_finished_stages(self, temp_dir):
+        """Test that a failed run resumes at the failed stage"""
+        state = temp_dir / "state.json"
+        rec = Recorder(temp_dir)
+        assert not InstallPipeline("g", state).run([rec.stage("download"), rec.stage("extract", ok=False)])
+
+        rec.calls.clear()
+        statuses = []
+        pipeline = InstallPipeline("g", state, stage_callback=lambda *args: statuses.append(args[:2]))
+        assert pipeline.run([rec.stage("download"), rec.stage("extract")])
+        assert rec.calls == ["extract"]
+        assert ("download", "skipped") in statuses
+
+    def test_changed_artefact_reruns_stage_and_successors(self, temp_dir):
+        """Test that modified outputs invalidate the stage and everything after it"""
+        state = temp_dir / "state.json"
+        rec = Recorder(temp_dir)
+        stages = [rec.stage("download"), rec.stage("verify"), rec.stage("extract")]
+        assert InstallPipeline("g", state).run(stages)
+
+        (temp_dir / "verify.out").write_text("tampered with")
+        rec.calls.clear()
+        assert InstallPipeline("g", state).run(stages)
+        assert rec.calls == ["verify", "extract"]
+
+    def test_fingerprint_change_starts_over(self, temp_dir):
+        """Test that a new download URL discards the checkpoint"""
+        state = temp_dir / "state.json"
+        rec = Recorder(temp_dir)
+        assert InstallPipeline("g", state, {'url': 'a'}).run([rec.stage("download")])
+        rec.calls.clear()
+        assert InstallPipeline("g", state, {'url': 'b'}).run([rec.stage("download")])
+        assert rec.calls == ["download"]
+
+    def test_discarded_artefact_does_not_invalidate(self, temp_dir):
+        """Test that an archive removed after extraction is not downloaded again"""
+        state = temp_dir / "state.json"
+        rec = Recorder(temp_dir)
+
+        def extract(pipeline):
+            pipeline.discard(temp_dir / "download.out")
+            return True
+
+        stages = [rec.stage("download"), ("extract", extract)]
+        assert InstallPipeline("g", state).run(stages)
+        assert not (temp_dir / "download.out").exists()
+
+        rec.calls.clear()
+        assert InstallPipeline("g", state).run(stages)
+        assert rec.calls == []
+
+    def test_cancel_stops_before_next_stage(self, temp_dir):
+        """Test that cancellation is checkpointed"""
+        state = temp_dir / "state.json"
+        cancel = threading.Event()
+
+        def cancelling(pipeline):
+            cancel.set()
+            return True
+
+        rec = Recorder(temp_dir)
+        assert not InstallPipeline("g", state, cancel_event=cancel).run([("download", cancelling), rec.stage("extract")])
+        assert rec.calls == []
+        assert [(name, status) for name, status, _ in stage_timings(state)] == [
+            ("download", "done"), ("extract", "cancelled")
+        ]
+
+    def test_exception_is_recorded_and_raised(self, temp_dir):
+        """Test that a crashing stage is marked failed"""
+        state = temp_dir / "state.json"
+
+        def crash(pipeline):
+            raise RuntimeError("disk full")
+
+        with pytest.raises(RuntimeError):
+            InstallPipeline("g", state).run([("extract", crash)])
+        assert stage_timings(state)[0][:2] == ("extract", "failed")
+
+
+class TestInstallerResume:
+    """Test that GameInstaller resumes interrupted installs"""
+
+    @pytest.fixture
+    def installer(self, temp_dir):
+        """GameInstaller writing its state into the temp dir"""
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            return GameInstaller(games_dir=str(temp_dir / "Games"))
+
+    @pytest.fixture
+    def client_zip(self, temp_dir):
+        archive = temp_dir / "client.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr("Game/game.exe", b"MZ" + b"\0" * 64)
+        return archive
+
+    def test_failed_extract_does_not_download_again(self, installer, client_zip, temp_dir):
+        """Test that a retry after an extraction failure reuses the download"""
+        game_data = {'name': 'Test', 'executable': 'game.exe', 'install_type': 'manual_download',
+                     'client_download_url': 'https://example.com/client.zip', 'dependencies': []}
+        downloads = []
+
+        def fake_download(url, dest, progress_callback=None):
+            downloads.append(url)
+            shutil.copy(client_zip, dest)
+            return True
+
+        with patch.object(installer, 'download_file', side_effect=fake_download), \
+             patch.object(installer, 'prepare_prefix', return_value=None):
+            with patch('game_installer.extract_archive', side_effect=OSError("No space left")):
+                assert installer._run_install_pipeline('test', game_data, temp_dir / "Games" / "test",
+                                                       "client.zip") is False
+            assert installer._run_install_pipeline('test', game_data, temp_dir / "Games" / "test",
+                                                   "client.zip") is True
+
+        assert len(downloads) == 1
+        game_dir = temp_dir / "Games" / "test"
+        assert installer.installed_games['test']['client_exe'] == str(game_dir / "Game" / "game.exe")
+        assert not (game_dir / "client.zip").exists()
+        assert [stage for stage, status, _ in installer.install_stage_timings('test') if status == "done"] == [
+            "resolve", "download", "verify", "extract", "prefix", "redistributables", "register"
+        ]
+
+    def test_web_page_download_is_rejected(self, installer, temp_dir):
+        """Test that an HTML landing page is not treated as a client"""
+        page = temp_dir / "client.zip"
+        page.write_text("<!DOCTYPE html><html></html>")
+        problem = installer._verify_download(page, {'install_type': 'manual_download'})
+        assert problem is not None and "web page" in problem
@@ -0,0 +1,175 @@
+"""
+Tests for install_scheduler.py module
+"""
+
+import pytest
+import shutil
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from install_scheduler import (
+    InstallScheduler, RESOURCE_NETWORK, RESOURCE_DISK, RESOURCE_CPU, RESOURCE_INTERACTIVE,
+    JOB_QUEUED, JOB_RUNNING, JOB_DONE, JOB_FAILED, JOB_CANCELLED
+)
+from game_installer import GameInstaller
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+class GatedJobs:
+    """run_job that blocks each install until the test releases it"""
+
+    def __init__(self):
+        self.gates = {}
+        self.started = []
+        self.lock = threading.Lock()
+
+    def __call__(self, job):
+        with self.lock:
+            self.started.append(job.game_id)
+            gate = self.gates.setdefault(job.game_id, threading.Event())
+        gate.wait(5)
+        return not job.cancel_event.is_set()
+
+    def release(self, game_id):
+        with self.lock:
+            self.gates.setdefault(game_id, threading.Event()).set()
+
+
+def make_scheduler(run_job, limits, finished=None):
+    return InstallScheduler(run_job, limits=limits,
+                            finished_callback=lambda gid, state: finished.append((gid, state))
+                            if finished is not None else None)
+
+
+class TestInstallScheduler:
+    """Test resource limits, ordering and cancellation"""
+
+    def test_limits_and_backfill(self):
+        """Test that a waiting job does not block one needing other resources"""
+        jobs = GatedJobs()
+        scheduler = make_scheduler(jobs, {RESOURCE_NETWORK: 1, RESOURCE_INTERACTIVE: 1})
+        scheduler.submit("a", {}, [RESOURCE_NETWORK])
+        scheduler.submit("b", {}, [RESOURCE_NETWORK])
+        scheduler.submit("c", {}, [RESOURCE_INTERACTIVE])
+
+        assert {job.game_id: job.state for job in scheduler.jobs()} == {
+            "a": JOB_RUNNING, "b": JOB_QUEUED, "c": JOB_RUNNING
+        }
+        jobs.release("a")
+        jobs.release("c")
+        jobs.release("b")
+        assert scheduler.wait(5)
+        assert jobs.started.index("b") > jobs.started.index("a")
+
+    def test_reorder_queue(self):
+        """Test that a job moved to the front starts next"""
+        jobs = GatedJobs()
+        scheduler = make_scheduler(jobs, {RESOURCE_DISK: 1})
+        for game_id in ("a", "b", "c"):
+            scheduler.submit(game_id, {}, [RESOURCE_DISK])
+
+        assert scheduler.move("c", -5)
+        assert not scheduler.move("a", 1)  # running jobs stay put
+        assert [job.game_id for job in scheduler.jobs()] == ["a", "c", "b"]
+
+        for game_id in ("a", "b", "c"):
+            jobs.release(game_id)
+        assert scheduler.wait(5)
+        assert jobs.started == ["a", "c", "b"]
+
+    def test_cancel_queued_and_running(self):
+        """Test that cancelling dequeues waiting jobs and signals running ones"""
+        jobs = GatedJobs()
+        finished = []
+        scheduler = make_scheduler(jobs, {RESOURCE_CPU: 1}, finished)
+        running = scheduler.submit("a", {}, [RESOURCE_CPU])
+        scheduler.submit("b", {}, [RESOURCE_CPU])
+
+        assert scheduler.cancel("b")
+        assert scheduler.cancel("a")
+        assert running.cancel_event.is_set()
+        jobs.release("a")
+        assert scheduler.wait(5)
+
+        assert sorted(finished) == [("a", JOB_CANCELLED), ("b", JOB_CANCELLED)]
+        assert jobs.started == ["a"]
+
+    def test_duplicate_and_failed_jobs(self):
+        """Test that a game is queued once and a crashing install is reported as failed"""
+        finished = []
+
+        def crash(job):
+            raise RuntimeError("boom")
+
+        scheduler = make_scheduler(crash, {RESOURCE_DISK: 1}, finished)
+        gate = threading.Event()
+        blocker = make_scheduler(lambda job: gate.wait(5), {})
+        assert blocker.submit("x", {}, []) is not None
+        assert blocker.submit("x", {}, []) is None
+        gate.set()
+        assert blocker.wait(5)
+
+        scheduler.submit("a", {}, [RESOURCE_DISK])
+        assert scheduler.wait(5)
+        assert finished == [("a", JOB_FAILED)]
+
+    def test_progress_is_kept_per_job(self):
+        """Test that job messages are recorded for the queue view"""
+        messages = []
+
+        def run(job):
+            progress, stage = scheduler.job_callbacks(job)
+            progress("Downloading")
+            progress("Extracting")
+            return True
+
+        scheduler = InstallScheduler(run, progress_callback=lambda gid, msg: messages.append((gid, msg)),
+                                     finished_callback=lambda gid, state: messages.append((gid, state)))
+        job = scheduler.submit("a", {'name': 'A'}, [RESOURCE_NETWORK])
+        assert scheduler.wait(5)
+        assert job.last_message == "Extracting"
+        assert messages == [("a", "Downloading"), ("a", "Extracting"), ("a", JOB_DONE)]
+
+    def test_unknown_resource_is_rejected(self):
+        scheduler = make_scheduler(lambda job: True, {})
+        with pytest.raises(ValueError):
+            scheduler.submit("a", {}, ["gpu"])
+
+
+class TestInstallResources:
+    """Test how GameInstaller classifies installs"""
+
+    @pytest.fixture
+    def installer(self, temp_dir):
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+        installer.aur_helper = None
+        return installer
+
+    def test_classification(self, installer):
+        """Test resource classes for the main install types"""
+        with patch.object(installer, 'check_dependencies', return_value={}):
+            assert installer.install_resources('a', {'install_type': 'auto_installer'}) == {
+                RESOURCE_NETWORK, RESOURCE_DISK, RESOURCE_INTERACTIVE
+            }
+            assert installer.install_resources('f', {'install_type': 'flatpak'}) == {RESOURCE_NETWORK, RESOURCE_DISK}
+            assert installer.install_resources('s', {'install_type': 'steam'}) == set()
+            # The P99 recipe runs the Titanium setup program
+            assert RESOURCE_INTERACTIVE in installer.install_resources(
+                'everquest-p1999', {'install_type': 'manual_download', 'install_script': 'recipe:everquest-p1999'}
+            )
+
+    def test_missing_dependencies_need_interactive(self, installer):
+        """Test that a sudo package install is never run alongside a prompt"""
+        with patch.object(installer, 'check_dependencies', return_value={'wine': False}):
+            assert RESOURCE_INTERACTIVE in installer.install_resources('f', {'install_type': 'flatpak'})
@@ -0,0 +1,146 @@
+"""
+Tests for installer_unpacker.py module
+"""
+
+import pytest
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from archive_extractor import ExtractionError
+from installer_unpacker import detect_installer_format, find_executable, unpack_installer
+from game_installer import GameInstaller
+
+
+PE_STUB = b"MZ" + b"\0" * 4094
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def zip_sfx(temp_dir):
+    """Create a self-extracting zip: PE stub followed by a zip payload"""
+    payload = temp_dir / "payload.zip"
+    with zipfile.ZipFile(payload, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("Client/Game.exe", b"MZ" + b"\0" * 64)
+        zf.writestr("Client/data.pak", b"pak" * 100)
+    installer = temp_dir / "installer.exe"
+    installer.write_bytes(PE_STUB + payload.read_bytes())
+    return installer
+
+
+class TestDetection:
+    """Test installer format detection"""
+
+    def test_detects_inno(self, temp_dir):
+        """Test Inno Setup signature in the PE overlay"""
+        installer = temp_dir / "setup.exe"
+        installer.write_bytes(PE_STUB + b"Inno Setup Setup Data (5.5.7)" + b"\0" * 64)
+        assert detect_installer_format(installer) == 'inno'
+
+    def test_detects_nsis(self, temp_dir):
+        """Test NSIS first-header signature"""
+        installer = temp_dir / "setup.exe"
+        installer.write_bytes(PE_STUB + b"\0\0\0\0\xef\xbe\xad\xdeNullsoftInst" + b"\0" * 64)
+        assert detect_installer_format(installer) == 'nsis'
+
+    def test_detects_zip_sfx(self, zip_sfx):
+        """Test zip payload appended to a PE stub"""
+        assert detect_installer_format(zip_sfx) == 'zip-sfx'
+
+    def test_detects_bare_installshield_cabinet(self, temp_dir):
+        """Test InstallShield cabinet headers"""
+        cabinet = temp_dir / "data1.hdr"
+        cabinet.write_bytes(b"ISc(" + b"\0" * 64)
+        assert detect_installer_format(cabinet) == 'installshield'
+
+    def test_unknown_executable(self, temp_dir):
+        """Test that plain executables are not claimed"""
+        installer = temp_dir / "setup.exe"
+        installer.write_bytes(PE_STUB + b"\x90" * 1024)
+        assert detect_installer_format(installer) is None
+
+
+class TestUnpack:
+    """Test payload extraction"""
+
+    def test_unpacks_zip_sfx(self, zip_sfx, temp_dir):
+        """Test that a zip SFX is extracted in-process"""
+        dest = temp_dir / "game"
+        assert unpack_installer(zip_sfx, dest) == 'zip-sfx'
+        assert (dest / "Client" / "data.pak").read_bytes() == b"pak" * 100
+
+    def test_payload_without_executable_is_discarded(self, zip_sfx, temp_dir):
+        """Test that no partial payload is left for the installer to run into"""
+        dest = temp_dir / "game"
+        dest.mkdir()
+        shutil.copy(zip_sfx, dest / "installer.exe")
+        assert unpack_installer(dest / "installer.exe", dest, executable="eqgame.exe") is None
+        assert [p.name for p in dest.iterdir()] == ["installer.exe"]
+
+    def test_unknown_format_extracts_nothing(self, temp_dir):
+        """Test that unknown installers are left for Wine"""
+        installer = temp_dir / "setup.exe"
+        installer.write_bytes(PE_STUB)
+        dest = temp_dir / "game"
+        assert unpack_installer(installer, dest) is None
+        assert not dest.exists()
+
+    def test_find_executable_case_insensitive(self, temp_dir):
+        """Test executable lookup prefers the shallowest match"""
+        (temp_dir / "a" / "b").mkdir(parents=True)
+        (temp_dir / "a" / "GAME.EXE").write_bytes(b"MZ")
+        (temp_dir / "a" / "b" / "game.exe").write_bytes(b"MZ")
+        assert find_executable(temp_dir, "game.exe") == temp_dir / "a" / "GAME.EXE"
+
+
+class TestInstallerIntegration:
+    """Test native unpacking from GameInstaller"""
+
+    @pytest.fixture
+    def installer(self, temp_dir):
+        """GameInstaller writing its state into the temp dir"""
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            return GameInstaller(games_dir=str(temp_dir / "Games"))
+
+    def test_registers_unpacked_client(self, installer, zip_sfx, temp_dir):
+        """Test that a successful unpack skips the installer entirely"""
+        game_data = {'name': 'Test', 'executable': 'game.exe', 'install_type': 'auto_installer',
+                     'client_download_url': 'https://example.com/setup.exe', 'dependencies': []}
+
+        def fake_download(url, dest, progress_callback=None):
+            shutil.copy(zip_sfx, dest)
+            return True
+
+        with patch.object(installer, 'download_file', side_effect=fake_download), \
+             patch.object(installer, 'prepare_prefix', return_value=None), \
+             patch('game_installer.run_streamed') as mock_run:
+            result = installer.install_game('test', game_data)
+
+        game_dir = temp_dir / "Games" / "test"
+        assert result is True
+        mock_run.assert_not_called()
+        assert not (game_dir / "installer.exe").exists()
+        assert installer.installed_games['test']['client_exe'] == str(game_dir / "Client" / "Game.exe")
+
+    def test_falls_back_when_unpack_fails(self, installer, temp_dir):
+        """Test that extraction errors hand over to the Wine installer path"""
+        game_dir = temp_dir / "game"
+        game_dir.mkdir()
+        installer_file = game_dir / "installer.exe"
+        installer_file.write_bytes(PE_STUB)
+
+        with patch('game_installer.unpack_installer', side_effect=ExtractionError("innoextract not found")):
+            result = installer._unpack_installer_payload({'executable': 'game.exe'}, installer_file, game_dir)
+
+        assert result is None
+        assert installer_file.exists()
@@ -0,0 +1,213 @@
+"""
+Tests for iso_reader.py module
+"""
+
+import pytest
+import shutil
+import struct
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+
+from iso_reader import (
+    IsoExtractionCancelled,
+    IsoFormatError,
+    IsoImage,
+    extract_iso,
+    extract_isos_from_zip,
+    is_iso_image,
+)
+from archive_extractor import detect_archive_format, extract_archive
+
+SECTOR = 2048
+
+
+def _dir_record(name: bytes, extent: int, size: int, is_dir: bool) -> bytes:
+    length = 33 + len(name) + (1 - len(name) % 2)
+    record = bytearray(length)
+    record[0] = length
+    struct.pack_into("<I", record, 2, extent)
+    struct.pack_into(">I", record, 6, extent)
+    struct.pack_into("<I", record, 10, size)
+    struct.pack_into(">I", record, 14, size)
+    record[25] = 0x02 if is_dir else 0x00
+    record[32] = len(name)
+    record[33:33 + len(name)] = name
+    return bytes(record)
+
+
+def build_iso(files, joliet: bool = False) -> bytes:
+    """
+    Build a minimal single-level ISO9660 image.
+
+    files maps "DIR/NAME" or "NAME" to bytes content.
+    """
+    encode = (lambda n: n.encode('utf-16-be')) if joliet else (lambda n: (n.upper() + ";1").encode('ascii'))
+    subdirs = sorted({path.split('/')[0] for path in files if '/' in path})
+    root_extent = 20
+    dir_extents = {name: root_extent + 1 + i for i, name in enumerate(subdirs)}
+    next_extent = root_extent + 1 + len(subdirs)
+    file_extents = {}
+    for path, data in files.items():
+        file_extents[path] = next_extent
+        next_extent += max(1, -(-len(data) // SECTOR))
+
+    def directory(extent, parent_extent, children):
+        body = _dir_record(b"\x00", extent, SECTOR, True) + _dir_record(b"\x01", parent_extent, SECTOR, True)
+        for name, child_extent, size, is_dir in children:
+            raw = name.encode('utf-16-be') if joliet and is_dir else (name.upper().encode('ascii') if is_dir else encode(name))
+            body += _dir_record(raw, child_extent, size, is_dir)
+        return body.ljust(SECTOR, b"\x00")
+
+    image = bytearray(next_extent * SECTOR)
+    root_children = [(d, dir_extents[d], SECTOR, True) for d in subdirs]
+    root_children += [(p, file_extents[p], len(files[p]), False) for p in files if '/' not in p]
+    image[root_extent * SECTOR:(root_extent + 1) * SECTOR] = directory(root_extent, root_extent, root_children)
+    for d in subdirs:
+        children = [(p.split('/', 1)[1], file_extents[p], len(files[p]), False) for p in files if p.startswith(d + '/')]
+        image[dir_extents[d] * SECTOR:(dir_extents[d] + 1) * SECTOR] = directory(dir_extents[d], root_extent, children)
+    for path, data in files.items():
+        start = file_extents[path] * SECTOR
+        image[start:start + len(data)] = data
+
+    root_record = _dir_record(b"\x00", root_extent, SECTOR, True)
+    pvd = bytearray(SECTOR)
+    pvd[0], pvd[1:6], pvd[6] = 1, b"CD001", 1
+    pvd[156:156 + len(root_record)] = root_record
+    image[16 * SECTOR:17 * SECTOR] = pvd
+    terminator_sector = 17
+    if joliet:
+        svd = bytearray(pvd)
+        svd[0] = 2
+        svd[88:91] = b"%/E"
+        image[17 * SECTOR:18 * SECTOR] = svd
+        terminator_sector = 18
+    terminator = bytearray(SECTOR)
+    terminator[0], terminator[1:6], terminator[6] = 255, b"CD001", 1
+    image[terminator_sector * SECTOR:(terminator_sector + 1) * SECTOR] = terminator
+    return bytes(image)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def disc_files():
+    """Contents of a small fake install disc"""
+    return {
+        "setup.exe": b"MZ" + b"\x90" * 3000,
+        "data1/resources.cab": b"CAB" * 1500,
+        "data1/readme.txt": b"EverQuest",
+    }
+
+
+class TestIsoImage:
+    """Test ISO9660 directory parsing"""
+
+    def test_lists_entries(self, disc_files, temp_dir):
+        """Test that files and directories are listed with ISO names normalised"""
+        iso = temp_dir / "cd1.iso"
+        iso.write_bytes(build_iso(disc_files))
+
+        with open(iso, 'rb') as handle:
+            entries = {e.path: e for e in IsoImage(handle).entries()}
+
+        assert entries["DATA1"].is_dir
+        assert entries["SETUP.EXE"].size == 3002
+        assert "DATA1/README.TXT" in entries
+
+    def test_prefers_joliet_names(self, disc_files, temp_dir):
+        """Test that Joliet volumes keep mixed-case names"""
+        iso = temp_dir / "cd1.iso"
+        iso.write_bytes(build_iso(disc_files, joliet=True))
+
+        with open(iso, 'rb') as handle:
+            image = IsoImage(handle)
+            paths = {e.path for e in image.entries()}
+
+        assert image.joliet
+        assert "data1/resources.cab" in paths
+
+    def test_rejects_non_iso(self, temp_dir):
+        """Test that arbitrary data is refused"""
+        bogus = temp_dir / "bogus.iso"
+        bogus.write_bytes(b"\0" * SECTOR * 40)
+        with open(bogus, 'rb') as handle, pytest.raises(IsoFormatError):
+            IsoImage(handle)
+
+
+class TestIsoExtraction:
+    """Test extracting ISO contents"""
+
+    def test_extract_iso(self, disc_files, temp_dir):
+        """Test that all file contents are written"""
+        iso = temp_dir / "cd1.iso"
+        iso.write_bytes(build_iso(disc_files, joliet=True))
+
+        count = extract_iso(iso, temp_dir / "out")
+
+        assert count == 3
+        assert (temp_dir / "out" / "data1" / "resources.cab").read_bytes() == disc_files["data1/resources.cab"]
+
+    def test_cancel(self, disc_files, temp_dir):
+        """Test cooperative cancellation"""
+        iso = temp_dir / "cd1.iso"
+        iso.write_bytes(build_iso(disc_files))
+        cancel_event = threading.Event()
+        cancel_event.set()
+
+        with pytest.raises(IsoExtractionCancelled):
+            extract_iso(iso, temp_dir / "out", cancel_event=cancel_event)
+
+    def test_extract_from_zip_without_temp_isos(self, disc_files, temp_dir):
+        """Test parallel extraction of ISOs streamed out of a zip"""
+        archive = temp_dir / "EverQuest_Titanium.zip"
+        with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for i in (1, 2):
+                zf.writestr(f"Titanium/EQ_TITANIUM_CD{i}.iso", build_iso(disc_files, joliet=True))
+            zf.writestr("Titanium/readme.txt", "not an iso")
+
+        results = extract_isos_from_zip(archive, "eq_titanium_cd*.iso", temp_dir / "cds")
+
+        assert len(results) == 2
+        for i in (1, 2):
+            assert (temp_dir / "cds" / f"EQ_TITANIUM_CD{i}" / "setup.exe").exists()
+        assert not list(temp_dir.glob("cds/*.iso"))
+        assert not list(temp_dir.glob("cds/.extracting-*"))
+
+    def test_cancelled_zip_extraction_leaves_nothing(self, disc_files, temp_dir):
+        """Test that images are staged and dropped when extraction is cancelled"""
+        archive = temp_dir / "discs.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            for i in (1, 2):
+                zf.writestr(f"CD{i}.iso", build_iso(disc_files))
+        cancel_event = threading.Event()
+
+        def progress(name, files_done, files_total, bytes_done, bytes_total):
+            if files_done:
+                cancel_event.set()
+
+        with pytest.raises(IsoExtractionCancelled):
+            extract_isos_from_zip(archive, "*.iso", temp_dir / "cds", progress, cancel_event=cancel_event)
+        assert list((temp_dir / "cds").iterdir()) == []
+
+
+class TestArchiveIntegration:
+    """Test ISO support in the archive extractor"""
+
+    def test_detects_and_extracts_iso(self, disc_files, temp_dir):
+        """Test that ISO images are handled as an archive backend"""
+        iso = temp_dir / "client_download"
+        iso.write_bytes(build_iso(disc_files, joliet=True))
+
+        assert is_iso_image(iso)
+        assert detect_archive_format(iso) == 'iso'
+        progress = extract_archive(iso, temp_dir / "game")
+        assert progress.files_done == 3
+        assert (temp_dir / "game" / "setup.exe").exists()
@@ -0,0 +1,98 @@
+"""
+Tests for launch_profiles.py module
+"""
+
+import pytest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from launch_profiles import build_launch_plan, merge_profile, validate_profile, parse_cpu_list
+from shader_cache import ShaderCacheManager
+from game_installer import GameInstaller
+from games_db import get_game_by_id
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+FULL_SUPPORT = {'futex_waitv': True, 'nofile_soft': 1024, 'nofile_hard': 1048576}
+
+
+class TestLaunchProfiles:
+    """Test profile merging, validation and plan assembly"""
+
+    def test_layers_override_defaults(self):
+        profile = merge_profile({'dxvk_async': True, 'env': {'A': "1"}}, {'gamemode': False, 'env': {'B': "2"}})
+        assert profile['dxvk_async'] is True
+        assert profile['gamemode'] is False
+        assert profile['env'] == {'A': "1", 'B': "2"}
+        assert profile['wine_debug'] == "-all"
+
+    def test_validation(self):
+        assert parse_cpu_list("0-3, 6") == [0, 1, 2, 3, 6]
+        assert validate_profile({'cpu_affinity': None, 'esync': False})
+        for bad in ({'turbo': True}, {'esync': "yes"}, {'cpu_affinity': "3-1"}, {'env': {'A': 1}}):
+            with pytest.raises(ValueError):
+                validate_profile(bad)
+
+    def test_plan_from_profile(self, temp_dir):
+        """Test the environment and wrappers built from a profile"""
+        profile = merge_profile({'large_address_aware': True, 'dxvk_async': True, 'cpu_affinity': "2-3"})
+        plan = build_launch_plan(profile, ["umu-run", "Wow.exe"], {'WINEPREFIX': "/p"}, FULL_SUPPORT,
+                                 which=lambda cmd: f"/usr/bin/{cmd}",
+                                 cache_env={'DXVK_STATE_CACHE_PATH': str(temp_dir)})
+        assert plan.command == ["gamemoderun", "taskset", "-c", "2,3", "umu-run", "Wow.exe"]
+        assert plan.env == {'WINEPREFIX': "/p", 'WINEDEBUG': "-all", 'DXVK_ASYNC': "1",
+                            'DXVK_STATE_CACHE_PATH': str(temp_dir), 'WINE_LARGE_ADDRESS_AWARE': "1"}
+        assert plan.notes == []
+
+    def test_unsupported_features_are_dropped(self):
+        """Test fallbacks for old kernels, low file limits and missing tools"""
+        features = {'futex_waitv': False, 'nofile_soft': 1024, 'nofile_hard': 4096}
+        profile = merge_profile({'cpu_affinity': "0"})
+        plan = build_launch_plan(profile, ["umu-run", "game.exe"], features=features, which=lambda cmd: None)
+        assert plan.command == ["umu-run", "game.exe"]
+        assert plan.env['PROTON_NO_FSYNC'] == "1"
+        assert plan.env['PROTON_NO_ESYNC'] == "1"
+        assert len(plan.notes) == 4
+
+
+class TestInstallerLaunchPlans:
+    """Test per-game overrides and plan caching in GameInstaller"""
+
+    @pytest.fixture
+    def installer(self, temp_dir):
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+        installer.installed_games['wow-warmane-icecrown'] = {'path': str(temp_dir / "wow"), 'prefix': str(temp_dir / "pfx"),
+                                                             'install_type': 'manual_download'}
+        return installer
+
+    def test_plan_is_cached_until_profile_changes(self, installer, temp_dir):
+        game_data = get_game_by_id('wow-warmane-icecrown')
+        command = ["umu-run", "Wow.exe"]
+        installer.shader_caches = ShaderCacheManager(temp_dir / "cache", temp_dir / "backup")
+        with patch('game_installer.build_launch_plan', wraps=build_launch_plan) as mock_build:
+            plan = installer.launch_plan('wow-warmane-icecrown', game_data, command)
+            assert installer.launch_plan('wow-warmane-icecrown', game_data, command) is plan
+            assert mock_build.call_count == 1
+
+            # Client family default, then a per-game override
+            assert plan.env['WINE_LARGE_ADDRESS_AWARE'] == "1"
+            assert plan.env['WINEPREFIX'] == str(temp_dir / "pfx")
+            assert plan.env['DXVK_STATE_CACHE_PATH'] == str(temp_dir / "cache" / "wow-3.3.5a" / "dxvk")
+            assert installer.set_launch_profile('wow-warmane-icecrown', {'large_address_aware': False})
+            plan = installer.launch_plan('wow-warmane-icecrown', game_data, command)
+            assert mock_build.call_count == 2
+        assert 'WINE_LARGE_ADDRESS_AWARE' not in plan.env
+        assert installer.installed_games['wow-warmane-icecrown']['profile'] == {'large_address_aware': False}
+        with pytest.raises(ValueError):
+            installer.set_launch_profile('wow-warmane-icecrown', {'unknown': 1})
@@ -0,0 +1,82 @@
+import pytest
+import os
+import tempfile
+from pathlib import Path
+
+import launch_timing
+from launch_timing import (
+    LaunchTimer, LaunchTimings, describe_launch, regressions, wineserver_socket,
+    PHASE_RESOLVE, PHASE_SETUP, PHASE_SPAWN, PHASE_WINESERVER, PHASE_WINDOW,
+)
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+def fake_process(proc_root: Path, pid: int, ppid: int, comm: str, fds=()):
+    proc_dir = proc_root / str(pid)
+    (proc_dir / "fd").mkdir(parents=True)
+    (proc_dir / "stat").write_text(f"{pid} ({comm}) S {ppid} 0 0\n")
+    (proc_dir / "comm").write_text(comm + "\n")
+    for number, target in enumerate(fds, 3):
+        os.symlink(target, proc_dir / "fd" / str(number))
+
+
+def record(proton, **phases):
+    return {'started': 0, 'proton': proton, 'phases': phases, 'total': sum(phases.values()), 'complete': True}
+
+
+class TestLaunchTimer:
+    def test_phase_durations(self):
+        timer = LaunchTimer("wow")
+        timer.marks = {PHASE_RESOLVE: 0.1, PHASE_SETUP: 0.5, PHASE_SPAWN: 0.6, PHASE_WINDOW: 4.6}
+        assert timer.phases() == {PHASE_RESOLVE: 0.1, PHASE_SETUP: 0.4, PHASE_SPAWN: 0.1, PHASE_WINDOW: 4.0}
+        data = timer.to_dict()
+        assert data['total'] == 4.6
+        assert "window 4.00s" in describe_launch(data) and "not seen" in describe_launch(data)
+
+    def test_regressions(self):
+        history = [record("GE-Proton9-20", wineserver=1.0, window=5.0) for _ in range(3)]
+        assert regressions(history + [record("GE-Proton9-20", wineserver=1.1, window=5.4)]) == []
+        slower = regressions(history + [record("GE-Proton9-22", wineserver=4.0, window=5.2)])
+        assert slower == ["wineserver 4.0s, usually 1.0s (Proton changed)"]
+
+
+class TestLaunchTimings:
+    def test_follow_until_gpu_open(self, temp_dir, monkeypatch):
+        proc_root = temp_dir / "proc"
+        prefix = temp_dir / "prefix"
+        prefix.mkdir()
+        monkeypatch.setattr(launch_timing, "WINE_SERVER_ROOT", temp_dir / "tmp")
+        socket = wineserver_socket(str(prefix))
+        socket.parent.mkdir(parents=True)
+        socket.touch()
+
+        fake_process(proc_root, 100, 1, "umu-run")
+        fake_process(proc_root, 101, 100, "explorer.exe", ["/dev/dri/renderD128"])
+        fake_process(proc_root, 102, 101, "Wow.exe", ["/dev/dri/renderD128", "/home/user/Wow.exe"])
+
+        timed = []
+        timings = LaunchTimings(temp_dir / "launch_times.json", callback=lambda gid, rec: timed.append(gid),
+                                proc_root=proc_root)
+        timer = timings.start("wow", "GE-Proton9-20")
+        timer.mark(PHASE_RESOLVE)
+        timer.mark(PHASE_SPAWN)
+        result = timings.follow(timer, 100, str(prefix), "Wow.exe", interval=0.01)
+
+        assert result['complete']
+        assert list(result['phases']) == [PHASE_RESOLVE, PHASE_SPAWN, PHASE_WINESERVER, PHASE_WINDOW]
+        assert timed == ["wow"]
+        assert timings.history("wow")[0]['proton'] == "GE-Proton9-20"
+        assert timings.summary("wow").startswith("Last launch: resolve")
+
+    def test_gives_up_when_game_exits(self, temp_dir):
+        timings = LaunchTimings(temp_dir / "launch_times.json", proc_root=temp_dir / "proc")
+        timer = timings.start("wow")
+        timer.mark(PHASE_SPAWN)
+        result = timings.follow(timer, 100, interval=0.01)
+        assert not result['complete'] and list(result['phases']) == [PHASE_SPAWN]
+        assert timings.summary("other") is None
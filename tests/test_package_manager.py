@@ -0,0 +1,121 @@
+"""
+Tests for package_manager.py module
+"""
+
+import pytest
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch, Mock
+
+from package_manager import plan_packages, install_command, flatpak_install_command
+from game_installer import GameInstaller
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+GAMES = {
+    'eq': {'name': 'EverQuest', 'install_type': 'manual_download', 'dependencies': ['wine', 'umu-launcher']},
+    'rs': {'name': 'RuneScape', 'install_type': 'flatpak', 'dependencies': ['flatpak'],
+           'client_download_url': 'flatpak://com.jagex.RuneScape'},
+    'xiv': {'name': 'FFXIV', 'install_type': 'flatpak', 'dependencies': ['flatpak'],
+            'client_download_url': 'flatpak://dev.goats.xivlauncher'},
+}
+
+
+class TestPlanPackages:
+    """Test transaction planning"""
+
+    def test_packages_are_merged_across_games(self):
+        """Test one package list per manager with the games each unblocks"""
+        missing = {'eq': ['wine', 'umu-launcher'], 'rs': ['flatpak'], 'xiv': ['flatpak']}
+        plan = plan_packages(GAMES, missing, "pacman", flatpaks_installed={'dev.goats.xivlauncher'})
+
+        assert plan.packages == {'wine': ['eq'], 'umu': ['eq'], 'flatpak': ['rs', 'xiv']}
+        assert plan.flatpaks == {'com.jagex.RuneScape': ['rs']}
+        assert plan.package_command() == ["sudo", "pacman", "-S", "--needed", "--noconfirm",
+                                          "wine", "umu", "flatpak"]
+        assert ('flatpak', ['RuneScape', 'FFXIV']) in plan.unblocks({k: v['name'] for k, v in GAMES.items()})
+
+    def test_unpackaged_dependencies_are_reported(self):
+        """Test that dependencies without a distro package are listed separately"""
+        plan = plan_packages(GAMES, {'eq': ['wine', 'umu-launcher']}, "apt", include_flatpaks=False)
+        assert plan.packages == {'wine': ['eq']}
+        assert plan.unavailable == {'umu-launcher': ['eq']}
+        assert not plan.flatpaks
+
+    def test_commands(self):
+        assert install_command("dnf", ["wine"]) == ["sudo", "dnf", "install", "-y", "wine"]
+        assert flatpak_install_command(["a", "b"])[-2:] == ["a", "b"]
+        with pytest.raises(ValueError):
+            install_command("zypper", ["wine"])
+
+
+class TestBatchedInstalls:
+    """Test that queued installs share package transactions"""
+
+    @pytest.fixture
+    def installer(self, temp_dir):
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            return GameInstaller(games_dir=str(temp_dir / "Games"))
+
+    def test_dependencies_of_queued_games_share_one_transaction(self, installer):
+        """Test that the first install also installs packages for the rest of the queue"""
+        installed = set()
+
+        def check(deps):
+            return {dep: dep in installed for dep in deps}
+
+        def run(cmd, *args, **kwargs):
+            installed.update({'wine', 'flatpak', 'umu-launcher'})
+            return Mock(returncode=0)
+
+        for game_id, data in GAMES.items():
+            installer.announce_install(game_id, data)
+        messages = []
+
+        with patch.object(installer, 'check_dependencies', side_effect=check), \
+             patch('game_installer.detect_package_manager', return_value="pacman"), \
+             patch('game_installer.run_streamed', side_effect=run) as mock_run:
+            assert installer.install_dependencies(GAMES['eq']['dependencies'], messages.append, 'eq', GAMES['eq'])
+            assert installer.install_dependencies(GAMES['rs']['dependencies'], messages.append, 'rs', GAMES['rs'])
+
+        mock_run.assert_called_once()
+        assert set(mock_run.call_args[0][0][5:]) == {'wine', 'umu', 'flatpak'}
+        # sudo needs the launcher's controlling terminal to ask for a password
+        assert mock_run.call_args[1]['new_session'] is False
+        assert "flatpak unblocks RuneScape, FFXIV" in messages
+
+    def test_flatpaks_of_queued_games_share_one_transaction(self, installer):
+        """Test a multi-ref Flatpak install and registration of the other games"""
+        installed = set()
+
+        def run(cmd, *args, **kwargs):
+            installed.update(cmd[5:])
+            return Mock(returncode=0)
+
+        installer.announce_install('rs', GAMES['rs'])
+        installer.announce_install('xiv', GAMES['xiv'])
+
+        with patch('game_installer.installed_flatpaks', side_effect=lambda which: set(installed)), \
+             patch('game_installer.run_streamed', side_effect=run) as mock_run:
+            assert installer._install_flatpak_game('rs', 'com.jagex.RuneScape', 'RuneScape')
+            assert installer._install_flatpak_game('xiv', 'dev.goats.xivlauncher', 'FFXIV')
+
+        mock_run.assert_called_once()
+        assert installed == {'com.jagex.RuneScape', 'dev.goats.xivlauncher'}
+        assert installer.installed_games['xiv']['path'] == 'flatpak://dev.goats.xivlauncher'
+
+    def test_withdrawn_games_are_not_batched(self, installer):
+        installer.announce_install('eq', GAMES['eq'])
+        installer.withdraw_install('eq')
+        with patch.object(installer, 'check_dependencies', return_value={'wine': False}), \
+             patch('game_installer.detect_package_manager', return_value="pacman"):
+            assert installer.plan_dependencies().packages == {}
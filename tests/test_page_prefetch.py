@@ -0,0 +1,73 @@
+"""
+Tests for page_prefetch.py module
+"""
+
+import pytest
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from page_prefetch import PagePrefetcher, descendants
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def game_dir(temp_dir):
+    game = temp_dir / "Games" / "eq"
+    (game / "zones").mkdir(parents=True)
+    for name in ("eqgame.dll", "zones/gfay.s3d", "zones/crushbone.s3d"):
+        (game / name).write_bytes(b"x" * 4096)
+    return game
+
+
+# Opens files one after another (the last one from a child process) and
+# keeps each open long enough to be sampled
+READER = """
+import subprocess, sys, time
+held = []
+for name in ["eqgame.dll", "zones/gfay.s3d"]:
+    held.append(open(name, "rb"))
+    time.sleep(0.3)
+subprocess.run([sys.executable, "-c", "import time; f = open('zones/crushbone.s3d', 'rb'); time.sleep(0.4)"])
+"""
+
+
+class TestPagePrefetcher:
+    """Test recording access profiles and prefetching them"""
+
+    def test_record_follows_child_processes(self, temp_dir, game_dir):
+        """Test that files are recorded in first-access order across the process tree"""
+        prefetcher = PagePrefetcher(temp_dir / "profiles")
+        process = subprocess.Popen([sys.executable, "-c", READER], cwd=game_dir)
+        assert descendants(process.pid) >= {process.pid}
+
+        session = prefetcher.record('eq', game_dir, process.pid, interval=0.05)
+        process.wait()
+        assert session == ["eqgame.dll", "zones/gfay.s3d", "zones/crushbone.s3d"]
+        assert prefetcher.load_profile('eq') == session
+
+    def test_sessions_are_merged(self, temp_dir):
+        prefetcher = PagePrefetcher(temp_dir / "profiles")
+        prefetcher.save_profile('eq', ["a", "b"])
+        assert prefetcher.save_profile('eq', ["c", "a"]) == ["c", "a", "b"]
+
+    def test_prefetch_respects_budget(self, temp_dir, game_dir):
+        """Test that prefetching stops at the byte budget and skips missing files"""
+        prefetcher = PagePrefetcher(temp_dir / "profiles")
+        prefetcher.save_profile('eq', ["zones/gfay.s3d", "gone.s3d", "eqgame.dll", "zones/crushbone.s3d"])
+
+        assert prefetcher.prefetch('eq', game_dir, budget=8192) == (2, 8192)
+        cancel = threading.Event()
+        cancel.set()
+        assert prefetcher.prefetch('eq', game_dir, cancel_event=cancel, budget=1 << 30) == (0, 0)
+        assert prefetcher.prefetch_in_background('other', game_dir) is None
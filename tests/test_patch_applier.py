@@ -0,0 +1,133 @@
+"""
+Tests for patch_applier.py module
+"""
+
+import pytest
+import shutil
+import tempfile
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from patch_applier import PatchError, apply_patch, main
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def patch_zip(temp_dir):
+    """Create a small patch archive"""
+    archive = temp_dir / "P99Files.zip"
+    with zipfile.ZipFile(archive, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("eqhost.txt", "[LoginServer]\nHost=login.eqemulator.net:5998\n")
+        zf.writestr("Resources/spells_us.txt", "spell" * 1000)
+        zf.writestr("Resources/", "")
+    return archive
+
+
+class TestApplyPatch:
+    """Test incremental patch application"""
+
+    def test_first_run_writes_everything(self, patch_zip, temp_dir):
+        """Test that missing files are written"""
+        dest = temp_dir / "eq"
+        result = apply_patch(patch_zip, dest)
+
+        assert result.files_written == 2
+        assert result.files_skipped == 0
+        assert (dest / "Resources" / "spells_us.txt").read_text() == "spell" * 1000
+
+    def test_second_run_skips_unchanged(self, patch_zip, temp_dir):
+        """Test that identical files are not rewritten or re-hashed"""
+        dest = temp_dir / "eq"
+        apply_patch(patch_zip, dest)
+
+        with patch('patch_applier._file_crc32') as mock_crc:
+            result = apply_patch(patch_zip, dest)
+
+        mock_crc.assert_not_called()
+        assert result.files_written == 0
+        assert result.files_skipped == 2
+        assert result.bytes_skipped == 5000 + len("[LoginServer]\nHost=login.eqemulator.net:5998\n")
+
+    def test_existing_identical_files_hashed_once(self, patch_zip, temp_dir):
+        """Test that files installed by other means are verified by CRC"""
+        dest = temp_dir / "eq"
+        (dest / "Resources").mkdir(parents=True)
+        (dest / "Resources" / "spells_us.txt").write_text("spell" * 1000)
+
+        result = apply_patch(patch_zip, dest)
+
+        assert result.files_skipped == 1
+        assert result.bytes_hashed == 5000
+
+    def test_rewrites_modified_file(self, patch_zip, temp_dir):
+        """Test that a same-size file with different content is replaced"""
+        dest = temp_dir / "eq"
+        apply_patch(patch_zip, dest)
+        (dest / "Resources" / "spells_us.txt").write_text("SPELL" * 1000)
+
+        result = apply_patch(patch_zip, dest)
+
+        assert result.files_written == 1
+        assert (dest / "Resources" / "spells_us.txt").read_text() == "spell" * 1000
+
+    def test_replaced_files_keep_their_mode(self, temp_dir):
+        """Test that patching keeps the exec bit and makes read-only copies writable"""
+        dest = temp_dir / "eq"
+        dest.mkdir()
+        (dest / "launch.sh").write_text("#!/bin/sh\nold\n")
+        (dest / "launch.sh").chmod(0o755)
+        (dest / "spells_us.txt").write_text("old")
+        (dest / "spells_us.txt").chmod(0o444)
+        archive = temp_dir / "patch.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr("launch.sh", "#!/bin/sh\nnew\n")
+            zf.writestr("spells_us.txt", "new")
+
+        apply_patch(archive, dest)
+
+        assert (dest / "launch.sh").stat().st_mode & 0o777 == 0o755
+        assert (dest / "spells_us.txt").stat().st_mode & 0o777 == 0o644
+
+    def test_new_files_take_archive_mode(self, temp_dir):
+        """Test that new files get the archive's unix mode, else the default"""
+        archive = temp_dir / "patch.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            info = zipfile.ZipInfo("eqemupatcher.sh")
+            info.create_system = 3
+            info.external_attr = 0o100755 << 16
+            zf.writestr(info, "#!/bin/sh\n")
+            info = zipfile.ZipInfo("eqhost.txt")
+            info.create_system = 0
+            zf.writestr(info, "[LoginServer]\n")
+
+        dest = temp_dir / "eq"
+        with patch('patch_applier._umask', return_value=0o022):
+            apply_patch(archive, dest)
+
+        assert (dest / "eqemupatcher.sh").stat().st_mode & 0o777 == 0o755
+        assert (dest / "eqhost.txt").stat().st_mode & 0o777 == 0o644
+
+    def test_rejects_path_traversal(self, temp_dir):
+        """Test that members escaping the destination are refused"""
+        archive = temp_dir / "evil.zip"
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr("../escape.txt", "nope")
+
+        with pytest.raises(PatchError):
+            apply_patch(archive, temp_dir / "eq")
+        assert not (temp_dir / "escape.txt").exists()
+
+    def test_cli_reports_savings(self, patch_zip, temp_dir, capsys):
+        """Test the command line entry point"""
+        dest = temp_dir / "eq"
+        assert main([str(patch_zip), str(dest)]) == 0
+        assert main([str(patch_zip), str(dest)]) == 0
+        assert "2 unchanged" in capsys.readouterr().out
@@ -0,0 +1,201 @@
+"""
+Tests for prefix_templates.py module
+"""
+
+import os
+import pytest
+import shutil
+import subprocess
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from prefix_templates import (
+    PrefixPool,
+    TemplateBuildError,
+    TemplateLibrary,
+    provision_prefix,
+    requested_verbs,
+    template_key,
+    winetricks_verbs,
+)
+
+
+def fake_umu(cmd, env=None, **kwargs):
+    """Pretend to be umu-run: create a prefix and record installed verbs"""
+    prefix = Path(env['WINEPREFIX'])
+    (prefix / "drive_c" / "windows").mkdir(parents=True, exist_ok=True)
+    (prefix / "system.reg").write_text("WINE REGISTRY Version 2\n")
+    if cmd[1:2] == ["winetricks"]:
+        (prefix / "winetricks.log").write_text("\n".join(cmd[3:]) + "\n")
+    return subprocess.CompletedProcess(cmd, 0, "", "")
+
+
+def fake_idle_umu(cmd, env=None, **kwargs):
+    """fake_umu for low priority template builds"""
+    return fake_umu([c for c in cmd if c not in ("ionice", "-c", "3", "nice", "-n", "19")], env)
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def library(temp_dir):
+    """Template library in a temp dir with umu available"""
+    with patch('prefix_templates.shutil.which', return_value='/usr/bin/umu-run'):
+        yield TemplateLibrary(temp_dir / "templates")
+
+
+class TestKeys:
+    """Test template selection from games_db dependencies"""
+
+    def test_verbs_exclude_host_packages(self):
+        """Test that only winetricks verbs are kept"""
+        assert winetricks_verbs(["umu-launcher", "wine-staging", "vcrun2008", "d3dx9", "corefonts"]) == \
+            ["corefonts", "d3dx9", "vcrun2008"]
+
+    def test_script_verbs_merge_with_catalog(self):
+        """Test that verbs passed alongside --game are added, not replaced"""
+        with patch('games_db.get_game_by_id', return_value={'dependencies': ["wine", "d3dx9", "vcrun2008"]}):
+            assert requested_verbs("l2-interlude", ["cjkfonts", "d3dx9"]) == ["cjkfonts", "d3dx9", "vcrun2008"]
+        with patch('games_db.get_game_by_id', return_value=None):
+            assert requested_verbs("unknown", ["cjkfonts"]) == ["cjkfonts"]
+        assert requested_verbs(None, ["corefonts"]) == ["corefonts"]
+
+    def test_key_ignores_order(self):
+        """Test that the same verb set always maps to the same template"""
+        assert template_key("GE-Proton", ["d3dx9", "corefonts"]) == template_key("GE-Proton", ["corefonts", "d3dx9"])
+        assert template_key("GE-Proton", ["d3dx9"]) != template_key("GE-Proton9-20", ["d3dx9"])
+
+    def test_key_follows_local_build(self, temp_dir):
+        """Test that a GE update gets a new template instead of reusing the old Wine version's"""
+        old = template_key(str(temp_dir / ".proton" / "GE-Proton9-20"), ["d3dx9"])
+        new = template_key(str(temp_dir / ".proton" / "GE-Proton9-22"), ["d3dx9"])
+        assert old != new
+        assert old == template_key("GE-Proton9-20", ["d3dx9"])
+
+
+class TestTemplateLibrary:
+    """Test building and cloning templates"""
+
+    def test_build_once_then_clone(self, library, temp_dir):
+        """Test that the second prefix is cloned without running wine"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_umu) as mock_run:
+            assert library.clone("GE-Proton", ["d3dx9"], temp_dir / "game-a")
+            builds = mock_run.call_count
+            assert library.clone("GE-Proton", ["d3dx9"], temp_dir / "game-b")
+
+        assert mock_run.call_count == builds
+        assert (temp_dir / "game-b" / "winetricks.log").read_text() == "d3dx9\n"
+        assert not (temp_dir / "game-b" / "template.json").exists()
+
+    def test_clone_never_hardlinks(self, library, temp_dir):
+        """Test that cloned prefixes do not share inodes with the template"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_umu), \
+             patch('content_store._reflink', side_effect=OSError(95, "not supported")):
+            library.clone("GE-Proton", [], temp_dir / "game")
+
+        template = library.get_template("GE-Proton", [])
+        assert os.stat(template / "system.reg").st_ino != os.stat(temp_dir / "game" / "system.reg").st_ino
+
+    def test_existing_prefix_untouched(self, library, temp_dir):
+        """Test that an initialised prefix is not overwritten"""
+        (temp_dir / "game" / "drive_c").mkdir(parents=True)
+        assert library.clone("GE-Proton", ["d3dx9"], temp_dir / "game", build_missing=False) is False
+
+    def test_failed_build_leaves_no_template(self, library, temp_dir):
+        """Test that a winetricks failure does not register a template"""
+        def failing(cmd, env=None, **kwargs):
+            result = fake_umu(cmd, env)
+            result.returncode = 1 if cmd[1:2] == ["winetricks"] else 0
+            return result
+
+        with patch('prefix_templates.subprocess.run', side_effect=failing), pytest.raises(TemplateBuildError):
+            library.build("GE-Proton", ["dotnet48"])
+        assert library.get_template("GE-Proton", ["dotnet48"]) is None
+        assert list((temp_dir / "templates").iterdir()) == []
+
+    def test_background_build(self, library):
+        """Test idle-priority background builds of several verb sets"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_umu):
+            thread = library.build_in_background("GE-Proton", [["d3dx9"], ["corefonts"], ["d3dx9"]])
+            thread.join(timeout=10)
+
+        assert library.get_template("GE-Proton", ["d3dx9"])
+        assert library.get_template("GE-Proton", ["corefonts"])
+        assert library.build_in_background("GE-Proton", [["d3dx9"]]) is None
+
+
+class TestPrefixPool:
+    """Test the pre-booted prefix pool"""
+
+    @pytest.fixture
+    def pool(self, library, temp_dir):
+        """Pool of two prefixes beside the template library"""
+        return PrefixPool(temp_dir / "pool", library, size=2)
+
+    def test_refill_to_size(self, pool):
+        """Test that refilling creates ready slots up to the pool size"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_idle_umu):
+            assert pool.refill("GE-Proton", ["d3dx9"]) == 2
+            assert pool.refill("GE-Proton", ["d3dx9"]) == 0
+        assert pool.available("GE-Proton", ["d3dx9"]) == 2
+
+    def test_refill_never_hardlinks(self, pool):
+        """Test that pooled prefixes do not share inodes with the template"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_idle_umu):
+            pool.refill("GE-Proton", ["d3dx9"])
+        template = pool.library.get_template("GE-Proton", ["d3dx9"])
+        for slot in pool._slots_dir("GE-Proton", ["d3dx9"]).iterdir():
+            assert (slot / "system.reg").stat().st_ino != (template / "system.reg").stat().st_ino
+            assert not (slot / "template.json").exists()
+
+    def test_background_refill_runs_idle(self, pool):
+        """Test that the refill thread drops to idle I/O and CPU priority before cloning"""
+        priorities = []
+
+        def record(*args):
+            priorities.append(threading.current_thread().name)
+
+        with patch('prefix_templates.subprocess.run', side_effect=fake_idle_umu), \
+             patch('prefix_templates.os.setpriority', side_effect=record) as mock_nice, \
+             patch('prefix_templates.set_io_priority', side_effect=record) as mock_ionice:
+            pool.refill_in_background("GE-Proton", ["d3dx9"]).join(timeout=10)
+
+        assert pool.available("GE-Proton", ["d3dx9"]) == 2
+        assert mock_nice.call_args[0][2] == 19
+        mock_ionice.assert_called_once_with(0, 3)
+        assert all(name.startswith("prefix-pool-") for name in priorities)
+
+    def test_claim_renames_slot(self, pool, temp_dir):
+        """Test that claiming moves a slot into place and empties the pool"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_idle_umu):
+            pool.refill("GE-Proton", ["d3dx9"])
+
+        dest = temp_dir / "umu" / "game" / "default"
+        assert pool.claim("GE-Proton", ["d3dx9"], dest)
+        assert (dest / "system.reg").exists()
+        assert not (dest / "template.json").exists()
+        assert pool.available("GE-Proton", ["d3dx9"]) == 1
+
+    def test_claim_from_empty_pool(self, pool, temp_dir):
+        """Test that an empty pool reports no prefix"""
+        assert not pool.claim("GE-Proton", ["d3dx9"], temp_dir / "game")
+
+    def test_provision_prefers_pool_and_refills(self, pool, library, temp_dir):
+        """Test that provisioning claims first, then tops the pool back up"""
+        with patch('prefix_templates.subprocess.run', side_effect=fake_idle_umu):
+            pool.refill("GE-Proton", [])
+            with patch.object(library, 'clone') as mock_clone:
+                assert provision_prefix(library, pool, "GE-Proton", [], temp_dir / "game")
+            mock_clone.assert_not_called()
+            for thread in threading.enumerate():
+                if thread.name.startswith("prefix-pool-"):
+                    thread.join(timeout=10)
+        assert pool.available("GE-Proton", []) == 2
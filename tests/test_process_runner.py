@@ -0,0 +1,100 @@
+"""
+Tests for process_runner.py module
+"""
+
+import os
+import pytest
+import sys
+import threading
+import time
+from unittest.mock import patch
+
+from process_runner import run_streamed, STDOUT, STDERR
+
+
+def python(code):
+    return [sys.executable, "-c", code]
+
+
+class TestRunStreamed:
+    """Test streaming, bounded output and cancellation"""
+
+    def test_lines_arrive_while_running(self):
+        """Test that output is delivered before the process exits"""
+        seen = []
+        gate = threading.Event()
+
+        def on_line(line):
+            seen.append((line, gate.is_set()))
+
+        code = "import sys, time; print('first', flush=True); time.sleep(0.5); print('second')"
+        timer = threading.Timer(0.3, gate.set)
+        timer.start()
+        result = run_streamed(python(code), on_line)
+        timer.cancel()
+
+        assert result.ok
+        assert seen == [("first", False), ("second", True)]
+
+    def test_tail_is_bounded(self):
+        """Test that only the last lines are kept for the failure report"""
+        code = "import sys\nfor i in range(5000): print(i)\nprint('boom', file=sys.stderr); sys.exit(3)"
+        result = run_streamed(python(code), tail_lines=10)
+
+        assert result.returncode == 3
+        assert result.lines == 5001
+        assert len(result.tail) == 10
+        assert result.tail[-1] == (STDERR, "boom")
+        assert result.output(STDERR) == "boom"
+        assert result.output(STDOUT).splitlines()[-1] == "4999"
+        assert "exited with status 3" in result.failure_report()
+
+    def test_progress_redraws_are_throttled(self):
+        """Test that carriage-return progress bars do not flood the callback"""
+        seen = []
+        code = "import sys\nfor i in range(1000): sys.stdout.write(f'{i}%\\r')\nprint('done')"
+        result = run_streamed(python(code), seen.append)
+
+        assert result.ok
+        assert seen[-1] == "done"
+        assert len(seen) < 10
+        assert result.tail == [(STDOUT, "done")]
+
+    def test_cancel_terminates_process(self):
+        """Test that setting the cancel event stops the process promptly"""
+        cancel = threading.Event()
+        threading.Timer(0.3, cancel.set).start()
+        started = time.monotonic()
+        result = run_streamed(python("import time; time.sleep(30)"), cancel_event=cancel)
+
+        assert result.cancelled
+        assert not result.ok
+        assert time.monotonic() - started < 10
+
+    def test_missing_command_raises(self):
+        with pytest.raises(FileNotFoundError):
+            run_streamed(["definitely-not-a-command-xyz"])
+
+    def test_background_child_does_not_block(self):
+        """Test that a child keeping the pipes open (like wineserver) does not stall the result"""
+        code = ("import subprocess, sys, time; "
+                "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(20)']); print('bye')")
+        with patch('process_runner.PIPE_DRAIN_SECONDS', 0.2):
+            started = time.monotonic()
+            result = run_streamed(python(code))
+        assert result.ok
+        assert result.output() == "bye"
+        assert time.monotonic() - started < 10
+
+    def test_session_is_kept_for_terminal_tools(self):
+        """Test that tools such as sudo can stay on the controlling terminal"""
+        code = "import os; print(os.getsid(0))"
+        assert run_streamed(python(code)).output() != str(os.getsid(0))
+        assert run_streamed(python(code), new_session=False).output() == str(os.getsid(0))
+
+    def test_cancel_without_new_session(self):
+        """Test that cancelling signals the process itself when it shares our session"""
+        cancel = threading.Event()
+        threading.Timer(0.3, cancel.set).start()
+        result = run_streamed(python("import time; time.sleep(30)"), cancel_event=cancel, new_session=False)
+        assert result.cancelled
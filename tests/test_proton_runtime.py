@@ -0,0 +1,145 @@
+"""
+Tests for proton_runtime.py module
+"""
+
+import pytest
+import hashlib
+import io
+import shutil
+import tarfile
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from proton_runtime import ProtonRegistry, ProtonBuildError, version_key
+from game_installer import GameInstaller
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+def make_build(directory, name):
+    build = directory / name
+    build.mkdir(parents=True)
+    (build / "proton").write_text("#!/usr/bin/env python3\n")
+    return build
+
+
+def make_tarball(path, name):
+    """GE-Proton style tarball with a single top-level build directory"""
+    with tarfile.open(path, "w:gz") as archive:
+        data = b"#!/usr/bin/env python3\n"
+        info = tarfile.TarInfo(f"{name}/proton")
+        info.size = len(data)
+        archive.addfile(info, io.BytesIO(data))
+    checksum = path.with_name(path.name.replace(".tar.gz", ".sha512sum"))
+    checksum.write_text(f"{hashlib.sha512(path.read_bytes()).hexdigest()}  {path.name}\n")
+    return path.as_uri(), checksum.as_uri()
+
+
+class TestProtonRegistry:
+    """Test local build discovery, fetching and pruning"""
+
+    def test_builds_are_ordered_by_version(self, temp_dir):
+        """Test that GE-Proton10-1 sorts after GE-Proton9-20 and the managed dir wins"""
+        managed, extra = temp_dir / "managed", temp_dir / "steam"
+        make_build(extra, "GE-Proton9-20")
+        make_build(extra, "GE-Proton9-3")
+        make_build(managed, "GE-Proton10-1")
+        managed_copy = make_build(managed, "GE-Proton9-20")
+        (managed / "not-a-build").mkdir()
+        registry = ProtonRegistry(managed, [extra])
+
+        assert list(registry.builds()) == ["GE-Proton9-3", "GE-Proton9-20", "GE-Proton10-1"]
+        assert registry.builds()["GE-Proton9-20"] == managed_copy
+        assert registry.latest() == "GE-Proton10-1"
+        assert version_key("GE-Proton9-20") == (9, 20)
+
+    def test_resolve_prefers_pin(self, temp_dir):
+        registry = ProtonRegistry(temp_dir, [])
+        assert registry.resolve() is None
+        old = make_build(temp_dir, "GE-Proton9-1")
+        new = make_build(temp_dir, "GE-Proton9-2")
+        assert registry.resolve() == new
+        assert registry.resolve("GE-Proton9-1") == old
+        assert registry.resolve("GE-Proton8-1") == new
+
+    def test_install_verifies_and_unpacks(self, temp_dir):
+        """Test that a build is unpacked into place from a checksummed tarball"""
+        url, checksum_url = make_tarball(temp_dir / "GE-Proton9-5.tar.gz", "GE-Proton9-5")
+        registry = ProtonRegistry(temp_dir / "managed", [])
+
+        path = registry.install("GE-Proton9-5", url, checksum_url)
+        assert path == temp_dir / "managed" / "GE-Proton9-5"
+        assert (path / "proton").is_file()
+        assert [p.name for p in (temp_dir / "managed").iterdir()] == ["GE-Proton9-5"]
+
+    def test_install_rejects_bad_checksum(self, temp_dir):
+        url, checksum_url = make_tarball(temp_dir / "GE-Proton9-5.tar.gz", "GE-Proton9-5")
+        (temp_dir / "GE-Proton9-5.sha512sum").write_text("0" * 128)
+        registry = ProtonRegistry(temp_dir / "managed", [])
+
+        with pytest.raises(ProtonBuildError):
+            registry.install("GE-Proton9-5", url, checksum_url)
+        assert registry.builds() == {}
+
+    def test_prefetch_is_throttled_and_prunes(self, temp_dir):
+        """Test one release check per interval and that pinned builds survive pruning"""
+        managed = temp_dir / "managed"
+        for name in ("GE-Proton9-1", "GE-Proton9-2", "GE-Proton9-3"):
+            make_build(managed, name)
+        url, checksum_url = make_tarball(temp_dir / "GE-Proton9-4.tar.gz", "GE-Proton9-4")
+        registry = ProtonRegistry(managed, [])
+
+        with patch.object(registry, 'latest_release', return_value=("GE-Proton9-4", url, checksum_url)) as mock_release:
+            assert registry.prefetch(keep=["GE-Proton9-1"]) == "GE-Proton9-4"
+            assert registry.prefetch() is None
+        mock_release.assert_called_once()
+        assert list(registry.builds()) == ["GE-Proton9-1", "GE-Proton9-3", "GE-Proton9-4"]
+
+
+class TestProtonPinning:
+    """Test per-game Proton pins in GameInstaller"""
+
+    @pytest.fixture
+    def installer(self, temp_dir):
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+        installer.proton = ProtonRegistry(temp_dir / "proton", [])
+        installer.installed_games['eq'] = {'path': str(temp_dir / "Games" / "eq"), 'install_type': 'manual_download',
+                                           'prefix': str(temp_dir / "prefix")}
+        return installer
+
+    def test_launch_path_uses_pin_or_newest_build(self, installer, temp_dir):
+        assert installer.proton_path('eq') == "GE-Proton"
+        old = make_build(temp_dir / "proton", "GE-Proton9-1")
+        new = make_build(temp_dir / "proton", "GE-Proton9-2")
+        assert installer.proton_path('eq') == str(new)
+
+        assert installer.set_proton_pin('eq', "GE-Proton9-1")
+        assert installer.proton_path('eq') == str(old)
+        assert installer.pinned_proton_builds() == {"GE-Proton9-1"}
+        assert not installer.set_proton_pin('eq', "GE-Proton7-1")
+
+        assert installer.set_proton_pin('eq', None)
+        assert installer.proton_path('eq') == str(new)
+
+    def test_templates_keyed_on_launch_build(self, installer, temp_dir):
+        """Test that prefixes come from templates built with the Proton the game launches with"""
+        old = make_build(temp_dir / "proton", "GE-Proton9-1")
+        new = make_build(temp_dir / "proton", "GE-Proton9-2")
+        installer.set_proton_pin('eq', "GE-Proton9-1")
+
+        with patch('game_installer.provision_prefix', return_value=True) as mock_provision:
+            installer.prepare_prefix('eq', {'dependencies': ["d3dx9"]})
+        assert mock_provision.call_args[0][2] == str(old)
+
+        with patch.object(installer.prefix_templates, 'build_in_background') as mock_build:
+            installer.prebuild_prefix_templates(['everquest-p1999'])
+        assert mock_build.call_args[0][0] == str(new)
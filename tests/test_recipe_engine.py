@@ -0,0 +1,232 @@
+"""
+Tests for recipe_engine.py and install_recipes.py modules
+"""
+
+import pytest
+import shutil
+import tempfile
+import threading
+import zipfile
+from pathlib import Path
+from unittest.mock import patch
+
+from recipe_engine import (
+    ACTIONS, BUILTIN_VARIABLES, RecipeCancelled, RecipeError, RecipeRunner, execution_waves, load_steps
+)
+from install_recipes import RECIPES, get_recipe
+from game_installer import GameInstaller
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+def make_runner(temp_dir, recipe, **kwargs):
+    prefix = temp_dir / "prefix"
+    return RecipeRunner("test", recipe, temp_dir / "game", prepare_prefix=lambda: prefix.mkdir(exist_ok=True) or prefix,
+                        cache_dir=temp_dir / "cache", home=temp_dir / "home", **kwargs)
+
+
+class TestLoadSteps:
+    """Test recipe validation"""
+
+    def test_references_become_dependencies(self):
+        """Test that $step references order steps"""
+        recipe = {'steps': [
+            {'id': 'a', 'action': 'notice', 'message': 'first'},
+            {'id': 'b', 'action': 'notice', 'message': 'after $a'},
+            {'id': 'c', 'action': 'notice', 'message': 'independent'},
+        ]}
+        assert execution_waves(recipe) == [['a', 'c'], ['b']]
+
+    def test_cycle_is_rejected(self):
+        """Test that circular dependencies fail validation"""
+        recipe = {'steps': [
+            {'id': 'a', 'action': 'notice', 'message': '$b'},
+            {'id': 'b', 'action': 'notice', 'message': '$a'},
+        ]}
+        with pytest.raises(RecipeError, match="cycle"):
+            load_steps(recipe)
+
+    def test_unknown_variable_is_rejected(self):
+        """Test that typos in variables are caught before anything runs"""
+        with pytest.raises(RecipeError, match="unknown"):
+            load_steps({'steps': [{'id': 'a', 'action': 'notice', 'message': '$missing'}]})
+
+    def test_bundled_recipes_are_valid(self):
+        """Test that every shipped recipe loads and is referenced from games_db"""
+        from games_db import GAMES_DATABASE
+        for name, recipe in RECIPES.items():
+            load_steps(recipe, BUILTIN_VARIABLES)
+            assert get_recipe(GAMES_DATABASE[name]['install_script']) is recipe
+
+
+class TestRecipeRunner:
+    """Test step execution"""
+
+    def test_independent_steps_run_concurrently(self, temp_dir):
+        """Test that steps without dependencies overlap"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def rendezvous(runner, step, params):
+            barrier.wait()
+            return step.id
+
+        recipe = {'steps': [
+            {'id': 'download', 'action': 'rendezvous'},
+            {'id': 'prefix_setup', 'action': 'rendezvous'},
+            {'id': 'done', 'action': 'notice', 'message': '$download $prefix_setup'},
+        ], 'register': {'result': '$done'}}
+        with patch.dict(ACTIONS, {'rendezvous': rendezvous}):
+            fields = make_runner(temp_dir, recipe).run()
+        assert fields == {'result': 'download prefix_setup'}
+
+    def test_failure_stops_run_and_runs_cleanups(self, temp_dir):
+        """Test that a failing step raises and temporary drive mappings are removed"""
+        (temp_dir / "disc").mkdir()
+        recipe = {'steps': [
+            {'id': 'prefix', 'action': 'prefix'},
+            {'id': 'drives', 'action': 'map_drives', 'prefix': '$prefix', 'drives': {'d:': str(temp_dir / "disc")}},
+            {'id': 'exe', 'action': 'find_executable', 'root': '$game_dir', 'names': ['game.exe'],
+             'needs': ['drives']},
+        ]}
+        with pytest.raises(RecipeError, match="game.exe"):
+            make_runner(temp_dir, recipe).run()
+        assert not (temp_dir / "prefix" / "dosdevices" / "d:").is_symlink()
+
+    def test_failure_stops_siblings_without_cancelling(self, temp_dir):
+        """Test that a failing step stops running siblings but is not reported as a cancel"""
+        def wait_for_stop(runner, step, params):
+            for _ in range(500):
+                if runner.stop_event.is_set():
+                    break
+                threading.Event().wait(0.01)
+            runner.check_cancelled()
+            return "finished"
+
+        recipe = {'steps': [
+            {'id': 'slow', 'action': 'wait_for_stop'},
+            {'id': 'exe', 'action': 'find_executable', 'root': '$game_dir', 'names': ['game.exe']},
+        ]}
+        cancel_event = threading.Event()
+        runner = make_runner(temp_dir, recipe, cancel_event=cancel_event)
+        with patch.dict(ACTIONS, {'wait_for_stop': wait_for_stop}):
+            with pytest.raises(RecipeError, match="game.exe") as excinfo:
+                runner.run()
+        assert not isinstance(excinfo.value, RecipeCancelled)
+        assert not cancel_event.is_set()
+        assert 'slow' not in runner.outputs
+
+    def test_fetch_prefers_user_download_then_cache(self, temp_dir):
+        """Test that nothing is downloaded when the file is already present"""
+        (temp_dir / "home" / "Hämtningar").mkdir(parents=True)
+        (temp_dir / "home" / "Hämtningar" / "Client_v2.zip").write_bytes(b"zip")
+        recipe = {'steps': [
+            {'id': 'local', 'action': 'fetch', 'search': ['client_v*.zip'], 'url': 'https://example.com/c.zip'},
+            {'id': 'cached', 'action': 'fetch', 'url': 'https://example.com/patch.zip'},
+        ], 'register': {'local': '$local'}}
+        def fake_download(runner, step, url, dest):
+            dest.parent.mkdir(parents=True, exist_ok=True)
+            dest.write_bytes(b"patch")
+
+        runner = make_runner(temp_dir, recipe)
+        with patch('recipe_engine._download', side_effect=fake_download) as mock_dl:
+            runner.run()
+            make_runner(temp_dir, recipe).run()
+
+        assert runner.outputs['local'] == temp_dir / "home" / "Hämtningar" / "Client_v2.zip"
+        assert mock_dl.call_count == 1
+
+    def test_skip_if_and_when(self, temp_dir):
+        """Test that finished work and missing optional inputs are skipped"""
+        (temp_dir / "game").mkdir()
+        (temp_dir / "game" / "done.txt").write_text("x")
+        recipe = {'steps': [
+            {'id': 'extra', 'action': 'fetch', 'search': ['nothing*.zip'], 'optional': True},
+            {'id': 'unpack', 'action': 'extract', 'archive': '$extra', 'dest': '$game_dir', 'when': 'extra'},
+            {'id': 'note', 'action': 'notice', 'message': 'hi', 'skip_if': '$game_dir/done.txt'},
+        ]}
+        runner = make_runner(temp_dir, recipe)
+        runner.run()
+        assert runner.outputs == {'extra': None, 'unpack': None, 'note': None}
+
+
+class TestQuarmRecipe:
+    """Test a bundled recipe end to end with local files"""
+
+    def test_installs_from_downloads(self, temp_dir):
+        """Test client hoisting, optional patcher and registration fields"""
+        downloads = temp_dir / "home" / "Downloads"
+        downloads.mkdir(parents=True)
+        with zipfile.ZipFile(downloads / "quarm_client.zip", 'w') as zf:
+            zf.writestr("TAKP/eqgame.exe", b"MZ" * 32)
+            zf.writestr("TAKP/spells_us.txt", "spells")
+        with zipfile.ZipFile(downloads / "QuarmPatcher.zip", 'w') as zf:
+            zf.writestr("eqemupatcher.exe", b"MZ" * 32)
+
+        proton = str(temp_dir / "proton" / "GE-Proton9-20")
+        runner = make_runner(temp_dir, RECIPES['everquest-quarm'], umu_command="/usr/bin/umu-run", proton_path=proton)
+        fields = runner.run()
+
+        game_dir = temp_dir / "game"
+        assert fields['client_exe'] == str(game_dir / "eqgame.exe")
+        assert fields['prefix'] == str(temp_dir / "prefix")
+        assert (game_dir / "eqemupatcher.exe").exists()
+        assert not (game_dir / "TAKP").exists()
+        script = (game_dir / "launch_patcher.sh").read_text()
+        assert str(temp_dir / "prefix") in script
+        assert f'PROTONPATH="${{PROTONPATH:-{proton}}}" exec /usr/bin/umu-run eqemupatcher.exe' in script
+
+
+class TestInstallerIntegration:
+    """Test that GameInstaller runs recipes instead of shell scripts"""
+
+    def test_recipe_install_registers_game(self, temp_dir):
+        """Test registration from the recipe's fields"""
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+
+        game_data = {'name': 'Test', 'install_type': 'manual_download', 'install_script': 'recipe:test',
+                     'dependencies': [], 'executable': 'game.exe'}
+        recipe = {'steps': [
+            {'id': 'exe', 'action': 'write_file', 'path': '$game_dir/game.exe', 'content': 'MZ'},
+        ], 'register': {'client_exe': '$exe'}}
+
+        with patch.dict(RECIPES, {'test': recipe}), \
+             patch.object(installer, 'check_dependencies', return_value={}):
+            assert installer.install_game('test', game_data) is True
+
+        info = installer.installed_games['test']
+        assert info['client_exe'] == str(temp_dir / "Games" / "test" / "game.exe")
+        assert info['path'] == str(temp_dir / "Games" / "test")
+
+    def test_run_steps_use_installer_proton(self, temp_dir):
+        """Test that Windows programs run with the installer's umu command and resolved Proton build"""
+        with patch('game_installer.Path.home') as mock_home:
+            mock_home.return_value = temp_dir
+            installer = GameInstaller(games_dir=str(temp_dir / "Games"))
+
+        game_data = {'name': 'Test', 'install_type': 'manual_download', 'install_script': 'recipe:test',
+                     'dependencies': [], 'executable': 'setup.exe'}
+        recipe = {'steps': [
+            {'id': 'setup', 'action': 'write_file', 'path': '$game_dir/setup.exe', 'content': 'MZ'},
+            {'id': 'installer', 'action': 'run', 'exe': '$setup', 'prefix': '$prefix_dir'},
+        ], 'register': {'client_exe': '$setup'}}
+
+        with patch.dict(RECIPES, {'test': recipe}), \
+             patch.object(installer, 'check_dependencies', return_value={}), \
+             patch.object(installer.probe, 'command', return_value="/usr/bin/umu-run"), \
+             patch.object(installer, 'proton_path', return_value="/builds/GE-Proton9-20"), \
+             patch('recipe_engine.run_streamed') as mock_run:
+            mock_run.return_value.cancelled = False
+            mock_run.return_value.returncode = 0
+            assert installer.install_game('test', game_data) is True
+
+        cmd = mock_run.call_args[0][0]
+        assert cmd[0] == "/usr/bin/umu-run"
+        assert mock_run.call_args[1]['env']['PROTONPATH'] == "/builds/GE-Proton9-20"
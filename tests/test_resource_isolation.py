@@ -0,0 +1,116 @@
+import pytest
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+from resource_isolation import (
+    ResourceIsolator, GAMES_SLICE, JOBS_SLICE, KIND_GAME, KIND_JOB, BACKGROUND_NICE,
+)
+from game_supervisor import GameSupervisor
+
+
+@pytest.fixture
+def temp_dir():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def cgroup_root(temp_dir):
+    root = temp_dir / "cgroup"
+    root.mkdir()
+    (root / "cgroup.controllers").write_text("cpu io memory pids\n")
+    return root
+
+
+class FakeRun:
+    """Records systemctl calls"""
+
+    def __init__(self, returncode=0):
+        self.returncode = returncode
+        self.calls = []
+
+    def __call__(self, cmd, **kwargs):
+        self.calls.append(cmd)
+        return subprocess.CompletedProcess(cmd, self.returncode, "", "")
+
+
+def which_all(cmd):
+    return f"/usr/bin/{cmd}"
+
+
+class TestResourceIsolator:
+    def test_wraps_in_systemd_scopes(self, cgroup_root):
+        isolator = ResourceIsolator(which_all, cgroup_root=cgroup_root, run=FakeRun())
+        assert isolator.available
+
+        game = isolator.wrap(["umu-run", "Wow.exe"], KIND_GAME, "wow-warmane")
+        job = isolator.wrap(["winetricks", "-q", "vcrun2019"])
+        assert game[:3] == ["systemd-run", "--user", "--scope"]
+        assert f"--slice={GAMES_SLICE}" in game and game[-3:] == ["--", "umu-run", "Wow.exe"]
+        assert f"--slice={JOBS_SLICE}" in job
+        units = [arg for arg in game + job if arg.startswith("--unit=")]
+        assert len(set(units)) == 2 and "wow-warmane" in units[0]
+
+    def test_fallback_without_systemd(self, temp_dir):
+        isolator = ResourceIsolator(which_all, cgroup_root=temp_dir, run=FakeRun())
+        assert not isolator.available
+        assert isolator.wrap(["umu-run", "Wow.exe"], KIND_GAME) == ["umu-run", "Wow.exe"]
+        job = isolator.wrap(["7z", "x", "client.7z"], KIND_JOB)
+        assert job[:3] == ["nice", "-n", str(BACKGROUND_NICE)] and job[-3:] == ["7z", "x", "client.7z"]
+        assert "ionice" in job
+
+        # Disabled in settings or no user manager behaves the same
+        assert not ResourceIsolator(which_all, enabled=False).available
+        assert not ResourceIsolator(which_all, cgroup_root=temp_dir, run=FakeRun(returncode=1)).available
+
+    def test_foreground_throttles_jobs_slice(self, cgroup_root, temp_dir):
+        run = FakeRun()
+        isolator = ResourceIsolator(which_all, [temp_dir], cgroup_root=cgroup_root, run=run)
+        assert isolator.available
+        run.calls.clear()
+
+        assert isolator.set_foreground(True)
+        assert not isolator.set_foreground(True)
+        throttle = run.calls[-1]
+        assert throttle[:5] == ["systemctl", "--user", "set-property", "--runtime", JOBS_SLICE]
+        assert "CPUWeight=20" in throttle and "IOWeight=10" in throttle
+        assert any(arg.startswith(f"IOReadBandwidthMax={temp_dir} ") for arg in throttle)
+
+        assert isolator.set_foreground(False)
+        release = run.calls[-1]
+        assert "CPUWeight=100" in release and "IOReadBandwidthMax=" in release
+        assert len(run.calls) == 2
+
+    def test_background_thread_priority(self, temp_dir):
+        isolator = ResourceIsolator(which_all, cgroup_root=temp_dir, run=FakeRun())
+        seen = {}
+        before = os.getpriority(os.PRIO_PROCESS, threading.get_native_id())
+
+        def work():
+            with isolator.background():
+                tid = threading.get_native_id()
+                seen['nice'] = os.getpriority(os.PRIO_PROCESS, tid)
+                seen['registered'] = tid in isolator._threads
+                # Children of a background thread inherit its priority already
+                seen['command'] = isolator.wrap(["7z", "x", "client.7z"])
+            seen['after'] = tid in isolator._threads
+
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join(10)
+        assert seen['nice'] >= BACKGROUND_NICE
+        assert seen['registered'] and not seen['after']
+        assert seen['command'] == ["7z", "x", "client.7z"]
+        # Other threads keep their priority
+        assert os.getpriority(os.PRIO_PROCESS, threading.get_native_id()) == before
+
+    def test_supervisor_reports_running_games(self):
+        counts = []
+        supervisor = GameSupervisor(interval=0.05, running_callback=counts.append)
+        supervisor.watch("wow", subprocess.Popen([sys.executable, "-c", "pass"]))
+        assert supervisor.wait("wow", 10)
+        assert counts == [1, 0]
@@ -0,0 +1,99 @@
+"""
+Tests for shader_cache.py module
+"""
+
+import hashlib
+import pytest
+import shutil
+import struct
+import tempfile
+from pathlib import Path
+
+from shader_cache import ShaderCacheManager, merge_state_cache, read_state_cache, cache_key
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+def entry(payload: bytes, stages: int = 0x11) -> bytes:
+    return struct.pack("<I", (len(payload) << 8) | stages) + hashlib.sha1(payload).digest() + payload
+
+
+def write_cache(path: Path, payloads, version: int = 17, trailing: bytes = b"") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(struct.pack("<4sII", b"DXVK", version, 0) + b"".join(entry(p) for p in payloads) + trailing)
+    return path
+
+
+class TestStateCacheMerge:
+    """Test entry-level merging of DXVK state caches"""
+
+    def test_merge_adds_missing_entries(self, temp_dir):
+        target = write_cache(temp_dir / "a" / "Wow.dxvk-cache", [b"one", b"two"])
+        source = write_cache(temp_dir / "b" / "Wow.dxvk-cache", [b"two", b"three", b"three"])
+
+        assert merge_state_cache(target, source) == 1
+        assert read_state_cache(target)[1] == [entry(b"one"), entry(b"two"), entry(b"three")]
+        assert merge_state_cache(target, source) == 0
+
+    def test_truncated_entry_is_dropped(self, temp_dir):
+        """Test a cache cut short by a killed game"""
+        path = write_cache(temp_dir / "Wow.dxvk-cache", [b"one"], trailing=entry(b"partial")[:6])
+        assert read_state_cache(path)[1] == [entry(b"one")]
+
+    def test_damaged_target_is_not_rewritten(self, temp_dir):
+        """Test that a target with a bad entry hash keeps its bytes"""
+        damaged = entry(b"two")[:-1] + b"X"
+        target = write_cache(temp_dir / "a" / "Wow.dxvk-cache", [b"one"], trailing=damaged + entry(b"three"))
+        before = target.read_bytes()
+        source = write_cache(temp_dir / "b" / "Wow.dxvk-cache", [b"four"])
+
+        assert read_state_cache(target)[1] == [entry(b"one")]
+        assert merge_state_cache(target, source) == 0
+        assert target.read_bytes() == before
+
+    def test_version_mismatch_keeps_larger_file(self, temp_dir):
+        target = write_cache(temp_dir / "a" / "Wow.dxvk-cache", [b"one"], version=15)
+        source = write_cache(temp_dir / "b" / "Wow.dxvk-cache", [b"one", b"two"], version=17)
+        assert merge_state_cache(target, source) == 0
+        assert target.read_bytes() == source.read_bytes()
+
+
+class TestShaderCacheManager:
+    """Test shared caches per client build"""
+
+    def test_cache_key_groups_client_builds(self):
+        wow = {'client_family': "wow", 'client_version': "3.3.5a"}
+        assert cache_key("wow-warmane-icecrown", wow) == cache_key("wow-stormforge", wow) == "wow-3.3.5a"
+        assert cache_key("runescape", {}) == "runescape"
+
+    def test_prepare_imports_game_dir_caches(self, temp_dir):
+        """Test that caches DXVK wrote next to the executable are merged into the shared cache"""
+        manager = ShaderCacheManager(temp_dir / "cache", temp_dir / "backup")
+        write_cache(temp_dir / "cache" / "wow-3.3.5a" / "dxvk" / "Wow.dxvk-cache", [b"one"])
+        game_dir = temp_dir / "Games" / "warmane"
+        write_cache(game_dir / "Wow.dxvk-cache", [b"two"])
+
+        env = manager.prepare("wow-3.3.5a", [game_dir])
+        shared = Path(env['DXVK_STATE_CACHE_PATH']) / "Wow.dxvk-cache"
+        assert read_state_cache(shared)[1] == [entry(b"one"), entry(b"two")]
+        assert not (game_dir / "Wow.dxvk-cache").exists()
+        assert Path(env['VKD3D_SHADER_CACHE_PATH']).is_dir()
+
+    def test_backup_survives_cache_loss(self, temp_dir):
+        """Test that a wiped live cache is restored from its backup on the next launch"""
+        manager = ShaderCacheManager(temp_dir / "cache", temp_dir / "backup")
+        env = manager.prepare("wow-3.3.5a")
+        write_cache(Path(env['DXVK_STATE_CACHE_PATH']) / "Wow.dxvk-cache", [b"one", b"two"])
+        (Path(env['VKD3D_SHADER_CACHE_PATH']) / "vkd3d-proton.cache").write_bytes(b"blob")
+        assert manager.backup("wow-3.3.5a") == 2
+
+        shutil.rmtree(temp_dir / "cache")
+        env = manager.prepare("wow-3.3.5a")
+        assert len(read_state_cache(Path(env['DXVK_STATE_CACHE_PATH']) / "Wow.dxvk-cache")[1]) == 2
+        assert (Path(env['VKD3D_SHADER_CACHE_PATH']) / "vkd3d-proton.cache").read_bytes() == b"blob"
@@ -0,0 +1,88 @@
+"""
+Tests for system_probe.py module
+"""
+
+import pytest
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+import system_probe
+from system_probe import SystemProbe, path_fingerprint, describe
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+@pytest.fixture
+def bin_dir(temp_dir, monkeypatch):
+    """A PATH containing only an empty temporary directory"""
+    path = temp_dir / "bin"
+    path.mkdir()
+    monkeypatch.setenv('PATH', str(path))
+    monkeypatch.setattr(system_probe, 'FINGERPRINT_INTERVAL', 0)
+    return path
+
+
+def add_tool(bin_dir, name, mtime):
+    """Create an executable and give the directory a distinct mtime"""
+    tool = bin_dir / name
+    tool.write_text("#!/bin/sh\n")
+    tool.chmod(0o755)
+    os.utime(bin_dir, (mtime, mtime))
+    return tool
+
+
+class TestSystemProbe:
+    """Test cached tool lookups"""
+
+    def test_lookups_are_cached(self, bin_dir):
+        """Test that repeated lookups do not search PATH again"""
+        add_tool(bin_dir, "wine", 1_000_000)
+        probe = SystemProbe()
+        with patch('system_probe.shutil.which', wraps=shutil.which) as mock_which:
+            assert probe.which("wine") == str(bin_dir / "wine")
+            assert probe.which("wine") == str(bin_dir / "wine")
+            assert probe.command('wine') == "wine"
+        mock_which.assert_called_once_with("wine")
+
+    def test_path_change_invalidates(self, bin_dir):
+        """Test that installing a tool is picked up without a restart"""
+        os.utime(bin_dir, (1_000_000, 1_000_000))
+        probe = SystemProbe()
+        assert probe.command('umu') is None
+
+        add_tool(bin_dir, "umu", 2_000_000)
+        assert probe.command('umu') == "umu"
+        add_tool(bin_dir, "umu-run", 3_000_000)
+        assert probe.command('umu') == "umu-run"
+
+    def test_snapshot_is_persisted(self, bin_dir, temp_dir):
+        """Test that a new probe reuses the saved snapshot while PATH is unchanged"""
+        add_tool(bin_dir, "7z", 1_000_000)
+        cache = temp_dir / "capabilities.json"
+        snapshot = SystemProbe(cache).snapshot()
+        assert snapshot['7z'] == {'command': "7z", 'path': str(bin_dir / "7z")}
+        assert snapshot['terminal']['command'] is None
+
+        with patch('system_probe.shutil.which') as mock_which:
+            probe = SystemProbe(cache)
+            assert probe.snapshot() == snapshot
+            assert probe.probed_at is not None
+        mock_which.assert_not_called()
+
+        add_tool(bin_dir, "xterm", 2_000_000)
+        assert SystemProbe(cache).snapshot()['terminal']['command'] == "xterm"
+
+    def test_fingerprint_and_describe(self, bin_dir):
+        assert path_fingerprint(f"{bin_dir}{os.pathsep}/nonexistent")[1] == ("/nonexistent", None)
+        lines = describe({'wine': {'command': "wine", 'path': "/usr/bin/wine"},
+                          'java': {'command': None, 'path': None}})
+        assert lines == ["wine: wine (/usr/bin/wine)", "java: not found"]
@@ -0,0 +1,109 @@
+"""
+Tests for wineserver_manager.py module
+"""
+
+import pytest
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from unittest.mock import patch
+
+from wineserver_manager import WineserverManager, wine_processes, wineserver_binary
+
+
+@pytest.fixture
+def temp_dir():
+    """Create temporary directory for tests"""
+    temp = tempfile.mkdtemp()
+    yield Path(temp)
+    shutil.rmtree(temp, ignore_errors=True)
+
+
+def add_process(proc_root, pid, argv0, prefix=None):
+    """Fake /proc/<pid> entry"""
+    proc_dir = proc_root / str(pid)
+    proc_dir.mkdir(parents=True)
+    (proc_dir / "cmdline").write_bytes(argv0.encode() + b"\0--flag\0")
+    environ = [b"HOME=/home/user"] + ([f"WINEPREFIX={prefix}".encode()] if prefix else [])
+    (proc_dir / "environ").write_bytes(b"\0".join(environ) + b"\0")
+
+
+@pytest.fixture
+def prefixes(temp_dir):
+    """Two prefixes with a wineserver each: one idle after a crash, one running a game"""
+    proc_root = temp_dir / "proc"
+    crashed, running = temp_dir / "crashed", temp_dir / "running"
+    for prefix in (crashed, running):
+        (prefix / "drive_c").mkdir(parents=True)
+    add_process(proc_root, 100, "/opt/proton/files/bin/wineserver", crashed)
+    add_process(proc_root, 101, "C:\\windows\\system32\\services.exe", crashed)
+    add_process(proc_root, 102, "C:\\windows\\system32\\winedevice.exe", crashed)
+    add_process(proc_root, 200, "wineserver", running)
+    add_process(proc_root, 201, "C:\\EverQuest\\eqgame.exe", running)
+    add_process(proc_root, 300, "/usr/bin/bash")
+    return proc_root, str(crashed), str(running)
+
+
+class TestWineserverManager:
+    """Test wineserver discovery, pre-warming and cleanup"""
+
+    def test_processes_are_grouped_by_prefix(self, prefixes):
+        proc_root, crashed, running = prefixes
+        names = {p.pid: p.name for p in wine_processes(proc_root)}
+        assert names == {100: "wineserver", 101: "services.exe", 102: "winedevice.exe",
+                         200: "wineserver", 201: "eqgame.exe"}
+        servers = WineserverManager(proc_root=proc_root).servers([crashed])
+        assert list(servers) == [crashed]
+
+    def test_reap_only_stops_servers_without_a_game(self, prefixes):
+        """Test that a server with only Wine services attached is stale"""
+        proc_root, crashed, running = prefixes
+        manager = WineserverManager(proc_root=proc_root)
+        with patch('wineserver_manager.os.kill') as mock_kill:
+            assert manager.reap_stale([crashed, running]) == [100]
+        mock_kill.assert_called_once()
+
+    def test_warm_starts_persistent_server_once(self, prefixes, temp_dir):
+        """Test the -p idle timeout and that running servers are reused"""
+        proc_root, crashed, running = prefixes
+        proton = temp_dir / "GE-Proton9-20"
+        binary = proton / "files" / "bin" / "wineserver"
+        binary.parent.mkdir(parents=True)
+        log = temp_dir / "calls.txt"
+        binary.write_text(f"#!{sys.executable}\nimport os, sys\n"
+                          f"open({str(log)!r}, 'a').write(os.environ['WINEPREFIX'] + ' ' + sys.argv[1] + '\\n')\n")
+        binary.chmod(0o755)
+        fresh = temp_dir / "fresh"
+        (fresh / "drive_c").mkdir(parents=True)
+        manager = WineserverManager(idle_timeout=120, proc_root=proc_root)
+
+        assert wineserver_binary("GE-Proton") is None
+        assert not manager.warm(str(fresh), "GE-Proton")
+        assert manager.warm(str(fresh), str(proton))
+        assert manager.warm(running, str(proton))
+        assert log.read_text().splitlines() == [f"{os.path.realpath(fresh)} -p120"]
+
+    def test_prefix_is_warmed_again_after_idle_exit(self, prefixes, temp_dir):
+        """Test that a pre-warmed server that timed out does not block the next warm-up"""
+        proc_root, crashed, running = prefixes
+        fresh = os.path.realpath(temp_dir / "fresh")
+        manager = WineserverManager(proc_root=proc_root)
+        manager._warmed = {os.path.realpath(running): "wineserver", fresh: "wineserver"}
+        with patch.object(manager, 'warm') as mock_warm:
+            assert manager.warm_in_background(running, "GE-Proton") is None
+            thread = manager.warm_in_background(fresh, "GE-Proton")
+            thread.join(5)
+        mock_warm.assert_called_once_with(fresh, "GE-Proton")
+        assert fresh not in manager._warmed
+
+    def test_shutdown_leaves_servers_in_use(self, prefixes):
+        """Test that exiting the launcher does not stop a running game's server"""
+        proc_root, crashed, running = prefixes
+        manager = WineserverManager(proc_root=proc_root)
+        manager._warmed = {os.path.realpath(crashed): "wineserver", os.path.realpath(running): "wineserver"}
+        with patch('wineserver_manager.os.kill') as mock_kill:
+            assert manager.shutdown() == [100]
+            assert manager.reap_stale([crashed]) == [100]
+        assert mock_kill.call_count == 2
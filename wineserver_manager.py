@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Wineserver manager module
+Starts a persistent wineserver for a game's prefix ahead of launch, so the
+client does not pay for the server and prefix services cold-starting, and
+cleans up servers that are idle or were left behind by crashed games
+"""
+
+import argparse
+import logging
+import os
+import signal
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Dict, List, Iterable
+
+# Constants
+PROC_ROOT = Path("/proc")
+
+# Seconds a pre-warmed wineserver stays up with no Wine process attached
+DEFAULT_IDLE_TIMEOUT = 300
+START_TIMEOUT = 15
+
+# Locations of wineserver inside a Proton build
+PROTON_WINESERVER_PATHS = ["files/bin/wineserver", "dist/bin/wineserver"]
+
+# Processes Wine starts for itself; a server with only these attached has
+# no game running
+WINE_SERVICE_PROCESSES = {
+    "services.exe", "winedevice.exe", "plugplay.exe", "explorer.exe", "rpcss.exe",
+    "svchost.exe", "conhost.exe", "wineboot.exe", "tabtip.exe", "start.exe",
+}
+
+logger = logging.getLogger("game_installer.wineserver")
+
+
+class WineProcess:
+    """A running process that belongs to a Wine prefix"""
+
+    def __init__(self, pid: int, name: str, prefix: str):
+        self.pid = pid
+        self.name = name
+        self.prefix = prefix
+
+    @property
+    def is_server(self) -> bool:
+        return self.name == "wineserver"
+
+    @property
+    def is_service(self) -> bool:
+        return self.name in WINE_SERVICE_PROCESSES
+
+    def __repr__(self) -> str:
+        return f"WineProcess({self.pid}, {self.name!r}, {self.prefix!r})"
+
+
+def _prefix_key(prefix) -> str:
+    """Comparable form of a prefix path (umu links <prefix>/pfx to the prefix)"""
+    return os.path.realpath(os.fspath(prefix))
+
+
+def _process_name(argv0: str) -> str:
+    return argv0.replace("\\", "/").rsplit("/", 1)[-1].lower()
+
+
+def wine_processes(proc_root: Path = PROC_ROOT) -> List[WineProcess]:
+    """
+    Processes of the current user that run with a WINEPREFIX.
+
+    Processes that cannot be inspected (other users, exited meanwhile) are
+    skipped.
+    """
+    processes = []
+    try:
+        entries = [e for e in os.listdir(proc_root) if e.isdigit()]
+    except OSError:
+        return processes
+    for entry in entries:
+        proc_dir = proc_root / entry
+        try:
+            environ = (proc_dir / "environ").read_bytes().split(b"\0")
+            argv0 = (proc_dir / "cmdline").read_bytes().split(b"\0", 1)[0]
+        except OSError:
+            continue
+        prefix = next((item[len(b"WINEPREFIX="):] for item in environ if item.startswith(b"WINEPREFIX=")), None)
+        if not prefix or not argv0:
+            continue
+        name = _process_name(argv0.decode("utf-8", errors="replace"))
+        processes.append(WineProcess(int(entry), name, _prefix_key(prefix.decode("utf-8", errors="replace"))))
+    return processes
+
+
+def wineserver_binary(proton_path: Optional[str]) -> Optional[str]:
+    """
+    wineserver of a local Proton build.
+
+    Clients refuse a server from a different Wine version, so there is no
+    fallback to the system wineserver.
+    """
+    if not proton_path or not Path(proton_path).is_dir():
+        return None
+    for relative in PROTON_WINESERVER_PATHS:
+        candidate = Path(proton_path) / relative
+        if os.access(candidate, os.X_OK):
+            return str(candidate)
+    return None
+
+
+class WineserverManager:
+    """
+    Pre-warmed wineservers, one per prefix.
+
+    Servers are started with ``wineserver -p<idle_timeout>`` so they exit on
+    their own once no Wine process has used them for that long.
+    """
+
+    def __init__(self, idle_timeout: int = DEFAULT_IDLE_TIMEOUT, proc_root: Path = PROC_ROOT):
+        """
+        Args:
+            idle_timeout: Seconds a server stays up with nothing attached
+            proc_root: procfs mount point
+        """
+        self.idle_timeout = idle_timeout
+        self.proc_root = Path(proc_root)
+        self._lock = threading.Lock()
+        self._warmed: Dict[str, str] = {}
+        self._starting: Dict[str, threading.Thread] = {}
+
+    def servers(self, prefixes: Optional[Iterable[str]] = None) -> Dict[str, List[WineProcess]]:
+        """
+        Running wineservers with their attached processes.
+
+        Args:
+            prefixes: Only report these prefixes (default: all)
+
+        Returns:
+            Dict of prefix -> processes of that prefix, for prefixes that have a wineserver
+        """
+        wanted = {_prefix_key(p) for p in prefixes} if prefixes is not None else None
+        by_prefix: Dict[str, List[WineProcess]] = {}
+        for process in wine_processes(self.proc_root):
+            if wanted is None or process.prefix in wanted:
+                by_prefix.setdefault(process.prefix, []).append(process)
+        return {prefix: procs for prefix, procs in by_prefix.items() if any(p.is_server for p in procs)}
+
+    def is_warm(self, prefix: str) -> bool:
+        return _prefix_key(prefix) in self.servers([prefix])
+
+    def warm(self, prefix: str, proton_path: Optional[str]) -> bool:
+        """
+        Start a persistent wineserver for a prefix unless one is running.
+
+        Args:
+            prefix: Wine prefix of the game
+            proton_path: Local Proton build the game will be launched with
+
+        Returns:
+            True if a server is running for the prefix
+        """
+        key = _prefix_key(prefix)
+        binary = wineserver_binary(proton_path)
+        if binary is None or not Path(key, "drive_c").is_dir():
+            return False
+        if self.is_warm(key):
+            return True
+        env = {**os.environ, 'WINEPREFIX': key}
+        try:
+            # wineserver forks into the background once its socket is ready
+            subprocess.run([binary, f"-p{self.idle_timeout}"], env=env, stdin=subprocess.DEVNULL,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           timeout=START_TIMEOUT, start_new_session=True)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.warning(f"Could not start wineserver for {key}: {e}")
+            return False
+        with self._lock:
+            self._warmed[key] = binary
+        logger.info(f"Pre-warmed wineserver for {key} (idle timeout {self.idle_timeout}s)")
+        return True
+
+    def warm_in_background(self, prefix: str, proton_path: Optional[str]) -> Optional[threading.Thread]:
+        """
+        Run warm() on a daemon thread.
+
+        Returns:
+            The thread, or None if the prefix has a warm server or is being warmed
+        """
+        key = _prefix_key(prefix)
+        with self._lock:
+            if key in self._starting:
+                return None
+            if key in self._warmed:
+                if self.is_warm(key):
+                    return None
+                # The server exited on its idle timeout; warm the prefix again
+                del self._warmed[key]
+
+            def run():
+                try:
+                    self.warm(key, proton_path)
+                finally:
+                    with self._lock:
+                        self._starting.pop(key, None)
+
+            thread = threading.Thread(target=run, name="wineserver-warm", daemon=True)
+            self._starting[key] = thread
+            thread.start()
+        return thread
+
+    def _stop_idle(self, prefixes: Iterable[str], skip_warmed: bool) -> List[int]:
+        stopped = []
+        with self._lock:
+            warmed = set(self._warmed)
+        for prefix, processes in self.servers(prefixes).items():
+            if skip_warmed and prefix in warmed:
+                continue
+            if any(not (p.is_server or p.is_service) for p in processes):
+                continue  # a game is still running in this prefix
+            for process in processes:
+                if process.is_server:
+                    try:
+                        os.kill(process.pid, signal.SIGTERM)
+                        stopped.append(process.pid)
+                    except (ProcessLookupError, PermissionError):
+                        pass
+            logger.info(f"Stopped idle wineserver for {prefix}")
+        return stopped
+
+    def reap_stale(self, prefixes: Iterable[str]) -> List[int]:
+        """
+        Stop wineservers left behind in the given prefixes by crashed games.
+
+        A server is stale when only Wine's own services are attached to it
+        and the launcher did not pre-warm it.
+
+        Returns:
+            PIDs of the stopped servers
+        """
+        return self._stop_idle(prefixes, skip_warmed=True)
+
+    def shutdown(self) -> List[int]:
+        """
+        Stop the servers this manager pre-warmed, unless a game is using them.
+
+        Returns:
+            PIDs of the stopped servers
+        """
+        with self._lock:
+            prefixes = list(self._warmed)
+            self._warmed.clear()
+        return self._stop_idle(prefixes, skip_warmed=False) if prefixes else []
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Pre-warm or clean up wineservers for Wine prefixes")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("list", help="List running wineservers and their processes")
+    warm = sub.add_parser("warm", help="Start a persistent wineserver for a prefix")
+    warm.add_argument("prefix")
+    warm.add_argument("--proton", required=True, help="Local Proton build directory")
+    warm.add_argument("--idle-timeout", type=int, default=DEFAULT_IDLE_TIMEOUT)
+    reap = sub.add_parser("reap", help="Stop wineservers with no game attached")
+    reap.add_argument("prefixes", nargs="+")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    if args.command == "list":
+        for prefix, processes in WineserverManager().servers().items():
+            print(f"{prefix}: {', '.join(f'{p.name} ({p.pid})' for p in processes)}")
+        return 0
+    if args.command == "warm":
+        return 0 if WineserverManager(args.idle_timeout).warm(args.prefix, args.proton) else 1
+    print(f"Stopped {len(WineserverManager().reap_stale(args.prefixes))} wineserver(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())